@@ -7,7 +7,7 @@ class Ascends(Base):
     __tablename__ = "Ascends"
 
     id = Column(Integer, primary_key=True, nullable=False)
-    parents = Column(Integer, ForeignKey("Family.id"))
+    parents = Column(Integer, ForeignKey("Family.id"), index=True)
     consang = Column(Integer, nullable=False)
 
     parents_obj = relationship("Family", foreign_keys=[parents])
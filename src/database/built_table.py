@@ -0,0 +1,36 @@
+from sqlalchemy import Text, event, insert
+from sqlalchemy.orm import mapped_column
+from database import Base
+
+# Tables derived from the whole base by the ``rebuild`` of a repository
+DERIVED_TABLES = ("NameIndex", "NameCount", "CachedValue", "Place")
+
+
+class BuiltTable(Base):
+    """Derived tables (``NameIndex``, ``NameCount``, ``CachedValue``,
+    ``Place``) that cover the whole base, because the ``rebuild`` of their
+    repository filled them or because they were created along with the
+    base.
+
+    The repositories also write the rows of the persons and families they
+    add or edit, so a derived table having rows does not mean that it
+    covers the base: on a base built before the table existed, it is only
+    listed here once it has been rebuilt.
+    """
+    __tablename__ = "BuiltTable"
+
+    name = mapped_column(Text, primary_key=True, nullable=False)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _new_base_is_built(target, connection, tables=(), **kw):
+    """The derived tables of a new base are kept up to date by every write
+    from the start: list them as soon as ``create_all`` creates ``Person``
+    with them."""
+    created = {table.name for table in tables}
+    if "Person" not in created:
+        return
+    names = [name for name in DERIVED_TABLES if name in created]
+    if names:
+        connection.execute(insert(BuiltTable), [
+            {"name": name} for name in names])
@@ -0,0 +1,32 @@
+import enum
+
+from sqlalchemy import Enum, Index, Text
+from sqlalchemy.orm import mapped_column
+from database import Base
+
+
+class CacheKind(enum.Enum):
+    SURNAME = "SURNAME"
+    FIRST_NAME = "FIRST_NAME"
+    PLACE = "PLACE"
+    OCCUPATION = "OCCUPATION"
+    SOURCE = "SOURCE"
+    TITLE = "TITLE"
+
+
+class CachedValue(Base):
+    """Distinct surnames, first names, places, occupations, sources and
+    titles of a base (the legacy ``cache_files``), derived by
+    ``repositories.cache_files_repository`` for the edit forms.
+
+    ``value`` is the value as written (stripped) and ``sort_key`` its
+    lowercase form without accents the lists are sorted on.
+    """
+    __tablename__ = "CachedValue"
+    __table_args__ = (
+        Index("ix_CachedValue_sort_key", "kind", "sort_key", "value"),
+    )
+
+    kind = mapped_column(Enum(CacheKind), primary_key=True, nullable=False)
+    value = mapped_column(Text, primary_key=True, nullable=False)
+    sort_key = mapped_column(Text, nullable=False)
@@ -8,8 +8,10 @@ class Couple(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
 
-    father_id = Column(Integer, ForeignKey("Person.id"), nullable=False)
-    mother_id = Column(Integer, ForeignKey("Person.id"), nullable=False)
+    father_id = Column(Integer, ForeignKey("Person.id"), nullable=False,
+                       index=True)
+    mother_id = Column(Integer, ForeignKey("Person.id"), nullable=False,
+                       index=True)
 
     father_obj = relationship("Person", foreign_keys=[father_id])
     mother_obj = relationship("Person", foreign_keys=[mother_id])
@@ -1,4 +1,6 @@
-from sqlalchemy import Integer, Text, Enum, ForeignKey
+from typing import Optional
+from sqlalchemy import Integer, Text, Enum, ForeignKey, Index, event, func
+from sqlalchemy import literal_column
 from sqlalchemy.orm import relationship, mapped_column
 from database import Base
 from libraries.date import Calendar
@@ -26,6 +28,16 @@ class Precision(Base):
 
 
 class Date(Base):
+    """A date, as ``iso_date`` ("YYYY-MM-DD", or "YYYY-MM" / "YYYY" when the
+    day or month is unknown) and its precision.
+
+    ``ymd`` is the same date as the integer YYYYMMDD (0 for an unknown day
+    or month), which date ranges are compared on. ``compressed`` is
+    ``libraries.date.DateValue.compress()`` of the date, precision
+    included: a date that has it is read without its ``Precision`` row.
+    Dates it cannot pack (OrYear, YearInt, a delta, a year out of 1-2499)
+    have it NULL and are read from ``iso_date`` and ``precision_obj``.
+    """
     __tablename__ = "Date"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
@@ -34,6 +46,8 @@ class Date(Base):
     precision_id = mapped_column(Integer,
                                  ForeignKey("Precision.id"), nullable=False)
     delta = mapped_column(Integer, nullable=False)
+    ymd = mapped_column(Integer, nullable=True, index=True)
+    compressed = mapped_column(Integer, nullable=True)
 
     precision_obj = relationship(
         "Precision",
@@ -42,3 +56,33 @@ class Date(Base):
         cascade="all, delete-orphan",
         single_parent=True
     )
+
+
+# "MM-DD" of the full dates (``iso_date`` is "YYYY-MM-DD", or "YYYY-MM" /
+# "YYYY" when the day or month is unknown). The anniversary pages filter on
+# this very expression so that SQLite answers them from its index.
+month_day = func.substr(
+    Date.iso_date, literal_column("6"), literal_column("5"))
+Index("ix_Date_month_day", month_day)
+
+
+def packed_date(date: Optional[Date]) -> Optional[int]:
+    """``compressed`` of ``date`` if it is a Gregorian date, else None.
+
+    The persons and families keep it in a ``<date>_compressed`` column next
+    to the foreign key of each of their dates, so that the dates packed
+    there are read without their ``Date`` row.
+    """
+    if date is None or date.calendar is not Calendar.GREGORIAN:
+        return None
+    return date.compressed
+
+
+def keep_packed(model: type, date: str) -> None:
+    """Keep ``<date>_compressed`` of ``model`` equal to ``packed_date`` of
+    the Date set on its ``<date>_obj`` relationship, whatever writes it."""
+    column = f"{date}_compressed"
+
+    @event.listens_for(getattr(model, f"{date}_obj"), "set")
+    def _set(target, value, oldvalue, initiator):
+        setattr(target, column, packed_date(value))
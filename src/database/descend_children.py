@@ -7,8 +7,9 @@ class DescendChildren(Base):
     __tablename__ = "DescendChildren"
     id = mapped_column(Integer, primary_key=True, nullable=False)
     descend_id = mapped_column(Integer, ForeignKey("Descends.id"),
-                               nullable=False)
-    person_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+                               nullable=False, index=True)
+    person_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
 
     descend_obj = relationship("Descends", foreign_keys=[descend_id])
     person_obj = relationship("Person", foreign_keys=[person_id])
@@ -0,0 +1,175 @@
+"""
+Process-wide cache of SQLAlchemy engines and sessionmakers, keyed by the
+path of the SQLite file they point to.
+
+Creating an engine and running ``Base.metadata.create_all`` is far more
+expensive than the queries behind most gwd pages, so the web routes share a
+single engine per base for the whole lifetime of the process. An entry is
+dropped as soon as the file it was built for disappears or is replaced by a
+new file (``gwsetup database delete``, ``gwc -f`` rebuild, ...).
+
+The registry also tells the version of a base, so that data derived from it
+can be cached until the next write. The version is read from the file
+itself: the file change counter SQLite keeps in its header, bumped by every
+transaction that writes to it (the bases use a rollback journal), and its
+modification time. Writes from other processes (``consang``, ``gwsetup``,
+another worker) change it too, and it does not start over when the server
+restarts.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, Engine
+from sqlalchemy.orm import sessionmaker, Session
+
+from database import Base
+from database.migrations import ensure_indexes
+
+
+FileSignature = Tuple[int, int]
+# (file change counter, modification time in ns)
+ContentStamp = Tuple[int, int]
+BaseVersion = Tuple[FileSignature, ContentStamp]
+
+# Offset of the file change counter in the header of an SQLite file
+_CHANGE_COUNTER = slice(24, 28)
+
+
+@dataclass
+class _RegistryEntry:
+    engine: Engine
+    sessionmaker: sessionmaker[Session]
+    signature: FileSignature
+
+
+def _file_signature(database_path: str) -> Optional[FileSignature]:
+    """Identify the file currently living at ``database_path``.
+
+    The (device, inode) pair changes when the file is deleted and created
+    again, but not when SQLite writes to it, which is exactly what the
+    registry needs to tell "same base" from "rebuilt base".
+    """
+    try:
+        st = os.stat(database_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _base_version(database_path: str) -> Optional[BaseVersion]:
+    """Signature and content stamp of the file at ``database_path``."""
+    try:
+        st = os.stat(database_path)
+        with open(database_path, "rb") as file:
+            header = file.read(_CHANGE_COUNTER.stop)
+    except FileNotFoundError:
+        return None
+    counter = int.from_bytes(header[_CHANGE_COUNTER], "big")
+    return (st.st_dev, st.st_ino), (counter, st.st_mtime_ns)
+
+
+class EngineRegistry:
+    """Thread-safe registry of engines shared by every request of a base."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _RegistryEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(database_path: str) -> str:
+        return os.path.abspath(database_path)
+
+    def get(
+        self, database_path: str
+    ) -> Tuple[Engine, sessionmaker[Session]]:
+        """Return the engine and sessionmaker for ``database_path``.
+
+        The schema is created, or given its missing indexes, the first time
+        a given file is seen; later calls only cost a ``stat`` of the file.
+        """
+        key = self._key(database_path)
+        with self._lock:
+            signature = _file_signature(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if signature is not None and signature == entry.signature:
+                    self.hits += 1
+                    return entry.engine, entry.sessionmaker
+                self._drop(key)
+
+            self.misses += 1
+            engine = create_engine(f"sqlite:///{key}")
+            Base.metadata.create_all(engine)
+            ensure_indexes(engine)
+            # create_all creates the file when it did not exist yet
+            signature = _file_signature(key)
+            if signature is None:
+                raise FileNotFoundError(
+                    f"Database file could not be created at {key}")
+            entry = _RegistryEntry(
+                engine=engine,
+                sessionmaker=sessionmaker(bind=engine),
+                signature=signature,
+            )
+            self._entries[key] = entry
+            return entry.engine, entry.sessionmaker
+
+    def version(self, database_path: str) -> Optional[BaseVersion]:
+        """Identify the current content of a registered base: the pair
+        changes when the file is replaced or when a transaction writes to
+        it, from this process or another one. None when the base has no
+        entry (or its file was replaced since)."""
+        key = self._key(database_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            signature = entry.signature
+        version = _base_version(key)
+        if version is None or version[0] != signature:
+            return None
+        return version
+
+    def invalidate(self, database_path: str) -> bool:
+        """Forget the entry for ``database_path`` and dispose its engine.
+
+        Returns True if an entry was actually removed.
+        """
+        key = self._key(database_path)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def clear(self) -> None:
+        """Dispose every cached engine and reset the counters."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        entry.engine.dispose()
+        self.invalidations += 1
+
+
+engine_registry = EngineRegistry()
@@ -1,6 +1,7 @@
 from sqlalchemy import Integer, Text, Enum, ForeignKey
 from sqlalchemy.orm import relationship, mapped_column
 from database import Base
+from database.date import keep_packed
 from libraries.family import MaritalStatus
 import enum
 
@@ -15,7 +16,7 @@ class Family(Base):
     __tablename__ = "Family"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    marriage_date = mapped_column(Integer, ForeignKey("Date.id"))
+    marriage_date = mapped_column(Integer, ForeignKey("Date.id"), index=True)
     marriage_place = mapped_column(Text, nullable=False)
     marriage_note = mapped_column(Text, nullable=False)
     marriage_src = mapped_column(Text, nullable=False)
@@ -27,6 +28,9 @@ class Family(Base):
     comment = mapped_column(Text, nullable=False)
     origin_file = mapped_column(Text, nullable=False)
     src = mapped_column(Text, nullable=False)
+    # ``database.date.packed_date`` of the marriage and divorce dates
+    marriage_date_compressed = mapped_column(Integer, nullable=True)
+    divorce_date_compressed = mapped_column(Integer, nullable=True)
 
     parents = relationship(
         "Couple",
@@ -55,3 +59,7 @@ class Family(Base):
         single_parent=True,
         foreign_keys=[divorce_date]
     )
+
+
+for _date in ("marriage_date", "divorce_date"):
+    keep_packed(Family, _date)
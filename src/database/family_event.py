@@ -24,7 +24,8 @@ class FamilyEvent(Base):
     __tablename__ = "FamilyEvent"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    family_id = mapped_column(Integer, ForeignKey("Family.id"), nullable=False)
+    family_id = mapped_column(Integer, ForeignKey("Family.id"),
+                              nullable=False, index=True)
     name = mapped_column(Enum(FamilyEventName), nullable=False)
     date = mapped_column(Integer, ForeignKey("Date.id"))
     place = mapped_column(Text, nullable=False)
@@ -8,9 +8,10 @@ class FamilyEventWitness(Base):
     __tablename__ = "FamilyEventWitness"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    person_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+    person_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
     event_id = mapped_column(Integer, ForeignKey("FamilyEvent.id"),
-                             nullable=False)
+                             nullable=False, index=True)
     kind = mapped_column(Enum(EventWitnessKind), nullable=False)
 
     person_obj = relationship("Person", foreign_keys=[person_id])
@@ -7,5 +7,7 @@ class FamilyWitness(Base):
     __tablename__ = "FamilyWitness"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    family_id = mapped_column(Integer, ForeignKey("Family.id"), nullable=False)
-    person_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+    family_id = mapped_column(Integer, ForeignKey("Family.id"),
+                              nullable=False, index=True)
+    person_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
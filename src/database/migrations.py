@@ -0,0 +1,142 @@
+"""
+In-place schema upgrades for existing SQLite bases.
+
+``Base.metadata.create_all`` only creates missing tables: a base built before
+an index was declared on the models keeps scanning the tables until it is
+rebuilt. ``ensure_indexes`` adds the missing indexes to such a file without
+touching its data, and is run every time an engine is opened on a base.
+
+Likewise, a column added to a model after a base was built is added to it by
+``ensure_columns``, and filled from the other columns of its rows.
+"""
+
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Engine, inspect
+from sqlalchemy.schema import CreateColumn
+
+from database import Base
+
+
+def _packed_date(table: str, date: str) -> str:
+    """Statement filling ``<date>_compressed`` of ``table`` with
+    ``database.date.packed_date`` of its ``date``."""
+    return f"""
+        UPDATE "{table}" SET {date}_compressed = (
+            SELECT d.compressed FROM "Date" AS d
+            WHERE d.id = "{table}".{date} AND d.calendar = 'GREGORIAN')
+        WHERE {date} IS NOT NULL
+    """
+
+
+# Dates packed on the rows holding them
+_PACKED_DATES = (
+    ("Person", "birth_date"),
+    ("Person", "baptism_date"),
+    ("Person", "death_date"),
+    ("Person", "burial_date"),
+    ("Family", "marriage_date"),
+    ("Family", "divorce_date"),
+)
+
+
+# Columns added to the models since the first bases were built, with the
+# statement filling them in the rows of an older base
+ADDED_COLUMNS: Dict[Tuple[str, str], str] = {
+    # "YYYY-MM-DD", "YYYY-MM" or "YYYY" as YYYYMMDD
+    ("Date", "ymd"): """
+        UPDATE "Date" SET ymd = CASE length(iso_date)
+            WHEN 10 THEN CAST(substr(iso_date, 1, 4) AS INTEGER) * 10000
+                + CAST(substr(iso_date, 6, 2) AS INTEGER) * 100
+                + CAST(substr(iso_date, 9, 2) AS INTEGER)
+            WHEN 7 THEN CAST(substr(iso_date, 1, 4) AS INTEGER) * 10000
+                + CAST(substr(iso_date, 6, 2) AS INTEGER) * 100
+            WHEN 4 THEN CAST(iso_date AS INTEGER) * 10000
+        END
+    """,
+    # ``libraries.date.DateValue.compress`` of the dates it can pack
+    ("Date", "compressed"): """
+        UPDATE "Date" SET compressed = (
+            SELECT (((CASE p.precision_level
+                        WHEN 'ABOUT' THEN 1 WHEN 'MAYBE' THEN 2
+                        WHEN 'BEFORE' THEN 3 WHEN 'AFTER' THEN 4
+                        ELSE 0 END * 32 + "Date".ymd % 100) * 13
+                     + "Date".ymd / 100 % 100) * 2500) + "Date".ymd / 10000
+            FROM "Precision" AS p
+            WHERE p.id = "Date".precision_id
+              AND p.precision_level IN
+                  ('SURE', 'ABOUT', 'MAYBE', 'BEFORE', 'AFTER'))
+        WHERE "Date".delta = 0
+          AND "Date".ymd / 10000 BETWEEN 1 AND 2499
+    """,
+    # From ``Date.compressed``, filled above
+    **{(table, f"{date}_compressed"): _packed_date(table, date)
+       for table, date in _PACKED_DATES},
+}
+
+
+def ensure_columns(engine: Engine) -> List[str]:
+    """Add the columns of ``ADDED_COLUMNS`` that the database behind
+    ``engine`` does not have yet, fill them, and return their names as
+    ``table.column``."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = [
+        (table, column)
+        for table, column in ADDED_COLUMNS
+        if table in existing_tables and column not in {
+            c["name"] for c in inspector.get_columns(table)}
+    ]
+    if not missing:
+        return []
+    with engine.begin() as connection:
+        for table, column in missing:
+            ddl = CreateColumn(Base.metadata.tables[table].c[column])
+            connection.exec_driver_sql(
+                f'ALTER TABLE "{table}" ADD COLUMN '
+                f'{ddl.compile(dialect=engine.dialect)}')
+        # In the order of ADDED_COLUMNS: a column may be filled from the
+        # one before it
+        for table, column in missing:
+            connection.exec_driver_sql(ADDED_COLUMNS[(table, column)])
+    return [f"{table}.{column}" for table, column in missing]
+
+
+def missing_indexes(engine: Engine) -> List[str]:
+    """Names of the indexes declared on the models but absent from the
+    database behind ``engine``."""
+    existing_tables = set(inspect(engine).get_table_names())
+    # Read from sqlite_master: the inspector skips expression indexes
+    with engine.connect() as connection:
+        existing = {row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    return [
+        str(index.name)
+        for table in Base.metadata.tables.values()
+        if table.name in existing_tables
+        for index in table.indexes
+        if index.name not in existing
+    ]
+
+
+def ensure_indexes(engine: Engine) -> List[str]:
+    """Create every index declared on the models that the database behind
+    ``engine`` does not have yet, and return their names.
+
+    The indexes are created in one transaction, followed by ``ANALYZE``.
+
+    The columns the indexes may be on are added first (``ensure_columns``).
+    """
+    ensure_columns(engine)
+    missing = missing_indexes(engine)
+    if not missing:
+        return []
+    wanted = set(missing)
+    with engine.begin() as connection:
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                if index.name in wanted:
+                    index.create(connection, checkfirst=True)
+        # Give the query planner statistics for the new indexes
+        connection.exec_driver_sql("ANALYZE")
+    return missing
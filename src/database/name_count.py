@@ -0,0 +1,30 @@
+from sqlalchemy import Enum, Index, Integer, Text
+from sqlalchemy.orm import mapped_column
+from database import Base
+from database.name_index import NameKind
+
+
+class NameCount(Base):
+    """Number of persons bearing each surname (``NameKind.SURNAME``) or
+    first name (``NameKind.FIRST_NAME``), derived from ``Person`` by
+    ``repositories.name_count_repository``.
+
+    ``name`` is the name as written (stripped), ``sort_key`` its lowercase
+    form the alphabetical lists are sorted on and ``initial`` the bucket
+    it is listed under (its first letter, or ``#``).
+    """
+    __tablename__ = "NameCount"
+    __table_args__ = (
+        Index("ix_NameCount_initial", "kind", "initial", "sort_key", "name"),
+    )
+
+    kind = mapped_column(Enum(NameKind), primary_key=True, nullable=False)
+    name = mapped_column(Text, primary_key=True, nullable=False)
+    sort_key = mapped_column(Text, nullable=False)
+    initial = mapped_column(Text, nullable=False)
+    count = mapped_column(Integer, nullable=False)
+
+
+# Most frequent names first, then alphabetically
+Index("ix_NameCount_count", NameCount.kind, NameCount.count.desc(),
+      NameCount.sort_key, NameCount.name)
@@ -0,0 +1,37 @@
+import enum
+
+from sqlalchemy import Enum, ForeignKey, Index, Integer, Text
+from sqlalchemy.orm import mapped_column
+from database import Base
+
+
+class NameKind(enum.Enum):
+    SURNAME = "SURNAME"
+    FIRST_NAME = "FIRST_NAME"
+    PUBLIC_NAME = "PUBLIC_NAME"
+    ALIAS = "ALIAS"
+    FIRST_NAME_ALIAS = "FIRST_NAME_ALIAS"
+    SURNAME_ALIAS = "SURNAME_ALIAS"
+
+
+class NameIndex(Base):
+    """Search keys of the names of a person, derived from ``Person`` by
+    ``repositories.name_index_repository``.
+
+    ``key`` is ``NameUtils.lower`` of the name from one of its words to the
+    end (``de la tour``, ``la tour``, ``tour``), ``crushed`` the
+    ``NameUtils.abbreviate_lower`` of that key, so that both can be matched
+    by prefix with a range scan of their index.
+    """
+    __tablename__ = "NameIndex"
+    __table_args__ = (
+        Index("ix_NameIndex_key", "key", "kind", "person_id"),
+        Index("ix_NameIndex_crushed", "crushed", "kind", "person_id"),
+    )
+
+    id = mapped_column(Integer, primary_key=True, nullable=False)
+    person_id = mapped_column(
+        Integer, ForeignKey("Person.id"), nullable=False, index=True)
+    kind = mapped_column(Enum(NameKind), nullable=False)
+    key = mapped_column(Text, nullable=False)
+    crushed = mapped_column(Text, nullable=False)
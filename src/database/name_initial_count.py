@@ -0,0 +1,15 @@
+from sqlalchemy import Enum, Integer, Text
+from sqlalchemy.orm import mapped_column
+from database import Base
+from database.name_index import NameKind
+
+
+class NameInitialCount(Base):
+    """Initial-letter buckets of ``NameCount``: how many distinct names of
+    a kind start with ``initial`` and how many persons bear them."""
+    __tablename__ = "NameInitialCount"
+
+    kind = mapped_column(Enum(NameKind), primary_key=True, nullable=False)
+    initial = mapped_column(Text, primary_key=True, nullable=False)
+    names = mapped_column(Integer, nullable=False)
+    persons = mapped_column(Integer, nullable=False)
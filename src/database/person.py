@@ -1,6 +1,7 @@
-from sqlalchemy import Integer, Text, Enum, ForeignKey
+from sqlalchemy import Integer, Text, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship, mapped_column
 from database import Base
+from database.date import keep_packed
 
 from libraries.person import Sex
 from libraries.title import AccessRight
@@ -26,6 +27,12 @@ class BurialStatus(enum.Enum):
 
 class Person(Base):
     __tablename__ = "Person"
+    __table_args__ = (
+        # Key of a person, as in ``GwConverter.key_tuple``
+        Index("ix_Person_surname_first_name_occ",
+              "surname", "first_name", "occ"),
+        Index("ix_Person_first_name", "first_name"),
+    )
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
     first_name = mapped_column(Text, nullable=False)
@@ -40,7 +47,7 @@ class Person(Base):
     occupation = mapped_column(Text, nullable=False)
     sex = mapped_column(Enum(Sex), nullable=False)
     access_right = mapped_column(Enum(AccessRight), nullable=False)
-    birth_date = mapped_column(Integer, ForeignKey("Date.id"))
+    birth_date = mapped_column(Integer, ForeignKey("Date.id"), index=True)
     birth_place = mapped_column(Text, nullable=False)
     birth_note = mapped_column(Text, nullable=False)
     birth_src = mapped_column(Text, nullable=False)
@@ -50,7 +57,7 @@ class Person(Base):
     baptism_src = mapped_column(Text, nullable=False)
     death_status = mapped_column(Enum(DeathStatus), nullable=False)
     death_reason = mapped_column(Enum(DeathReason))
-    death_date = mapped_column(Integer, ForeignKey("Date.id"))
+    death_date = mapped_column(Integer, ForeignKey("Date.id"), index=True)
     death_place = mapped_column(Text, nullable=False)
     death_note = mapped_column(Text, nullable=False)
     death_src = mapped_column(Text, nullable=False)
@@ -63,6 +70,12 @@ class Person(Base):
     src = mapped_column(Text, nullable=False)
     ascend_id = mapped_column(Integer, ForeignKey("Ascends.id"))
     families_id = mapped_column(Integer, ForeignKey("Unions.id"))
+    # ``database.date.packed_date`` of the birth, baptism, death and burial
+    # dates
+    birth_date_compressed = mapped_column(Integer, nullable=True)
+    baptism_date_compressed = mapped_column(Integer, nullable=True)
+    death_date_compressed = mapped_column(Integer, nullable=True)
+    burial_date_compressed = mapped_column(Integer, nullable=True)
 
     ascend = relationship(
         "Ascends",
@@ -102,3 +115,7 @@ class Person(Base):
         single_parent=True,
         foreign_keys=[burial_date]
     )
+
+
+for _date in ("birth_date", "baptism_date", "death_date", "burial_date"):
+    keep_packed(Person, _date)
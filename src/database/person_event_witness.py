@@ -8,9 +8,10 @@ class PersonEventWitness(Base):
     __tablename__ = "PersonEventWitness"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    person_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+    person_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
     event_id = mapped_column(Integer, ForeignKey("PersonalEvent.id"),
-                             nullable=False)
+                             nullable=False, index=True)
     kind = mapped_column(Enum(EventWitnessKind), nullable=False)
 
     person_obj = relationship("Person", foreign_keys=[person_id])
@@ -6,5 +6,7 @@ class PersonNonNativeRelations(Base):
     __tablename__ = "PersonNonNativeRelations"
 
     id = Column(Integer, primary_key=True, nullable=False)
-    person_id = Column(Integer, ForeignKey("Person.id"), nullable=False)
-    relation_id = Column(Integer, ForeignKey("Relation.id"), nullable=False)
+    person_id = Column(Integer, ForeignKey("Person.id"), nullable=False,
+                       index=True)
+    relation_id = Column(Integer, ForeignKey("Relation.id"),
+                         nullable=False, index=True)
@@ -7,9 +7,10 @@ class PersonRelations(Base):
     __tablename__ = "PersonRelations"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    person_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+    person_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
     related_person_id = mapped_column(
-        Integer, ForeignKey("Person.id"), nullable=False)
+        Integer, ForeignKey("Person.id"), nullable=False, index=True)
 
     person_obj = relationship("Person", foreign_keys=[person_id])
     related_person_obj = relationship(
@@ -62,7 +62,8 @@ class PersonalEvent(Base):
     __tablename__ = "PersonalEvent"
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
-    person_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+    person_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
     name = mapped_column(Enum(PersonalEventName), nullable=False)
     date = mapped_column(Integer, ForeignKey("Date.id"))
     place = mapped_column(Text, nullable=False)
@@ -1,16 +1,23 @@
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import Index, Integer, Text
+from sqlalchemy.orm import mapped_column
 from database import Base
 
 
 class Place(Base):
+    """A place of the base, split from the free text of the events by
+    ``repositories.place_repository`` (one row per distinct place)."""
     __tablename__ = "Place"
+    __table_args__ = (
+        Index("ux_Place_name", "country", "region", "county", "town",
+              "other", "township", "canton", "district", unique=True),
+    )
 
-    id = Column(Integer, primary_key=True, nullable=False)
-    town = Column(Text, nullable=False)
-    township = Column(Text, nullable=False)
-    canton = Column(Text, nullable=False)
-    district = Column(Text, nullable=False)
-    county = Column(Text, nullable=False)
-    region = Column(Text, nullable=False)
-    country = Column(Text, nullable=False)
-    other = Column(Text, nullable=False)
+    id = mapped_column(Integer, primary_key=True, nullable=False)
+    town = mapped_column(Text, nullable=False)
+    township = mapped_column(Text, nullable=False)
+    canton = mapped_column(Text, nullable=False)
+    district = mapped_column(Text, nullable=False)
+    county = mapped_column(Text, nullable=False)
+    region = mapped_column(Text, nullable=False)
+    country = mapped_column(Text, nullable=False)
+    other = mapped_column(Text, nullable=False)
@@ -0,0 +1,35 @@
+import enum
+
+from sqlalchemy import Enum, ForeignKey, Index, Integer
+from sqlalchemy.orm import mapped_column
+from database import Base
+
+
+class PlaceEventKind(enum.Enum):
+    BIRTH = "BIRTH"
+    BAPTISM = "BAPTISM"
+    DEATH = "DEATH"
+    BURIAL = "BURIAL"
+    MARRIAGE = "MARRIAGE"
+    PERSONAL_EVENT = "PERSONAL_EVENT"
+    FAMILY_EVENT = "FAMILY_EVENT"
+
+
+class PlaceEvent(Base):
+    """An event of ``person_id`` that took place at ``place_id``, derived
+    from the place columns by ``repositories.place_repository``.
+
+    The events of a family (``family_id``) have one row per spouse.
+    """
+    __tablename__ = "PlaceEvent"
+    __table_args__ = (
+        Index("ix_PlaceEvent_kind", "kind", "place_id", "person_id"),
+    )
+
+    id = mapped_column(Integer, primary_key=True, nullable=False)
+    place_id = mapped_column(
+        Integer, ForeignKey("Place.id"), nullable=False, index=True)
+    person_id = mapped_column(
+        Integer, ForeignKey("Person.id"), nullable=False, index=True)
+    family_id = mapped_column(Integer, ForeignKey("Family.id"), index=True)
+    kind = mapped_column(Enum(PlaceEventKind), nullable=False)
@@ -9,8 +9,10 @@ class Relation(Base):
 
     id = mapped_column(Integer, primary_key=True, nullable=False)
     type = mapped_column(Enum(RelationToParentType), nullable=False)
-    father_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
-    mother_id = mapped_column(Integer, ForeignKey("Person.id"), nullable=False)
+    father_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
+    mother_id = mapped_column(Integer, ForeignKey("Person.id"),
+                              nullable=False, index=True)
     sources = mapped_column(Text, nullable=False)
 
     father_obj = relationship("Person", foreign_keys=[father_id])
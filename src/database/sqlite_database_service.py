@@ -1,9 +1,13 @@
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, func, inspect, Engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import TypeVar, Type, List, Optional
+from typing import TypeVar, Type, Iterator, List, Optional
 from database import Base
+from database.engine_registry import engine_registry
+from database.migrations import ensure_indexes
 
 from .ascends import Ascends
+from .built_table import BuiltTable
+from .cached_value import CachedValue
 from .couple import Couple
 from .date import Date
 from .descend_children import DescendChildren
@@ -13,6 +17,9 @@ from .family_event import FamilyEvent
 from .family_event_witness import FamilyEventWitness
 from .family_events import FamilyEvents
 from .family_witness import FamilyWitness
+from .name_count import NameCount
+from .name_index import NameIndex
+from .name_initial_count import NameInitialCount
 from .person import Person
 from .person_event_witness import PersonEventWitness
 from .person_events import PersonEvents
@@ -23,6 +30,7 @@ from .person_relations import PersonRelations
 from .person_titles import PersonTitles
 from .personal_event import PersonalEvent
 from .place import Place
+from .place_event import PlaceEvent
 from .relation import Relation
 from .titles import Titles
 from .union_families import UnionFamilies
@@ -30,6 +38,8 @@ from .unions import Unions
 
 _models = (
     Ascends,
+    BuiltTable,
+    CachedValue,
     Couple,
     Date,
     DescendChildren,
@@ -39,6 +49,9 @@ _models = (
     FamilyEventWitness,
     FamilyEvents,
     FamilyWitness,
+    NameCount,
+    NameIndex,
+    NameInitialCount,
     Person,
     PersonEventWitness,
     PersonEvents,
@@ -47,6 +60,7 @@ _models = (
     PersonTitles,
     PersonalEvent,
     Place,
+    PlaceEvent,
     Relation,
     Titles,
     UnionFamilies,
@@ -57,6 +71,7 @@ del _models
 ModelType = TypeVar("ModelType", bound=Base)
 
 DEFAULT_DATABASE_PATH = "base.db"
+DEFAULT_BATCH_SIZE = 1000
 
 
 class SQLiteDatabaseService:
@@ -64,24 +79,40 @@ class SQLiteDatabaseService:
     _database_path: str = DEFAULT_DATABASE_PATH
     _engine: Optional[Engine] = None
     _sessionmaker: Optional[sessionmaker[Session]] = None
+    _shared: bool = False
 
-    def __init__(self, database_path=DEFAULT_DATABASE_PATH):
+    def __init__(self, database_path=DEFAULT_DATABASE_PATH, shared=False):
+        """When ``shared`` is True, the engine comes from the process-wide
+        ``engine_registry`` instead of being created for this instance, and
+        ``disconnect`` leaves it alive for the next user of the base."""
         self._database_path = database_path
         self._engine = None
         self._sessionmaker = None
+        self._shared = shared
+
+    @property
+    def database_path(self) -> str:
+        return self._database_path
 
     def connect(self):
         if self._engine is not None:
             return
 
+        if self._shared:
+            self._engine, self._sessionmaker = engine_registry.get(
+                self._database_path)
+            return
+
         self._engine = create_engine(f"sqlite:///{self._database_path}")
         self._sessionmaker = sessionmaker(bind=self._engine)
         Base.metadata.create_all(self._engine)
+        ensure_indexes(self._engine)
 
     def disconnect(self):
         if self._engine is None:
             return
-        self._engine.dispose()
+        if not self._shared:
+            self._engine.dispose()
         self._engine = None
         self._sessionmaker = None
 
@@ -124,13 +155,65 @@ class SQLiteDatabaseService:
         model: Type[ModelType],
         query: dict = {},
         offset: int = 0,
-        limit: int = 100
+        limit: Optional[int] = None
     ) -> List[ModelType]:
+        """Rows of ``model`` matching ``query``; all of them unless a
+        ``limit`` is given."""
         if session is None:
             return []
         return (session.query(model).filter_by(**query)
                 .offset(offset).limit(limit).all())
 
+    def iter_all(
+        self,
+        session: Session,
+        model: Type[ModelType],
+        query: dict = {},
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[ModelType]:
+        """Yield every row of ``model`` matching ``query`` in primary key
+        order, reading ``batch_size`` rows per statement.
+
+        Batches are fetched with keyset pagination (``WHERE id > last_id``)
+        rather than OFFSET, so each statement is an index range scan and
+        walking the whole table stays linear. The session only keeps weak
+        references to loaded rows, so memory stays bounded as long as the
+        caller does not hold on to them.
+        """
+        if session is None:
+            return
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        primary_key = inspect(model).primary_key
+        if len(primary_key) != 1:
+            raise ValueError(
+                f"iter_all needs a single-column primary key on {model}")
+        key_column = primary_key[0]
+        base_query = session.query(model).filter_by(**query)
+        last_key = None
+        while True:
+            batch_query = base_query
+            if last_key is not None:
+                batch_query = batch_query.filter(key_column > last_key)
+            batch = (batch_query.order_by(key_column)
+                     .limit(batch_size).all())
+            if not batch:
+                return
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            last_key = getattr(batch[-1], key_column.key)
+
+    def count(
+        self, session: Session, model: Type[ModelType], query: dict = {}
+    ) -> int:
+        """Number of rows of ``model`` matching ``query``, computed by the
+        database without loading them."""
+        if session is None:
+            return 0
+        return (session.query(func.count()).select_from(model)
+                .filter_by(**query).scalar() or 0)
+
     def refresh(self, session: Session, obj: object) -> None:
         if session is None:
             return
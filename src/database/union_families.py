@@ -7,8 +7,10 @@ class UnionFamilies(Base):
     __tablename__ = "UnionFamilies"
 
     id = Column(Integer, primary_key=True, nullable=False)
-    union_id = Column(Integer, ForeignKey("Unions.id"), nullable=False)
-    family_id = Column(Integer, ForeignKey("Family.id"), nullable=False)
+    union_id = Column(Integer, ForeignKey("Unions.id"), nullable=False,
+                      index=True)
+    family_id = Column(Integer, ForeignKey("Family.id"), nullable=False,
+                       index=True)
 
     union_obj = relationship("Unions", foreign_keys=[union_id])
     family_obj = relationship("Family", foreign_keys=[family_id])
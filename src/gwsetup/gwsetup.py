@@ -7,6 +7,10 @@ from typing import Sequence
 
 import click
 
+from sqlalchemy import create_engine
+
+from database.engine_registry import engine_registry
+from database.migrations import ensure_indexes
 from database.sqlite_database_service import SQLiteDatabaseService
 from database.ascends import Ascends
 from database.couple import Couple
@@ -28,10 +32,15 @@ from database.person_relations import PersonRelations
 from database.person_titles import PersonTitles
 from database.personal_event import PersonalEvent
 from database.place import Place
+from database.place_event import PlaceEvent
 from database.relation import Relation
 from database.titles import Titles
 from database.union_families import UnionFamilies
 from database.unions import Unions
+from repositories.cache_files_repository import CacheFilesRepository
+from repositories.name_count_repository import NameCountRepository
+from repositories.name_index_repository import NameIndexRepository
+from repositories.place_repository import PlaceRepository
 from script.gwc import gwc_main, GwcArguments
 
 _NAME_RE = re.compile(r"^[A-Za-z0-9_\-]+$")
@@ -56,6 +65,7 @@ _models = (
     PersonTitles,
     PersonalEvent,
     Place,
+    PlaceEvent,
     Relation,
     Titles,
     UnionFamilies,
@@ -105,10 +115,96 @@ def delete_database(name: str) -> tuple[bool, str]:
             os.remove(db_path)
         except Exception as e:
             return False, f"failed to remove database file: {e}"
+        engine_registry.invalidate(db_path)
         return True, f"Deleted database '{name}' (file removed)"
     return False, f"database '{name}' does not exist at {db_path}"
 
 
+def migrate_database(name: str) -> tuple[bool, str]:
+    """Add the indexes missing from an existing base, keeping its data."""
+    ok, err = _validate_database_name(name)
+    if not ok:
+        return False, err
+
+    db_path = os.path.join(DEFAULT_BASES_DIR, f"{name}.db")
+    if not os.path.exists(db_path):
+        return False, f"database '{name}' does not exist at {db_path}"
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        created = ensure_indexes(engine)
+    except Exception as e:
+        return False, f"failed to migrate database '{name}': {e}"
+    finally:
+        engine.dispose()
+
+    db_service = SQLiteDatabaseService(db_path)
+    try:
+        db_service.connect()
+        name_index = NameIndexRepository(db_service)
+        indexed = not name_index.is_built()
+        if indexed:
+            name_index.rebuild()
+        name_counts = NameCountRepository(db_service)
+        counted = not name_counts.is_built()
+        if counted:
+            name_counts.rebuild()
+        cache_files = CacheFilesRepository(db_service)
+        cached = not cache_files.is_built()
+        if cached:
+            cache_files.rebuild()
+        places = PlaceRepository(db_service)
+        split = not places.is_built()
+        if split:
+            places.rebuild()
+    except Exception as e:
+        return False, f"failed to build the derived tables of '{name}': {e}"
+    finally:
+        db_service.disconnect()
+    engine_registry.invalidate(db_path)
+
+    if not any((created, indexed, counted, cached, split)):
+        return True, f"Database '{name}' is up to date"
+    messages = []
+    if created:
+        messages.append(f"Added {len(created)} indexes to database '{name}'")
+    if indexed:
+        messages.append(f"Indexed the names of database '{name}'")
+    if counted:
+        messages.append(f"Counted the names of database '{name}'")
+    if cached:
+        messages.append(f"Computed the cache files of database '{name}'")
+    if split:
+        messages.append(f"Split the places of database '{name}'")
+    return True, "\n".join(messages)
+
+
+def cache_files_database(name: str) -> tuple[bool, str]:
+    """Compute the value lists of the edit forms of an existing base."""
+    ok, err = _validate_database_name(name)
+    if not ok:
+        return False, err
+
+    db_path = os.path.join(DEFAULT_BASES_DIR, f"{name}.db")
+    if not os.path.exists(db_path):
+        return False, f"database '{name}' does not exist at {db_path}"
+
+    db_service = SQLiteDatabaseService(db_path)
+    try:
+        db_service.connect()
+        cached = CacheFilesRepository(db_service).rebuild()
+    except Exception as e:
+        return False, f"failed to compute the cache files of '{name}': {e}"
+    finally:
+        db_service.disconnect()
+    engine_registry.invalidate(db_path)
+
+    counts = ", ".join(
+        f"{count} {kind.value.lower().replace('_', ' ')}(s)"
+        for kind, count in cached.items())
+    return True, f"Computed the cache files of database '{name}': {counts}"
+
+
 @click.group()
 def cli() -> None:
     pass
@@ -164,6 +260,27 @@ def delete_cmd(name: str) -> None:
         raise SystemExit(1)
 
 
+@database.command("migrate")
+@click.argument("name")
+def migrate_cmd(name: str) -> None:
+    """Add missing indexes to an existing database."""
+    ok, msg = migrate_database(name)
+    click.echo(msg)
+    if not ok:
+        raise SystemExit(1)
+
+
+@database.command("cache-files")
+@click.argument("name")
+def cache_files_cmd(name: str) -> None:
+    """Compute the surname, first name, place, occupation, source and
+    title lists of the edit forms."""
+    ok, msg = cache_files_database(name)
+    click.echo(msg)
+    if not ok:
+        raise SystemExit(1)
+
+
 def run(argv: Sequence[str]) -> int:
     try:
         # standalone_mode=False prevents Click from calling sys.exit
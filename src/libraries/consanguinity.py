@@ -0,0 +1,287 @@
+"""Consanguinity computation (legacy ``Consang`` / ``ConsangAll``).
+
+The consanguinity of a person is the relationship coefficient of their
+parents. It is computed with Didier Remy's algorithm: the ancestors of both
+parents are visited once each, in topological order, carrying the sum of
+the weights of every path that reaches them. Shared ancestors are therefore
+never enumerated path by path, which keeps the cost linear in the number of
+ancestors even with deep pedigree collapse.
+"""
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from libraries.consanguinity_rate import ConsanguinityRate
+
+# Fixed-point value of a consanguinity that has not been computed yet
+# (Adef.no_consang).
+NO_CONSANG = -1
+
+# Person ID -> IDs of the father and the mother.
+ParentsMap = Mapping[int, Tuple[int, ...]]
+
+
+class TopologicalSortError(Exception):
+    """The base contains a loop: ``person`` is their own ancestor."""
+
+    def __init__(self, person: int):
+        super().__init__(f"person {person} is their own ancestor")
+        self.person = person
+
+
+def _find_loop(persons: Iterable[int], parents: ParentsMap) -> Optional[int]:
+    """Return a person who is their own ancestor, if any."""
+    being_visited, visited = 1, 2
+    state: Dict[int, int] = {}
+    for root in persons:
+        if root in state:
+            continue
+        state[root] = being_visited
+        stack = [(root, iter(parents.get(root, ())))]
+        while stack:
+            person, ancestors = stack[-1]
+            for parent in ancestors:
+                parent_state = state.get(parent)
+                if parent_state == being_visited:
+                    return parent
+                if parent_state is None:
+                    state[parent] = being_visited
+                    stack.append((parent, iter(parents.get(parent, ()))))
+                    break
+            else:
+                state[person] = visited
+                stack.pop()
+    return None
+
+
+def topological_sort(
+    persons: Iterable[int], parents: ParentsMap
+) -> Dict[int, int]:
+    """Rank persons so that an ancestor always ranks higher than any of its
+    descendants.
+
+    Persons without children rank 0 and every other person ranks one more
+    than their highest-ranked child, which keeps the ranks as small as
+    possible (the relationship computation walks them one by one).
+
+    Raises:
+        TopologicalSortError: if someone is their own ancestor
+    """
+    persons = list(persons)
+    children_count: Dict[int, int] = dict.fromkeys(persons, 0)
+    for person in persons:
+        for parent in parents.get(person, ()):
+            children_count[parent] += 1
+
+    rank: Dict[int, int] = {}
+    todo = [p for p in persons if children_count[p] == 0]
+    level = 0
+    while todo:
+        next_todo = []
+        for person in todo:
+            rank[person] = level
+            for parent in parents.get(person, ()):
+                children_count[parent] -= 1
+                if children_count[parent] == 0:
+                    next_todo.append(parent)
+        todo = next_todo
+        level += 1
+
+    if len(rank) != len(persons):
+        looping = _find_loop(persons, parents)
+        raise TopologicalSortError(
+            looping if looping is not None else persons[0])
+    return rank
+
+
+class _Visit:
+    __slots__ = ("weight1", "weight2", "relationship", "anc1", "anc2")
+
+    def __init__(self) -> None:
+        self.weight1 = 0.0
+        self.weight2 = 0.0
+        self.relationship = 0.0
+        self.anc1 = False
+        self.anc2 = False
+
+
+class ConsanguinityEngine:
+    """Compute and keep up to date the consanguinity of a set of persons.
+
+    Args:
+        parents: Father and mother of every person who has parents
+        consang: Current fixed-point consanguinity of the persons
+                 (``NO_CONSANG`` or missing when unknown)
+        persons: Every person of the base (defaults to the persons
+                 appearing in ``parents`` and ``consang``)
+
+    Raises:
+        TopologicalSortError: if someone is their own ancestor
+    """
+
+    def __init__(
+        self,
+        parents: ParentsMap,
+        consang: Optional[Mapping[int, int]] = None,
+        persons: Optional[Iterable[int]] = None,
+    ):
+        consang = consang or {}
+        if persons is None:
+            known = set(parents) | set(consang)
+            for couple in parents.values():
+                known.update(couple)
+            persons = known
+        self._persons: List[int] = list(persons)
+        person_set = set(self._persons)
+        # Links to persons missing from the base are ignored
+        self._parents: Dict[int, Tuple[int, ...]] = {
+            person: tuple(p for p in couple if p in person_set)
+            for person, couple in parents.items() if person in person_set
+        }
+        self._consang: Dict[int, int] = {
+            p: consang.get(p, NO_CONSANG) for p in self._persons}
+        self._rank = topological_sort(self._persons, self._parents)
+        self._children: Optional[Dict[int, List[int]]] = None
+
+    def consanguinity(self, person: int) -> ConsanguinityRate:
+        """Stored consanguinity of ``person`` (``NO_CONSANG`` when not
+        computed yet)."""
+        return ConsanguinityRate.from_integer(self._consang[person])
+
+    def _consang_of(self, person: int) -> float:
+        value = self._consang.get(person, NO_CONSANG)
+        if value == NO_CONSANG:
+            return 0.0
+        return ConsanguinityRate.from_integer(value).rate()
+
+    def relationship(
+        self, person1: int, person2: int, deadline: Optional[float] = None
+    ) -> float:
+        """Relationship coefficient of two persons, i.e. the consanguinity
+        a child of theirs would have.
+
+        Only meaningful once the consanguinity of the common ancestors is
+        known (``compute`` takes care of the order).
+
+        Raises:
+            TimeoutError: if ``time.monotonic()`` passes ``deadline``
+        """
+        if person1 == person2:
+            return 1.0
+        rank = self._rank
+        visits: Dict[int, _Visit] = {}
+        queue: Dict[int, List[int]] = {}
+        level = min(rank[person1], rank[person2])
+        last_level = level
+
+        def insert(person: int) -> _Visit:
+            nonlocal last_level
+            visit = visits[person] = _Visit()
+            person_rank = rank[person]
+            queue.setdefault(person_rank, []).append(person)
+            last_level = max(last_level, person_rank)
+            return visit
+
+        first = insert(person1)
+        first.weight1 = 1.0
+        first.anc1 = True
+        second = insert(person2)
+        second.weight2 = 1.0
+        second.anc2 = True
+        # Number of queued ancestors of each side: the walk stops as soon
+        # as one side has none left, since no common ancestor remains.
+        nb_anc1 = nb_anc2 = 1
+        relationship = 0.0
+
+        while level <= last_level and nb_anc1 > 0 and nb_anc2 > 0:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError()
+            for person in queue.pop(level, ()):
+                visit = visits[person]
+                relationship += (
+                    visit.weight1 * visit.weight2
+                    - visit.relationship * (1.0 + self._consang_of(person))
+                )
+                if visit.anc1:
+                    nb_anc1 -= 1
+                if visit.anc2:
+                    nb_anc2 -= 1
+                half1 = visit.weight1 * 0.5
+                half2 = visit.weight2 * 0.5
+                for parent in self._parents.get(person, ()):
+                    parent_visit = visits.get(parent) or insert(parent)
+                    if visit.anc1 and not parent_visit.anc1:
+                        parent_visit.anc1 = True
+                        nb_anc1 += 1
+                    if visit.anc2 and not parent_visit.anc2:
+                        parent_visit.anc2 = True
+                        nb_anc2 += 1
+                    parent_visit.weight1 += half1
+                    parent_visit.weight2 += half2
+                    parent_visit.relationship += half1 * half2
+            level += 1
+        return relationship * 0.5
+
+    def _descendants(self, persons: Iterable[int]) -> Set[int]:
+        if self._children is None:
+            self._children = {}
+            for child, couple in self._parents.items():
+                for parent in set(couple):
+                    self._children.setdefault(parent, []).append(child)
+        found: Set[int] = set()
+        stack = [p for p in persons if p in self._consang]
+        while stack:
+            person = stack.pop()
+            if person in found:
+                continue
+            found.add(person)
+            stack.extend(self._children.get(person, ()))
+        return found
+
+    def invalidate(self, persons: Iterable[int]) -> None:
+        """Forget the consanguinity of ``persons`` and of all their
+        descendants, e.g. after their ancestry changed."""
+        for person in self._descendants(persons):
+            self._consang[person] = NO_CONSANG
+
+    def compute(self, from_scratch: bool = False) -> Dict[int, int]:
+        """Compute the consanguinity of every person whose value is
+        unknown, and of their descendants, whose ancestry includes them.
+
+        Persons are handled ancestors first, so that each relationship is
+        computed with the final consanguinity of the common ancestors, and
+        the relationship of a couple is computed once for all its children.
+
+        Args:
+            from_scratch: Recompute every person
+
+        Returns:
+            The fixed-point consanguinity of every person whose value
+            changed
+        """
+        if from_scratch:
+            todo: Iterable[int] = self._persons
+        else:
+            todo = self._descendants(
+                p for p, value in self._consang.items()
+                if value == NO_CONSANG)
+        ordered = sorted(todo, key=lambda p: -self._rank[p])
+        before = {p: self._consang[p] for p in ordered}
+        for person in ordered:
+            self._consang[person] = NO_CONSANG
+
+        couples: Dict[Tuple[int, ...], int] = {}
+        for person in ordered:
+            couple = self._parents.get(person, ())
+            if len(couple) < 2:
+                self._consang[person] = 0
+                continue
+            key = tuple(sorted(couple))
+            if key not in couples:
+                couples[key] = int(ConsanguinityRate.from_rate(
+                    self.relationship(*couple)))
+            self._consang[person] = couples[key]
+
+        return {
+            p: self._consang[p] for p in ordered
+            if self._consang[p] != before[p]
+        }
@@ -0,0 +1,147 @@
+"""
+Birth, death and marriage anniversaries for the AN, AD and AM pages.
+
+The dates of a base are stored as ISO strings, and ``database.date``
+indexes their "MM-DD" part (``month_day``). An anniversary page is a
+single query. It walks that index over the days or the month asked for,
+joins the persons or the couples the dates belong to, and reads their
+names only.
+"""
+
+import enum
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import aliased
+
+import database.couple as db_couple
+import database.date as db_date
+import database.family as db_family
+import database.person as db_person
+from database.family import DivorceStatus
+from database.person import DeathStatus
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.date import Calendar
+from libraries.family import MaritalStatus
+
+# Couples whose wedding anniversaries are listed (as in GeneWeb: married,
+# not divorced)
+MARRIED = (MaritalStatus.MARRIED, MaritalStatus.NO_SEXES_CHECK_MARRIED)
+# Persons who may still be alive (gwc leaves the persons without death
+# information as DONT_KNOW_IF_DEAD)
+MAYBE_ALIVE = (DeathStatus.NOT_DEAD, DeathStatus.DONT_KNOW_IF_DEAD)
+
+
+class AnniversaryKind(enum.Enum):
+    BIRTH = "BIRTH"
+    DEATH = "DEATH"
+    MARRIAGE = "MARRIAGE"
+
+
+class AnniversaryPerson(NamedTuple):
+    id: int
+    first_name: str
+    surname: str
+
+
+class Anniversary(NamedTuple):
+    month: int
+    day: int
+    year: int
+    # The person born or dead, or the husband and the wife
+    persons: Tuple[AnniversaryPerson, ...]
+
+
+def _month_day(month: int, day: int) -> str:
+    return f"{month:02d}-{day:02d}"
+
+
+class AnniversaryRepository:
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+
+    def anniversaries(
+        self,
+        kind: AnniversaryKind,
+        days: Sequence[Tuple[int, int]] = (),
+        month: Optional[int] = None,
+        min_year: Optional[int] = None,
+    ) -> List[Anniversary]:
+        """Anniversaries of ``kind`` falling on one of the ``(month, day)``
+        of ``days`` or anywhere in ``month``, by date then name.
+
+        Only full Gregorian dates count, from ``min_year`` on when given.
+        Births are those of the persons not known to be dead, marriages
+        those of the married, not divorced couples whose spouses are not
+        known to be dead.
+        """
+        conditions = []
+        if days:
+            conditions.append(db_date.month_day.in_(
+                [_month_day(m, d) for m, d in days]))
+        if month is not None:
+            conditions.append(db_date.month_day.between(
+                _month_day(month, 1), _month_day(month, 31)))
+        if not conditions:
+            return []
+
+        Date = db_date.Date
+        Person = db_person.Person
+        if kind is AnniversaryKind.MARRIAGE:
+            father = aliased(Person)
+            mother = aliased(Person)
+            statement = (
+                select(Date.ymd,
+                       father.id, father.first_name, father.surname,
+                       mother.id, mother.first_name, mother.surname)
+                .select_from(Date)
+                .join(db_family.Family,
+                      db_family.Family.marriage_date == Date.id)
+                .join(db_couple.Couple,
+                      db_couple.Couple.id == db_family.Family.parents_id)
+                .join(father, father.id == db_couple.Couple.father_id)
+                .join(mother, mother.id == db_couple.Couple.mother_id)
+                .where(
+                    db_family.Family.relation_kind.in_(MARRIED),
+                    db_family.Family.divorce_status
+                    == DivorceStatus.NOT_DIVORCED,
+                    father.death_status.in_(MAYBE_ALIVE),
+                    mother.death_status.in_(MAYBE_ALIVE),
+                )
+                .order_by(db_date.month_day, father.surname,
+                          father.first_name)
+            )
+        else:
+            date_column = (Person.birth_date if kind is AnniversaryKind.BIRTH
+                           else Person.death_date)
+            statement = (
+                select(Date.ymd,
+                       Person.id, Person.first_name, Person.surname)
+                .select_from(Date)
+                .join(Person, date_column == Date.id)
+                .order_by(db_date.month_day, Person.surname,
+                          Person.first_name)
+            )
+            if kind is AnniversaryKind.BIRTH:
+                statement = statement.where(
+                    Person.death_status.in_(MAYBE_ALIVE))
+        statement = statement.where(
+            or_(*conditions), Date.calendar == Calendar.GREGORIAN)
+        if min_year is not None:
+            statement = statement.where(Date.ymd >= min_year * 10000)
+
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        try:
+            rows = session.execute(statement).all()
+        finally:
+            session.close()
+
+        anniversaries = []
+        for ymd, *names in rows:
+            anniversaries.append(Anniversary(
+                ymd // 100 % 100, ymd % 100, ymd // 10000,
+                tuple(AnniversaryPerson(*names[i:i + 3])
+                      for i in range(0, len(names), 3))))
+        return anniversaries
@@ -0,0 +1,125 @@
+"""
+Ascendants of a person, generation by generation, with Sosa numbers.
+
+The walk reads the parents from a ``GenealogyGraph`` and only keeps the
+current generation in memory. An ancestor reached through several lines
+(implex) is expanded once, under its smallest Sosa number; its other
+occurrences point to that number, so shared branches are neither walked
+nor loaded twice.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from libraries.sosa import Sosa
+from repositories.genealogy_graph import GenealogyGraph
+from repositories.person_repository import PersonRepository, PersonSummary
+
+# Deepest generation the A mode walks up to
+MAX_GENERATIONS = 64
+# Entries shown per page of the A mode
+PAGE_SIZE = 500
+
+
+class AscendantEntry(NamedTuple):
+    sosa: Sosa
+    person_id: int
+    # Smallest Sosa number of the same person when it was already reached
+    # through another line
+    implex_of: Optional[Sosa] = None
+
+
+class AscendantRow(NamedTuple):
+    sosa: Sosa
+    person: PersonSummary
+    implex_of: Optional[Sosa]
+    # Page showing the ``implex_of`` entry
+    implex_page: Optional[int]
+
+
+class AscendantGeneration(NamedTuple):
+    number: int
+    rows: List[AscendantRow]
+
+
+class AscendantsPage(NamedTuple):
+    generations: List[AscendantGeneration]
+    page: int
+    page_count: int
+    total: int
+    implex_count: int
+
+
+def iter_ascendant_generations(
+    graph: GenealogyGraph, person_id: int, max_generations: int
+) -> Iterator[List[AscendantEntry]]:
+    """Yield the entries of each generation, in Sosa order, starting with
+    ``person_id`` alone (Sosa 1, generation 1)."""
+    first_sosa: Dict[int, Sosa] = {person_id: Sosa.one()}
+    generation = [AscendantEntry(Sosa.one(), person_id)]
+    number = 1
+    while generation and number <= max_generations:
+        yield generation
+        next_generation = []
+        for entry in generation:
+            if entry.implex_of is not None:
+                continue
+            father, mother = graph.parents(entry.person_id)
+            for sosa, parent in ((entry.sosa.father(), father),
+                                 (entry.sosa.mother(), mother)):
+                if parent is None:
+                    continue
+                first = first_sosa.get(parent)
+                if first is None:
+                    first_sosa[parent] = sosa
+                next_generation.append(AscendantEntry(sosa, parent, first))
+        generation = next_generation
+        number += 1
+
+
+def ascendants_page(
+    graph: GenealogyGraph,
+    person_repo: PersonRepository,
+    person_id: int,
+    max_generations: int,
+    page: int = 1,
+    page_size: int = PAGE_SIZE,
+) -> AscendantsPage:
+    """Ascendants of ``person_id`` (itself included) shown on ``page``.
+
+    The whole walk runs on the graph to count the entries, but only the
+    persons of the requested page are loaded, with one batched query per
+    generation.
+    """
+    start = (page - 1) * page_size
+    end = start + page_size
+    position = 0
+    total = 0
+    implex_count = 0
+    # Position of the first entry of every person, to link the implex
+    # entries to the page where that person is shown
+    first_position: Dict[int, int] = {}
+    generations: List[AscendantGeneration] = []
+    walk = iter_ascendant_generations(
+        graph, person_id, min(max_generations, MAX_GENERATIONS))
+    for number, entries in enumerate(walk, start=1):
+        total += len(entries)
+        shown = entries[max(start - position, 0):max(end - position, 0)]
+        for offset, entry in enumerate(entries, start=position):
+            if entry.implex_of is None:
+                first_position[entry.person_id] = offset
+            else:
+                implex_count += 1
+        position += len(entries)
+        if not shown:
+            continue
+        persons = person_repo.get_person_summaries(
+            e.person_id for e in shown)
+        generations.append(AscendantGeneration(number, [
+            AscendantRow(
+                e.sosa, persons[e.person_id], e.implex_of,
+                None if e.implex_of is None
+                else first_position[e.person_id] // page_size + 1)
+            for e in shown if e.person_id in persons
+        ]))
+    page_count = max((total + page_size - 1) // page_size, 1)
+    return AscendantsPage(generations, page, page_count, total, implex_count)
@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from database.date import Date
+
+T = TypeVar("T")
+
+# SQLite refuses statements with more bound parameters than
+# SQLITE_MAX_VARIABLE_NUMBER (999 on older builds), so every IN (...) list
+# built by the repositories is split into chunks of at most this size.
+ID_BATCH_SIZE = 500
+
+
+def unique_ids(ids: Iterable[T]) -> List[T]:
+    """Drop duplicates and None values while keeping the first-seen order."""
+    return [i for i in dict.fromkeys(ids) if i is not None]
+
+
+def chunked(items: List[T], size: int = ID_BATCH_SIZE) -> Iterator[List[T]]:
+    """Yield consecutive slices of ``items`` holding at most ``size``
+    elements each."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def batched(
+    items: Iterable[T], size: int = ID_BATCH_SIZE
+) -> Iterator[List[T]]:
+    """Like ``chunked``, for an iterable that is consumed lazily."""
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def attach_unpacked_dates(
+    session: Session, rows: Sequence[object], dates: Sequence[str]
+) -> None:
+    """Load the ``Date`` rows of the ``dates`` of ``rows`` that are not
+    packed in their ``<date>_compressed`` column (see
+    ``database.date.packed_date``), with one query per chunk, and set them
+    on the ``<date>_obj`` relationships. The packed dates need no row."""
+    owners: Dict[int, List[Tuple[object, str]]] = {}
+    for row in rows:
+        for date in dates:
+            date_id = getattr(row, date)
+            if (date_id is not None
+                    and getattr(row, f"{date}_compressed") is None):
+                owners.setdefault(date_id, []).append((row, f"{date}_obj"))
+    for chunk in chunked(list(owners)):
+        for date_row in session.query(Date).filter(Date.id.in_(chunk)):
+            for row, key in owners[date_row.id]:
+                set_committed_value(row, key, date_row)
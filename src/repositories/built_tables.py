@@ -0,0 +1,24 @@
+"""
+Records of the derived tables rebuilt from the whole base
+(``database.built_table``).
+"""
+
+from sqlalchemy import Connection, Table, exists, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from database.built_table import BuiltTable
+
+
+def mark_built(connection: Connection, table: Table) -> None:
+    """Record, in the transaction of ``connection``, that ``table`` was
+    just filled from the whole base."""
+    connection.execute(insert(BuiltTable).values(
+        name=table.name).on_conflict_do_nothing())
+
+
+def was_built(session: Session, table: Table) -> bool:
+    """True when ``table`` was filled from the whole base since it
+    exists."""
+    return session.execute(select(exists().where(
+        BuiltTable.name == table.name))).scalar_one()
@@ -0,0 +1,386 @@
+"""Bulk import of persons and families, used by gwc.
+
+``PersonRepository.add_person`` and ``FamilyRepository.add_family`` open a
+session per record and flush several times to learn the generated IDs,
+which makes importing a large base take hours. ``BulkWriter`` converts the
+records with the same ``converter_to_db`` functions, assigns every primary
+key itself and writes the rows with one ``executemany`` per table and per
+chunk, inside a single transaction. The rows it writes are the same as the
+ones the per-record path would have written.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import (
+    Connection, Index, Table, delete, func, inspect, select)
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from database import Base
+from database.sqlite_database_service import SQLiteDatabaseService
+import libraries.family as app_family
+import libraries.person as app_person
+import database.ascends as db_ascends
+import database.built_table as db_built_table
+import database.couple as db_couple
+import database.date as db_date
+import database.descend_children as db_descend_children
+import database.descends as db_descends
+import database.family as db_family
+import database.family_event as db_family_event
+import database.family_event_witness as db_family_event_witness
+import database.family_witness as db_family_witness
+import database.person as db_person
+import database.person_event_witness as db_person_event_witness
+import database.person_non_native_relations as db_person_non_native_relations
+import database.person_relations as db_person_relations
+import database.person_titles as db_person_titles
+import database.personal_event as db_personal_event
+import database.relation as db_relation
+import database.titles as db_titles
+import database.union_families as db_union_families
+import database.unions as db_unions
+from repositories.converter_to_db import (
+    convert_family_to_db,
+    convert_person_to_db,
+)
+
+DEFAULT_CHUNK_SIZE = 20000
+
+# Connection-level settings for the import transaction. Nothing here
+# outlives the connection: the journal is kept in memory and the file is
+# not fsynced until the final commit, which is safe because a failed
+# import leaves a base that gwc rebuilds from scratch anyway.
+IMPORT_PRAGMAS: Dict[str, str] = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": "-200000",  # in KiB, i.e. ~200 MB of page cache
+}
+
+# Insertion order of the tables, parents first.
+_MODELS: Tuple[Type[Base], ...] = (
+    db_date.Precision,
+    db_date.Date,
+    db_ascends.Ascends,
+    db_unions.Unions,
+    db_descends.Descends,
+    db_couple.Couple,
+    db_person.Person,
+    db_family.Family,
+    db_union_families.UnionFamilies,
+    db_titles.Titles,
+    db_person_titles.PersonTitles,
+    db_relation.Relation,
+    db_person_non_native_relations.PersonNonNativeRelations,
+    db_person_relations.PersonRelations,
+    db_personal_event.PersonalEvent,
+    db_person_event_witness.PersonEventWitness,
+    db_family_witness.FamilyWitness,
+    db_family_event.FamilyEvent,
+    db_family_event_witness.FamilyEventWitness,
+    db_descend_children.DescendChildren,
+)
+
+# Tables whose IDs come from the records themselves rather than from the
+# writer's counters.
+_EXPLICIT_ID_MODELS = (db_person.Person, db_family.Family)
+
+Row = Dict[str, Any]
+
+_SAVEPOINT = "bulk_writer"
+
+
+def _table(model: Type[Base]) -> Table:
+    return model.__table__  # type: ignore[return-value]
+
+
+def _date_relationships(model: Type[Base]) -> List[Tuple[str, str]]:
+    """(relationship, foreign key attribute) pairs of ``model`` pointing to
+    a Date or a Precision row."""
+    pairs = []
+    for rel in inspect(model).relationships:
+        if rel.mapper.class_ in (db_date.Date, db_date.Precision):
+            (column,) = rel.local_columns
+            pairs.append((rel.key, column.key))
+    return pairs
+
+
+_DATE_RELATIONSHIPS = {model: _date_relationships(model) for model in _MODELS}
+
+
+class BulkWriter:
+    """Buffer the rows of many persons and families and write them with
+    set-based inserts.
+
+    The writer owns one session and one transaction for its whole life:
+    call ``add_person`` / ``add_family`` for every record, then ``commit``
+    (or ``rollback``). A record that fails to convert is skipped as a whole,
+    so the caller may report it and carry on.
+    """
+
+    def __init__(
+        self,
+        db_service: SQLiteDatabaseService,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        pragmas: Optional[Dict[str, str]] = None,
+        defer_indexes: bool = True,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        session = db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        self._session: Session = session
+        self._connection: Connection = session.connection()
+        self.chunk_size = chunk_size
+        self.persons_added = 0
+        self.families_added = 0
+        self._pending: Dict[Type[Base], List[Row]] = {
+            model: [] for model in _MODELS}
+        self._pending_count = 0
+        self._savepoint_state: Optional[
+            Tuple[Dict[Type[Base], int], int, int]] = None
+
+        # The pragmas are set on the pooled connection: remember the
+        # previous values to put them back once the import is over.
+        self._saved_pragmas: Dict[str, Any] = {}
+        for name, value in (
+                IMPORT_PRAGMAS if pragmas is None else pragmas).items():
+            self._saved_pragmas[name] = self._connection.exec_driver_sql(
+                f"PRAGMA {name}").scalar()
+            self._connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+
+        # pysqlite only opens a transaction before DML statements: open it
+        # explicitly so that the DDL below and the savepoints are part of
+        # it too (releasing a savepoint that opened the transaction would
+        # commit it).
+        self._connection.exec_driver_sql("BEGIN")
+
+        self._next_id: Dict[Type[Base], int] = {}
+        for model in _MODELS:
+            if model in _EXPLICIT_ID_MODELS:
+                continue
+            table = _table(model)
+            last_id = self._connection.execute(
+                select(func.max(table.c.id))).scalar()
+            self._next_id[model] = (last_id or 0) + 1
+
+        # Filling indexed tables row by row costs far more than building
+        # the indexes once at the end.
+        self._deferred_indexes: List[Index] = []
+        if defer_indexes:
+            for model in _MODELS:
+                for index in _table(model).indexes:
+                    # IF EXISTS: the inspector behind ``checkfirst`` does
+                    # not see expression indexes
+                    self._connection.execute(
+                        DropIndex(index, if_exists=True))
+                    self._deferred_indexes.append(index)
+
+    def add_person(
+            self, person: app_person.Person[int, int, str, int]) -> None:
+        """Queue ``person`` with the same rows as
+        ``PersonRepository.add_person``."""
+        with self._record() as rows:
+            ascend_id = None
+            if person.ascend.parents is not None:
+                ascend_id = self._add_row(rows, db_ascends.Ascends(
+                    parents=person.ascend.parents,
+                    consang=int(person.ascend.consanguinity_rate)
+                ))
+
+            families_id = None
+            if person.families:
+                families_id = self._add_row(rows, db_unions.Unions())
+                for family_id in person.families:
+                    self._add_row(rows, db_union_families.UnionFamilies(
+                        union_id=families_id,
+                        family_id=family_id
+                    ))
+
+            (db_person_instance, titles, non_native_relations,
+             related_persons, events_with_witnesses) = convert_person_to_db(
+                person, ascend_id, families_id
+            )
+            person_id = self._add_row(rows, db_person_instance)
+
+            for title in titles:
+                title_id = self._add_row(rows, title)
+                self._add_row(rows, db_person_titles.PersonTitles(
+                    person_id=person_id,
+                    title_id=title_id
+                ))
+
+            for relation in non_native_relations:
+                relation_id = self._add_row(rows, relation)
+                self._add_row(
+                    rows,
+                    db_person_non_native_relations.PersonNonNativeRelations(
+                        person_id=person_id,
+                        relation_id=relation_id
+                    )
+                )
+
+            for related_person in related_persons:
+                related_person.person_id = person_id
+                self._add_row(rows, related_person)
+
+            for event, event_witnesses in events_with_witnesses:
+                event.person_id = person_id
+                event_id = self._add_row(rows, event)
+                for event_witness in event_witnesses:
+                    event_witness.event_id = event_id
+                    self._add_row(rows, event_witness)
+        self.persons_added += 1
+
+    def add_family(self, family: app_family.Family[int, int, str]) -> None:
+        """Queue ``family`` with the same rows as
+        ``FamilyRepository.add_family``."""
+        with self._record() as rows:
+            couple_id = self._add_row(rows, db_couple.Couple(
+                father_id=family.parents[0],
+                mother_id=family.parents[1]
+            ))
+
+            (db_family_instance, witnesses, events_with_witnesses,
+             children) = convert_family_to_db(family, couple_id)
+            descend_id = self._allocate_id(db_descends.Descends)
+            db_family_instance.children_id = descend_id
+            family_id = self._add_row(rows, db_family_instance)
+
+            for witness in witnesses:
+                witness.family_id = family_id
+                self._add_row(rows, witness)
+
+            for event, event_witnesses in events_with_witnesses:
+                event.family_id = family_id
+                event_id = self._add_row(rows, event)
+                for event_witness in event_witnesses:
+                    event_witness.event_id = event_id
+                    self._add_row(rows, event_witness)
+
+            self._add_row(rows, db_descends.Descends(id=descend_id))
+            for child in children:
+                child.descend_id = descend_id
+                self._add_row(rows, child)
+        self.families_added += 1
+
+    def commit(self) -> None:
+        """Write the remaining rows, rebuild the deferred indexes and
+        commit the import transaction."""
+        try:
+            self._flush()
+            if self.persons_added or self.families_added:
+                # Unlike the repositories, the writer leaves the derived
+                # tables behind: they cover the base again once rebuilt
+                self._connection.execute(
+                    delete(db_built_table.BuiltTable))
+            for index in self._deferred_indexes:
+                self._connection.execute(
+                    CreateIndex(index, if_not_exists=True))
+            self._connection.exec_driver_sql("ANALYZE")
+            self._session.commit()
+        except Exception:
+            self.rollback()
+            raise
+        self._close()
+
+    def savepoint(self) -> None:
+        """Mark the current state, so that everything added afterwards can
+        be dropped with ``rollback_to_savepoint`` (gwc uses one per input
+        file). Only one savepoint is active at a time."""
+        self._flush()
+        self._connection.exec_driver_sql(f"SAVEPOINT {_SAVEPOINT}")
+        self._savepoint_state = (
+            dict(self._next_id), self.persons_added, self.families_added)
+
+    def release_savepoint(self) -> None:
+        """Keep everything added since ``savepoint``."""
+        if self._savepoint_state is None:
+            raise RuntimeError("No active savepoint")
+        self._connection.exec_driver_sql(f"RELEASE {_SAVEPOINT}")
+        self._savepoint_state = None
+
+    def rollback_to_savepoint(self) -> None:
+        """Drop everything added since ``savepoint``, written or not."""
+        if self._savepoint_state is None:
+            raise RuntimeError("No active savepoint")
+        for pending in self._pending.values():
+            pending.clear()
+        self._pending_count = 0
+        self._connection.exec_driver_sql(f"ROLLBACK TO {_SAVEPOINT}")
+        self._connection.exec_driver_sql(f"RELEASE {_SAVEPOINT}")
+        (self._next_id, self.persons_added,
+         self.families_added) = self._savepoint_state
+        self._savepoint_state = None
+
+    def rollback(self) -> None:
+        """Drop everything written or queued by this writer."""
+        try:
+            self._session.rollback()
+        finally:
+            self._close()
+
+    def _close(self) -> None:
+        try:
+            connection = self._session.connection()
+            for name, value in self._saved_pragmas.items():
+                connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+        finally:
+            self._session.close()
+
+    def _record(self) -> "_RecordScope":
+        return _RecordScope(self)
+
+    def _allocate_id(self, model: Type[Base]) -> int:
+        new_id = self._next_id[model]
+        self._next_id[model] = new_id + 1
+        return new_id
+
+    def _add_row(self, rows: List[Tuple[Type[Base], Row]], obj: Base) -> int:
+        """Give ``obj`` (and the dates hanging off it) its primary key and
+        queue its column values in ``rows``. Returns the ID."""
+        model = type(obj)
+        for rel_key, column_key in _DATE_RELATIONSHIPS[model]:
+            related = getattr(obj, rel_key)
+            if related is not None:
+                setattr(obj, column_key, self._add_row(rows, related))
+        if model not in _EXPLICIT_ID_MODELS and getattr(obj, "id") is None:
+            setattr(obj, "id", self._allocate_id(model))
+        table = _table(model)
+        rows.append((model, {
+            column.key: getattr(obj, column.key) for column in table.columns
+        }))
+        return getattr(obj, "id")
+
+    def _flush(self) -> None:
+        for model in _MODELS:
+            pending = self._pending[model]
+            if pending:
+                self._connection.execute(_table(model).insert(), pending)
+                pending.clear()
+        self._pending_count = 0
+
+
+class _RecordScope:
+    """Collect the rows of one record; they are only queued if the whole
+    record converted, otherwise the IDs it took are given back."""
+
+    def __init__(self, writer: BulkWriter):
+        self._writer = writer
+        self._rows: List[Tuple[Type[Base], Row]] = []
+        self._next_id = dict(writer._next_id)
+
+    def __enter__(self) -> List[Tuple[Type[Base], Row]]:
+        return self._rows
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        writer = self._writer
+        if exc_type is not None:
+            writer._next_id = self._next_id
+            return
+        for model, row in self._rows:
+            writer._pending[model].append(row)
+        writer._pending_count += len(self._rows)
+        if writer._pending_count >= writer.chunk_size:
+            writer._flush()
@@ -0,0 +1,166 @@
+"""
+Value lists of the edit forms (``database.cached_value``), the equivalent
+of the legacy ``cache_files``.
+
+The surname, first name, place, occupation, source and title fields of
+the person and family forms offer the distinct values already in the base.
+These lists are read, sorted and deduplicated, from one table instead of
+scanning ``Person`` and the event tables each time a form is opened.
+
+The table is rebuilt by ``gwc`` and by ``gwsetup database cache-files``.
+``PersonRepository`` / ``FamilyRepository`` add the values they write. A
+value no longer used stays listed until the next rebuild, as with the
+legacy cache files.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+import database.cached_value as db_cached_value
+import database.family as db_family
+import database.family_event as db_family_event
+import database.person as db_person
+import database.personal_event as db_personal_event
+import database.titles as db_titles
+from database.cached_value import CacheKind
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.built_tables import mark_built, was_built
+from repositories.name_count_repository import name_sort_key
+
+_Person = db_person.Person
+_PersonalEvent = db_personal_event.PersonalEvent
+_Family = db_family.Family
+_FamilyEvent = db_family_event.FamilyEvent
+_Titles = db_titles.Titles
+
+# Sorts after every character of a sort key
+_PREFIX_END = "\U0010ffff"
+
+# Columns each list is made of
+CACHED_COLUMNS = {
+    CacheKind.SURNAME: (_Person.surname,),
+    CacheKind.FIRST_NAME: (_Person.first_name,),
+    CacheKind.PLACE: (
+        _Person.birth_place, _Person.baptism_place, _Person.death_place,
+        _Person.burial_place, _PersonalEvent.place, _Family.marriage_place,
+        _FamilyEvent.place, _Titles.place,
+    ),
+    CacheKind.OCCUPATION: (_Person.occupation,),
+    CacheKind.SOURCE: (
+        _Person.src, _Person.birth_src, _Person.baptism_src,
+        _Person.death_src, _Person.burial_src, _PersonalEvent.src,
+        _Family.src, _Family.marriage_src, _FamilyEvent.src,
+    ),
+    CacheKind.TITLE: (_Titles.ident,),
+}
+
+
+def _cached(value: Optional[str]) -> Optional[str]:
+    """``value`` as listed, or None when it is not worth listing."""
+    value = (value or "").strip()
+    return value if value and value != "?" else None
+
+
+def cache_values(session: Session, rows: Iterable[object]) -> None:
+    """Add the values of the model ``rows`` (persons, events, families,
+    titles) missing from the lists, in the transaction of ``session``."""
+    values: Set[Tuple[CacheKind, str]] = set()
+    for row in rows:
+        for kind, columns in CACHED_COLUMNS.items():
+            for column in columns:
+                if isinstance(row, column.class_):
+                    value = _cached(getattr(row, column.key))
+                    if value is not None:
+                        values.add((kind, value))
+    if not values:
+        return
+    cached = db_cached_value.CachedValue
+    session.execute(insert(cached).values([
+        {"kind": kind, "value": value, "sort_key": name_sort_key(value)}
+        for kind, value in values
+    ]).on_conflict_do_nothing())
+
+
+class CacheFilesRepository:
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+
+    def _session(self) -> Session:
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        return session
+
+    def rebuild(self) -> Dict[CacheKind, int]:
+        """Compute every list from scratch, in one transaction. Returns the
+        number of values of each list."""
+        cached = db_cached_value.CachedValue
+        session = self._session()
+        try:
+            lists: Dict[CacheKind, Set[str]] = {}
+            for kind, columns in CACHED_COLUMNS.items():
+                values = lists[kind] = set()
+                for column in columns:
+                    for value in session.execute(
+                            select(column).distinct()).scalars():
+                        value = _cached(value)
+                        if value is not None:
+                            values.add(value)
+
+            connection = session.connection()
+            connection.execute(delete(cached))
+            rows = [
+                {"kind": kind, "value": value,
+                 "sort_key": name_sort_key(value)}
+                for kind, values in lists.items() for value in values
+            ]
+            if rows:
+                connection.execute(cached.__table__.insert(), rows)
+            mark_built(connection, cached.__table__)
+            session.commit()
+            return {kind: len(values) for kind, values in lists.items()}
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def is_built(self) -> bool:
+        """True when the lists were computed (or the base has no person)."""
+        cached = db_cached_value.CachedValue
+        session = self._session()
+        try:
+            return was_built(session, cached.__table__) or session.execute(
+                select(func.count()).select_from(_Person)
+            ).scalar_one() == 0
+        finally:
+            session.close()
+
+    def ensure_built(self) -> None:
+        if not self.is_built():
+            self.rebuild()
+
+    def values(
+        self, kind: CacheKind, prefix: str = "", limit: Optional[int] = None
+    ) -> List[str]:
+        """Values of the list ``kind``, alphabetically. With ``prefix``,
+        only the values starting with it, accents and case aside (a range
+        scan of ``ix_CachedValue_sort_key``), and at most ``limit`` of
+        them."""
+        cached = db_cached_value.CachedValue
+        statement = select(cached.value).where(cached.kind == kind)
+        key = name_sort_key(prefix)
+        if key:
+            statement = statement.where(
+                cached.sort_key >= key, cached.sort_key < key + _PREFIX_END)
+        statement = statement.order_by(cached.sort_key, cached.value)
+        if limit is not None:
+            statement = statement.limit(limit)
+        session = self._session()
+        try:
+            return list(session.execute(statement).scalars())
+        finally:
+            session.close()
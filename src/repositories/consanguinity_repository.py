@@ -0,0 +1,147 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+import database.ascends as db_ascends
+import database.couple as db_couple
+import database.family as db_family
+import database.person as db_person
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.consanguinity import NO_CONSANG, ConsanguinityEngine
+from repositories.batching import chunked, unique_ids
+
+
+def invalidate_consanguinity(
+    session: Session, person_ids: Iterable[int]
+) -> None:
+    """Reset the stored consanguinity of ``person_ids`` and of all their
+    descendants to ``NO_CONSANG``, in the transaction of ``session``, after
+    their ancestry changed. The next ``consang`` (or ``gwc -cg``) computes
+    it again."""
+    person = db_person.Person
+    ascends = db_ascends.Ascends
+    couple = db_couple.Couple
+    found: Set[int] = set()
+    generation = unique_ids(person_ids)
+    while generation:
+        found.update(generation)
+        children: List[int] = []
+        for chunk in chunked(generation):
+            children.extend(session.execute(
+                select(person.id)
+                .join(ascends, ascends.id == person.ascend_id)
+                .join(db_family.Family,
+                      db_family.Family.id == ascends.parents)
+                .join(couple, couple.id == db_family.Family.parents_id)
+                .where(or_(couple.father_id.in_(chunk),
+                           couple.mother_id.in_(chunk)))).scalars())
+        generation = [
+            child for child in unique_ids(children) if child not in found]
+    for chunk in chunked(sorted(found)):
+        session.execute(
+            update(ascends)
+            .where(ascends.id.in_(
+                select(person.ascend_id).where(person.id.in_(chunk))))
+            .values(consang=NO_CONSANG))
+
+
+class ConsanguinityRepository:
+    """Read the ancestry of a base and store the consanguinity computed by
+    ``libraries.consanguinity`` in ``Ascends.consang``."""
+
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+
+    def load_engine(self) -> Tuple[ConsanguinityEngine, Dict[int, int]]:
+        """Build an engine holding the whole base.
+
+        Only the person, ascendant and couple IDs are read, in one query.
+
+        Returns:
+            The engine and the Ascends row ID of every person who has
+            parents
+        """
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        try:
+            rows = session.execute(
+                select(
+                    db_person.Person.id,
+                    db_ascends.Ascends.id,
+                    db_ascends.Ascends.consang,
+                    db_couple.Couple.father_id,
+                    db_couple.Couple.mother_id,
+                )
+                .outerjoin(
+                    db_ascends.Ascends,
+                    db_person.Person.ascend_id == db_ascends.Ascends.id)
+                .outerjoin(
+                    db_family.Family,
+                    db_ascends.Ascends.parents == db_family.Family.id)
+                .outerjoin(
+                    db_couple.Couple,
+                    db_family.Family.parents_id == db_couple.Couple.id)
+            ).all()
+        finally:
+            session.close()
+
+        persons = []
+        parents: Dict[int, Tuple[int, ...]] = {}
+        consang: Dict[int, int] = {}
+        ascend_ids: Dict[int, int] = {}
+        for person_id, ascend_id, value, father_id, mother_id in rows:
+            persons.append(person_id)
+            if ascend_id is None:
+                # Without parents, the consanguinity is 0 and not stored
+                consang[person_id] = 0
+                continue
+            ascend_ids[person_id] = ascend_id
+            consang[person_id] = value
+            if father_id is not None:
+                parents[person_id] = (father_id, mother_id)
+        return ConsanguinityEngine(parents, consang, persons), ascend_ids
+
+    def save(self, ascend_ids: Dict[int, int], values: Dict[int, int]) -> int:
+        """Store fixed-point consanguinity ``values`` (keyed by person ID)
+        in one transaction. Returns the number of rows updated."""
+        params = [
+            {"ascend_id": ascend_ids[person_id], "value": value}
+            for person_id, value in values.items()
+            if person_id in ascend_ids
+        ]
+        if not params:
+            return 0
+        statement = (
+            update(db_ascends.Ascends)
+            .where(db_ascends.Ascends.id == bindparam("ascend_id"))
+            .values(consang=bindparam("value"))
+        )
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        try:
+            session.connection().execute(statement, params)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return len(params)
+
+    def compute_consanguinity(self, from_scratch: bool = False) -> int:
+        """Compute the consanguinity of the persons for which it is unknown
+        (``NO_CONSANG``) and of their descendants, or of every person with
+        ``from_scratch``, and store it.
+
+        Returns:
+            The number of persons whose stored consanguinity changed
+
+        Raises:
+            TopologicalSortError: if someone is their own ancestor
+        """
+        engine, ascend_ids = self.load_engine()
+        changed = engine.compute(from_scratch=from_scratch)
+        return self.save(ascend_ids, changed)
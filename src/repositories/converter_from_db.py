@@ -1,5 +1,6 @@
 from datetime import date
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Mapping, Optional, Tuple
 import re
 import libraries.date
 import database.date
@@ -27,42 +28,181 @@ import database.union_families
 import libraries.consanguinity_rate
 
 
+# Library classes of the database enum values, in place of ``match``
+# chains: the converters below run for every row of every page
+_DatePrecision = database.date.DatePrecision
+_SIMPLE_PRECISIONS = {
+    _DatePrecision.SURE: libraries.date.Sure,
+    _DatePrecision.ABOUT: libraries.date.About,
+    _DatePrecision.MAYBE: libraries.date.Maybe,
+    _DatePrecision.BEFORE: libraries.date.Before,
+    _DatePrecision.AFTER: libraries.date.After,
+}
+_INTERVAL_PRECISIONS = {
+    _DatePrecision.ORYEAR: libraries.date.OrYear,
+    _DatePrecision.YEARINT: libraries.date.YearInt,
+}
+_DIVORCE_STATUSES = {
+    database.family.DivorceStatus.NOT_DIVORCED: libraries.family.NotDivorced,
+    database.family.DivorceStatus.SEPARATED: libraries.family.Separated,
+}
+_DeathStatus = database.person.DeathStatus
+_DEATH_STATUSES = {
+    _DeathStatus.NOT_DEAD: libraries.death_info.NotDead,
+    _DeathStatus.DEAD_YOUNG: libraries.death_info.DeadYoung,
+    _DeathStatus.DEAD_DONT_KNOW_WHEN: libraries.death_info.DeadDontKnowWhen,
+    _DeathStatus.DONT_KNOW_IF_DEAD: libraries.death_info.DontKnowIfDead,
+    _DeathStatus.OF_COURSE_DEAD: libraries.death_info.OfCourseDead,
+}
+_FamilyEventName = database.family_event.FamilyEventName
+_FAM_EVENT_NAMES = {
+    _FamilyEventName.MARRIAGE: libraries.events.FamMarriage,
+    _FamilyEventName.NO_MARRIAGE: libraries.events.FamNoMarriage,
+    _FamilyEventName.NO_MENTION: libraries.events.FamNoMention,
+    _FamilyEventName.DIVORCE: libraries.events.FamDivorce,
+    _FamilyEventName.ENGAGE: libraries.events.FamEngage,
+    _FamilyEventName.SEPARATED: libraries.events.FamSeparated,
+    _FamilyEventName.ANNULATION: libraries.events.FamAnnulation,
+    _FamilyEventName.MARRIAGE_BANN: libraries.events.FamMarriageBann,
+    _FamilyEventName.MARRIAGE_CONTRACT: libraries.events.FamMarriageContract,
+    _FamilyEventName.MARRIAGE_LICENSE: libraries.events.FamMarriageLicense,
+    _FamilyEventName.PACS: libraries.events.FamPACS,
+    _FamilyEventName.RESIDENCE: libraries.events.FamResidence,
+}
+_PersonalEventName = database.personal_event.PersonalEventName
+_PERS_EVENT_NAMES = {
+    _PersonalEventName.BIRTH: libraries.events.PersBirth,
+    _PersonalEventName.BAPTISM: libraries.events.PersBaptism,
+    _PersonalEventName.DEATH: libraries.events.PersDeath,
+    _PersonalEventName.BURIAL: libraries.events.PersBurial,
+    _PersonalEventName.CREMATION: libraries.events.PersCremation,
+    _PersonalEventName.ACCOMPLISHMENT: libraries.events.PersAccomplishment,
+    _PersonalEventName.ACQUISITION: libraries.events.PersAcquisition,
+    _PersonalEventName.ADHESION: libraries.events.PersAdhesion,
+    _PersonalEventName.BAPTISM_LDS: libraries.events.PersBaptismLDS,
+    _PersonalEventName.BAR_MITZVAH: libraries.events.PersBarMitzvah,
+    _PersonalEventName.BAT_MITZVAH: libraries.events.PersBatMitzvah,
+    _PersonalEventName.BENEDICTION: libraries.events.PersBenediction,
+    _PersonalEventName.CHANGE_NAME: libraries.events.PersChangeName,
+    _PersonalEventName.CIRCUMCISION: libraries.events.PersCircumcision,
+    _PersonalEventName.CONFIRMATION: libraries.events.PersConfirmation,
+    _PersonalEventName.CONFIRMATION_LDS: libraries.events.PersConfirmationLDS,
+    _PersonalEventName.DECORATION: libraries.events.PersDecoration,
+    _PersonalEventName.DEMOBILISATION_MILITAIRE:
+        libraries.events.PersDemobilisationMilitaire,
+    _PersonalEventName.DIPLOMA: libraries.events.PersDiploma,
+    _PersonalEventName.DISTINCTION: libraries.events.PersDistinction,
+    _PersonalEventName.DOTATION: libraries.events.PersDotation,
+    _PersonalEventName.DOTATION_LDS: libraries.events.PersDotationLDS,
+    _PersonalEventName.EDUCATION: libraries.events.PersEducation,
+    _PersonalEventName.ELECTION: libraries.events.PersElection,
+    _PersonalEventName.EMIGRATION: libraries.events.PersEmigration,
+    _PersonalEventName.EXCOMMUNICATION: libraries.events.PersExcommunication,
+    _PersonalEventName.FAMILY_LINK_LDS: libraries.events.PersFamilyLinkLDS,
+    _PersonalEventName.FIRST_COMMUNION: libraries.events.PersFirstCommunion,
+    _PersonalEventName.FUNERAL: libraries.events.PersFuneral,
+    _PersonalEventName.GRADUATE: libraries.events.PersGraduate,
+    _PersonalEventName.HOSPITALISATION: libraries.events.PersHospitalisation,
+    _PersonalEventName.ILLNESS: libraries.events.PersIllness,
+    _PersonalEventName.IMMIGRATION: libraries.events.PersImmigration,
+    _PersonalEventName.LISTE_PASSENGER: libraries.events.PersListePassenger,
+    _PersonalEventName.MILITARY_DISTINCTION:
+        libraries.events.PersMilitaryDistinction,
+    _PersonalEventName.MILITARY_PROMOTION:
+        libraries.events.PersMilitaryPromotion,
+    _PersonalEventName.MILITARY_SERVICE: libraries.events.PersMilitaryService,
+    _PersonalEventName.MOBILISATION_MILITAIRE:
+        libraries.events.PersMobilisationMilitaire,
+    _PersonalEventName.NATURALISATION: libraries.events.PersNaturalisation,
+    _PersonalEventName.OCCUPATION: libraries.events.PersOccupation,
+    _PersonalEventName.ORDINATION: libraries.events.PersOrdination,
+    _PersonalEventName.PROPERTY: libraries.events.PersProperty,
+    _PersonalEventName.RECENSEMENT: libraries.events.PersRecensement,
+    _PersonalEventName.RESIDENCE: libraries.events.PersResidence,
+    _PersonalEventName.RETIRED: libraries.events.PersRetired,
+    _PersonalEventName.SCELLENT_CHILD_LDS:
+        libraries.events.PersScellentChildLDS,
+    _PersonalEventName.SCELLENT_PARENT_LDS:
+        libraries.events.PersScellentParentLDS,
+    _PersonalEventName.SCELLENT_SPOUSE_LDS:
+        libraries.events.PersScellentSpouseLDS,
+    _PersonalEventName.VENTE_BIEN: libraries.events.PersVenteBien,
+    _PersonalEventName.WILL: libraries.events.PersWill,
+}
+
+
+def _loaded(row: object, names: FrozenSet[str]) -> Mapping[str, Any]:
+    """The ``names`` attributes of the model ``row``.
+
+    Once loaded, they are read straight from the instance dict: the ORM
+    descriptors cost more than the rest of the conversion. Attributes not
+    loaded yet (expired, lazy) go through the descriptors.
+    """
+    values = row.__dict__
+    if values.keys() >= names:
+        return values
+    return {name: getattr(row, name) for name in names}
+
+
+# Attributes read by the converters below
+_DATE_ATTRIBUTES = frozenset(("iso_date", "compressed", "calendar"))
+_EVENT_ATTRIBUTES = frozenset((
+    "name", "date_obj", "place", "reason", "note", "src"))
+_PERSON_ATTRIBUTES = frozenset((
+    "access_right", "aliases", "ascend", "baptism_date_compressed",
+    "baptism_note", "baptism_place", "baptism_src", "birth_date_compressed",
+    "birth_note", "birth_place", "birth_src", "burial_date_compressed",
+    "burial_note", "burial_place", "burial_src", "burial_status",
+    "death_date_compressed", "death_note", "death_place", "death_reason",
+    "death_src", "death_status", "first_name", "first_names_aliases", "id",
+    "image", "notes", "occ", "occupation", "public_name", "qualifiers",
+    "sex", "src", "surname", "surname_aliases",
+))
+_FAMILY_DATE_ATTRIBUTES = frozenset((
+    "marriage_date_compressed", "divorce_date_compressed",
+))
+
+
+@lru_cache(maxsize=4096)
+def _uncompressed_date(
+    compressed: int, calendar: libraries.date.Calendar
+) -> libraries.date.CalendarDate:
+    """Date of a ``Date.compressed`` value. Dates are immutable and a base
+    has few distinct ones, so each is decoded once and then shared."""
+    return libraries.date.CalendarDate(
+        dmy=libraries.date.DateValue.uncompress(compressed), cal=calendar)
+
+
 def convert_precision_from_db(
         to_convert: database.date.Precision) -> libraries.date.PrecisionBase:
-    def date_value() -> libraries.date.DateValue:
-        dateTime = date.fromisoformat(to_convert.iso_date)
-        return libraries.date.DateValue(day=dateTime.day,
-                                        month=dateTime.month,
-                                        year=dateTime.year,
-                                        prec=None,
-                                        delta=to_convert.delta,)
-
-    match to_convert.precision_level:
-        case database.date.DatePrecision.SURE:
-            return libraries.date.Sure()
-        case database.date.DatePrecision.ABOUT:
-            return libraries.date.About()
-        case database.date.DatePrecision.MAYBE:
-            return libraries.date.Maybe()
-        case database.date.DatePrecision.BEFORE:
-            return libraries.date.Before()
-        case database.date.DatePrecision.AFTER:
-            return libraries.date.After()
-        case database.date.DatePrecision.ORYEAR:
-            return libraries.date.OrYear(date_value=date_value())
-        case database.date.DatePrecision.YEARINT:
-            return libraries.date.YearInt(date_value=date_value())
-        case _:
-            raise ValueError(
-                f"Unknown precision level: {to_convert.precision_level}"
-            )
+    simple = _SIMPLE_PRECISIONS.get(to_convert.precision_level)
+    if simple is not None:
+        return simple()
+    interval = _INTERVAL_PRECISIONS.get(to_convert.precision_level)
+    if interval is None:
+        raise ValueError(
+            f"Unknown precision level: {to_convert.precision_level}"
+        )
+    date_time = date.fromisoformat(to_convert.iso_date)
+    return interval(date_value=libraries.date.DateValue(
+        day=date_time.day,
+        month=date_time.month,
+        year=date_time.year,
+        prec=None,
+        delta=to_convert.delta,
+    ))
 
 
 def convert_date_from_db(
         to_convert: database.date.Date) -> libraries.date.CompressedDate:
-    if to_convert is None or \
-            (not to_convert.iso_date or to_convert.iso_date == ''):
+    if to_convert is None:
+        return None
+    row = _loaded(to_convert, _DATE_ATTRIBUTES)
+    if not row["iso_date"]:
         return None
+    if row["compressed"] is not None:
+        # The precision is packed with the date: no Precision row to read
+        return _uncompressed_date(row["compressed"], row["calendar"])
     try:
         dateTime = date.fromisoformat(to_convert.iso_date)
 
@@ -77,11 +217,15 @@ def convert_date_from_db(
         )
     except BaseException:
         s = to_convert.iso_date.strip()
-        # mm-yyyy (month 1-2 digits, year 4 digits)
-        m = re.match(r'^\s*(\d{1,2})-(\d{4})\s*$', s)
+        # yyyy-mm (as written by convert_date_to_db) or mm-yyyy
+        m = re.match(r'^\s*(\d{4})-(\d{1,2})\s*$', s)
+        if m:
+            year, month = int(m.group(1)), int(m.group(2))
+        else:
+            m = re.match(r'^\s*(\d{1,2})-(\d{4})\s*$', s)
+            if m:
+                month, year = int(m.group(1)), int(m.group(2))
         if m:
-            month = int(m.group(1))
-            year = int(m.group(2))
             return libraries.date.CalendarDate(
                 dmy=libraries.date.DateValue(
                     day=0,
@@ -111,63 +255,59 @@ def convert_date_from_db(
         raise
 
 
+def _date_of(
+    to_convert: object, row: Mapping[str, Any], date: str
+) -> Tuple[bool, libraries.date.CompressedDate]:
+    """Whether the ``date`` of the person or family ``to_convert`` is set,
+    and its value: decoded from its ``<date>_compressed`` column when it is
+    packed there, read from its ``Date`` row otherwise (no query is made
+    for a date that is not set)."""
+    packed = row[f"{date}_compressed"]
+    if packed is not None:
+        return True, _uncompressed_date(
+            packed, libraries.date.Calendar.GREGORIAN)
+    date_row = getattr(to_convert, f"{date}_obj")
+    return date_row is not None, convert_date_from_db(date_row)
+
+
 def convert_divorce_status_from_db(to_convert: database.family.DivorceStatus,
                                    divorce_date: Optional[database.date.Date]
                                    ) -> libraries.family.DivorceStatusBase:
-    match to_convert:
-        case database.family.DivorceStatus.NOT_DIVORCED:
-            return libraries.family.NotDivorced()
-        case database.family.DivorceStatus.SEPARATED:
-            return libraries.family.Separated()
-        case database.family.DivorceStatus.DIVORCED:
-            if divorce_date is None:
-                raise ValueError(
-                    "Divorce date must be provided for divorced status"
-                )
-            return libraries.family.Divorced(divorce_date=convert_date_from_db(
-                divorce_date))
+    return _divorce_status(to_convert, divorce_date is not None,
+                           convert_date_from_db(divorce_date))
+
+
+def _divorce_status(
+    to_convert: database.family.DivorceStatus,
+    dated: bool,
+    divorce_date: libraries.date.CompressedDate
+) -> libraries.family.DivorceStatusBase:
+    if to_convert is database.family.DivorceStatus.DIVORCED:
+        if not dated:
+            raise ValueError(
+                "Divorce date must be provided for divorced status"
+            )
+        return libraries.family.Divorced(divorce_date=divorce_date)
+    return _DIVORCE_STATUSES[to_convert]()
 
 
 def convert_fam_event_from_db(
     to_convert: database.family_event.FamilyEvent,
     witnesses: List[database.family_event_witness.FamilyEventWitness]
 ) -> libraries.family.FamilyEvent[int, str]:
+    row = _loaded(to_convert, _EVENT_ATTRIBUTES)
     famEventName: libraries.events.FamEventNameBase
-    match to_convert.name:
-        case database.family_event.FamilyEventName.MARRIAGE:
-            famEventName = libraries.events.FamMarriage()
-        case database.family_event.FamilyEventName.NO_MARRIAGE:
-            famEventName = libraries.events.FamNoMarriage()
-        case database.family_event.FamilyEventName.NO_MENTION:
-            famEventName = libraries.events.FamNoMention()
-        case database.family_event.FamilyEventName.DIVORCE:
-            famEventName = libraries.events.FamDivorce()
-        case database.family_event.FamilyEventName.ENGAGE:
-            famEventName = libraries.events.FamEngage()
-        case database.family_event.FamilyEventName.SEPARATED:
-            famEventName = libraries.events.FamSeparated()
-        case database.family_event.FamilyEventName.ANNULATION:
-            famEventName = libraries.events.FamAnnulation()
-        case database.family_event.FamilyEventName.MARRIAGE_BANN:
-            famEventName = libraries.events.FamMarriageBann()
-        case database.family_event.FamilyEventName.MARRIAGE_CONTRACT:
-            famEventName = libraries.events.FamMarriageContract()
-        case database.family_event.FamilyEventName.MARRIAGE_LICENSE:
-            famEventName = libraries.events.FamMarriageLicense()
-        case database.family_event.FamilyEventName.PACS:
-            famEventName = libraries.events.FamPACS()
-        case database.family_event.FamilyEventName.RESIDENCE:
-            famEventName = libraries.events.FamResidence()
-        case database.family_event.FamilyEventName.NAMED_EVENT:
-            famEventName = libraries.events.FamNamedEvent(
-                name=to_convert.name.value)
+    if row["name"] is database.family_event.FamilyEventName.NAMED_EVENT:
+        famEventName = libraries.events.FamNamedEvent(name=row["name"].value)
+    else:
+        famEventName = _FAM_EVENT_NAMES[row["name"]]()
     return libraries.family.FamilyEvent(
         name=famEventName,
-        date=convert_date_from_db(to_convert.date_obj),
-        place=to_convert.place,
-        reason=to_convert.reason,
-        note=to_convert.note,
-        src=to_convert.src,
+        date=convert_date_from_db(row["date_obj"]),
+        place=row["place"],
+        reason=row["reason"],
+        note=row["note"],
+        src=row["src"],
         witnesses=[(w.person_id, w.kind) for w in witnesses],
     )
 
@@ -181,16 +321,18 @@ def convert_family_from_db(
     ]],
     children: List[database.descend_children.DescendChildren]
 ) -> libraries.family.Family[int, int, str]:
+    dates = _loaded(to_convert, _FAMILY_DATE_ATTRIBUTES)
     return libraries.family.Family(
         index=to_convert.id,
-        marriage_date=convert_date_from_db(to_convert.marriage_date_obj),
+        marriage_date=_date_of(to_convert, dates, "marriage_date")[1],
         marriage_place=to_convert.marriage_place,
         marriage_note=to_convert.marriage_note,
         marriage_src=to_convert.marriage_src,
         witnesses=[w.person_id for w in witnesses],
         relation_kind=to_convert.relation_kind,
-        divorce_status=convert_divorce_status_from_db(
-            to_convert.divorce_status, to_convert.divorce_date_obj
+        divorce_status=_divorce_status(
+            to_convert.divorce_status,
+            *_date_of(to_convert, dates, "divorce_date")
         ),
         family_events=[convert_fam_event_from_db(e[0], e[1])
                        for e in events_and_witnesses],
@@ -209,30 +351,30 @@ def convert_death_status_from_db(
     death_date: Optional[database.date.Date]
 ) -> libraries.death_info.DeathStatusBase:
     """Convert death status from database to library type."""
-    match to_convert:
-        case database.person.DeathStatus.NOT_DEAD:
-            return libraries.death_info.NotDead()
-        case database.person.DeathStatus.DEAD:
-            if death_date is None:
-                raise ValueError(
-                    "Death date must be provided for DEAD status"
-                )
-            if death_reason is None:
-                raise ValueError(
-                    "Death reason must be provided for DEAD status"
-                )
-            return libraries.death_info.Dead(
-                death_reason=death_reason,
-                date_of_death=convert_date_from_db(death_date)
+    return _death_status(to_convert, death_reason, death_date is not None,
+                         convert_date_from_db(death_date))
+
+
+def _death_status(
+    to_convert: database.person.DeathStatus,
+    death_reason: Optional[database.person.DeathReason],
+    dated: bool,
+    death_date: libraries.date.CompressedDate
+) -> libraries.death_info.DeathStatusBase:
+    if to_convert is database.person.DeathStatus.DEAD:
+        if not dated:
+            raise ValueError(
+                "Death date must be provided for DEAD status"
+            )
+        if death_reason is None:
+            raise ValueError(
+                "Death reason must be provided for DEAD status"
             )
-        case database.person.DeathStatus.DEAD_YOUNG:
-            return libraries.death_info.DeadYoung()
-        case database.person.DeathStatus.DEAD_DONT_KNOW_WHEN:
-            return libraries.death_info.DeadDontKnowWhen()
-        case database.person.DeathStatus.DONT_KNOW_IF_DEAD:
-            return libraries.death_info.DontKnowIfDead()
-        case database.person.DeathStatus.OF_COURSE_DEAD:
-            return libraries.death_info.OfCourseDead()
+        return libraries.death_info.Dead(
+            death_reason=death_reason,
+            date_of_death=death_date
+        )
+    return _DEATH_STATUSES[to_convert]()
 
 
 def convert_burial_status_from_db(
@@ -240,25 +382,24 @@ def convert_burial_status_from_db(
     burial_date: Optional[database.date.Date]
 ) -> libraries.burial_info.BurialInfoBase:
     """Convert burial status from database to library type."""
-    match to_convert:
-        case database.person.BurialStatus.UNKNOWN_BURIAL:
-            return libraries.burial_info.UnknownBurial()
-        case database.person.BurialStatus.BURIAL:
-            if burial_date is None:
-                raise ValueError(
-                    "Burial date must be provided for BURIAL status"
-                )
-            return libraries.burial_info.Burial(
-                burial_date=convert_date_from_db(burial_date)
-            )
-        case database.person.BurialStatus.CREMATED:
-            if burial_date is None:
-                raise ValueError(
-                    "Burial date must be provided for CREMATED status"
-                )
-            return libraries.burial_info.Cremated(
-                cremation_date=convert_date_from_db(burial_date)
-            )
+    return _burial_status(to_convert, burial_date is not None,
+                          convert_date_from_db(burial_date))
+
+
+def _burial_status(
+    to_convert: database.person.BurialStatus,
+    dated: bool,
+    burial_date: libraries.date.CompressedDate
+) -> libraries.burial_info.BurialInfoBase:
+    if to_convert is database.person.BurialStatus.UNKNOWN_BURIAL:
+        return libraries.burial_info.UnknownBurial()
+    if not dated:
+        raise ValueError(
+            f"Burial date must be provided for {to_convert.name} status"
+        )
+    if to_convert is database.person.BurialStatus.BURIAL:
+        return libraries.burial_info.Burial(burial_date=burial_date)
+    return libraries.burial_info.Cremated(cremation_date=burial_date)
 
 
 def convert_title_name_from_db(
@@ -303,110 +444,9 @@ def convert_pers_event_name_from_db(
     name: database.personal_event.PersonalEventName
 ) -> libraries.events.PersEventNameBase[str]:
     """Convert personal event name from database enum to library type."""
-    match name:
-        case database.personal_event.PersonalEventName.BIRTH:
-            return libraries.events.PersBirth()
-        case database.personal_event.PersonalEventName.BAPTISM:
-            return libraries.events.PersBaptism()
-        case database.personal_event.PersonalEventName.DEATH:
-            return libraries.events.PersDeath()
-        case database.personal_event.PersonalEventName.BURIAL:
-            return libraries.events.PersBurial()
-        case database.personal_event.PersonalEventName.CREMATION:
-            return libraries.events.PersCremation()
-        case database.personal_event.PersonalEventName.ACCOMPLISHMENT:
-            return libraries.events.PersAccomplishment()
-        case database.personal_event.PersonalEventName.ACQUISITION:
-            return libraries.events.PersAcquisition()
-        case database.personal_event.PersonalEventName.ADHESION:
-            return libraries.events.PersAdhesion()
-        case database.personal_event.PersonalEventName.BAPTISM_LDS:
-            return libraries.events.PersBaptismLDS()
-        case database.personal_event.PersonalEventName.BAR_MITZVAH:
-            return libraries.events.PersBarMitzvah()
-        case database.personal_event.PersonalEventName.BAT_MITZVAH:
-            return libraries.events.PersBatMitzvah()
-        case database.personal_event.PersonalEventName.BENEDICTION:
-            return libraries.events.PersBenediction()
-        case database.personal_event.PersonalEventName.CHANGE_NAME:
-            return libraries.events.PersChangeName()
-        case database.personal_event.PersonalEventName.CIRCUMCISION:
-            return libraries.events.PersCircumcision()
-        case database.personal_event.PersonalEventName.CONFIRMATION:
-            return libraries.events.PersConfirmation()
-        case database.personal_event.PersonalEventName.CONFIRMATION_LDS:
-            return libraries.events.PersConfirmationLDS()
-        case database.personal_event.PersonalEventName.DECORATION:
-            return libraries.events.PersDecoration()
-        case (database.personal_event.PersonalEventName.
-              DEMOBILISATION_MILITAIRE):
-            return libraries.events.PersDemobilisationMilitaire()
-        case database.personal_event.PersonalEventName.DIPLOMA:
-            return libraries.events.PersDiploma()
-        case database.personal_event.PersonalEventName.DISTINCTION:
-            return libraries.events.PersDistinction()
-        case database.personal_event.PersonalEventName.DOTATION:
-            return libraries.events.PersDotation()
-        case database.personal_event.PersonalEventName.DOTATION_LDS:
-            return libraries.events.PersDotationLDS()
-        case database.personal_event.PersonalEventName.EDUCATION:
-            return libraries.events.PersEducation()
-        case database.personal_event.PersonalEventName.ELECTION:
-            return libraries.events.PersElection()
-        case database.personal_event.PersonalEventName.EMIGRATION:
-            return libraries.events.PersEmigration()
-        case database.personal_event.PersonalEventName.EXCOMMUNICATION:
-            return libraries.events.PersExcommunication()
-        case database.personal_event.PersonalEventName.FAMILY_LINK_LDS:
-            return libraries.events.PersFamilyLinkLDS()
-        case database.personal_event.PersonalEventName.FIRST_COMMUNION:
-            return libraries.events.PersFirstCommunion()
-        case database.personal_event.PersonalEventName.FUNERAL:
-            return libraries.events.PersFuneral()
-        case database.personal_event.PersonalEventName.GRADUATE:
-            return libraries.events.PersGraduate()
-        case database.personal_event.PersonalEventName.HOSPITALISATION:
-            return libraries.events.PersHospitalisation()
-        case database.personal_event.PersonalEventName.ILLNESS:
-            return libraries.events.PersIllness()
-        case database.personal_event.PersonalEventName.IMMIGRATION:
-            return libraries.events.PersImmigration()
-        case database.personal_event.PersonalEventName.LISTE_PASSENGER:
-            return libraries.events.PersListePassenger()
-        case database.personal_event.PersonalEventName.MILITARY_DISTINCTION:
-            return libraries.events.PersMilitaryDistinction()
-        case database.personal_event.PersonalEventName.MILITARY_PROMOTION:
-            return libraries.events.PersMilitaryPromotion()
-        case database.personal_event.PersonalEventName.MILITARY_SERVICE:
-            return libraries.events.PersMilitaryService()
-        case database.personal_event.PersonalEventName.MOBILISATION_MILITAIRE:
-            return libraries.events.PersMobilisationMilitaire()
-        case database.personal_event.PersonalEventName.NATURALISATION:
-            return libraries.events.PersNaturalisation()
-        case database.personal_event.PersonalEventName.OCCUPATION:
-            return libraries.events.PersOccupation()
-        case database.personal_event.PersonalEventName.ORDINATION:
-            return libraries.events.PersOrdination()
-        case database.personal_event.PersonalEventName.PROPERTY:
-            return libraries.events.PersProperty()
-        case database.personal_event.PersonalEventName.RECENSEMENT:
-            return libraries.events.PersRecensement()
-        case database.personal_event.PersonalEventName.RESIDENCE:
-            return libraries.events.PersResidence()
-        case database.personal_event.PersonalEventName.RETIRED:
-            return libraries.events.PersRetired()
-        case database.personal_event.PersonalEventName.SCELLENT_CHILD_LDS:
-            return libraries.events.PersScellentChildLDS()
-        case database.personal_event.PersonalEventName.SCELLENT_PARENT_LDS:
-            return libraries.events.PersScellentParentLDS()
-        case database.personal_event.PersonalEventName.SCELLENT_SPOUSE_LDS:
-            return libraries.events.PersScellentSpouseLDS()
-        case database.personal_event.PersonalEventName.VENTE_BIEN:
-            return libraries.events.PersVenteBien()
-        case database.personal_event.PersonalEventName.WILL:
-            return libraries.events.PersWill()
-        case database.personal_event.PersonalEventName.NAMED_EVENT:
-            return libraries.events.PersNamedEvent(name=name.value)
+    if name is database.personal_event.PersonalEventName.NAMED_EVENT:
+        return libraries.events.PersNamedEvent(name=name.value)
+    return _PERS_EVENT_NAMES[name]()
 
 
 def convert_personal_event_from_db(
@@ -414,17 +454,25 @@ def convert_personal_event_from_db(
     witnesses: List[database.person_event_witness.PersonEventWitness]
 ) -> libraries.events.PersonalEvent[int, str]:
     """Convert personal event from database to library type."""
+    row = _loaded(to_convert, _EVENT_ATTRIBUTES)
     return libraries.events.PersonalEvent(
-        name=convert_pers_event_name_from_db(to_convert.name),
-        date=convert_date_from_db(to_convert.date_obj),
-        place=to_convert.place,
-        reason=to_convert.reason,
-        note=to_convert.note,
-        src=to_convert.src,
+        name=convert_pers_event_name_from_db(row["name"]),
+        date=convert_date_from_db(row["date_obj"]),
+        place=row["place"],
+        reason=row["reason"],
+        note=row["note"],
+        src=row["src"],
         witnesses=[(w.person_id, w.kind) for w in witnesses]
     )
 
 
+def _split_list(text: str) -> List[str]:
+    """Items of a comma-separated list column, without blanks."""
+    if not text:
+        return []
+    return [item.strip() for item in text.split(',') if item.strip()]
+
+
 def convert_person_from_db(
     to_convert: database.person.Person,
     titles: List[database.titles.Titles],
@@ -451,51 +499,32 @@ def convert_person_from_db(
         A Person object with int indexes, int person references,
         str descriptors, and int family references
     """
+    row = _loaded(to_convert, _PERSON_ATTRIBUTES)
+
     # Parse comma-separated lists from database string fields
-    qualifiers = [
-        q.strip() for q in to_convert.qualifiers.split(',') if q.strip()
-    ]
-    aliases = [
-        a.strip() for a in to_convert.aliases.split(',') if a.strip()
-    ]
-    first_names_aliases = [
-        fn.strip()
-        for fn in to_convert.first_names_aliases.split(',')
-        if fn.strip()
-    ]
-    surname_aliases = [
-        sn.strip()
-        for sn in to_convert.surname_aliases.split(',')
-        if sn.strip()
-    ]
+    qualifiers = _split_list(row["qualifiers"])
+    aliases = _split_list(row["aliases"])
+    first_names_aliases = _split_list(row["first_names_aliases"])
+    surname_aliases = _split_list(row["surname_aliases"])
 
     # Determine ascendants - if person has ascend, get family ID
-    if to_convert.ascend:
-        ascend_family = to_convert.ascend.parents
+    ascend = row["ascend"]
+    if ascend:
+        ascend_family = ascend.parents
         consanguinity_rate = libraries.consanguinity_rate.ConsanguinityRate(
-            to_convert.ascend.consang
+            ascend.consang
         )
     else:
         ascend_family = None
         consanguinity_rate = libraries.consanguinity_rate.ConsanguinityRate(0)
 
-    print("BIRTH DATE OBJECT")
-    print(to_convert.birth_date)
-    print(to_convert.first_name)
-    print(to_convert.surname)
-    print(to_convert.birth_date_obj)
-    print((
-        convert_date_from_db(to_convert.birth_date_obj)
-        if to_convert.birth_date_obj else None
-    ))
-
     return libraries.person.Person(
-        index=to_convert.id,
-        first_name=to_convert.first_name,
-        surname=to_convert.surname,
-        occ=to_convert.occ,
-        image=to_convert.image,
-        public_name=to_convert.public_name,
+        index=row["id"],
+        first_name=row["first_name"],
+        surname=row["surname"],
+        occ=row["occ"],
+        image=row["image"],
+        public_name=row["public_name"],
         qualifiers=qualifiers,
         aliases=aliases,
         first_names_aliases=first_names_aliases,
@@ -505,44 +534,38 @@ def convert_person_from_db(
             convert_relation_from_db(r) for r in non_native_relations
         ],
         related_persons=[rp.related_person_id for rp in related_persons],
-        occupation=to_convert.occupation,
-        sex=to_convert.sex,
-        access_right=to_convert.access_right,
-        birth_date=(
-            convert_date_from_db(to_convert.birth_date_obj)
-            if to_convert.birth_date_obj else None
-        ),
-        birth_place=to_convert.birth_place,
-        birth_note=to_convert.birth_note,
-        birth_src=to_convert.birth_src,
-        baptism_date=(
-            convert_date_from_db(to_convert.baptism_date_obj)
-            if to_convert.baptism_date_obj else None
+        occupation=row["occupation"],
+        sex=row["sex"],
+        access_right=row["access_right"],
+        birth_date=_date_of(to_convert, row, "birth_date")[1],
+        birth_place=row["birth_place"],
+        birth_note=row["birth_note"],
+        birth_src=row["birth_src"],
+        baptism_date=_date_of(to_convert, row, "baptism_date")[1],
+        baptism_place=row["baptism_place"],
+        baptism_note=row["baptism_note"],
+        baptism_src=row["baptism_src"],
+        death_status=_death_status(
+            row["death_status"],
+            row["death_reason"],
+            *_date_of(to_convert, row, "death_date")
         ),
-        baptism_place=to_convert.baptism_place,
-        baptism_note=to_convert.baptism_note,
-        baptism_src=to_convert.baptism_src,
-        death_status=convert_death_status_from_db(
-            to_convert.death_status,
-            to_convert.death_reason,
-            to_convert.death_date_obj
+        death_place=row["death_place"],
+        death_note=row["death_note"],
+        death_src=row["death_src"],
+        burial=_burial_status(
+            row["burial_status"],
+            *_date_of(to_convert, row, "burial_date")
         ),
-        death_place=to_convert.death_place,
-        death_note=to_convert.death_note,
-        death_src=to_convert.death_src,
-        burial=convert_burial_status_from_db(
-            to_convert.burial_status,
-            to_convert.burial_date_obj
-        ),
-        burial_place=to_convert.burial_place,
-        burial_note=to_convert.burial_note,
-        burial_src=to_convert.burial_src,
+        burial_place=row["burial_place"],
+        burial_note=row["burial_note"],
+        burial_src=row["burial_src"],
         personal_events=[
             convert_personal_event_from_db(e[0], e[1])
             for e in personal_events_and_witnesses
         ],
-        notes=to_convert.notes,
-        src=to_convert.src,
+        notes=row["notes"],
+        src=row["src"],
         ascend=libraries.family.Ascendants(
             parents=ascend_family,
             consanguinity_rate=consanguinity_rate
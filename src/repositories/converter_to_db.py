@@ -3,6 +3,7 @@
 This module provides functions to convert from immutable library types
 back to SQLAlchemy database models for persistence.
 """
+from dataclasses import replace
 from datetime import date
 from typing import List, Optional, Tuple
 import libraries.date
@@ -133,6 +134,11 @@ def convert_date_to_db(
         db_date.iso_date = date_str
         db_date.calendar = to_convert.cal
         db_date.delta = to_convert.dmy.delta
+        dmy = to_convert.dmy
+        db_date.ymd = dmy.year * 10000 + dmy.month * 100 + dmy.day
+        # Read back as Sure when no precision is given
+        db_date.compressed = replace(
+            dmy, prec=dmy.prec or libraries.date.Sure()).compress()
 
         if to_convert.dmy.prec:
             db_date.precision_obj = convert_precision_to_db(
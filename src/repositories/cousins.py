@@ -0,0 +1,126 @@
+"""
+Cousins of a person for the C mode: the persons ``down`` generations below
+the ancestors ``up`` generations above the person (``up = down = 1`` for
+the siblings, ``2, 2`` for the first cousins, ``3, 2`` for the first
+cousins once removed upwards...).
+
+A ``CousinTable`` walks up once, one generation of ancestors per batched
+query, and then down from every generation of ancestors, one batched query
+per generation. The children already looked up are remembered, so the
+descendants of the parents are read once and reused for the grandparents
+and every cell of the table is a set difference of sets computed once.
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+from repositories.person_repository import PersonRepository, PersonSummary
+
+# Most generations the C mode walks up or down
+MAX_GENERATIONS = 10
+# Cousins listed per page of the C mode
+PAGE_SIZE = 500
+
+
+class CousinsPage(NamedTuple):
+    up: int
+    down: int
+    persons: List[PersonSummary]
+    page: int
+    page_count: int
+    total: int
+
+
+class CousinTable:
+    """Ancestors of a person by generation and the descendants of each
+    generation of ancestors by depth, up to ``max_up`` and ``max_down``
+    generations."""
+
+    def __init__(
+        self,
+        person_repo: PersonRepository,
+        person_id: int,
+        max_up: int,
+        max_down: int,
+    ):
+        self.person_repo = person_repo
+        self.person_id = person_id
+        self.max_up = min(max_up, MAX_GENERATIONS)
+        self.max_down = min(max_down, MAX_GENERATIONS)
+        self._children: Dict[int, List[int]] = {}
+        self._descendants: Dict[Tuple[int, int], FrozenSet[int]] = {}
+        self.ancestors = self._ancestors_by_generation()
+
+    def _ancestors_by_generation(self) -> List[FrozenSet[int]]:
+        """``[{person}, {parents}, {grandparents}, ...]``, stopping at the
+        first empty generation."""
+        generations = [frozenset((self.person_id,))]
+        while len(generations) <= self.max_up:
+            parents = self.person_repo.get_parent_ids(generations[-1])
+            generation = frozenset(
+                parent for couple in parents.values() for parent in couple)
+            if not generation:
+                break
+            generations.append(generation)
+        return generations
+
+    def _children_of(self, persons: Iterable[int]) -> FrozenSet[int]:
+        persons = list(persons)
+        missing = [p for p in persons if p not in self._children]
+        if missing:
+            found = self.person_repo.get_children_ids(missing)
+            for person in missing:
+                self._children[person] = found.get(person, [])
+        return frozenset(
+            child for person in persons for child in self._children[person])
+
+    def descendants(self, up: int, down: int) -> FrozenSet[int]:
+        """Descendants, ``down`` generations below, of the ancestors ``up``
+        generations above the person."""
+        if up >= len(self.ancestors):
+            return frozenset()
+        key = (up, down)
+        result = self._descendants.get(key)
+        if result is None:
+            if down == 0:
+                result = self.ancestors[up]
+            else:
+                result = self._children_of(self.descendants(up, down - 1))
+            self._descendants[key] = result
+        return result
+
+    def cousins(self, up: int, down: int) -> FrozenSet[int]:
+        """Persons ``down`` generations below the ancestors ``up``
+        generations above, except those already below the closer ancestors
+        (the ones ``up - 1`` generations above) and the person itself."""
+        if not 1 <= up <= self.max_up or not 1 <= down <= self.max_down:
+            return frozenset()
+        return (self.descendants(up, down)
+                - self.descendants(up - 1, down - 1)
+                - {self.person_id})
+
+    def counts(self) -> List[List[int]]:
+        """Number of cousins of every cell, indexed ``[up - 1][down - 1]``.
+        """
+        return [[len(self.cousins(up, down))
+                 for down in range(1, self.max_down + 1)]
+                for up in range(1, self.max_up + 1)]
+
+
+def cousins_page(
+    table: CousinTable,
+    up: int,
+    down: int,
+    page: int = 1,
+    page_size: int = PAGE_SIZE,
+) -> CousinsPage:
+    """Cousins of the ``(up, down)`` cell shown on ``page``, sorted by
+    name (the summaries of the whole cell are loaded to sort them)."""
+    persons = table.person_repo.get_person_summaries(table.cousins(up, down))
+    ordered = sorted(
+        persons.values(),
+        key=lambda p: (p.surname, p.first_name, p.occ, p.id))
+    start = (page - 1) * page_size
+    total = len(ordered)
+    page_count = max((total + page_size - 1) // page_size, 1)
+    return CousinsPage(up, down, ordered[start:start + page_size],
+                       page, page_count, total)
@@ -0,0 +1,113 @@
+"""
+Descendants of a person, generation by generation, with d'Aboville numbers
+(``1``, then ``1.1``, ``1.2`` for its children, ``1.1.1`` ...).
+
+Each generation is found with one set-based lookup of the children of the
+previous one, and a page only loads the persons it shows, so the tree of a
+prolific founder is never held in memory as a whole. A person descending
+through several lines is expanded once, under its first number; its other
+entries point to that number.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from repositories.person_repository import PersonRepository, PersonSummary
+
+# Deepest generation the D mode walks down to
+MAX_GENERATIONS = 64
+# Entries shown per page of the D mode
+PAGE_SIZE = 1000
+
+
+class DescendantEntry(NamedTuple):
+    number: str
+    person_id: int
+    # First number of the same person when it was already reached through
+    # another line
+    duplicate_of: Optional[str] = None
+
+
+class DescendantRow(NamedTuple):
+    number: str
+    person: PersonSummary
+    duplicate_of: Optional[str]
+
+
+class DescendantGeneration(NamedTuple):
+    number: int
+    rows: List[DescendantRow]
+
+
+def iter_descendant_generations(
+    person_repo: PersonRepository, person_id: int, max_generations: int
+) -> Iterator[List[DescendantEntry]]:
+    """Yield the entries of each generation, in d'Aboville order, starting
+    with ``person_id`` alone (``1``, generation 1)."""
+    first_number: Dict[int, str] = {person_id: "1"}
+    generation = [DescendantEntry("1", person_id)]
+    depth = 1
+    while generation:
+        yield generation
+        if depth == max_generations:
+            return
+        children = person_repo.get_children_ids(
+            e.person_id for e in generation if e.duplicate_of is None)
+        next_generation = []
+        for entry in generation:
+            if entry.duplicate_of is not None:
+                continue
+            for rank, child in enumerate(
+                    children.get(entry.person_id, ()), start=1):
+                number = f"{entry.number}.{rank}"
+                first = first_number.get(child)
+                if first is None:
+                    first_number[child] = number
+                next_generation.append(
+                    DescendantEntry(number, child, first))
+        generation = next_generation
+        depth += 1
+
+
+class DescendantsPage:
+    """Rows of one page of the D mode, produced lazily, one generation at
+    a time, when iterated.
+
+    The walk stops as soon as the page is full, so ``has_next`` is only
+    known once the iteration is over.
+    """
+
+    def __init__(
+        self,
+        person_repo: PersonRepository,
+        person_id: int,
+        max_generations: int,
+        page: int = 1,
+        page_size: int = PAGE_SIZE,
+    ):
+        self.person_repo = person_repo
+        self.person_id = person_id
+        self.max_generations = min(max_generations, MAX_GENERATIONS)
+        self.page = page
+        self.page_size = page_size
+        self.has_next = False
+
+    def __iter__(self) -> Iterator[DescendantGeneration]:
+        start = (self.page - 1) * self.page_size
+        end = start + self.page_size
+        position = 0
+        walk = iter_descendant_generations(
+            self.person_repo, self.person_id, self.max_generations)
+        for number, entries in enumerate(walk, start=1):
+            shown = entries[max(start - position, 0):max(end - position, 0)]
+            position += len(entries)
+            if shown:
+                persons = self.person_repo.get_person_summaries(
+                    e.person_id for e in shown)
+                yield DescendantGeneration(number, [
+                    DescendantRow(e.number, persons[e.person_id],
+                                  e.duplicate_of)
+                    for e in shown if e.person_id in persons
+                ])
+            if position > end:
+                self.has_next = True
+                return
@@ -1,4 +1,5 @@
-from typing import List
+from typing import Dict, Iterable, List, Sequence, Tuple
+from sqlalchemy.orm import Session, selectinload
 from database.sqlite_database_service import SQLiteDatabaseService
 
 import libraries.family as app_family
@@ -9,8 +10,13 @@ import database.descend_children as db_descend_children
 import database.family_witness as db_witness
 import database.descends as db_descend
 from database.couple import Couple
+from repositories.batching import (
+    ID_BATCH_SIZE, attach_unpacked_dates, batched, chunked, unique_ids)
+from repositories.cache_files_repository import cache_values
+from repositories.consanguinity_repository import invalidate_consanguinity
 from repositories.converter_from_db import convert_family_from_db
 from repositories.converter_to_db import convert_family_to_db
+from repositories.place_repository import index_family_places
 
 
 class FamilyRepository:
@@ -19,74 +25,56 @@ class FamilyRepository:
 
     def get_family_by_id(
             self, family_id: int) -> app_family.Family[int, int, str]:
+        families = self.get_families_by_ids([family_id])
+        if family_id not in families:
+            raise ValueError(f"Family with id {family_id} not found")
+        return families[family_id]
+
+    def get_families_by_ids(
+        self, family_ids: Iterable[int]
+    ) -> Dict[int, app_family.Family[int, int, str]]:
+        """Get many families at once, keyed by ID.
+
+        Couples, children, witnesses, events and event witnesses are read
+        with one IN (...) query per table and per batch of IDs. IDs that do
+        not exist are simply missing from the result.
+        """
+        ids = unique_ids(family_ids)
+        if not ids:
+            return {}
+
         session = self.db_service.get_session()
         if session is None:
             raise RuntimeError("Database session is not available")
-        family = self.db_service.get(
-            session, db_family.Family, {
-                "id": family_id})
-        if family is None:
+
+        try:
+            result: Dict[int, app_family.Family[int, int, str]] = {}
+            for chunk in chunked(ids):
+                families = (
+                    session.query(db_family.Family)
+                    .options(*_family_load_options())
+                    .filter(db_family.Family.id.in_(chunk))
+                    .all()
+                )
+                result.update(_convert_families(session, families))
+            return result
+        finally:
             session.close()
-            raise ValueError(f"Family with id {family_id} not found")
-        witnesses = self.db_service.get_all(session=session,
-                                            model=db_witness.FamilyWitness,
-                                            query={"family_id": family_id})
-        events = self.db_service.get_all(
-            session=session,
-            model=db_family_event.FamilyEvent,
-            query={"family_id": family_id}
-        )
-        events_with_witnesses = [(event, self.db_service.get_all(
-            session=session,
-            model=db_family_event_witness.FamilyEventWitness,
-            query={"event_id": event.id}
-        )) for event in events]
-        children = self.db_service.get_all(
-            session=session,
-            model=db_descend_children.DescendChildren,
-            query={"descend_id": family.children_id}
-        )
-        if witnesses is None:
-            witnesses = []
-        result = convert_family_from_db(
-            family, witnesses, events_with_witnesses, children)
-        session.close()
-        return result
 
     def get_all_families(self) -> List[app_family.Family[int, int, str]]:
         session = self.db_service.get_session()
         if session is None:
             raise RuntimeError("Database session is not available")
-        families = self.db_service.get_all(session, db_family.Family)
-        result = []
-        for family in families:
-            witnesses = self.db_service.get_all(
-                session=session,
-                model=db_witness.FamilyWitness,
-                query={"family_id": family.id}
-            )
-            events = self.db_service.get_all(
-                session=session,
-                model=db_family_event.FamilyEvent,
-                query={"family_id": family.id}
-            )
-            events_with_witnesses = [(event, self.db_service.get_all(
-                session=session,
-                model=db_family_event_witness.FamilyEventWitness,
-                query={"event_id": event.id}
-            )) for event in events]
-            children = self.db_service.get_all(
-                session=session,
-                model=db_descend_children.DescendChildren,
-                query={"descend_id": family.children_id}
-            )
-            if witnesses is None:
-                witnesses = []
-            app_family_instance = convert_family_from_db(
-                family, witnesses, events_with_witnesses, children)
-            result.append(app_family_instance)
-        session.close()
-        return result
+        try:
+            result: List[app_family.Family[int, int, str]] = []
+            rows = self.db_service.iter_all(
+                session, db_family.Family, batch_size=ID_BATCH_SIZE)
+            for batch in batched(rows):
+                converted = _convert_families(session, batch)
+                result.extend(converted[family.id] for family in batch)
+            return result
+        finally:
+            session.close()
 
     def add_family(self, family: app_family.Family[int, int, str]) -> bool:
         """Add a new family to the database."""
@@ -130,7 +118,17 @@ class FamilyRepository:
                 self.db_service.add(session, child)
 
             db_family_instance.children_id = descend.id
+            # The children have new parents
+            invalidate_consanguinity(
+                session, [child.person_id for child in children])
 
+            cache_values(session, [
+                db_family_instance,
+                *(event for event, _ in events_with_witnesses)])
+            index_family_places(
+                session, db_family_instance,
+                (couple.father_id, couple.mother_id),
+                [event for event, _ in events_with_witnesses])
             session.commit()
             return True
         except Exception as e:
@@ -220,7 +218,20 @@ class FamilyRepository:
                 for child in children:
                     child.descend_id = descend_id
                     self.db_service.add(session, child)
+                # The children added or removed change parents
+                session.flush()
+                invalidate_consanguinity(session, {
+                    child.person_id for child in old_children
+                } ^ {child.person_id for child in children})
 
+            cache_values(session, [
+                existing_family,
+                *(event for event, _ in events_with_witnesses)])
+            couple = self.db_service.get(session, Couple, {"id": couple_id})
+            index_family_places(
+                session, existing_family,
+                (couple.father_id, couple.mother_id) if couple else (),
+                [event for event, _ in events_with_witnesses])
             session.commit()
             return True
         except Exception as e:
@@ -228,3 +239,93 @@ class FamilyRepository:
             raise e
         finally:
             session.close()
+
+
+def _date_load_options(relationship):
+    # Precision rows are only read (lazily) for the dates without
+    # ``Date.compressed``
+    return selectinload(relationship)
+
+
+def _family_load_options():
+    # The dates are read from their packed columns, or attached by
+    # ``_convert_families``
+    return (selectinload(db_family.Family.parents),)
+
+
+# Dates of a family, each packed in its ``<date>_compressed`` column
+_FAMILY_DATES = ("marriage_date", "divorce_date")
+
+
+def _convert_families(
+    session: Session, families: Sequence[db_family.Family]
+) -> Dict[int, app_family.Family[int, int, str]]:
+    """Load the child rows of ``families`` with one query per table and
+    convert them to application families."""
+    family_ids = [f.id for f in families]
+    witnesses: Dict[int, List[db_witness.FamilyWitness]] = {
+        i: [] for i in family_ids
+    }
+    events: Dict[int, List[Tuple[
+        db_family_event.FamilyEvent,
+        List[db_family_event_witness.FamilyEventWitness]
+    ]]] = {i: [] for i in family_ids}
+    children: Dict[int, List[db_descend_children.DescendChildren]] = {}
+
+    attach_unpacked_dates(session, families, _FAMILY_DATES)
+    event_model = db_family_event.FamilyEvent
+    event_witness_model = db_family_event_witness.FamilyEventWitness
+    for chunk in chunked(family_ids):
+        witness_rows = (
+            session.query(db_witness.FamilyWitness)
+            .filter(db_witness.FamilyWitness.family_id.in_(chunk))
+            .order_by(db_witness.FamilyWitness.id)
+            .all()
+        )
+        for witness in witness_rows:
+            witnesses[witness.family_id].append(witness)
+
+        event_rows = (
+            session.query(event_model)
+            .options(_date_load_options(event_model.date_obj))
+            .filter(event_model.family_id.in_(chunk))
+            .order_by(event_model.id)
+            .all()
+        )
+        event_witness_rows = (
+            session.query(event_witness_model)
+            .join(event_model, event_model.id == event_witness_model.event_id)
+            .filter(event_model.family_id.in_(chunk))
+            .order_by(event_witness_model.id)
+            .all()
+        )
+        witnesses_by_event: Dict[
+            int, List[db_family_event_witness.FamilyEventWitness]
+        ] = {}
+        for event_witness in event_witness_rows:
+            witnesses_by_event.setdefault(
+                event_witness.event_id, []).append(event_witness)
+        for event in event_rows:
+            events[event.family_id].append(
+                (event, witnesses_by_event.get(event.id, [])))
+
+    descend_ids = unique_ids(f.children_id for f in families)
+    for chunk in chunked(descend_ids):
+        child_rows = (
+            session.query(db_descend_children.DescendChildren)
+            .filter(db_descend_children.DescendChildren.descend_id.in_(chunk))
+            .order_by(db_descend_children.DescendChildren.id)
+            .all()
+        )
+        for child in child_rows:
+            children.setdefault(child.descend_id, []).append(child)
+
+    return {
+        family.id: convert_family_from_db(
+            family,
+            witnesses[family.id],
+            events[family.id],
+            children.get(family.children_id, [])
+        )
+        for family in families
+    }
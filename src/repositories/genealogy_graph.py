@@ -0,0 +1,353 @@
+"""
+Compact in-memory index of the links between the persons and families of a
+base, for traversals that would otherwise cost one query per hop.
+
+The graph only holds IDs, in ``array`` columns indexed by person or family
+ID (``-1`` when there is no link), plus two CSR-style adjacency lists
+(offsets + values) for the children of a family and the families of a
+person. It is loaded with four queries and shared through ``graph_registry``
+until the base is written to or replaced.
+"""
+
+import os
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import database.ascends as db_ascends
+import database.couple as db_couple
+import database.descend_children as db_descend_children
+import database.family as db_family
+import database.person as db_person
+import database.union_families as db_union_families
+from database.engine_registry import BaseVersion, engine_registry
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.consanguinity import NO_CONSANG
+
+NONE = -1
+
+
+def _column(size: int) -> array:
+    return array("q", [NONE]) * size
+
+
+def _adjacency(
+    size: int, pairs: Iterable[Tuple[int, int]]
+) -> Tuple[array, array]:
+    """Build (offsets, values) such that the values of ``key`` are
+    ``values[offsets[key]:offsets[key + 1]]``, in the order of ``pairs``."""
+    grouped: Dict[int, List[int]] = {}
+    for key, value in pairs:
+        if 0 <= key < size:
+            grouped.setdefault(key, []).append(value)
+    offsets = array("q", [0]) * (size + 1)
+    values = array("q")
+    for key in range(size):
+        offsets[key] = len(values)
+        values.extend(grouped.get(key, ()))
+    offsets[size] = len(values)
+    return offsets, values
+
+
+class GenealogyGraph:
+    """Parent/child links of a whole base.
+
+    Build it with ``GenealogyGraph.load`` (or get the shared one from
+    ``graph_registry``); it is immutable afterwards.
+    """
+
+    def __init__(
+        self,
+        person_parents: Dict[int, Optional[int]],
+        family_couples: Dict[int, Tuple[Optional[int], Optional[int]]],
+        family_children: Iterable[Tuple[int, int]],
+        person_families: Iterable[Tuple[int, int]],
+        person_consang: Optional[Dict[int, int]] = None,
+    ):
+        """
+        Args:
+            person_parents: Parent family ID (or None) of every person
+            family_couples: Father and mother IDs of every family
+            family_children: (family ID, child ID) pairs, in child order
+            person_families: (person ID, family ID) pairs, in union order
+            person_consang: Stored fixed-point consanguinity of the persons
+                            who have parents (``NO_CONSANG`` when unknown)
+        """
+        person_count = max(person_parents, default=NONE) + 1
+        family_count = max(family_couples, default=NONE) + 1
+
+        self._persons = array("b", [0]) * person_count
+        self._parent_family = _column(person_count)
+        for person, family in person_parents.items():
+            self._persons[person] = 1
+            if family is not None:
+                self._parent_family[person] = family
+        self._consang = array("q", [0]) * person_count
+        for person, consang in (person_consang or {}).items():
+            self._consang[person] = consang
+
+        self._families = array("b", [0]) * family_count
+        self._father = _column(family_count)
+        self._mother = _column(family_count)
+        for family, (father, mother) in family_couples.items():
+            self._families[family] = 1
+            if father is not None:
+                self._father[family] = father
+            if mother is not None:
+                self._mother[family] = mother
+
+        self._child_offsets, self._children = _adjacency(
+            family_count, family_children)
+        self._union_offsets, self._unions = _adjacency(
+            person_count, person_families)
+        self.person_count = len(person_parents)
+        self.family_count = len(family_couples)
+
+    @classmethod
+    def load(cls, db_service: SQLiteDatabaseService) -> "GenealogyGraph":
+        """Read the links of the whole base, with one query per table."""
+        session = db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        try:
+            return cls._load(session)
+        finally:
+            session.close()
+
+    @classmethod
+    def _load(cls, session: Session) -> "GenealogyGraph":
+        person_parents: Dict[int, Optional[int]] = {}
+        person_consang: Dict[int, int] = {}
+        for person_id, parents, consang in session.execute(
+            select(
+                db_person.Person.id,
+                db_ascends.Ascends.parents,
+                db_ascends.Ascends.consang,
+            ).outerjoin(
+                db_ascends.Ascends,
+                db_person.Person.ascend_id == db_ascends.Ascends.id)
+        ):
+            person_parents[person_id] = parents
+            if consang is not None:
+                person_consang[person_id] = consang
+
+        family_couples: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+        family_of_descend: Dict[int, int] = {}
+        for family_id, father, mother, children_id in session.execute(
+            select(
+                db_family.Family.id,
+                db_couple.Couple.father_id,
+                db_couple.Couple.mother_id,
+                db_family.Family.children_id,
+            ).outerjoin(
+                db_couple.Couple,
+                db_family.Family.parents_id == db_couple.Couple.id)
+        ):
+            family_couples[family_id] = (father, mother)
+            if children_id is not None:
+                family_of_descend[children_id] = family_id
+
+        children = db_descend_children.DescendChildren
+        family_children = [
+            (family_of_descend[descend_id], person_id)
+            for descend_id, person_id in session.execute(
+                select(children.descend_id, children.person_id)
+                .order_by(children.descend_id, children.id))
+            if descend_id in family_of_descend
+        ]
+
+        unions = db_union_families.UnionFamilies
+        person_families = session.execute(
+            select(db_person.Person.id, unions.family_id)
+            .join(unions, unions.union_id == db_person.Person.families_id)
+            .order_by(db_person.Person.id, unions.id)
+        ).tuples().all()
+
+        return cls(
+            person_parents, family_couples, family_children, person_families,
+            person_consang)
+
+    def __contains__(self, person: int) -> bool:
+        return 0 <= person < len(self._persons) and bool(
+            self._persons[person])
+
+    def has_family(self, family: int) -> bool:
+        return 0 <= family < len(self._families) and bool(
+            self._families[family])
+
+    def parent_family(self, person: int) -> Optional[int]:
+        """ID of the family ``person`` was born in, if known."""
+        if person not in self:
+            return None
+        family = self._parent_family[person]
+        return None if family == NONE else family
+
+    def family_parents(
+        self, family: int
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Father and mother IDs of ``family``."""
+        if not self.has_family(family):
+            return None, None
+        father, mother = self._father[family], self._mother[family]
+        return (None if father == NONE else father,
+                None if mother == NONE else mother)
+
+    def parents(self, person: int) -> Tuple[Optional[int], Optional[int]]:
+        """Father and mother IDs of ``person``."""
+        family = self.parent_family(person)
+        if family is None:
+            return None, None
+        return self.family_parents(family)
+
+    def consanguinity(self, person: int) -> int:
+        """Stored fixed-point consanguinity of ``person`` (0 without
+        parents, ``NO_CONSANG`` when not computed yet)."""
+        if person not in self:
+            return NO_CONSANG
+        return self._consang[person]
+
+    def couples(self, persons: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """Father and mother of every person of ``persons`` who has both,
+        as expected by ``libraries.consanguinity.ConsanguinityEngine``."""
+        parent_family, father, mother = (
+            self._parent_family, self._father, self._mother)
+        size = len(parent_family)
+        couples: Dict[int, Tuple[int, int]] = {}
+        for person in persons:
+            family = parent_family[person] if 0 <= person < size else NONE
+            if family != NONE and father[family] != NONE \
+                    and mother[family] != NONE:
+                couples[person] = (father[family], mother[family])
+        return couples
+
+    def children(self, family: int) -> Sequence[int]:
+        """Children IDs of ``family``, in birth order."""
+        if not self.has_family(family):
+            return ()
+        return self._children[
+            self._child_offsets[family]:self._child_offsets[family + 1]]
+
+    def families(self, person: int) -> Sequence[int]:
+        """IDs of the families where ``person`` is a parent."""
+        if person not in self:
+            return ()
+        return self._unions[
+            self._union_offsets[person]:self._union_offsets[person + 1]]
+
+    def person_children(self, person: int) -> List[int]:
+        """Children of ``person`` in all their families."""
+        return [
+            child
+            for family in self.families(person)
+            for child in self.children(family)
+        ]
+
+    def siblings(self, person: int, include_self: bool = False) -> List[int]:
+        """Children of the parent family of ``person``, in birth order."""
+        family = self.parent_family(person)
+        if family is None:
+            return [person] if include_self else []
+        return [
+            child for child in self.children(family)
+            if include_self or child != person
+        ]
+
+    def ancestors(
+        self, person: int, max_depth: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Every ancestor of ``person`` (at most ``max_depth`` generations
+        up), mapped to the generation it is first reached at (1 for the
+        parents). Ancestors reached by several lines are listed once."""
+        # Reads the columns directly: this is the hot loop of the
+        # relationship and consanguinity computations
+        parent_family, father, mother = (
+            self._parent_family, self._father, self._mother)
+        size = len(parent_family)
+        found: Dict[int, int] = {}
+        generation = [person]
+        depth = 0
+        while generation and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_generation = []
+            for current in generation:
+                family = parent_family[current] if 0 <= current < size \
+                    else NONE
+                if family == NONE:
+                    continue
+                for parent in (father[family], mother[family]):
+                    if parent != NONE and parent not in found \
+                            and parent != person:
+                        found[parent] = depth
+                        next_generation.append(parent)
+            generation = next_generation
+        return found
+
+    def descendants(
+        self, person: int, max_depth: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Every descendant of ``person`` (at most ``max_depth``
+        generations down), mapped to the generation it is first reached at
+        (1 for the children)."""
+        return self._walk(person, max_depth, self.person_children)
+
+    def _walk(self, person, max_depth, next_of) -> Dict[int, int]:
+        found: Dict[int, int] = {}
+        generation = [person]
+        depth = 0
+        while generation and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_generation = []
+            for current in generation:
+                for relative in next_of(current):
+                    if relative not in found and relative != person:
+                        found[relative] = depth
+                        next_generation.append(relative)
+            generation = next_generation
+        return found
+
+
+class GraphRegistry:
+    """Process-wide cache of ``GenealogyGraph`` per base.
+
+    A graph is reused until the base is replaced or written to (see
+    ``engine_registry.version``); bases without a shared engine get a fresh
+    graph each time.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[BaseVersion, GenealogyGraph]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db_service: SQLiteDatabaseService) -> GenealogyGraph:
+        key = os.path.abspath(db_service.database_path)
+        version = engine_registry.version(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and version is not None \
+                    and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        graph = GenealogyGraph.load(db_service)
+        if version is not None:
+            with self._lock:
+                self._entries[key] = (version, graph)
+        return graph
+
+    def invalidate(self, database_path: str) -> None:
+        with self._lock:
+            self._entries.pop(os.path.abspath(database_path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+graph_registry = GraphRegistry()
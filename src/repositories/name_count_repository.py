@@ -0,0 +1,326 @@
+"""
+Surname and first name frequency tables (``database.name_count`` and
+``database.name_initial_count``).
+
+The alphabetical and by-frequency name lists of the search page read the
+number of persons of each name and of each initial letter from these
+tables, a page of names at a time, instead of grouping every ``Person`` on
+each request.
+
+The tables are rebuilt by ``gwc`` and kept up to date by
+``PersonRepository.add_person`` / ``edit_person``. On a base built before
+they existed, the lists are counted from ``Person`` as they are read, and
+nothing is written to the base, until ``gwsetup database migrate`` builds
+the tables.
+"""
+
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+import database.name_count as db_name_count
+import database.name_initial_count as db_name_initial_count
+import database.person as db_person
+from database.name_index import NameKind
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.batching import ID_BATCH_SIZE
+from repositories.built_tables import mark_built, was_built
+
+# Names listed per page
+PAGE_SIZE = 500
+
+# (surname, first name) of a person
+PersonNames = Tuple[Optional[str], Optional[str]]
+
+
+class NameFrequency(NamedTuple):
+    name: str
+    persons: int
+
+
+class InitialBucket(NamedTuple):
+    initial: str
+    names: int
+    persons: int
+
+
+class NamePage(NamedTuple):
+    names: List[NameFrequency]
+    page: int
+    page_count: int
+
+
+def name_sort_key(name: str) -> str:
+    """``name`` lowercase and without accents, so that "Émile" is listed
+    with the names starting with "e"."""
+    return "".join(
+        c for c in unicodedata.normalize("NFD", name)
+        if unicodedata.category(c) != "Mn"
+    ).lower()
+
+
+def name_initial(name: str) -> str:
+    """Bucket ``name`` is listed under: its first letter (see
+    ``name_sort_key``), or ``#`` when it does not start with a letter."""
+    initial = name_sort_key(name)[:1]
+    return initial if initial.isalpha() else "#"
+
+
+def _counted_names(
+    names: PersonNames,
+) -> List[Tuple[NameKind, str]]:
+    surname, first_name = names
+    return [
+        (NameKind.SURNAME, (surname or "").strip()),
+        (NameKind.FIRST_NAME, (first_name or "").strip()),
+    ]
+
+
+def _buckets(
+    totals: Counter,
+) -> Dict[Tuple[NameKind, str], Tuple[int, int]]:
+    """(names, persons) of each (kind, initial) bucket of ``totals``, the
+    number of persons of each (kind, name)."""
+    buckets: Dict[Tuple[NameKind, str], Tuple[int, int]] = {}
+    for (kind, name), count in totals.items():
+        names, persons = buckets.get((kind, name_initial(name)), (0, 0))
+        buckets[kind, name_initial(name)] = (names + 1, persons + count)
+    return buckets
+
+
+def _page_of(rows: List, page: int, page_size: int) -> NamePage:
+    """Page ``page`` of ``rows``, the (name, count) pairs of a list."""
+    page_count = max((len(rows) + page_size - 1) // page_size, 1)
+    page = min(max(page, 1), page_count)
+    start = (page - 1) * page_size
+    return NamePage(
+        [NameFrequency(*row) for row in rows[start:start + page_size]],
+        page, page_count)
+
+
+def count_names(
+    session: Session,
+    removed: Iterable[PersonNames] = (),
+    added: Iterable[PersonNames] = (),
+) -> None:
+    """Update the counts in the transaction of ``session`` for persons
+    whose names ``removed`` were replaced by ``added``."""
+    deltas: Counter = Counter()
+    for names in removed:
+        deltas.subtract(_counted_names(names))
+    for names in added:
+        deltas.update(_counted_names(names))
+    deltas = Counter({key: delta for key, delta in deltas.items() if delta})
+    if not deltas:
+        return
+
+    counts = db_name_count.NameCount
+    for (kind, name), delta in deltas.items():
+        statement = insert(counts).values(
+            kind=kind, name=name, sort_key=name_sort_key(name),
+            initial=name_initial(name), count=delta)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[counts.kind, counts.name],
+            set_={"count": counts.count + statement.excluded.count}))
+    session.execute(delete(counts).where(counts.count <= 0))
+
+    buckets = db_name_initial_count.NameInitialCount
+    for kind, initial in {(kind, name_initial(name))
+                          for kind, name in deltas}:
+        names, persons = session.execute(
+            select(func.count(), func.coalesce(func.sum(counts.count), 0))
+            .where(counts.kind == kind, counts.initial == initial)).one()
+        if not names:
+            session.execute(delete(buckets).where(
+                buckets.kind == kind, buckets.initial == initial))
+            continue
+        statement = insert(buckets).values(
+            kind=kind, initial=initial, names=names, persons=persons)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[buckets.kind, buckets.initial],
+            set_={"names": names, "persons": persons}))
+
+
+class NameCountRepository:
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+        # Counts of a base whose tables were never built, once computed
+        self._scanned: Optional[Counter] = None
+
+    def _session(self) -> Session:
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        return session
+
+    def rebuild(self) -> int:
+        """Count the names of every person of the base from scratch, in one
+        transaction. Returns the number of distinct names counted."""
+        counts = db_name_count.NameCount
+        buckets = db_name_initial_count.NameInitialCount
+        session = self._session()
+        try:
+            totals = self._count(session)
+            connection = session.connection()
+            connection.execute(delete(counts))
+            connection.execute(delete(buckets))
+            if totals:
+                connection.execute(counts.__table__.insert(), [
+                    {"kind": kind, "name": name,
+                     "sort_key": name_sort_key(name),
+                     "initial": name_initial(name), "count": count}
+                    for (kind, name), count in totals.items()
+                ])
+                connection.execute(buckets.__table__.insert(), [
+                    {"kind": kind, "initial": initial,
+                     "names": names, "persons": persons}
+                    for (kind, initial), (names, persons)
+                    in _buckets(totals).items()
+                ])
+            mark_built(connection, counts.__table__)
+            session.commit()
+            return len(totals)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @classmethod
+    def _count(cls, session: Session) -> Counter:
+        """Number of persons of each (kind, name) of the base."""
+        totals: Counter = Counter()
+        for persons in cls._iter_names(session):
+            for names in persons:
+                totals.update(_counted_names(names))
+        return totals
+
+    @staticmethod
+    def _iter_names(session: Session) -> Iterable[List[Tuple]]:
+        """(surname, first name) of all the persons, a batch at a time."""
+        statement = select(
+            db_person.Person.id,
+            db_person.Person.surname,
+            db_person.Person.first_name,
+        ).order_by(db_person.Person.id).limit(ID_BATCH_SIZE * 10)
+        persons = session.execute(statement).all()
+        while persons:
+            yield [(surname, first_name) for _, surname, first_name in persons]
+            persons = session.execute(statement.where(
+                db_person.Person.id > persons[-1][0])).all()
+
+    def is_built(self) -> bool:
+        """False when the base has persons but the tables were never built
+        (the base predates them)."""
+        session = self._session()
+        try:
+            if was_built(session, db_name_count.NameCount.__table__):
+                return True
+            return session.execute(
+                select(db_person.Person.id).limit(1)).first() is None
+        finally:
+            session.close()
+
+    def ensure_built(self) -> None:
+        if not self.is_built():
+            self.rebuild()
+
+    def _unbuilt_counts(self) -> Optional[Counter]:
+        """Counts of the names of every person when the tables were never
+        built, computed without writing; None when the tables can be
+        read."""
+        if self._scanned is None and not self.is_built():
+            session = self._session()
+            try:
+                self._scanned = self._count(session)
+            finally:
+                session.close()
+        return self._scanned
+
+    def initials(self, kind: NameKind) -> List[InitialBucket]:
+        """Buckets of names of ``kind`` in alphabetical order, ``#``
+        last."""
+        scanned = self._unbuilt_counts()
+        if scanned is not None:
+            return sorted(
+                (InitialBucket(initial, names, persons)
+                 for (bucket_kind, initial), (names, persons)
+                 in _buckets(scanned).items() if bucket_kind == kind),
+                key=lambda b: (b.initial == "#", b.initial))
+        buckets = db_name_initial_count.NameInitialCount
+        session = self._session()
+        try:
+            rows = session.execute(
+                select(buckets.initial, buckets.names, buckets.persons)
+                .where(buckets.kind == kind)).all()
+        finally:
+            session.close()
+        return sorted(
+            (InitialBucket(*row) for row in rows),
+            key=lambda b: (b.initial == "#", b.initial))
+
+    def names_by_initial(
+        self,
+        kind: NameKind,
+        initial: str,
+        page: int = 1,
+        page_size: int = PAGE_SIZE,
+    ) -> NamePage:
+        """Names of ``kind`` listed under ``initial``, alphabetically."""
+        scanned = self._unbuilt_counts()
+        if scanned is not None:
+            return _page_of(sorted(
+                ((name, count) for (name_kind, name), count in scanned.items()
+                 if name_kind == kind and name_initial(name) == initial),
+                key=lambda row: (name_sort_key(row[0]), row[0])),
+                page, page_size)
+        counts = db_name_count.NameCount
+        return self._page(
+            select(counts.name, counts.count)
+            .where(counts.kind == kind, counts.initial == initial)
+            .order_by(counts.sort_key, counts.name),
+            select(func.count()).select_from(counts).where(
+                counts.kind == kind, counts.initial == initial),
+            page, page_size)
+
+    def most_frequent(
+        self,
+        kind: NameKind,
+        page: int = 1,
+        page_size: int = PAGE_SIZE,
+    ) -> NamePage:
+        """Names of ``kind``, the most frequent first."""
+        scanned = self._unbuilt_counts()
+        if scanned is not None:
+            return _page_of(sorted(
+                ((name, count) for (name_kind, name), count in scanned.items()
+                 if name_kind == kind),
+                key=lambda row: (-row[1], name_sort_key(row[0]), row[0])),
+                page, page_size)
+        counts = db_name_count.NameCount
+        return self._page(
+            select(counts.name, counts.count)
+            .where(counts.kind == kind)
+            .order_by(counts.count.desc(), counts.sort_key, counts.name),
+            select(func.count()).select_from(counts).where(
+                counts.kind == kind),
+            page, page_size)
+
+    def _page(self, statement, count_statement, page: int,
+              page_size: int) -> NamePage:
+        session = self._session()
+        try:
+            total = session.execute(count_statement).scalar_one()
+            page_count = max((total + page_size - 1) // page_size, 1)
+            page = min(max(page, 1), page_count)
+            rows = session.execute(
+                statement.limit(page_size).offset((page - 1) * page_size)
+            ).all()
+        finally:
+            session.close()
+        return NamePage(
+            [NameFrequency(*row) for row in rows], page, page_count)
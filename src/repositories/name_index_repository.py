@@ -0,0 +1,292 @@
+"""
+Search index of the names of the persons (``database.name_index``).
+
+Every surname, first name, public name and alias of a person is stored
+normalized with ``NameUtils.lower`` (lowercase, without accents or
+punctuation) and ``NameUtils.abbreviate_lower``, once per word it starts
+with, so that "Tour", "la tour" or "élisabeth" all find "Élisabeth de la
+Tour" with a range scan of an index instead of a pass over ``Person``.
+Names ``NameUtils.lower`` keeps nothing of (Cyrillic, CJK...) are stored
+casefolded instead.
+
+The index is rebuilt by ``gwc`` and kept up to date by
+``PersonRepository.add_person`` / ``edit_person``. On a base built before it
+existed, searches scan ``Person`` until ``gwsetup database migrate`` builds
+the index.
+"""
+
+import functools
+from typing import (
+    Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, cast)
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+import database.name_index as db_name_index
+import database.person as db_person
+from database.name_index import NameKind
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.name import NameUtils
+from repositories.batching import ID_BATCH_SIZE, chunked
+from repositories.built_tables import mark_built, was_built
+
+# Kinds of names a search by surname or by first name looks at (full-name
+# aliases are indexed word by word, so they match either)
+SURNAME_KINDS = (NameKind.SURNAME, NameKind.SURNAME_ALIAS, NameKind.ALIAS)
+FIRST_NAME_KINDS = (
+    NameKind.FIRST_NAME,
+    NameKind.FIRST_NAME_ALIAS,
+    NameKind.PUBLIC_NAME,
+    NameKind.ALIAS,
+)
+
+# Sorts after every character a key can hold
+_PREFIX_END = "\U0010ffff"
+
+# Person columns the index is built from
+_NAME_COLUMNS = (
+    db_person.Person.id,
+    db_person.Person.surname,
+    db_person.Person.first_name,
+    db_person.Person.public_name,
+    db_person.Person.aliases,
+    db_person.Person.first_names_aliases,
+    db_person.Person.surname_aliases,
+)
+
+
+def name_key(text: str) -> str:
+    """Normalized form of ``text`` the index is keyed by: ``NameUtils.lower``,
+    or ``text`` casefolded when ``NameUtils.lower`` keeps nothing of it (a
+    name in a non-Latin script)."""
+    return NameUtils.lower(text) or " ".join(text.casefold().split())
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def name_keys(name: str) -> Tuple[Tuple[str, str], ...]:
+    """(key, crushed key) pairs of ``name``, one per word it starts with:
+    ``"de la Tour"`` gives ``de la tour``, ``la tour`` and ``tour``.
+
+    Cached, since the same surnames and first names come back all over a
+    base.
+    """
+    words = name_key(name).split()
+    keys = dict.fromkeys(
+        " ".join(words[start:]) for start in range(len(words)))
+    return tuple((key, NameUtils.abbreviate_lower(key)) for key in keys)
+
+
+def _split(names: str) -> List[str]:
+    """Names of a comma-separated ``Person`` column (see
+    ``converter_to_db``)."""
+    return [n.strip() for n in (names or "").split(",") if n.strip()]
+
+
+def name_index_rows(
+    person_id: int,
+    surname: str,
+    first_name: str,
+    public_name: str = "",
+    aliases: str = "",
+    first_names_aliases: str = "",
+    surname_aliases: str = "",
+) -> List[Dict[str, object]]:
+    """``NameIndex`` rows of a person, from its ``Person`` columns."""
+    names = [
+        (NameKind.SURNAME, [surname]),
+        (NameKind.FIRST_NAME, [first_name]),
+        (NameKind.PUBLIC_NAME, [public_name]),
+        (NameKind.ALIAS, _split(aliases)),
+        (NameKind.FIRST_NAME_ALIAS, _split(first_names_aliases)),
+        (NameKind.SURNAME_ALIAS, _split(surname_aliases)),
+    ]
+    rows: Dict[Tuple[NameKind, str], Dict[str, object]] = {}
+    for kind, values in names:
+        for value in values:
+            if not value or value == "?":
+                continue
+            for key, crushed in name_keys(value):
+                rows.setdefault((kind, key), {
+                    "person_id": person_id,
+                    "kind": kind,
+                    "key": key,
+                    "crushed": crushed,
+                })
+    return list(rows.values())
+
+
+def reindex_persons(
+    session: Session, persons: Iterable[db_person.Person]
+) -> None:
+    """Replace the index rows of ``persons`` (flushed ``Person`` rows) in
+    the transaction of ``session``."""
+    persons = list(persons)
+    for chunk in chunked([p.id for p in persons]):
+        session.execute(delete(db_name_index.NameIndex).where(
+            db_name_index.NameIndex.person_id.in_(chunk)))
+    rows = [
+        row for p in persons
+        for row in name_index_rows(
+            p.id, p.surname, p.first_name, p.public_name, p.aliases,
+            p.first_names_aliases, p.surname_aliases)
+    ]
+    if rows:
+        session.execute(insert(db_name_index.NameIndex), rows)
+
+
+class NameIndexRepository:
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+
+    def _session(self) -> Session:
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        return session
+
+    def rebuild(self) -> int:
+        """Index every person of the base from scratch, in one transaction.
+        Returns the number of index rows written.
+
+        As in ``BulkWriter``, the indexes of the table are dropped while it
+        is filled and built once at the end.
+        """
+        table = db_name_index.NameIndex.__table__
+        session = self._session()
+        try:
+            connection = session.connection()
+            connection.execute(table.delete())
+            for index in table.indexes:
+                index.drop(connection, checkfirst=True)
+            written = 0
+            for rows in self._iter_rows(session):
+                connection.execute(table.insert(), rows)
+                written += len(rows)
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+            mark_built(connection, table)
+            session.commit()
+            return written
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @staticmethod
+    def _iter_rows(session: Session) -> Iterator[List[Dict[str, object]]]:
+        """Index rows of all the persons, a batch of persons at a time."""
+        statement = select(*_NAME_COLUMNS).order_by(
+            db_person.Person.id).limit(ID_BATCH_SIZE * 10)
+        persons = session.execute(statement).all()
+        while persons:
+            yield [row for person in persons
+                   for row in name_index_rows(*person)]
+            persons = session.execute(statement.where(
+                db_person.Person.id > persons[-1][0])).all()
+
+    def is_built(self) -> bool:
+        """False when the base has persons but the index was never built
+        (the base predates it)."""
+        session = self._session()
+        try:
+            if was_built(session, db_name_index.NameIndex.__table__):
+                return True
+            return session.execute(
+                select(db_person.Person.id).limit(1)).first() is None
+        finally:
+            session.close()
+
+    def search(
+        self,
+        text: str,
+        kinds: Sequence[NameKind] = tuple(NameKind),
+        prefix: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """IDs of the persons having a name of one of ``kinds`` matching
+        ``text``, in the order of the matched keys.
+
+        ``text`` is compared once normalized, so accents, case and
+        punctuation do not matter, and it may match any word of a name
+        onwards. With ``prefix``, the names starting with ``text`` match
+        too (typeahead). When nothing matches, the abbreviated forms are
+        compared instead (``Saint Martin`` finds ``St Martin``).
+        """
+        key = name_key(text)
+        if not key:
+            return []
+        if not self.is_built():
+            return self._scan(key, kinds, prefix, limit)
+
+        index = db_name_index.NameIndex
+        session = self._session()
+        try:
+            # Core execution: the rows are fetched from the cursor as they
+            # are read, so a prefix search stops after ``limit`` persons
+            connection = session.connection()
+            statement = select(index.person_id).where(index.kind.in_(kinds))
+            if prefix:
+                matching = statement.where(
+                    index.key >= key, index.key < key + _PREFIX_END)
+            else:
+                matching = statement.where(index.key == key)
+            found = self._first_persons(
+                connection.execute(matching.order_by(index.key)), limit)
+            if found:
+                return found
+            # Only whole abbreviated forms: their prefixes are too loose
+            crushed = NameUtils.abbreviate_lower(key)
+            if crushed:
+                return self._first_persons(connection.execute(
+                    statement.where(index.crushed == crushed)), limit)
+            return []
+        finally:
+            session.close()
+
+    def _scan(
+        self,
+        key: str,
+        kinds: Sequence[NameKind],
+        prefix: bool,
+        limit: Optional[int],
+    ) -> List[int]:
+        """``search`` on a base whose index was never built: the index rows
+        of every person are computed and matched as they are read, and
+        nothing is written to the base."""
+        wanted = set(kinds)
+        crushed = NameUtils.abbreviate_lower(key)
+        matches: List[Tuple[str, str, int]] = []
+        abbreviated: List[int] = []
+        session = self._session()
+        try:
+            for rows in self._iter_rows(session):
+                for row in rows:
+                    kind = cast(NameKind, row["kind"])
+                    if kind not in wanted:
+                        continue
+                    name_key = cast(str, row["key"])
+                    person_id = cast(int, row["person_id"])
+                    if name_key == key or (
+                            prefix and name_key.startswith(key)):
+                        matches.append((name_key, kind.name, person_id))
+                    elif crushed and row["crushed"] == crushed:
+                        abbreviated.append(person_id)
+        finally:
+            session.close()
+        # The order of ``ix_NameIndex_key``
+        matches.sort()
+        return self._first_persons(
+            [(person_id,) for *_, person_id in matches] if matches
+            else [(person_id,) for person_id in abbreviated], limit)
+
+    @staticmethod
+    def _first_persons(rows: Iterable, limit: Optional[int]) -> List[int]:
+        """Distinct person IDs of ``rows`` in order, reading no more rows
+        than needed to find ``limit`` of them."""
+        found: Dict[int, None] = {}
+        for (person_id,) in rows:
+            found[person_id] = None
+            if limit is not None and len(found) >= limit:
+                break
+        return list(found)
@@ -1,4 +1,6 @@
-from typing import List
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from database.sqlite_database_service import SQLiteDatabaseService
 
 import libraries.person as app_person
@@ -13,7 +15,18 @@ import database.person_non_native_relations as db_person_non_native_relations
 import database.ascends as db_ascends
 import database.unions as db_unions
 import database.union_families as db_union_families
+import database.date as db_date
+import database.descend_children as db_descend_children
+import database.family as db_family
+import database.couple as db_couple
+from repositories.batching import (
+    ID_BATCH_SIZE, attach_unpacked_dates, batched, chunked, unique_ids)
+from repositories.consanguinity_repository import invalidate_consanguinity
 from repositories.converter_from_db import convert_person_from_db
+from repositories.cache_files_repository import cache_values
+from repositories.name_count_repository import count_names
+from repositories.name_index_repository import reindex_persons
+from repositories.place_repository import index_person_places
 from repositories.converter_to_db import (
     convert_person_to_db,
     convert_date_to_db,
@@ -22,6 +35,47 @@ from repositories.converter_to_db import (
 )
 
 
+class PersonSummary(NamedTuple):
+    """The few fields listing pages show about a person."""
+    id: int
+    first_name: str
+    surname: str
+    occ: int
+    sex: app_person.Sex
+    birth_year: Optional[int]
+    death_year: Optional[int]
+    public_name: str = ""
+    # First of the person's qualifiers
+    qualifier: str = ""
+
+    @property
+    def dates(self) -> str:
+        """Birth and death years as "1850-1912", "1850-" or "-1912" (a
+        year 0 is an unknown one)."""
+        if not self.birth_year and not self.death_year:
+            return ""
+        return f"{self.birth_year or ''}-{self.death_year or ''}"
+
+
+def _year_of(ymd: Optional[int]) -> Optional[int]:
+    """Year of a ``Date.ymd``, None when it is unknown."""
+    return None if ymd is None else ymd // 10000 or None
+
+
+def _packed_year(compressed: Optional[int]) -> Optional[int]:
+    """Year of a packed date (``Date.compressed``), None when it is
+    unknown."""
+    return None if compressed is None else compressed % 2500 or None
+
+
+def _first_item(text: Optional[str]) -> str:
+    """First item of a comma-separated list column."""
+    for item in (text or "").split(","):
+        if item.strip():
+            return item.strip()
+    return ""
+
+
 class PersonRepository:
     def __init__(self, db_service: SQLiteDatabaseService):
         self.db_service = db_service
@@ -29,82 +83,202 @@ class PersonRepository:
     def get_person_by_id(
             self, person_id: int) -> app_person.Person[int, int, str, int]:
         """Get a person by ID from the database."""
+        persons = self.get_persons_by_ids([person_id])
+        if person_id not in persons:
+            raise ValueError(f"Person with id {person_id} not found")
+        return persons[person_id]
+
+    def find_by_key(
+            self, first_name: str, surname: str, occ: int = 0
+    ) -> Optional[int]:
+        """ID of the person with the key ``(first_name, surname, occ)``
+        (see ``GwConverter.key_tuple``), or None.
+
+        This is a single lookup of ``ix_Person_surname_first_name_occ``.
+        The forms can still add a homonym with a key already in use, so
+        the first person added with the key wins.
+        """
         session = self.db_service.get_session()
         if session is None:
             raise RuntimeError("Database session is not available")
 
         try:
-            person = self.db_service.get(
-                session, db_person.Person, {"id": person_id}
-            )
-            print("PERSON")
-            print(person)
-            if person is None:
-                raise ValueError(f"Person with id {person_id} not found")
-
-            person_title_links = self.db_service.get_all(
-                session=session,
-                model=db_person_titles.PersonTitles,
-                query={"person_id": person_id}
-            )
-            titles = []
-            for link in person_title_links:
-                title = self.db_service.get(
-                    session, db_titles.Titles, {"id": link.title_id}
+            return session.execute(
+                select(db_person.Person.id).where(
+                    db_person.Person.surname == surname.strip(),
+                    db_person.Person.first_name == first_name.strip(),
+                    db_person.Person.occ == occ,
+                ).order_by(db_person.Person.id).limit(1)
+            ).scalar_one_or_none()
+        finally:
+            session.close()
+
+    def get_persons_by_ids(
+        self, person_ids: Iterable[int]
+    ) -> Dict[int, app_person.Person[int, int, str, int]]:
+        """Get many persons at once, keyed by ID.
+
+        Every child table is read with one IN (...) query per batch of
+        IDs instead of one query per person and per row, so the number of
+        round-trips does not depend on how many persons are requested.
+        IDs that do not exist are simply missing from the result.
+        """
+        ids = unique_ids(person_ids)
+        if not ids:
+            return {}
+
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+
+        try:
+            result: Dict[int, app_person.Person[int, int, str, int]] = {}
+            for chunk in chunked(ids):
+                persons = (
+                    session.query(db_person.Person)
+                    .options(*_person_load_options())
+                    .filter(db_person.Person.id.in_(chunk))
+                    .all()
                 )
-                if title:
-                    titles.append(title)
+                result.update(_convert_persons(session, persons))
+            return result
+        finally:
+            session.close()
 
-            non_native_links = self.db_service.get_all(
-                session=session,
-                model=(db_person_non_native_relations.
-                       PersonNonNativeRelations),
-                query={"person_id": person.id}
-            )
-            non_native_relations = []
-            for link in non_native_links:
-                relation = self.db_service.get(
-                    session, db_relation.Relation, {"id": link.relation_id}
+    def get_person_summaries(
+        self, person_ids: Iterable[int]
+    ) -> Dict[int, PersonSummary]:
+        """Get the names and birth/death years of many persons, keyed by ID.
+
+        Only these columns are selected, with one query per batch of IDs,
+        and nothing is converted to ``libraries.person.Person``: this is
+        what listing pages (search results, titles, tables) should use.
+        IDs that do not exist are missing from the result.
+
+        The years come from the packed dates of the ``Person`` rows. Only
+        the dates that are not packed (see ``database.date.packed_date``)
+        are read from their ``Date`` row, with one more query.
+        """
+        ids = unique_ids(person_ids)
+        if not ids:
+            return {}
+
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+
+        person = db_person.Person
+        try:
+            result: Dict[int, PersonSummary] = {}
+            # (person ID, birth or death) of the years to read from a Date
+            unpacked: Dict[int, List[Tuple[int, bool]]] = {}
+            for chunk in chunked(ids):
+                rows = session.execute(
+                    select(
+                        person.id, person.first_name, person.surname,
+                        person.occ, person.sex,
+                        person.birth_date, person.birth_date_compressed,
+                        person.death_date, person.death_date_compressed,
+                        person.public_name, person.qualifiers,
+                    ).where(person.id.in_(chunk))
                 )
-                if relation:
-                    non_native_relations.append(relation)
+                for (person_id, first_name, surname, occ, sex,
+                     birth_date, birth_packed, death_date, death_packed,
+                     public_name, qualifiers) in rows:
+                    result[person_id] = PersonSummary(
+                        person_id, first_name, surname, occ, sex,
+                        _packed_year(birth_packed), _packed_year(death_packed),
+                        public_name or "", _first_item(qualifiers))
+                    for is_birth, date_id, packed in (
+                            (True, birth_date, birth_packed),
+                            (False, death_date, death_packed)):
+                        if packed is None and date_id is not None:
+                            unpacked.setdefault(date_id, []).append(
+                                (person_id, is_birth))
+            for chunk in chunked(list(unpacked)):
+                for date_id, ymd in session.execute(
+                        select(db_date.Date.id, db_date.Date.ymd)
+                        .where(db_date.Date.id.in_(chunk))):
+                    for person_id, is_birth in unpacked[date_id]:
+                        summary = result[person_id]
+                        result[person_id] = summary._replace(
+                            birth_year=_year_of(ymd)) if is_birth \
+                            else summary._replace(death_year=_year_of(ymd))
+            return result
+        finally:
+            session.close()
 
-            related_persons = self.db_service.get_all(
-                session=session,
-                model=db_person_relations.PersonRelations,
-                query={"person_id": person_id}
-            )
+    def get_children_ids(
+        self, person_ids: Iterable[int]
+    ) -> Dict[int, List[int]]:
+        """Get the children IDs of many persons, keyed by parent ID.
 
-            events = self.db_service.get_all(
-                session=session,
-                model=db_personal_event.PersonalEvent,
-                query={"person_id": person_id}
-            )
-            events_with_witnesses = []
-            for event in events:
-                witnesses = self.db_service.get_all(
-                    session=session,
-                    model=db_person_event_witness.PersonEventWitness,
-                    query={"event_id": event.id}
+        The children of all the families of a parent are listed together,
+        family after family and in birth order within a family, with one
+        query per batch of parents. Persons without children are missing
+        from the result.
+        """
+        ids = unique_ids(person_ids)
+        if not ids:
+            return {}
+
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+
+        person = db_person.Person
+        unions = db_union_families.UnionFamilies
+        family = db_family.Family
+        children = db_descend_children.DescendChildren
+        try:
+            result: Dict[int, List[int]] = {}
+            for chunk in chunked(ids):
+                rows = session.execute(
+                    select(person.id, children.person_id)
+                    .join(unions, unions.union_id == person.families_id)
+                    .join(family, family.id == unions.family_id)
+                    .join(children, children.descend_id == family.children_id)
+                    .where(person.id.in_(chunk))
+                    .order_by(person.id, unions.id, children.id)
                 )
-                events_with_witnesses.append((event, witnesses))
+                for parent_id, child_id in rows:
+                    result.setdefault(parent_id, []).append(child_id)
+            return result
+        finally:
+            session.close()
+
+    def get_parent_ids(
+        self, person_ids: Iterable[int]
+    ) -> Dict[int, Tuple[int, int]]:
+        """Get the (father ID, mother ID) of many persons, keyed by person
+        ID, with one query per batch of persons. Persons without parents
+        are missing from the result.
+        """
+        ids = unique_ids(person_ids)
+        if not ids:
+            return {}
 
-            family_ids = []
-            if person.families_id:
-                union_families = self.db_service.get_all(
-                    session, db_union_families.UnionFamilies,
-                    query={"union_id": person.families_id}
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+
+        person = db_person.Person
+        ascends = db_ascends.Ascends
+        family = db_family.Family
+        couple = db_couple.Couple
+        try:
+            result: Dict[int, Tuple[int, int]] = {}
+            for chunk in chunked(ids):
+                rows = session.execute(
+                    select(person.id, couple.father_id, couple.mother_id)
+                    .join(ascends, ascends.id == person.ascend_id)
+                    .join(family, family.id == ascends.parents)
+                    .join(couple, couple.id == family.parents_id)
+                    .where(person.id.in_(chunk))
                 )
-                family_ids = [uf.family_id for uf in union_families]
-
-            return convert_person_from_db(
-                person,
-                titles,
-                non_native_relations,
-                related_persons,
-                events_with_witnesses,
-                family_ids
-            )
+                for person_id, father_id, mother_id in rows:
+                    result[person_id] = (father_id, mother_id)
+            return result
         finally:
             session.close()
 
@@ -188,6 +362,11 @@ class PersonRepository:
             existing_person.burial_note = person.burial_note
             existing_person.burial_src = person.burial_src
 
+            cache_values(session, [existing_person])
+            index_person_places(
+                session, existing_person, self.db_service.get_all(
+                    session, db_personal_event.PersonalEvent,
+                    query={"person_id": existing_person.id}))
             session.commit()
             return True
         except Exception as e:
@@ -203,75 +382,12 @@ class PersonRepository:
             raise RuntimeError("Database session is not available")
 
         try:
-            persons = self.db_service.get_all(session, db_person.Person)
-            result = []
-
-            for person in persons:
-                person_title_links = self.db_service.get_all(
-                    session=session,
-                    model=db_person_titles.PersonTitles,
-                    query={"person_id": person.id}
-                )
-                titles = []
-                for link in person_title_links:
-                    title = self.db_service.get(
-                        session, db_titles.Titles, {"id": link.title_id}
-                    )
-                    if title:
-                        titles.append(title)
-
-                non_native_links = self.db_service.get_all(
-                    session=session,
-                    model=(db_person_non_native_relations.
-                           PersonNonNativeRelations),
-                    query={"person_id": person.id}
-                )
-                non_native_relations = []
-                for link in non_native_links:
-                    relation = self.db_service.get(
-                        session, db_relation.Relation, {"id": link.relation_id}
-                    )
-                    if relation:
-                        non_native_relations.append(relation)
-
-                related_persons = self.db_service.get_all(
-                    session=session,
-                    model=db_person_relations.PersonRelations,
-                    query={"person_id": person.id}
-                )
-
-                events = self.db_service.get_all(
-                    session=session,
-                    model=db_personal_event.PersonalEvent,
-                    query={"person_id": person.id}
-                )
-                events_with_witnesses = []
-                for event in events:
-                    witnesses = self.db_service.get_all(
-                        session=session,
-                        model=db_person_event_witness.PersonEventWitness,
-                        query={"event_id": event.id}
-                    )
-                    events_with_witnesses.append((event, witnesses))
-
-                family_ids = []
-                if person.families_id:
-                    union_families = self.db_service.get_all(
-                        session, db_union_families.UnionFamilies,
-                        query={"union_id": person.families_id}
-                    )
-                    family_ids = [uf.family_id for uf in union_families]
-
-                app_person_instance = convert_person_from_db(
-                    person,
-                    titles,
-                    non_native_relations,
-                    related_persons,
-                    events_with_witnesses,
-                    family_ids
-                )
-                result.append(app_person_instance)
-
+            result: List[app_person.Person[int, int, str, int]] = []
+            rows = self.db_service.iter_all(
+                session, db_person.Person, batch_size=ID_BATCH_SIZE)
+            for batch in batched(rows):
+                converted = _convert_persons(session, batch)
+                result.extend(converted[person.id] for person in batch)
             return result
         finally:
             session.close()
@@ -315,6 +431,11 @@ class PersonRepository:
 
             self.db_service.add(session, db_person_instance)
             session.flush()
+            if ascend_id is not None:
+                invalidate_consanguinity(session, [db_person_instance.id])
+            reindex_persons(session, [db_person_instance])
+            count_names(session, added=[
+                (db_person_instance.surname, db_person_instance.first_name)])
 
             for title in titles:
                 self.db_service.add(session, title)
@@ -351,6 +472,12 @@ class PersonRepository:
                     event_witness.event_id = event.id
                     self.db_service.add(session, event_witness)
 
+            cache_values(session, [
+                db_person_instance, *titles,
+                *(event for event, _ in events_with_witnesses)])
+            index_person_places(
+                session, db_person_instance,
+                [event for event, _ in events_with_witnesses])
             session.commit()
             return True
         except Exception as e:
@@ -374,12 +501,17 @@ class PersonRepository:
                 raise ValueError(f"Person with id {person.index} not found")
 
             ascend_id = existing_person.ascend_id
+            # The consanguinity of the person and of their descendants
+            # goes once their parents change
+            parents_changed = False
             if person.ascend.parents is not None:
                 if ascend_id:
                     ascend = self.db_service.get(
                         session, db_ascends.Ascends, {"id": ascend_id}
                     )
                     if ascend:
+                        parents_changed = (
+                            ascend.parents != person.ascend.parents)
                         ascend.parents = person.ascend.parents
                         consang = int(person.ascend.consanguinity_rate)
                         ascend.consang = consang
@@ -391,6 +523,7 @@ class PersonRepository:
                     self.db_service.add(session, ascend)
                     session.flush()
                     ascend_id = ascend.id
+                    parents_changed = True
 
             families_id = existing_person.families_id
             if person.families:
@@ -418,6 +551,12 @@ class PersonRepository:
                 person, ascend_id, families_id
             )
 
+            count_names(
+                session,
+                removed=[(existing_person.surname,
+                          existing_person.first_name)],
+                added=[(db_person_instance.surname,
+                        db_person_instance.first_name)])
             existing_person.first_name = db_person_instance.first_name
             existing_person.surname = db_person_instance.surname
             existing_person.occ = db_person_instance.occ
@@ -542,6 +681,16 @@ class PersonRepository:
                     event_witness.event_id = event.id
                     self.db_service.add(session, event_witness)
 
+            session.flush()
+            if parents_changed:
+                invalidate_consanguinity(session, [existing_person.id])
+            reindex_persons(session, [existing_person])
+            cache_values(session, [
+                existing_person, *titles,
+                *(event for event, _ in events_with_witnesses)])
+            index_person_places(
+                session, existing_person,
+                [event for event, _ in events_with_witnesses])
             session.commit()
             return True
         except Exception as e:
@@ -549,3 +698,130 @@ class PersonRepository:
             raise e
         finally:
             session.close()
+
+
+def _date_load_options(relationship):
+    # Precision rows are only read (lazily) for the dates without
+    # ``Date.compressed``
+    return selectinload(relationship)
+
+
+def _person_load_options():
+    # The dates are read from their packed columns, or attached by
+    # ``_convert_persons``
+    return (selectinload(db_person.Person.ascend),)
+
+
+# Dates of a person, each packed in its ``<date>_compressed`` column
+_PERSON_DATES = ("birth_date", "baptism_date", "death_date", "burial_date")
+
+
+def _convert_persons(
+    session: Session, persons: Sequence[db_person.Person]
+) -> Dict[int, app_person.Person[int, int, str, int]]:
+    """Load the child rows of ``persons`` with one query per table and
+    convert them to application persons."""
+    person_ids = [p.id for p in persons]
+    titles: Dict[int, List[db_titles.Titles]] = {i: [] for i in person_ids}
+    non_native_relations: Dict[int, List[db_relation.Relation]] = {
+        i: [] for i in person_ids
+    }
+    related_persons: Dict[
+        int, List[db_person_relations.PersonRelations]
+    ] = {i: [] for i in person_ids}
+    events: Dict[int, List[Tuple[
+        db_personal_event.PersonalEvent,
+        List[db_person_event_witness.PersonEventWitness]
+    ]]] = {i: [] for i in person_ids}
+    families: Dict[int, List[int]] = {}
+
+    attach_unpacked_dates(session, persons, _PERSON_DATES)
+    person_titles = db_person_titles.PersonTitles
+    for chunk in chunked(person_ids):
+        title_rows = (
+            session.query(person_titles.person_id, db_titles.Titles)
+            .join(db_titles.Titles,
+                  db_titles.Titles.id == person_titles.title_id)
+            .options(
+                _date_load_options(db_titles.Titles.date_start_obj),
+                _date_load_options(db_titles.Titles.date_end_obj),
+            )
+            .filter(person_titles.person_id.in_(chunk))
+            .order_by(person_titles.id)
+            .all()
+        )
+        for person_id, title in title_rows:
+            titles[person_id].append(title)
+
+        nnr = db_person_non_native_relations.PersonNonNativeRelations
+        relation_rows = (
+            session.query(nnr.person_id, db_relation.Relation)
+            .join(db_relation.Relation,
+                  db_relation.Relation.id == nnr.relation_id)
+            .filter(nnr.person_id.in_(chunk))
+            .order_by(nnr.id)
+            .all()
+        )
+        for person_id, relation in relation_rows:
+            non_native_relations[person_id].append(relation)
+
+        related_rows = (
+            session.query(db_person_relations.PersonRelations)
+            .filter(db_person_relations.PersonRelations.person_id.in_(chunk))
+            .order_by(db_person_relations.PersonRelations.id)
+            .all()
+        )
+        for related in related_rows:
+            related_persons[related.person_id].append(related)
+
+        event_rows = (
+            session.query(db_personal_event.PersonalEvent)
+            .options(_date_load_options(
+                db_personal_event.PersonalEvent.date_obj))
+            .filter(db_personal_event.PersonalEvent.person_id.in_(chunk))
+            .order_by(db_personal_event.PersonalEvent.id)
+            .all()
+        )
+        witness_rows = (
+            session.query(db_person_event_witness.PersonEventWitness)
+            .join(db_personal_event.PersonalEvent,
+                  db_personal_event.PersonalEvent.id
+                  == db_person_event_witness.PersonEventWitness.event_id)
+            .filter(db_personal_event.PersonalEvent.person_id.in_(chunk))
+            .order_by(db_person_event_witness.PersonEventWitness.id)
+            .all()
+        )
+        witnesses_by_event: Dict[
+            int, List[db_person_event_witness.PersonEventWitness]
+        ] = {}
+        for witness in witness_rows:
+            witnesses_by_event.setdefault(witness.event_id, []).append(
+                witness)
+        for event in event_rows:
+            events[event.person_id].append(
+                (event, witnesses_by_event.get(event.id, [])))
+
+    union_ids = unique_ids(p.families_id for p in persons)
+    for chunk in chunked(union_ids):
+        union_rows = (
+            session.query(db_union_families.UnionFamilies)
+            .filter(db_union_families.UnionFamilies.union_id.in_(chunk))
+            .order_by(db_union_families.UnionFamilies.id)
+            .all()
+        )
+        for union_family in union_rows:
+            families.setdefault(union_family.union_id, []).append(
+                union_family.family_id)
+
+    return {
+        person.id: convert_person_from_db(
+            person,
+            titles[person.id],
+            non_native_relations[person.id],
+            related_persons[person.id],
+            events[person.id],
+            families.get(person.families_id, []) if person.families_id
+            else []
+        )
+        for person in persons
+    }
@@ -0,0 +1,326 @@
+"""
+Places of a base (``database.place``) and the events that took place there
+(``database.place_event``).
+
+Persons, families and events keep their places as the text they were
+entered with. Each distinct text is split here into a ``Place`` row
+("town, ..., county, region, country", from the most to the least precise
+part), and each event with a place gets a ``PlaceEvent`` row. The place
+pages read these two indexed tables instead of scanning every place column
+of ``Person``, ``PersonalEvent``, ``Family`` and ``FamilyEvent``.
+
+The tables are rebuilt by ``gwc`` and kept up to date by
+``PersonRepository`` / ``FamilyRepository``. A base whose places were never
+split is split by ``gwsetup database migrate``; until then, the place pages
+list no place.
+"""
+
+from typing import (
+    Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple)
+
+from sqlalchemy import delete, distinct, exists, func, or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+import database.couple as db_couple
+import database.family as db_family
+import database.family_event as db_family_event
+import database.person as db_person
+import database.personal_event as db_personal_event
+import database.place as db_place
+import database.place_event as db_place_event
+import libraries.person as app_person
+from database.place_event import PlaceEventKind
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.batching import ID_BATCH_SIZE
+from repositories.built_tables import mark_built, was_built
+from repositories.name_count_repository import NameFrequency, name_sort_key
+
+# Columns of a place, as in ``libraries.person.Place``
+PLACE_FIELDS = ("town", "township", "canton", "district", "county",
+                "region", "country", "other")
+
+# Place columns of ``Person``
+PERSON_PLACES = (
+    (PlaceEventKind.BIRTH, "birth_place"),
+    (PlaceEventKind.BAPTISM, "baptism_place"),
+    (PlaceEventKind.DEATH, "death_place"),
+    (PlaceEventKind.BURIAL, "burial_place"),
+)
+
+PlaceKey = Tuple[str, ...]
+# (kind, place text, person ID, family ID) of an event
+_EventPlace = Tuple[PlaceEventKind, Optional[str], int, Optional[int]]
+
+
+class PlaceSurnames(NamedTuple):
+    place: str
+    surnames: List[NameFrequency]
+
+
+def split_place(text: Optional[str]) -> Optional[app_person.Place]:
+    """``text`` split on its commas, or None when it is empty.
+
+    The first part is the town, the last ones the country, the region and
+    the county, and the parts in between (if any) go to ``other``.
+    """
+    parts = [part.strip() for part in (text or "").split(",")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return None
+    town, *rest = parts
+    country = rest.pop() if rest else ""
+    region = rest.pop() if rest else ""
+    county = rest.pop() if rest else ""
+    return app_person.Place(
+        town=town, township="", canton="", district="", county=county,
+        region=region, country=country, other=", ".join(rest))
+
+
+def place_name(place: app_person.Place) -> str:
+    """Text of ``place``, the inverse of ``split_place``."""
+    return ", ".join(part for part in (
+        place.town, place.other, place.county, place.region, place.country)
+        if part)
+
+
+def _key(place: app_person.Place) -> PlaceKey:
+    return tuple(getattr(place, field) for field in PLACE_FIELDS)
+
+
+def _sort_key(key: PlaceKey) -> Tuple[str, ...]:
+    """Places by country, then region, county and town."""
+    place = dict(zip(PLACE_FIELDS, key))
+    return tuple(name_sort_key(place[field]) for field in (
+        "country", "region", "county", "town", "other"))
+
+
+def _place_events(
+    session: Session, events: Iterable[_EventPlace]
+) -> None:
+    """Add the ``PlaceEvent`` rows of ``events``, adding their places to
+    ``Place`` if needed."""
+    split = []
+    for kind, text, person_id, family_id in events:
+        place = split_place(text)
+        if place is not None:
+            split.append((kind, _key(place), person_id, family_id))
+    if not split:
+        return
+
+    places = db_place.Place
+    keys = {key for _, key, _, _ in split}
+    session.execute(insert(places).values([
+        dict(zip(PLACE_FIELDS, key)) for key in keys
+    ]).on_conflict_do_nothing())
+    place_ids = {
+        key: session.execute(select(places.id).where(*(
+            getattr(places, field) == value
+            for field, value in zip(PLACE_FIELDS, key)))).scalar_one()
+        for key in keys
+    }
+    session.execute(insert(db_place_event.PlaceEvent).values([
+        {"kind": kind, "place_id": place_ids[key], "person_id": person_id,
+         "family_id": family_id}
+        for kind, key, person_id, family_id in split
+    ]))
+
+
+def index_person_places(
+    session: Session,
+    person: db_person.Person,
+    events: Iterable[db_personal_event.PersonalEvent] = (),
+) -> None:
+    """Record the places of ``person`` and of its personal ``events`` in
+    the transaction of ``session``, replacing those recorded before."""
+    place_events = db_place_event.PlaceEvent
+    session.execute(delete(place_events).where(
+        place_events.person_id == person.id,
+        place_events.family_id.is_(None)))
+    _place_events(session, [
+        *((kind, getattr(person, column), person.id, None)
+          for kind, column in PERSON_PLACES),
+        *((PlaceEventKind.PERSONAL_EVENT, event.place, person.id, None)
+          for event in events),
+    ])
+
+
+def index_family_places(
+    session: Session,
+    family: db_family.Family,
+    spouses: Sequence[Optional[int]],
+    events: Iterable[db_family_event.FamilyEvent] = (),
+) -> None:
+    """Record the places of ``family`` and of its ``events`` for each of
+    its ``spouses``, replacing those recorded before."""
+    place_events = db_place_event.PlaceEvent
+    session.execute(delete(place_events).where(
+        place_events.family_id == family.id))
+    texts = [(PlaceEventKind.MARRIAGE, family.marriage_place)]
+    texts.extend((PlaceEventKind.FAMILY_EVENT, event.place)
+                 for event in events)
+    _place_events(session, [
+        (kind, text, spouse, family.id)
+        for kind, text in texts for spouse in spouses if spouse is not None
+    ])
+
+
+class PlaceRepository:
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+
+    def _session(self) -> Session:
+        session = self.db_service.get_session()
+        if session is None:
+            raise RuntimeError("Database session is not available")
+        return session
+
+    def rebuild(self) -> int:
+        """Split the places of the whole base from scratch, in one
+        transaction. Returns the number of distinct places."""
+        places = db_place.Place
+        place_events = db_place_event.PlaceEvent
+        session = self._session()
+        try:
+            events = []
+            for kind, text, person_id, family_id in self._iter_places(
+                    session):
+                place = split_place(text)
+                if place is not None:
+                    events.append((kind, _key(place), person_id, family_id))
+            place_ids = {
+                key: place_id for place_id, key in enumerate(
+                    sorted({key for _, key, _, _ in events}, key=_sort_key),
+                    start=1)
+            }
+
+            connection = session.connection()
+            connection.execute(delete(place_events))
+            connection.execute(delete(places))
+            if place_ids:
+                connection.execute(places.__table__.insert(), [
+                    {"id": place_id, **dict(zip(PLACE_FIELDS, key))}
+                    for key, place_id in place_ids.items()
+                ])
+                connection.execute(place_events.__table__.insert(), [
+                    {"kind": kind, "place_id": place_ids[key],
+                     "person_id": person_id, "family_id": family_id}
+                    for kind, key, person_id, family_id in events
+                ])
+            mark_built(connection, places.__table__)
+            session.commit()
+            return len(place_ids)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @staticmethod
+    def _iter_places(session: Session) -> Iterable[_EventPlace]:
+        """Every event place of the base, persons first."""
+        person = db_person.Person
+        columns = [getattr(person, column) for _, column in PERSON_PLACES]
+        statement = select(person.id, *columns).order_by(person.id).limit(
+            ID_BATCH_SIZE * 10)
+        rows = session.execute(statement).all()
+        while rows:
+            for person_id, *texts in rows:
+                for (kind, _), text in zip(PERSON_PLACES, texts):
+                    yield kind, text, person_id, None
+            rows = session.execute(
+                statement.where(person.id > rows[-1][0])).all()
+
+        event = db_personal_event.PersonalEvent
+        for person_id, text in session.execute(
+                select(event.person_id, event.place)
+                .where(event.person_id.is_not(None), event.place != "")
+                .order_by(event.id)):
+            yield PlaceEventKind.PERSONAL_EVENT, text, person_id, None
+
+        family = db_family.Family
+        couple = db_couple.Couple
+        family_event = db_family_event.FamilyEvent
+        for kind, statement in (
+            (PlaceEventKind.MARRIAGE,
+             select(family.id, family.marriage_place, couple.father_id,
+                    couple.mother_id)
+             .join(couple, couple.id == family.parents_id)
+             .where(family.marriage_place != "")
+             .order_by(family.id)),
+            (PlaceEventKind.FAMILY_EVENT,
+             select(family.id, family_event.place, couple.father_id,
+                    couple.mother_id)
+             .join(family, family.id == family_event.family_id)
+             .join(couple, couple.id == family.parents_id)
+             .where(family_event.place != "")
+             .order_by(family_event.id)),
+        ):
+            for family_id, text, *spouses in session.execute(statement):
+                for spouse in spouses:
+                    if spouse is not None:
+                        yield kind, text, spouse, family_id
+
+    def is_built(self) -> bool:
+        """True when the places were split, or when the base has none."""
+        person = db_person.Person
+        session = self._session()
+        try:
+            if was_built(session, db_place.Place.__table__):
+                return True
+            event = db_personal_event.PersonalEvent
+            family = db_family.Family
+            family_event = db_family_event.FamilyEvent
+            return not any(session.execute(select(exists(
+                select(1).where(condition)))).scalar_one()
+                for condition in (
+                    or_(*(getattr(person, column) != ""
+                          for _, column in PERSON_PLACES)),
+                    event.place != "",
+                    family.marriage_place != "",
+                    family_event.place != "",
+            ))
+        finally:
+            session.close()
+
+    def ensure_built(self) -> None:
+        if not self.is_built():
+            self.rebuild()
+
+    def surnames_by_place(
+        self, kinds: Iterable[PlaceEventKind]
+    ) -> List[PlaceSurnames]:
+        """Surnames of the persons with events of ``kinds`` at each place,
+        with their number of persons. Places are sorted by country, region,
+        county and town, and surnames alphabetically."""
+        places = db_place.Place
+        place_events = db_place_event.PlaceEvent
+        person = db_person.Person
+        statement = (
+            select(places.id, *(getattr(places, field)
+                                for field in PLACE_FIELDS),
+                   person.surname, func.count(distinct(person.id)))
+            .select_from(place_events)
+            .join(places, places.id == place_events.place_id)
+            .join(person, person.id == place_events.person_id)
+            .where(place_events.kind.in_(list(kinds)))
+            .group_by(places.id, person.surname)
+        )
+        session = self._session()
+        try:
+            rows = session.execute(statement).all()
+        finally:
+            session.close()
+
+        by_place: Dict[int, Tuple[PlaceKey, List[NameFrequency]]] = {}
+        for place_id, *key, surname, count in rows:
+            by_place.setdefault(place_id, (tuple(key), []))[1].append(
+                NameFrequency(surname, count))
+        result = []
+        for place_key, surnames in sorted(
+                by_place.values(), key=lambda item: _sort_key(item[0])):
+            place = app_person.Place(**dict(zip(PLACE_FIELDS, place_key)))
+            surnames.sort(key=lambda name: (name_sort_key(name.name),
+                                            name.name))
+            result.append(PlaceSurnames(place_name(place), surnames))
+        return result
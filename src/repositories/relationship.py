@@ -0,0 +1,241 @@
+"""
+Relationship between two persons, for the R, RL and RLM modes: their
+closest common ancestors, every shortest line from each of them up to these
+ancestors, and the consanguinity a child of theirs would have.
+
+The common ancestors are found with a bidirectional breadth-first search
+on the ``GenealogyGraph``, both persons climbing one generation at a time,
+so only the ancestors closer than the answer are visited.
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from libraries.consanguinity import ConsanguinityEngine
+from repositories.genealogy_graph import GenealogyGraph
+
+# Seconds a single search may take before giving up
+DEFAULT_TIME_BUDGET = 2.0
+# Lines listed per person and per common ancestor
+MAX_PATHS = 50
+# Person pairs remembered per graph
+CACHE_SIZE = 1024
+
+# IDs from a person up to one of their ancestors, both included
+Path = Tuple[int, ...]
+
+
+class RelationshipTimeout(Exception):
+    """The search did not finish within its time budget."""
+
+
+class CommonAncestor(NamedTuple):
+    ancestor: int
+    # Shortest lines from the first and the second person
+    paths1: List[Path]
+    paths2: List[Path]
+
+    @property
+    def distance1(self) -> int:
+        return len(self.paths1[0]) - 1
+
+    @property
+    def distance2(self) -> int:
+        return len(self.paths2[0]) - 1
+
+
+class Relationship(NamedTuple):
+    person1: int
+    person2: int
+    ancestors: List[CommonAncestor]
+    # Consanguinity a child of both persons would have (0 to 1), None when
+    # the time budget ran out before it was computed
+    consanguinity: Optional[float]
+
+    @property
+    def related(self) -> bool:
+        return bool(self.ancestors)
+
+
+class _Side:
+    """One direction of the search: the distance from a person to each
+    ancestor found so far, and the children through which each ancestor is
+    reached at that distance."""
+
+    def __init__(self, person: int):
+        self.distance: Dict[int, int] = {person: 0}
+        self.via: Dict[int, List[int]] = {person: []}
+        self.frontier = [person]
+        self.depth = 0
+
+    def expand(self, graph: GenealogyGraph, deadline: float) -> None:
+        if time.monotonic() > deadline:
+            raise RelationshipTimeout()
+        self.depth += 1
+        frontier = []
+        for person in self.frontier:
+            for parent in graph.parents(person):
+                if parent is None:
+                    continue
+                distance = self.distance.get(parent)
+                if distance is None:
+                    self.distance[parent] = self.depth
+                    self.via[parent] = [person]
+                    frontier.append(parent)
+                elif distance == self.depth:
+                    self.via[parent].append(person)
+        self.frontier = frontier
+
+    def paths(self, ancestor: int, limit: int) -> List[Path]:
+        """Shortest lines from the person up to ``ancestor``."""
+        paths: List[Path] = []
+        stack: List[Path] = [(ancestor,)]
+        while stack and len(paths) < limit:
+            path = stack.pop()
+            children = self.via[path[-1]]
+            if not children:
+                paths.append(path[::-1])
+            for child in reversed(children):
+                stack.append(path + (child,))
+        return paths
+
+
+def _closest_common_ancestors(
+    graph: GenealogyGraph, person1: int, person2: int, deadline: float
+) -> Tuple[_Side, _Side, List[int]]:
+    side1, side2 = _Side(person1), _Side(person2)
+    best: Optional[int] = 0 if person1 == person2 else None
+    while True:
+        # An ancestor not yet found by both sides is farther than the
+        # current depth of one of them
+        open_sides = [s for s in (side1, side2) if s.frontier]
+        if not open_sides:
+            break
+        if best is not None and min(s.depth for s in open_sides) >= best:
+            break
+        min(open_sides, key=lambda s: (s.depth, len(s.frontier))).expand(
+            graph, deadline)
+        # Every newly found ancestor is on one of the frontiers
+        for person in side1.frontier + side2.frontier:
+            if person in side1.distance and person in side2.distance:
+                total = side1.distance[person] + side2.distance[person]
+                if best is None or total < best:
+                    best = total
+
+    if best is None:
+        return side1, side2, []
+    return side1, side2, sorted(
+        person for person, distance in side1.distance.items()
+        if side2.distance.get(person, best + 1) + distance == best)
+
+
+def _consanguinity(
+    graph: GenealogyGraph, person1: int, person2: int, deadline: float
+) -> Optional[float]:
+    """Relationship coefficient of two persons, computed on their
+    ancestors only, with the consanguinity stored for these ancestors (as
+    computed by ``consang`` or ``gwc -cg``; unknown values count as 0).
+
+    Returns None if ``deadline`` passes first.
+    """
+    persons = {person1, person2}
+    persons.update(graph.ancestors(person1))
+    persons.update(graph.ancestors(person2))
+    if time.monotonic() > deadline:
+        return None
+    engine = ConsanguinityEngine(
+        graph.couples(persons),
+        {p: graph.consanguinity(p) for p in persons},
+        persons)
+    try:
+        return engine.relationship(person1, person2, deadline)
+    except TimeoutError:
+        return None
+
+
+def find_relationship(
+    graph: GenealogyGraph,
+    person1: int,
+    person2: int,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> Relationship:
+    """Closest common ancestors of two persons (the ones minimizing the
+    sum of the two distances) with every shortest line to them.
+
+    The consanguinity is left to None when the common ancestors took
+    most of ``time_budget``.
+
+    Raises:
+        RelationshipTimeout: if finding the common ancestors takes more
+            than ``time_budget`` seconds
+    """
+    deadline = time.monotonic() + time_budget
+    side1, side2, ancestors = _closest_common_ancestors(
+        graph, person1, person2, deadline)
+    if not ancestors:
+        return Relationship(person1, person2, [], 0.0)
+    common = [
+        CommonAncestor(ancestor,
+                       side1.paths(ancestor, MAX_PATHS),
+                       side2.paths(ancestor, MAX_PATHS))
+        for ancestor in ancestors
+    ]
+    return Relationship(
+        person1, person2, common,
+        _consanguinity(graph, person1, person2, deadline))
+
+
+class RelationshipFinder:
+    """``find_relationship`` on one graph, with the last ``cache_size``
+    results kept per person pair."""
+
+    def __init__(self, graph: GenealogyGraph, cache_size: int = CACHE_SIZE):
+        # Weak, so that the finders registered by ``relationship_finder``
+        # do not keep their graph alive
+        self._graph = weakref.ref(graph)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[int, int], Relationship]" = \
+            OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(
+        self,
+        person1: int,
+        person2: int,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+    ) -> Relationship:
+        key = (person1, person2)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        graph = self._graph()
+        if graph is None:
+            raise RuntimeError("The genealogy graph no longer exists")
+        result = find_relationship(graph, person1, person2, time_budget)
+        if result.consanguinity is None and result.related:
+            # Incomplete: try again next time
+            return result
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+
+_finders: "weakref.WeakKeyDictionary[GenealogyGraph, RelationshipFinder]" = \
+    weakref.WeakKeyDictionary()
+_finders_lock = threading.Lock()
+
+
+def relationship_finder(graph: GenealogyGraph) -> RelationshipFinder:
+    """The finder of ``graph``, whose cache lives as long as the graph,
+    i.e. until ``graph_registry`` replaces it after a write."""
+    with _finders_lock:
+        finder = _finders.get(graph)
+        if finder is None:
+            finder = _finders[graph] = RelationshipFinder(graph)
+        return finder
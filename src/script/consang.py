@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.consanguinity import TopologicalSortError
+from repositories.consanguinity_repository import ConsanguinityRepository
+from repositories.person_repository import PersonRepository
+
+
+def consang_main(db_path: str, from_scratch: bool, verbosity: int) -> int:
+    """Compute the missing consanguinities of a base (legacy
+    ``bin/consang``).
+
+    Args:
+        db_path: SQLite database of the base
+        from_scratch: Recompute every person, not only the unknown ones
+        verbosity: 0 (-qq), 1 (-q) or 2
+
+    Returns:
+        The exit code: 0 on success, 2 when the base contains a loop
+    """
+    if not os.path.exists(db_path):
+        print(f"Error: Database '{db_path}' not found.", file=sys.stderr)
+        return 2
+
+    db_service = SQLiteDatabaseService(db_path)
+    db_service.connect()
+    try:
+        repository = ConsanguinityRepository(db_service)
+        if verbosity >= 2:
+            print("Computing consanguinity...", file=sys.stderr)
+        try:
+            updated = repository.compute_consanguinity(from_scratch)
+        except TopologicalSortError as e:
+            person = PersonRepository(db_service).get_person_by_id(e.person)
+            print(
+                f"\nError: loop in database, {person.first_name}."
+                f"{person.occ} {person.surname} is his/her own ancestor.")
+            return 2
+        if verbosity >= 1:
+            print(
+                f"Consanguinity updated for {updated} person(s)",
+                file=sys.stderr)
+        return 0
+    finally:
+        db_service.disconnect()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compute the consanguinity of the persons of a base",
+        usage="consang [options] <file_name>"
+    )
+    parser.add_argument(
+        "-q", action="store_true", help="quiet mode")
+    parser.add_argument(
+        "-qq", action="store_true", help="very quiet mode")
+    parser.add_argument(
+        "-scratch", action="store_true", help="from scratch")
+    parser.add_argument("base", help="Database file")
+    args = parser.parse_args()
+
+    verbosity = 0 if args.qq else 1 if args.q else 2
+    return consang_main(args.base, args.scratch, verbosity)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
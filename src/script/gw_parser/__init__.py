@@ -4,7 +4,7 @@ This package provides functionality to parse GeneWeb genealogical data files
 (.gw format) into structured Python objects.
 """
 
-from .parser import parse_gw_file
+from .parser import parse_gw_file, iter_gw_file
 from .gw_converter import convert_gw_file, GwConverter
 from .data_types import (
     Key,
@@ -23,6 +23,7 @@ from .data_types import (
 
 __all__ = [
     'parse_gw_file',
+    'iter_gw_file',
     'convert_gw_file',
     'GwConverter',
     'Key',
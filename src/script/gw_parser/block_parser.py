@@ -31,6 +31,7 @@ from .data_types import (
     Key,
     Somebody,
     SomebodyDefined,
+    SomebodyUndefined,
     GwSyntax,
     FamilyGwSyntax,
     NotesGwSyntax,
@@ -308,11 +309,14 @@ def parse_family_block(
                         child_sex = Sex.FEMALE
                         toks = toks[1:]
 
-            father_person = None
+            # Children take the father's surname by default, whether the
+            # father is defined here or only referred to
+            father_surname = ''
             first_parent = parents.parents[0]
             if isinstance(first_parent, SomebodyDefined):
-                father_person = first_parent.person
-            father_surname = father_person.surname if father_person else ''
+                father_surname = first_parent.person.surname
+            elif isinstance(first_parent, SomebodyUndefined):
+                father_surname = first_parent.key.pk_surname
 
             child, _ = _parse_child_line(
                 toks,
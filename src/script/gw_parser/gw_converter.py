@@ -4,7 +4,7 @@ This module converts the parsed GeneWeb syntax into the proper application
 types defined in the libraries/ module.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import replace
 
 from script.gw_parser.data_types import (
@@ -448,15 +448,49 @@ class GwConverter:
         else:
             raise TypeError(f"Unknown GwSyntax type: {type(gw_syntax)}")
 
-    def convert_all(self, gw_blocks: List[GwSyntax]) -> None:
+    def convert_all(self, gw_blocks: Iterable[GwSyntax]) -> None:
         """Convert multiple GwSyntax blocks in sequence.
 
         Args:
-            gw_blocks: List of parsed GeneWeb blocks
+            gw_blocks: Parsed GeneWeb blocks (a list or any iterable, such
+                       as ``iter_gw_file``)
         """
         for block in gw_blocks:
             self.convert(block)
 
+    def convert_stream(
+        self,
+        gw_blocks: Iterable[GwSyntax]
+    ) -> Iterator[Family[int, Person[int, int, str, int], str]]:
+        """Convert blocks as they are produced and yield every family as
+        soon as it has been converted.
+
+        A family never changes once converted, whereas persons keep
+        receiving families, parents and events until the last block: the
+        yielded families are therefore handed over and not kept by the
+        converter, and persons are only available once the stream has been
+        consumed (``get_enriched_persons``).
+
+        Args:
+            gw_blocks: Parsed GeneWeb blocks, typically from
+                       ``iter_gw_file``
+
+        Yields:
+            Converted families, in index order
+        """
+        for block in gw_blocks:
+            self.convert(block)
+            yield from self.drain_families()
+
+    def drain_families(
+        self
+    ) -> List[Family[int, Person[int, int, str, int], str]]:
+        """Return the families converted since the last drain and forget
+        them."""
+        families = list(self.families.values())
+        self.families.clear()
+        return families
+
     def get_all_persons(self) -> List[Person[int, int, str, int]]:
         """Get all registered persons."""
         return list(self.person_by_key.values())
@@ -464,7 +498,7 @@ class GwConverter:
     def get_all_families(
         self
     ) -> List[Family[int, Person[int, int, str, int], str]]:
-        """Get all registered families."""
+        """Get all registered families (except the drained ones)."""
         return list(self.families.values())
 
     def get_person_by_key(
@@ -599,7 +633,7 @@ class GwConverter:
             'total_persons': len(self.person_by_key),
             'defined_persons': defined_count,
             'dummy_persons': len(self.dummy_persons),
-            'families': len(self.families),
+            'families': self.family_index_counter,
             'base_notes': len(self.base_notes),
             'wizard_notes': len(self.wizard_notes),
             'page_extensions': len(self.page_extensions),
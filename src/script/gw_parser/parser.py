@@ -4,7 +4,7 @@ Entry point for parsing GeneWeb genealogical data files.
 """
 
 import sys
-from typing import List
+from typing import Iterator, List
 
 from .data_types import GwSyntax
 from .stream import LineStream, iter_strip_lines
@@ -25,6 +25,28 @@ def parse_gw_file(path: str, encoding: str = 'utf-8',
     Returns:
         List of parsed GwSyntax blocks
     """
+    return list(iter_gw_file(path, encoding, no_fail))
+
+
+def iter_gw_file(path: str, encoding: str = 'utf-8',
+                 no_fail: bool = False) -> Iterator[GwSyntax]:
+    """Parse a .gw file lazily, yielding each GwSyntax block as soon as it
+    has been read from the file.
+
+    Only the block being parsed is held in memory, so callers that consume
+    the blocks as they come (see ``GwConverter.convert_stream``) can process
+    files of any size.
+
+    Args:
+        path: Path to .gw file
+        encoding: File encoding (default 'utf-8', can be overridden by
+                  encoding directive)
+        no_fail: If True, continue parsing after errors (collect errors but
+                 don't raise)
+
+    Yields:
+        Parsed GwSyntax blocks, in file order
+    """
     from . import data_types as dt
     dt.gwplus_mode = False
     dt.no_fail_mode = no_fail
@@ -40,7 +62,6 @@ def parse_gw_file(path: str, encoding: str = 'utf-8',
                 detected_encoding = 'utf-8'
 
     with open(path, 'r', encoding=detected_encoding) as fh:
-        syntaxes: List[GwSyntax] = []
         stream = LineStream(iter_strip_lines(fh))
         line_num = 0
 
@@ -56,12 +77,12 @@ def parse_gw_file(path: str, encoding: str = 'utf-8',
                 continue
             try:
                 block = parse_block(first, stream)
-                if block is not None:
-                    syntaxes.append(block)
             except Exception as e:
                 if not dt.no_fail_mode:
                     raise RuntimeError(
                         f"Parse error at line ~{line_num}: {e}") from e
                 print(f"Warning: Parse error at line ~{line_num}: {e}",
                       file=sys.stderr)
-        return syntaxes
+                continue
+            if block is not None:
+                yield block
@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 import argparse
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 import os
 import sys
-from typing import Dict, List, Tuple
+from typing import Any
 
-from script.gw_parser import parse_gw_file, GwConverter
+from script.gw_parser import iter_gw_file, GwConverter
 from libraries.person import Person
 from libraries.family import Family
+from database.engine_registry import engine_registry
 from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.consanguinity import TopologicalSortError
+from repositories.bulk_writer import BulkWriter, DEFAULT_CHUNK_SIZE
+from repositories.cache_files_repository import CacheFilesRepository
+from repositories.consanguinity_repository import ConsanguinityRepository
+from repositories.name_count_repository import NameCountRepository
+from repositories.name_index_repository import NameIndexRepository
 from repositories.person_repository import PersonRepository
-from repositories.family_repository import FamilyRepository
+from repositories.place_repository import PlaceRepository
 
 import database.couple  # noqa: F401
 import database.ascends  # noqa: F401
@@ -29,6 +38,11 @@ import database.person_titles  # noqa: F401
 import database.person_non_native_relations  # noqa: F401
 import database.date  # noqa: F401
 import database.place  # noqa: F401
+import database.name_index  # noqa: F401
+import database.name_count  # noqa: F401
+import database.name_initial_count  # noqa: F401
+import database.cached_value  # noqa: F401
+import database.place_event  # noqa: F401
 
 
 @dataclass(frozen=False)
@@ -47,6 +61,8 @@ class GwcArguments:
     ds: str
     particles: str
     nc: bool
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    jobs: int = 1
 
 
 def normalize_family(
@@ -145,6 +161,225 @@ def normalize_person(
     return replace(person, personal_events=new_events)
 
 
+def shift_person(
+    person: Person[int, int, str, int],
+    person_offset: int,
+    family_offset: int
+) -> Person[int, int, str, int]:
+    """Move a normalized person, and every person or family it refers to,
+    from the indexes of its own file to the indexes of the database.
+
+    Each input file is converted on its own, with indexes starting at 0;
+    the persons and families of the next files are stored after those of
+    the previous ones.
+    """
+    if not person_offset and not family_offset:
+        return person
+
+    def shift(index: int | None) -> int | None:
+        return None if index is None else index + person_offset
+
+    return replace(
+        person,
+        index=person.index + person_offset,
+        non_native_parents_relation=[
+            replace(r, father=shift(r.father), mother=shift(r.mother))
+            for r in person.non_native_parents_relation
+        ],
+        related_persons=[p + person_offset for p in person.related_persons],
+        personal_events=[
+            replace(event, witnesses=[
+                (witness + person_offset, kind)
+                for witness, kind in event.witnesses
+            ])
+            for event in person.personal_events
+        ],
+        ascend=replace(
+            person.ascend,
+            parents=None if person.ascend.parents is None
+            else person.ascend.parents + family_offset),
+        families=[f + family_offset for f in person.families],
+    )
+
+
+def shift_family(
+    family: Family[int, int, str],
+    person_offset: int,
+    family_offset: int
+) -> Family[int, int, str]:
+    """Family counterpart of ``shift_person``."""
+    if not person_offset and not family_offset:
+        return family
+    from libraries.family import Parents
+
+    return replace(
+        family,
+        index=family.index + family_offset,
+        witnesses=[w + person_offset for w in family.witnesses],
+        family_events=[
+            replace(event, witnesses=[
+                (witness + person_offset, kind)
+                for witness, kind in event.witnesses
+            ])
+            for event in family.family_events
+        ],
+        parents=Parents[int](
+            [p + person_offset for p in family.parents.parents]),
+        children=[c + person_offset for c in family.children],
+    )
+
+
+def _add_record(
+    args: GwcArguments,
+    add: Callable[[Any], None],
+    record: Any,
+    kind: str
+) -> None:
+    """Queue one person or family in the bulk writer.
+
+    With -nofail a record that cannot be saved is reported and skipped,
+    otherwise the error aborts the current file.
+    """
+    try:
+        add(record)
+    except Exception as e:
+        if not args.no_fail:
+            raise
+        print(
+            f"Warning: Failed to add {kind} {record.index}: {e}",
+            file=sys.stderr
+        )
+
+
+def _remove_database(db_service: SQLiteDatabaseService, path: str) -> None:
+    """Delete the database created by a failed run, so that it can be run
+    again without -f."""
+    db_service.disconnect()
+    if os.path.exists(path):
+        os.remove(path)
+    engine_registry.invalidate(path)
+
+
+@dataclass
+class _FileSummary:
+    """Database-level data and statistics of one converted file."""
+    base_notes: list[tuple[str, str]] = field(default_factory=list)
+    wizard_notes: dict[str, str] = field(default_factory=dict)
+    page_extensions: dict[str, str] = field(default_factory=dict)
+    stats: dict[str, int] = field(default_factory=dict)
+    # Number of person / family indexes used by the file
+    persons: int = 0
+    families: int = 0
+
+
+# ("family" | "person", normalized record), in the order they are written
+_Record = tuple[str, Any]
+_FileRecords = Generator[_Record, None, _FileSummary]
+
+
+def _stream_file(filename: str) -> _FileRecords:
+    """Parse and convert one .gw file, yielding its normalized families as
+    soon as they are converted, then its persons, and return its summary.
+    """
+    converter = GwConverter()
+    for family in converter.convert_stream(iter_gw_file(filename)):
+        # Normalize family to use integer IDs instead of Person objects
+        yield "family", normalize_family(
+            replace(family, origin_file=filename))
+    for person in converter.get_enriched_persons():
+        yield "person", normalize_person(person)
+    return _FileSummary(
+        base_notes=converter.get_base_notes(),
+        wizard_notes=converter.get_wizard_notes(),
+        page_extensions=converter.get_page_extensions(),
+        stats=converter.get_statistics(),
+        persons=converter.person_index_counter,
+        families=converter.family_index_counter,
+    )
+
+
+def _parse_file(filename: str) -> tuple[list[_Record], _FileSummary]:
+    """Worker of the -j process pool: convert a whole file at once."""
+    records = _stream_file(filename)
+    converted: list[_Record] = []
+    while True:
+        try:
+            converted.append(next(records))
+        except StopIteration as stop:
+            return converted, stop.value
+
+
+def _replay(
+    future: "Future[tuple[list[_Record], _FileSummary]]"
+) -> _FileRecords:
+    """Records of a file converted by the process pool. Errors raised by
+    the worker are raised by the first ``next``, like in _stream_file."""
+    records, summary = future.result()
+    yield from records
+    return summary
+
+
+def _iter_file_records(
+    args: GwcArguments
+) -> Iterator[tuple[tuple[str, bool, str, int], _FileRecords]]:
+    """Yield the records of every input file, in command-line order.
+
+    With -j 1 each file is converted while it is written. Otherwise up to
+    ``2 * jobs`` files are converted ahead by a process pool; they are
+    still handed over in command-line order, so -sep, -bnotes and -sh
+    apply exactly as in a sequential run.
+    """
+    if args.jobs <= 1:
+        for file_data in args.input_file_data:
+            yield file_data, _stream_file(file_data[0])
+        return
+
+    pool = ProcessPoolExecutor(max_workers=args.jobs)
+    try:
+        files = iter(args.input_file_data)
+        pending: deque[tuple[
+            tuple[str, bool, str, int],
+            Future[tuple[list[_Record], _FileSummary]]
+        ]] = deque()
+
+        def submit_next() -> None:
+            file_data = next(files, None)
+            if file_data is not None:
+                pending.append(
+                    (file_data, pool.submit(_parse_file, file_data[0])))
+
+        for _ in range(2 * args.jobs):
+            submit_next()
+        while pending:
+            file_data, future = pending.popleft()
+            submit_next()
+            yield file_data, _replay(future)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _write_records(
+    args: GwcArguments,
+    writer: BulkWriter,
+    records: _FileRecords,
+    person_offset: int,
+    family_offset: int
+) -> _FileSummary:
+    """Queue the records of one file in the bulk writer, after the persons
+    and families already written, and return the file's summary."""
+    while True:
+        try:
+            kind, record = next(records)
+        except StopIteration as stop:
+            return stop.value
+        if kind == "family":
+            _add_record(args, writer.add_family, shift_family(
+                record, person_offset, family_offset), kind)
+        else:
+            _add_record(args, writer.add_person, shift_person(
+                record, person_offset, family_offset), kind)
+
+
 def appendFileData(
     files: list[tuple[str, bool, str, int]],
     x: str,
@@ -175,6 +410,13 @@ def main() -> int:
         "-bnotes", type=str, default="merge",
         help="[drop|erase|first|merge] Behavior "
         "for base notes of the next file.")
+    parser.add_argument(
+        "-chunk", type=int, default=DEFAULT_CHUNK_SIZE,
+        help="Number of rows written per insert statement "
+        f"(default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument(
+        "-j", type=int, default=1,
+        help="Number of processes parsing the input files (default: 1)")
     parser.add_argument(
         "-cg",
         action="store_true",
@@ -255,7 +497,9 @@ def main() -> int:
         cg=cg,
         ds=ds,
         particles=particles,
-        nc=nc), parser.print_help)
+        nc=nc,
+        chunk_size=args.chunk,
+        jobs=args.j), parser.print_help)
 
 
 def gwc_main(args: GwcArguments, print_help: Callable) -> int:
@@ -267,6 +511,10 @@ def gwc_main(args: GwcArguments, print_help: Callable) -> int:
         print("Allowed characters: a..z, A..Z, 0..9, -, _, .")
         sys.exit(2)
 
+    if args.jobs < 1:
+        print(f"Invalid number of jobs: {args.jobs}")
+        sys.exit(2)
+
     for x in args.files:
         appendFileData(
             args.input_file_data,
@@ -281,46 +529,79 @@ def gwc_main(args: GwcArguments, print_help: Callable) -> int:
         print_help()
         sys.exit(1)
 
-    all_persons: list[Person] = []
-    all_families: list[Family] = []
     all_base_notes: list[tuple[str, str]] = []
     all_wizard_notes: dict[str, str] = {}
     all_page_extensions: dict[str, str] = {}
+    files_processed = 0
+    person_offset = 0
+    family_offset = 0
+
+    # Check if database exists and handle -f flag
+    if os.path.exists(args.out_file):
+        if args.f:
+            if args.verbose:
+                print(f"Removing existing database: {args.out_file}")
+            os.remove(args.out_file)
+            engine_registry.invalidate(args.out_file)
+        else:
+            print(f"Error: Database '{args.out_file}' already exists.")
+            print("Use -f flag to overwrite.")
+            sys.exit(1)
 
+    # Each file is parsed, converted and written in a single pass: families
+    # are written as soon as they are converted, persons once their file
+    # has been read completely, so memory does not grow with the number of
+    # files. With -j, files are converted ahead by worker processes and
+    # written here in command-line order.
     if args.verbose:
+        print(f"Creating database: {args.out_file}")
+    try:
+        db_service = SQLiteDatabaseService(args.out_file)
+        db_service.connect()
+        writer = BulkWriter(db_service, chunk_size=args.chunk_size)
+    except Exception as e:
+        print(f"Error saving to database: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+    if args.verbose:
+        print("Database initialized successfully")
         print(f"Processing {len(args.input_file_data)} file(s)...")
 
-    for idx, (filename, separate, bnotes_mode, shift) in enumerate(
-        args.input_file_data, 1
-    ):
+    for idx, ((filename, separate, bnotes_mode, shift), records) in \
+            enumerate(_iter_file_records(args), 1):
         if args.verbose:
             print(
                 f"\n[{idx}/{len(args.input_file_data)}]"
                 f" Processing {filename}...")
+        # A file that fails is dropped as a whole, even if some of its
+        # records were already written
+        writer.savepoint()
         try:
             if args.verbose:
-                print(f"  Parsing {filename}...")
+                print(f"  Parsing and saving {filename}...")
 
-            gw_syntax_blocks = parse_gw_file(filename)
-
-            if args.verbose:
-                print(f"  Parsed {len(gw_syntax_blocks)} blocks")
-                print("  Converting to application types...")
-
-            converter = GwConverter()
-            converter.convert_all(gw_syntax_blocks)
-            persons = converter.get_enriched_persons()
-            families = converter.get_all_families()
-            base_notes = converter.get_base_notes()
-            wizard_notes = converter.get_wizard_notes()
-            page_extensions = converter.get_page_extensions()
-            stats = converter.get_statistics()
+            families_added = writer.families_added
+            persons_added = writer.persons_added
+            summary = _write_records(
+                args, writer, records, person_offset, family_offset)
+            base_notes = summary.base_notes
+            wizard_notes = summary.wizard_notes
+            page_extensions = summary.page_extensions
+            stats = summary.stats
 
             if args.verbose:
                 print(
                     f"  Converted {stats['defined_persons']} persons, "
                     f"{stats['families']} families"
                 )
+                print(
+                    f"  Saved {writer.persons_added - persons_added} "
+                    f"persons, {writer.families_added - families_added} "
+                    f"families"
+                )
                 if stats['dummy_persons'] > 0:
                     print(
                         f"  Warning: {stats['dummy_persons']} "
@@ -344,14 +625,6 @@ def gwc_main(args: GwcArguments, print_help: Callable) -> int:
             if separate and args.verbose:
                 print("  Note: -sep specified but not yet implemented")
 
-            from dataclasses import replace
-            families_with_origin = [
-                replace(fam, origin_file=filename) for fam in families
-            ]
-
-            all_persons.extend(persons)
-            all_families.extend(families_with_origin)
-
             match bnotes_mode:
                 case "merge":
                     all_base_notes.extend(base_notes)
@@ -374,136 +647,111 @@ def gwc_main(args: GwcArguments, print_help: Callable) -> int:
                     f"for database-level data"
                 )
 
+            writer.release_savepoint()
+            files_processed += 1
+            person_offset += summary.persons
+            family_offset += summary.families
+
         except Exception as e:
+            writer.rollback_to_savepoint()
+            print(f"Error processing {filename}: {e}", file=sys.stderr)
+            if args.verbose:
+                import traceback
+                traceback.print_exc()
             if args.no_fail:
-                print(f"Error processing {filename}: {e}", file=sys.stderr)
-                if args.verbose:
-                    import traceback
-                    traceback.print_exc()
                 continue
-            else:
-                print(f"Error processing {filename}: {e}", file=sys.stderr)
-                if args.verbose:
-                    import traceback
-                    traceback.print_exc()
-                sys.exit(1)
-
-    if stats or args.verbose:
-        print("\n" + "=" * 50)
-        print("Parsing Statistics:")
-        print("=" * 50)
-        print(f"Total persons: {len(all_persons)}")
-        print(f"Total families: {len(all_families)}")
-        print(f"Total base notes: {len(all_base_notes)}")
-        print(f"Total wizard notes: {len(all_wizard_notes)}")
-        print(f"Total page extensions: {len(all_page_extensions)}")
-        print(f"Files processed: {len(args.input_file_data)}")
-        if args.verbose:
-            # Print detailed data only in verbose mode
-            print_data(
-                all_persons,
-                all_families,
-                all_base_notes,
-                all_wizard_notes,
-                all_page_extensions
-            )
-        print("=" * 50)
-
-    # Save to SQLite database
-    if args.verbose:
-        print(f"\nCreating database: {args.out_file}")
-
-    # Check if database exists and handle -f flag
-    if os.path.exists(args.out_file):
-        if args.f:
-            if args.verbose:
-                print(f"Removing existing database: {args.out_file}")
-            os.remove(args.out_file)
-        else:
-            print(f"Error: Database '{args.out_file}' already exists.")
-            print("Use -f flag to overwrite.")
+            writer.rollback()
+            _remove_database(db_service, args.out_file)
             sys.exit(1)
-
     try:
-        # Initialize database
-        db_service = SQLiteDatabaseService(args.out_file)
-        db_service.connect()
-
+        writer.commit()
+    except Exception as e:
+        print(f"Error saving to database: {e}", file=sys.stderr)
         if args.verbose:
-            print("Database initialized successfully")
-            print("Saving persons...")
-
-        # Initialize repositories
-        person_repo = PersonRepository(db_service)
-        family_repo = FamilyRepository(db_service)
-
-        # Save all persons
-        persons_added = 0
-        for person in all_persons:
-            try:
-                normalized_person = normalize_person(person)
-                person_repo.add_person(normalized_person)
-                persons_added += 1
-            except Exception as e:
-                if args.no_fail:
-                    print(
-                        f"Warning: Failed to add person "
-                        f"{person.index}: {e}",
-                        file=sys.stderr
-                    )
-                    continue
-                else:
-                    raise
+            import traceback
+            traceback.print_exc()
+        _remove_database(db_service, args.out_file)
+        sys.exit(1)
 
-        if args.verbose:
-            print(f"Successfully added {persons_added} persons")
-            print("Saving families...")
-
-        # Save all families
-        families_added = 0
-        for family in all_families:
-            try:
-                # Normalize family to use integer IDs instead of Person objects
-                normalized_family = normalize_family(family)
-                family_repo.add_family(normalized_family)
-                families_added += 1
-            except Exception as e:
-                if args.no_fail:
-                    print(
-                        f"Warning: Failed to add family "
-                        f"{family.index}: {e}",
-                        file=sys.stderr
-                    )
-                    continue
-                else:
-                    raise
+    if args.verbose:
+        print("Indexing names...")
+    try:
+        indexed = NameIndexRepository(db_service).rebuild()
+    except Exception as e:
+        print(f"Error indexing names: {e}", file=sys.stderr)
+        _remove_database(db_service, args.out_file)
+        sys.exit(1)
+    if args.verbose:
+        print(f"  {indexed} name key(s) indexed")
+        print("Counting names...")
+    try:
+        counted = NameCountRepository(db_service).rebuild()
+    except Exception as e:
+        print(f"Error counting names: {e}", file=sys.stderr)
+        _remove_database(db_service, args.out_file)
+        sys.exit(1)
+    if args.verbose:
+        print(f"  {counted} distinct name(s) counted")
+        print("Computing cache files...")
+    try:
+        cached = CacheFilesRepository(db_service).rebuild()
+    except Exception as e:
+        print(f"Error computing cache files: {e}", file=sys.stderr)
+        _remove_database(db_service, args.out_file)
+        sys.exit(1)
+    if args.verbose:
+        print(f"  {sum(cached.values())} value(s) cached")
+        print("Splitting places...")
+    try:
+        places = PlaceRepository(db_service).rebuild()
+    except Exception as e:
+        print(f"Error splitting places: {e}", file=sys.stderr)
+        _remove_database(db_service, args.out_file)
+        sys.exit(1)
+    if args.verbose:
+        print(f"  {places} place(s)")
 
+    if args.cg:
         if args.verbose:
-            print(f"Successfully added {families_added} families")
-
-        # TODO: Save base notes, wizard notes, and page extensions
-        if (all_base_notes or all_wizard_notes or all_page_extensions) \
-                and args.verbose:
+            print("Computing consanguinity...")
+        try:
+            updated = ConsanguinityRepository(
+                db_service).compute_consanguinity(from_scratch=True)
+        except TopologicalSortError as e:
+            person = PersonRepository(db_service).get_person_by_id(e.person)
             print(
-                "Note: Base notes, wizard notes, and page extensions "
-                "not yet saved to database"
-            )
-
+                f"Error: loop in database, {person.first_name}."
+                f"{person.occ} {person.surname} is his/her own ancestor.")
+            _remove_database(db_service, args.out_file)
+            sys.exit(2)
         if args.verbose:
-            print(f"\nDatabase saved successfully: {args.out_file}")
-            print(f"  Persons: {persons_added}")
-            print(f"  Families: {families_added}")
+            print(f"  Consanguinity stored for {updated} person(s)")
+    db_service.disconnect()
 
-    except Exception as e:
-        print(f"Error saving to database: {e}", file=sys.stderr)
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+    if args.stats or args.verbose:
+        print("\n" + "=" * 50)
+        print("Statistics:")
+        print("=" * 50)
+        print(f"Total persons: {writer.persons_added}")
+        print(f"Total families: {writer.families_added}")
+        print(f"Total base notes: {len(all_base_notes)}")
+        print(f"Total wizard notes: {len(all_wizard_notes)}")
+        print(f"Total page extensions: {len(all_page_extensions)}")
+        print(f"Files processed: {files_processed}")
+        print("=" * 50)
 
-    # TODO: Compute consanguinity if requested
-    if args.cg and args.verbose:
-        print("Note: -cg (consanguinity) not yet implemented")
+    # TODO: Save base notes, wizard notes, and page extensions
+    if (all_base_notes or all_wizard_notes or all_page_extensions) \
+            and args.verbose:
+        print(
+            "Note: Base notes, wizard notes, and page extensions "
+            "not yet saved to database"
+        )
+
+    if args.verbose:
+        print(f"\nDatabase saved successfully: {args.out_file}")
+        print(f"  Persons: {writer.persons_added}")
+        print(f"  Families: {writer.families_added}")
 
     # TODO: Handle default source
     if args.ds and args.verbose:
@@ -526,137 +774,5 @@ def gwc_main(args: GwcArguments, print_help: Callable) -> int:
     return 0
 
 
-def print_data(
-        all_persons: List[Person],
-        all_families: List[Family],
-        all_base_notes: List[Tuple[str, str]],
-        all_wizard_notes: Dict[str, str],
-        all_page_extensions: Dict[str, str]):
-    """Serve as a temporary function to print parsed data.
-    To remove when database saving is implemented."""
-
-    def _get(obj, *names):
-        for n in names:
-            if hasattr(obj, n):
-                val = getattr(obj, n)
-                if val is not None:
-                    return val
-        if hasattr(obj, "__dict__"):
-            d = obj.__dict__
-            for k, v in d.items():
-                for n in names:
-                    if n in k and v is not None:
-                        return v
-        return None
-
-    def _id_of(o):
-        return _get(o, "id", "pid", "fid", "xref") or str(o)
-
-    def _format_person(p):
-        pid = _id_of(p)
-        name = _get(p, "name", "full_name", "fullname")
-        if not name:
-            given = _get(p, "given", "given_name", "firstname", "first")
-            family = _get(p, "surname", "last", "lastname", "family")
-            if given or family:
-                name = " ".join(filter(None, (given, family)))
-        sex = _get(p, "sex", "gender")
-        birth = _get(p, "birth", "bdate", "born")
-        death = _get(p, "death", "ddate", "died")
-        parts = [f"id={pid}"]
-        if name:
-            parts.append(f"name=\"{name}\"")
-        if sex:
-            parts.append(f"sex={sex}")
-        if birth or death:
-            parts.append(f"b:{birth or '?'} d:{death or '?'}")
-        return "  - " + " | ".join(parts)
-
-    def _format_family(f):
-        fid = _id_of(f)
-        hus = _get(f, "husband", "husb", "hus", "h", "father")
-        wife = _get(f, "wife", "w", "mother", "m")
-        children = _get(
-            f,
-            "children",
-            "kids",
-            "children_list",
-            "childs",
-            "child")
-
-        def _ref(x):
-            if hasattr(x, "__dict__"):
-                return _id_of(x)
-            return str(x)
-        child_ids = []
-        if children is not None:
-            if isinstance(children, (list, tuple)):
-                child_ids = [_ref(c) for c in children]
-            else:
-                child_ids = [_ref(children)]
-        parts = [f"id={fid}"]
-        if hus:
-            parts.append(f"H={_ref(hus)}")
-        if wife:
-            parts.append(f"W={_ref(wife)}")
-        if child_ids:
-            parts.append(f"children={len(child_ids)}")
-        tail = f" -> [{', '.join(child_ids)}]" if child_ids else ""
-        return "  - " + " | ".join(parts) + tail
-
-    print("\nPersons:")
-    if not all_persons:
-        print("  (none)")
-    else:
-        for p in all_persons:
-            try:
-                print(_format_person(p))
-            except Exception:
-                print("  -", str(p))
-
-    print("\nFamilies:")
-    if not all_families:
-        print("  (none)")
-    else:
-        for f in all_families:
-            try:
-                print(_format_family(f))
-            except Exception:
-                print("  -", str(f))
-
-    print("\nBase Notes:")
-    if not all_base_notes:
-        print("  (none)")
-    else:
-        for page, content in all_base_notes:
-            content_preview = (
-                content[:80] + "..." if len(content) > 80 else content
-            )
-            print(f"  - Page: {page!r}")
-            print(f"    Content: {content_preview!r}")
-
-    print("\nWizard Notes:")
-    if not all_wizard_notes:
-        print("  (none)")
-    else:
-        for wizard_id, content in all_wizard_notes.items():
-            content_preview = (
-                content[:80] + "..." if len(content) > 80 else content
-            )
-            print(f"  - Wizard ID: {wizard_id!r}")
-            print(f"    Content: {content_preview!r}")
-
-    print("\nPage Extensions:")
-    if not all_page_extensions:
-        print("  (none)")
-    else:
-        for page_name, content in all_page_extensions.items():
-            content_preview = (
-                content[:80] + "..." if len(content) > 80 else content
-            )
-            print(f"  - Page: {page_name!r}")
-            print(f"    Content: {content_preview!r}")
-
-
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Process-wide cache of rendered gwd pages.
+
+Bases are read far more often than they are edited, so the read-only pages
+(details, search, titles, fiefs, AN...) are kept once rendered, keyed on the
+base, the endpoint, the query arguments and the language. Each entry also
+records the version of its base (``engine_registry.version``), read from
+the file: it changes with every transaction that writes to the base
+(``ADD_FAM``, ``MOD_IND``, ``consang``, another worker...) and when ``gwc``
+rebuilds it, so a page is never served after its base changed.
+
+The cache is bounded by the size of the pages it holds, the least recently
+used pages being evicted first.
+
+The same key and version also give each page a strong ETag, so a client
+revalidating a page the base has not changed since gets a ``304 Not
+Modified`` before the view runs. The version being read from the file, an
+ETag only matches the content it was given for, even across restarts of
+the server.
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from database.engine_registry import BaseVersion, engine_registry
+from wserver import get_locale
+
+# Total size of the pages kept in memory
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Rough size of an entry besides its body (key, headers, bookkeeping)
+ENTRY_OVERHEAD = 512
+
+# (base, endpoint, sorted query arguments, language, day or None)
+PageKey = Tuple[str, str, Tuple[Tuple[str, str], ...], str, Optional[str]]
+
+
+class CachedPage(NamedTuple):
+    version: BaseVersion
+    body: bytes
+    content_type: str
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + ENTRY_OVERHEAD
+
+
+class PageCache:
+    """Thread-safe LRU of rendered pages, bounded by ``max_bytes``."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[PageKey, CachedPage]" = OrderedDict()
+        # Version of each base the cached pages were rendered from
+        self._versions: Dict[str, BaseVersion] = {}
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: PageKey, version: BaseVersion) -> Optional[CachedPage]:
+        with self._lock:
+            self._check_version(key[0], version)
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: PageKey, page: CachedPage) -> None:
+        """Keep ``page`` unless it alone would take more than an eighth of
+        the cache."""
+        if page.size > self.max_bytes // 8:
+            return
+        with self._lock:
+            # A write may have happened while the page was rendered
+            if self._versions.get(key[0], page.version) != page.version:
+                return
+            self._versions[key[0]] = page.version
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = page
+            self.size += page.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, base: str) -> None:
+        """Drop every page of ``base``."""
+        with self._lock:
+            self._drop_base(base)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _check_version(self, base: str, version: BaseVersion) -> None:
+        """Drop the pages of ``base`` rendered from an older version."""
+        if self._versions.get(base, version) != version:
+            self._drop_base(base)
+        self._versions[base] = version
+
+    def _drop_base(self, base: str) -> None:
+        for key in [k for k in self._entries if k[0] == base]:
+            self.size -= self._entries.pop(key).size
+        self._versions.pop(base, None)
+
+
+page_cache = PageCache()
+
+
+def page_etag(key: PageKey, version: BaseVersion) -> str:
+    """Strong ETag of the page ``key`` rendered from ``version``."""
+    return hashlib.md5(repr((key, version)).encode()).hexdigest()
+
+
+def cached_page(vary_by_day: bool = False) -> Callable:
+    """Serve the GET requests of a ``<base>`` view from ``page_cache``,
+    with an ETag and conditional requests.
+
+    Only successful, non-streamed responses are kept, and only once the
+    base has a shared engine to tell its version. ``vary_by_day`` is for
+    pages that depend on the current date.
+    """
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(base: str, *args, **kwargs):
+            # Imported here: the routes package imports this module
+            from wserver.routes import db_utils
+
+            if request.method not in ("GET", "HEAD"):
+                return view(base, *args, **kwargs)
+            version = engine_registry.version(db_utils.get_db_path(base))
+            if version is None:
+                return view(base, *args, **kwargs)
+
+            key: PageKey = (
+                base,
+                request.endpoint or "",
+                tuple(sorted(request.args.items(multi=True))),
+                get_locale(),
+                date.today().isoformat() if vary_by_day else None,
+            )
+            etag = page_etag(key, version)
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                page = page_cache.get(key, version)
+                if page is not None:
+                    response = Response(
+                        page.body, content_type=page.content_type)
+                else:
+                    response = make_response(view(base, *args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    if not response.is_streamed:
+                        page_cache.put(key, CachedPage(
+                            version, response.get_data(),
+                            response.content_type))
+            response.set_etag(etag)
+            # Let browsers keep the page but revalidate it every time
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
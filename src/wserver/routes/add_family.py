@@ -21,6 +21,7 @@ from libraries.consanguinity_rate import ConsanguinityRate
 from libraries.family import Ascendants
 from libraries.death_info import DeathStatusBase, NotDead, Dead, DeathReason
 from libraries.burial_info import UnknownBurial
+from .datalists import DATALISTS
 from .db_utils import get_db_service
 from typing import Optional, List
 
@@ -650,4 +651,5 @@ def implem_route_ADD_FAM(base, lang="en"):
         submitted=submitted,
         submitted_count=submitted_count,
         num_children=num_children,
+        datalists=DATALISTS,
     )
@@ -1,18 +1,38 @@
 from datetime import datetime, timedelta
 from flask import request, render_template
 
+from repositories.anniversary_repository import (
+    AnniversaryKind,
+    AnniversaryRepository,
+)
 from ..i18n import get_translator
 
+# Births and marriages older than this are not listed: the persons are
+# most likely dead even when the base does not say so
+MAX_AGE = 120
 
-def implem_route_AN(base):
-    """Render the anniversaries-by-birth (AN) page for the given base.
-    """
+# Lexicon keys of each anniversary page: title, "it is ... of" and "no ..."
+_LABELS = {
+    AnniversaryKind.BIRTH: (
+        'anniversaries of birth', 'the birthday', 'no birthday'),
+    AnniversaryKind.DEATH: (
+        'anniversaries of dead people', 'the anniversary', 'no anniversary'),
+    AnniversaryKind.MARRIAGE: (
+        'anniversaries of marriage', 'the anniversary of marriage',
+        'no anniversary'),
+}
+
+
+def _implem_anniversaries(base, kind: AnniversaryKind, endpoint: str):
+    """Render an anniversary page: those of today, tomorrow and the day
+    after, or those of the month ``v`` when it is given."""
     req_lang = request.args.get('lang') or 'en'
     translator = get_translator()
 
     def _(key, capitalize_first=True):
         return translator.gettext(key, req_lang, capitalize_first)
 
+    title, event_label, none_label = _LABELS[kind]
     today = datetime.now().date()
     tomorrow = (today + timedelta(days=1))
     day_after = (today + timedelta(days=2))
@@ -26,67 +46,59 @@ def implem_route_AN(base):
 
     months = [(i + 1, _('(month)').split('/')[i]) for i in range(12)]
 
-    current_month = datetime.now().month
+    selected_month = request.args.get('v', type=int)
+    if selected_month not in range(1, 13):
+        selected_month = None
+    current_month = selected_month or today.month
 
+    month_items = []
     try:
         from ..routes.db_utils import get_db_service
-        from repositories.person_repository import PersonRepository
-        import libraries.death_info as death_info
-        import libraries.date as lib_date
-
-        db_service = get_db_service(base)
-        person_repo = PersonRepository(db_service)
-        persons = person_repo.get_all_persons()
-
-        def extract_dmy(compressed_date):
-            if compressed_date is None:
-                return None
-            if isinstance(compressed_date, lib_date.CalendarDate):
-                dv = compressed_date.dmy
-                if dv.day and dv.month:
-                    return (dv.day, dv.month, dv.year)
-            return None
-        month_items = []
-
-        for p in persons:
-            if isinstance(p.death_status, death_info.NotDead):
-                dmy = extract_dmy(p.birth_date)
-                if dmy is None:
-                    continue
-                day, month, year = dmy
-                display_name = f"{p.first_name} {p.surname}".strip()
-
-                item = {
-                    'id': p.index,
-                    'name': display_name,
-                    'given': p.first_name,
-                    'surname': p.surname,
-                    'day': day,
-                    'month': month,
-                    'year': year,
-                }
-                if month == current_month:
-                    month_items.append(item)
-                if (day == today.day and month == today.month):
-                    sections[0]['items'].append(item)
-                elif (day == tomorrow.day and month == tomorrow.month):
-                    sections[1]['items'].append(item)
-                elif (day == day_after.day and month == day_after.month):
-                    sections[2]['items'].append(item)
-        month_items.sort(key=lambda it: it['day'])
 
+        repo = AnniversaryRepository(get_db_service(base))
+        min_year = None
+        if kind is not AnniversaryKind.DEATH:
+            min_year = today.year - MAX_AGE
+        if selected_month is not None:
+            month_items = repo.anniversaries(
+                kind, month=selected_month, min_year=min_year)
+        else:
+            by_day = {(s['date'].month, s['date'].day): s for s in sections}
+            for item in repo.anniversaries(
+                    kind, days=list(by_day), min_year=min_year):
+                by_day[item.month, item.day]['items'].append(item)
     except Exception:
         month_items = []
     data = {
         'lang': req_lang,
-        'title': _('anniversaries of birth'),
+        'title': _(title),
+        'event_label': _(event_label, False),
+        'none_label': _(none_label),
         'base': base,
-        'prefix': f'/gwd/{base}/',
+        'endpoint': endpoint,
         '_': _,
         'sections': sections,
         'months': months,
+        'selected_month': selected_month,
         'current_month': current_month,
         'month_items': month_items,
     }
 
     return render_template('gwd/an.html', **data)
+
+
+def implem_route_AN(base):
+    """Render the anniversaries-by-birth (AN) page for the given base.
+    """
+    return _implem_anniversaries(base, AnniversaryKind.BIRTH, 'gwd.route_AN')
+
+
+def implem_route_AD(base):
+    """Render the anniversaries of death (AD) page for the given base."""
+    return _implem_anniversaries(base, AnniversaryKind.DEATH, 'gwd.route_AD')
+
+
+def implem_route_AM(base):
+    """Render the wedding anniversaries (AM) page for the given base."""
+    return _implem_anniversaries(
+        base, AnniversaryKind.MARRIAGE, 'gwd.route_AM')
@@ -0,0 +1,48 @@
+from flask import g, render_template, request
+
+from repositories.ascendants import MAX_GENERATIONS, ascendants_page
+from repositories.genealogy_graph import graph_registry
+from repositories.person_repository import PersonRepository
+from .db_utils import get_db_service
+
+# Generations shown when the request does not say (legacy default)
+DEFAULT_GENERATIONS = 5
+
+
+def implem_route_A(base: str, lang: str = "en"):
+    """Render the ascendants (A) page of person ``i``.
+
+    ``v`` is the number of generations (``DEFAULT_GENERATIONS`` by default,
+    at most ``MAX_GENERATIONS``) and ``pg`` the page, for the widest
+    trees.
+    """
+    g.locale = lang
+    person_id = request.args.get('i', type=int)
+    generations = request.args.get('v', DEFAULT_GENERATIONS, type=int)
+    page = request.args.get('pg', 1, type=int)
+    if person_id is None or generations < 1 or page < 1:
+        return render_template("gwd/bad_request.html", base=base, lang=lang)
+
+    try:
+        db_service = get_db_service(base)
+    except FileNotFoundError:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    person_repo = PersonRepository(db_service)
+    root = person_repo.get_person_summaries([person_id]).get(person_id)
+    if root is None:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    generations = min(generations, MAX_GENERATIONS)
+    result = ascendants_page(
+        graph_registry.get(db_service), person_repo, person_id,
+        generations, page)
+
+    return render_template(
+        "gwd/ascendants.html",
+        base=base,
+        lang=lang,
+        root=root,
+        generations=generations,
+        result=result,
+    )
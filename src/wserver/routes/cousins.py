@@ -0,0 +1,62 @@
+from flask import g, render_template, request
+
+from repositories.cousins import MAX_GENERATIONS, CousinTable, cousins_page
+from repositories.person_repository import PersonRepository
+from .db_utils import get_db_service
+
+# Generations up and down of the table when the request does not say
+DEFAULT_GENERATIONS = 3
+
+
+def implem_route_C(base: str, lang: str = "en"):
+    """Render the cousins (C) page of person ``i``.
+
+    Without ``v1`` and ``v2``, the page is a table of how many cousins the
+    person has ``v1`` generations up and ``v2`` down, for every level up to
+    ``v`` (``DEFAULT_GENERATIONS`` by default, at most
+    ``MAX_GENERATIONS``). With them, it lists the cousins of that level,
+    ``pg`` being the page.
+    """
+    g.locale = lang
+    person_id = request.args.get('i', type=int)
+    generations = request.args.get('v', DEFAULT_GENERATIONS, type=int)
+    up = request.args.get('v1', type=int)
+    down = request.args.get('v2', up, type=int)
+    page = request.args.get('pg', 1, type=int)
+    if (person_id is None or generations < 1 or page < 1
+            or (up is None) != (down is None)
+            or (up is not None and down is not None
+                and (up < 1 or down < 1))):
+        return render_template("gwd/bad_request.html", base=base, lang=lang)
+
+    try:
+        db_service = get_db_service(base)
+    except FileNotFoundError:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    person_repo = PersonRepository(db_service)
+    root = person_repo.get_person_summaries([person_id]).get(person_id)
+    if root is None:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    if up is None or down is None:
+        generations = min(generations, MAX_GENERATIONS)
+        table = CousinTable(person_repo, person_id, generations, generations)
+        return render_template(
+            "gwd/cousins.html",
+            base=base,
+            lang=lang,
+            root=root,
+            counts=table.counts(),
+            result=None,
+        )
+
+    table = CousinTable(person_repo, person_id, up, down)
+    return render_template(
+        "gwd/cousins.html",
+        base=base,
+        lang=lang,
+        root=root,
+        counts=None,
+        result=cousins_page(table, up, down, page),
+    )
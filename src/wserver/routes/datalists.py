@@ -0,0 +1,43 @@
+"""
+Value lists the person and family forms offer as ``<datalist>`` elements.
+
+The forms only hold empty datalists: as a field is typed in, its list is
+filled with the values of the base starting with what the field holds,
+asked to the ``DATALIST`` endpoint, instead of every value of the base
+being written into each form.
+"""
+
+from flask import jsonify, request
+
+from database.cached_value import CacheKind
+from repositories.cache_files_repository import CacheFilesRepository
+from .db_utils import get_db_service
+
+# Lists of the forms, by the ``data`` argument of the endpoint. The
+# ``list`` attribute of their fields is ``datalist_<data>``.
+DATALISTS = {
+    "fnames": CacheKind.FIRST_NAME,
+    "snames": CacheKind.SURNAME,
+    "places": CacheKind.PLACE,
+    "occupations": CacheKind.OCCUPATION,
+    "sources": CacheKind.SOURCE,
+    "titles": CacheKind.TITLE,
+}
+
+# Values sent for one prefix
+DATALIST_LIMIT = 50
+
+
+def implem_route_DATALIST(base: str):
+    """Values of the list ``data`` starting with ``s``, as a JSON array.
+    An unknown list or base gets an empty array: the field then simply
+    offers no suggestion."""
+    kind = DATALISTS.get(request.args.get("data", ""))
+    prefix = request.args.get("s", "")
+    if kind is None or not prefix.strip():
+        return jsonify([])
+    try:
+        cache_files = CacheFilesRepository(get_db_service(base))
+        return jsonify(cache_files.values(kind, prefix, DATALIST_LIMIT))
+    except FileNotFoundError:
+        return jsonify([])
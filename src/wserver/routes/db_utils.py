@@ -3,6 +3,9 @@ Database utility functions for Geneweb Flask routes.
 """
 
 import os
+from typing import Dict
+
+from database.engine_registry import engine_registry
 from database.sqlite_database_service import SQLiteDatabaseService
 
 
@@ -32,6 +35,11 @@ def _import_all_models() -> None:
         import database.person_titles  # noqa: F401
         import database.family_event  # noqa: F401
         import database.family_events  # noqa: F401
+        import database.name_index  # noqa: F401
+        import database.name_count  # noqa: F401
+        import database.name_initial_count  # noqa: F401
+        import database.cached_value  # noqa: F401
+        import database.place_event  # noqa: F401
         # Optional extras if present
         try:
             import database.family_event_witness  # noqa: F401
@@ -44,6 +52,15 @@ def _import_all_models() -> None:
         pass
 
 
+def get_db_path(base: str) -> str:
+    """Return the path of the SQLite file of the given base name."""
+    # Get the project root (3 levels up from this file)
+    current_file = os.path.abspath(__file__)
+    project_root = os.path.dirname(os.path.dirname(
+        os.path.dirname(os.path.dirname(current_file))))
+    return os.path.join(project_root, 'bases', f'{base}.db')
+
+
 def get_db_service(base: str) -> SQLiteDatabaseService:
     """
     Return a connected SQLiteDatabaseService for the given base name.
@@ -51,18 +68,23 @@ def get_db_service(base: str) -> SQLiteDatabaseService:
 
     Note: This function imports all database models to ensure SQLAlchemy
     can properly initialize all mappers and resolve relationships.
+
+    The engine behind the returned service is shared with every other
+    request on the same base (see ``database.engine_registry``), so the
+    schema is only created once per process.
     """
-    # Get the project root (3 levels up from this file)
-    current_file = os.path.abspath(__file__)
-    project_root = os.path.dirname(os.path.dirname(
-        os.path.dirname(os.path.dirname(current_file))))
-    db_path = os.path.join(project_root, 'bases', f'{base}.db')
+    db_path = get_db_path(base)
     if not os.path.exists(db_path):
         raise FileNotFoundError(
             f"Database for base '{base}' not found. Expected at: {db_path}"
         )
-    db_service = SQLiteDatabaseService(database_path=db_path)
+    db_service = SQLiteDatabaseService(database_path=db_path, shared=True)
     # Ensure models are registered before connecting/creating metadata
     _import_all_models()
     db_service.connect()
     return db_service
+
+
+def get_db_registry_stats() -> Dict[str, int]:
+    """Return hit/miss/invalidation counters of the shared engine registry."""
+    return engine_registry.stats()
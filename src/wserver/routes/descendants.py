@@ -0,0 +1,43 @@
+from flask import Response, g, render_template, request, stream_template
+
+from repositories.descendants import MAX_GENERATIONS, DescendantsPage
+from repositories.person_repository import PersonRepository
+from .db_utils import get_db_service
+
+# Generations shown when the request does not say
+DEFAULT_GENERATIONS = 3
+
+
+def implem_route_D(base: str, lang: str = "en"):
+    """Render the descendants (D) page of person ``i``.
+
+    ``v`` is the number of generations (``DEFAULT_GENERATIONS`` by default,
+    at most ``MAX_GENERATIONS``) and ``pg`` the page. The page is streamed:
+    each generation is sent as soon as it is loaded.
+    """
+    g.locale = lang
+    person_id = request.args.get('i', type=int)
+    generations = request.args.get('v', DEFAULT_GENERATIONS, type=int)
+    page = request.args.get('pg', 1, type=int)
+    if person_id is None or generations < 1 or page < 1:
+        return render_template("gwd/bad_request.html", base=base, lang=lang)
+
+    try:
+        db_service = get_db_service(base)
+    except FileNotFoundError:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    person_repo = PersonRepository(db_service)
+    root = person_repo.get_person_summaries([person_id]).get(person_id)
+    if root is None:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    generations = min(generations, MAX_GENERATIONS)
+    return Response(stream_template(
+        "gwd/descendants.html",
+        base=base,
+        lang=lang,
+        root=root,
+        generations=generations,
+        result=DescendantsPage(person_repo, person_id, generations, page),
+    ))
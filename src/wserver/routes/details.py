@@ -1,12 +1,13 @@
 from flask import render_template, request, g
 from repositories.person_repository import PersonRepository
 from repositories.family_repository import FamilyRepository
+from repositories.genealogy_graph import GenealogyGraph, graph_registry
 from wserver.routes.db_utils import get_db_service
 from libraries.date import CalendarDate, Calendar
 from libraries.death_info import Dead, DeadYoung, DeadDontKnowWhen
 from libraries.family import Divorced, Separated
 from libraries.events import FamMarriage, FamDivorce, FamSeparated
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import time
 from datetime import date as python_date
 
@@ -274,19 +275,39 @@ def get_family_info(
 def get_children_info(
     person,
     family_repo: FamilyRepository,
-    person_repo: PersonRepository
+    person_repo: PersonRepository,
+    graph: Optional[GenealogyGraph] = None
 ) -> List[Dict[str, Any]]:
-    """Extract children information from all families."""
+    """Extract children information from all families.
+
+    With ``graph``, the children IDs are read from the genealogy graph
+    instead of loading the families.
+    """
     children: List[Dict[str, Any]] = []
 
     if not person.families:
         return children
 
-    for family_id in person.families:
-        family = family_repo.get_family_by_id(family_id)
+    if graph is not None:
+        children_ids = {
+            family_id: graph.children(family_id)
+            for family_id in person.families
+        }
+    else:
+        families = family_repo.get_families_by_ids(person.families)
+        children_ids = {
+            family_id: families[family_id].children
+            for family_id in person.families
+        }
+    persons = person_repo.get_persons_by_ids(
+        child_id
+        for family_children in children_ids.values()
+        for child_id in family_children
+    )
 
-        for child_id in family.children:
-            child = person_repo.get_person_by_id(child_id)
+    for family_id in person.families:
+        for child_id in children_ids[family_id]:
+            child = persons[child_id]
 
             birth_year = None
             if child.birth_date:
@@ -329,11 +350,20 @@ def get_children_info(
 
 def get_witness_info(
     witness_id: int,
-    person_repo: PersonRepository
+    person_repo: PersonRepository,
+    prefetched: Optional[Dict[int, Any]] = None
 ) -> Dict[str, Any]:
-    """Extract witness information."""
+    """Extract witness information.
+
+    ``prefetched`` may hold persons already loaded through
+    ``PersonRepository.get_persons_by_ids``; the repository is only
+    queried for witnesses missing from it.
+    """
     try:
-        witness = person_repo.get_person_by_id(witness_id)
+        if prefetched is not None and witness_id in prefetched:
+            witness = prefetched[witness_id]
+        else:
+            witness = person_repo.get_person_by_id(witness_id)
 
         # Get witness birth and death years for date range
         witness_birth_year = None
@@ -376,6 +406,20 @@ def get_witness_info(
         return {}
 
 
+def _related_person_ids(person, families) -> List[int]:
+    """IDs of the spouses, children and event witnesses of ``families``,
+    so that they can be loaded in one batch."""
+    ids: List[int] = []
+    for family in families:
+        if family.parents.is_couple():
+            father_id, mother_id = family.parents.couple()
+            ids.append(mother_id if father_id == person.index else father_id)
+        ids.extend(family.children)
+        for fam_event in family.family_events:
+            ids.extend(witness_id for witness_id, _ in fam_event.witnesses)
+    return ids
+
+
 def get_sort_key(event: Dict[str, Any]) -> tuple:
     """Generate a sort key for timeline events based on their date."""
     date_obj = event.get('_sort_date')
@@ -418,8 +462,45 @@ def _extract_person_years(person):
     return birth_year, death_year
 
 
+def _ancestor_info(person) -> Dict[str, Any]:
+    birth_year, death_year = _extract_person_years(person)
+    return {
+        'id': person.index,
+        'first_name': person.first_name,
+        'surname': person.surname,
+        'birth_year': birth_year if birth_year is not None else '?',
+        'death_year': death_year if death_year is not None else '?',
+    }
+
+
+def _ancestor_tree(person_id, person_repo, graph: GenealogyGraph,
+                   max_depth):
+    """Build the tree of ``get_ancestor_recursive`` from the genealogy
+    graph, loading every person shown with a single batched query."""
+    ancestor_ids = graph.ancestors(person_id, max_depth - 1)
+    persons = person_repo.get_persons_by_ids([person_id, *ancestor_ids])
+
+    def build(current_id, depth):
+        person = persons.get(current_id)
+        if person is None:
+            return None
+        ancestor_info = _ancestor_info(person)
+        if depth + 1 < max_depth:
+            father_id, mother_id = graph.parents(current_id)
+            for key, parent_id in (('father', father_id),
+                                   ('mother', mother_id)):
+                if parent_id is not None:
+                    parent = build(parent_id, depth + 1)
+                    if parent is not None:
+                        ancestor_info[key] = parent
+        return ancestor_info
+
+    return build(person_id, 0)
+
+
 def get_ancestor_recursive(person_id, person_repo,
-                           family_repo, depth=0, max_depth=10):
+                           family_repo, depth=0, max_depth=10,
+                           graph: Optional[GenealogyGraph] = None):
     """
     Recursively get complete ancestor tree for a person.
 
@@ -429,6 +510,9 @@ def get_ancestor_recursive(person_id, person_repo,
         family_repo: Family repository
         depth: Current recursion depth
         max_depth: Maximum depth to prevent infinite loops
+        graph: Genealogy graph of the base; when given, the parents are
+               read from it and all the ancestors are loaded at once
+               instead of with two queries per ancestor
 
     Returns:
         Dictionary with person info and nested father/mother ancestors
@@ -436,20 +520,19 @@ def get_ancestor_recursive(person_id, person_repo,
     if person_id is None or depth >= max_depth:
         return None
 
+    if graph is not None:
+        try:
+            return _ancestor_tree(
+                person_id, person_repo, graph, max_depth - depth)
+        except Exception:
+            return None
+
     try:
         person = person_repo.get_person_by_id(person_id)
         if not person:
             return None
 
-        birth_year, death_year = _extract_person_years(person)
-
-        ancestor_info = {
-            'id': person.index,
-            'first_name': person.first_name,
-            'surname': person.surname,
-            'birth_year': birth_year if birth_year is not None else '?',
-            'death_year': death_year if death_year is not None else '?',
-        }
+        ancestor_info = _ancestor_info(person)
 
         # Recursively get parents if they exist
         father_ancestor = None
@@ -496,11 +579,15 @@ def get_ancestor_recursive(person_id, person_repo,
 def get_siblings_info(
     person,
     family_repo: FamilyRepository,
-    person_repo: PersonRepository
+    person_repo: PersonRepository,
+    graph: Optional[GenealogyGraph] = None
 ) -> List[Dict[str, Any]]:
     """
     Get information about person's siblings.
 
+    With ``graph``, the children of the parent family are read from the
+    genealogy graph instead of loading the family.
+
     Returns:
         List of siblings with their information
     """
@@ -511,15 +598,21 @@ def get_siblings_info(
         return siblings
 
     try:
-        parent_family = family_repo.get_family_by_id(person.ascend.parents)
+        if graph is not None:
+            children_ids = graph.children(person.ascend.parents)
+        else:
+            parent_family = family_repo.get_family_by_id(
+                person.ascend.parents)
 
-        if not parent_family:
-            return siblings
+            if not parent_family:
+                return siblings
+            children_ids = parent_family.children
 
         # Get all children from parent family (including the person themselves)
-        for child_id in parent_family.children:
+        persons = person_repo.get_persons_by_ids(children_ids)
+        for child_id in children_ids:
             try:
-                sibling = person_repo.get_person_by_id(child_id)
+                sibling = persons[child_id]
 
                 # Extract birth and death years
                 birth_year = None
@@ -649,8 +742,12 @@ def get_timeline_events(
 
     # Marriage events
     if person.families:
+        families = family_repo.get_families_by_ids(person.families)
+        persons = person_repo.get_persons_by_ids(
+            _related_person_ids(person, families.values()))
+
         for family_id in person.families:
-            family = family_repo.get_family_by_id(family_id)
+            family = families[family_id]
 
             # Get spouse
             spouse_id = None
@@ -660,7 +757,7 @@ def get_timeline_events(
                 spouse_id = (
                     mother_id if father_id == person.index else father_id
                 )
-                spouse = person_repo.get_person_by_id(spouse_id)
+                spouse = persons.get(spouse_id)
 
             if family.marriage_date:
                 marriage_display = ''
@@ -676,7 +773,8 @@ def get_timeline_events(
                             witness_id = witness_tuple[0]
                             witness_info = get_witness_info(
                                 witness_id,
-                                person_repo
+                                person_repo,
+                                persons
                             )
                             if witness_info:
                                 witnesses.append(witness_info)
@@ -706,7 +804,7 @@ def get_timeline_events(
 
             # Children births
             for child_id in family.children:
-                child = person_repo.get_person_by_id(child_id)
+                child = persons[child_id]
                 if child.birth_date:
                     child_display = ''
                     if isinstance(child.birth_date, CalendarDate):
@@ -776,7 +874,8 @@ def get_timeline_events(
                                 witness_id = witness_tuple[0]
                                 witness_info = get_witness_info(
                                     witness_id,
-                                    person_repo
+                                    person_repo,
+                                    persons
                                 )
                                 if witness_info:
                                     witnesses.append(witness_info)
@@ -1006,6 +1105,7 @@ def implem_gwd_details(base, lang="en"):
     person_id = request.args.get('i', type=int)
     person_first_name = request.args.get('p', type=str)
     person_surname = request.args.get('n', type=str)
+    person_occ = request.args.get('oc', 0, type=int)
 
     # Validate query parameters
     if person_id is None:
@@ -1030,15 +1130,10 @@ def implem_gwd_details(base, lang="en"):
         if person_id is not None:
             person = person_repo.get_person_by_id(person_id)
         elif person_first_name and person_surname:
-            # Try to find person by name
-            all_persons = person_repo.get_all_persons()
-            for p in all_persons:
-                if (
-                    p.first_name == person_first_name and
-                    p.surname == person_surname
-                ):
-                    person = p
-                    break
+            found_id = person_repo.find_by_key(
+                person_first_name, person_surname, person_occ)
+            if found_id is not None:
+                person = person_repo.get_person_by_id(found_id)
     except (ValueError, Exception):
         # Person not found or error occurred
         person = None
@@ -1056,14 +1151,16 @@ def implem_gwd_details(base, lang="en"):
     basic_info = get_person_basic_info(person)
     vital_events = get_person_vital_events(person)
     family_info = get_family_info(person, family_repo, person_repo)
-    children = get_children_info(person, family_repo, person_repo)
-    siblings = get_siblings_info(person, family_repo, person_repo)
+    graph = graph_registry.get(db_service)
+    children = get_children_info(person, family_repo, person_repo, graph)
+    siblings = get_siblings_info(person, family_repo, person_repo, graph)
     timeline_events = get_timeline_events(person, family_repo, person_repo)
     notes = get_notes(person, family_repo, person_repo)
     sources = get_sources(person, family_repo)
     # Get ancestor tree with depth=2 (parents and grandparents only)
     ancestor_tree = get_ancestor_recursive(
-        person.index, person_repo, family_repo, depth=0, max_depth=2
+        person.index, person_repo, family_repo, depth=0, max_depth=2,
+        graph=graph
     )
 
     # Pass nested structure directly to template
@@ -6,10 +6,18 @@ from .add_family import implem_route_ADD_FAM
 from .mod_individual import implem_route_MOD_IND
 from ..routes.gwd_root_impl import implem_route_gwd_root
 from .anm_impl import implem_route_ANM
-from .an_impl import implem_route_AN
+from .an_impl import implem_route_AD, implem_route_AM, implem_route_AN
 from .titles import route_titles
+from .places import PLACE_EVENT_ARGS, route_places_surnames
+from .ascendants import implem_route_A
+from .cousins import implem_route_C
+from .datalists import implem_route_DATALIST
+from .descendants import implem_route_D
+from .relationship import implem_route_R, implem_route_RL, implem_route_RLM
 from flask import Blueprint, request, g
 
+from ..page_cache import cached_page
+
 gwd_bp = Blueprint('gwd', __name__, url_prefix='/gwd')
 
 """
@@ -26,6 +34,7 @@ def gwd_homepage(base: str):
 
 
 @gwd_bp.route("<base>/search", methods=['GET', 'POST'])
+@cached_page()
 def gwd_search(base: str):
     lang = request.args.get("lang", "en")
     sort = request.args.get("sort", None)
@@ -33,10 +42,14 @@ def gwd_search(base: str):
     surname = request.args.get("surname", None)
     firstname = request.args.get("firstname", None)
     previous_url = request.args.get("previous_url", None)
-    return route_search(base, lang, sort, on, surname, firstname, previous_url)
+    letter = request.args.get("letter", None)
+    page = request.args.get("pg", 1, type=int)
+    return route_search(base, lang, sort, on, surname, firstname,
+                        previous_url, letter, page)
 
 
 @gwd_bp.route("<base>/titles", methods=['GET', 'POST'])
+@cached_page()
 def gwd_titles(base: str):
     lang = request.args.get("lang", "en")
     title = request.args.get("title", None)
@@ -46,6 +59,7 @@ def gwd_titles(base: str):
 
 
 @gwd_bp.route("<base>/fiefs", methods=['GET', 'POST'])
+@cached_page()
 def gwd_fiefs(base: str):
     lang = request.args.get("lang", "en")
     previous_url = request.args.get("previous_url", None)
@@ -58,11 +72,14 @@ def gwd_root():
 
 
 @gwd_bp.route('<base>/A/', methods=['GET', 'POST'])
+@cached_page()
 def route_A(base):
-    raise NotImplementedError("Route A not implemented yet")
+    lang = request.args.get('lang', 'en')
+    return implem_route_A(base, lang)
 
 
 @gwd_bp.route('<base>/details', methods=['GET', 'POST'], strict_slashes=False)
+@cached_page()
 def route_details(base):
     lang = request.args.get('lang', 'en')
     # Set g.locale for Flask-Babel to use
@@ -107,18 +124,21 @@ def route_ANM(base):
 
 
 @gwd_bp.route('<base>/AN/', methods=['GET', 'POST'])
+@cached_page(vary_by_day=True)
 def route_AN(base):
     return implem_route_AN(base)
 
 
 @gwd_bp.route('<base>/AD/', methods=['GET', 'POST'])
+@cached_page(vary_by_day=True)
 def route_AD(base):
-    raise NotImplementedError("Route AD not implemented yet")
+    return implem_route_AD(base)
 
 
 @gwd_bp.route('<base>/AM/', methods=['GET', 'POST'])
+@cached_page(vary_by_day=True)
 def route_AM(base):
-    raise NotImplementedError("Route AM not implemented yet")
+    return implem_route_AM(base)
 
 
 @gwd_bp.route('<base>/AS/', methods=['GET', 'POST'])
@@ -132,8 +152,10 @@ def route_AS_OK(base):
 
 
 @gwd_bp.route('<base>/C/', methods=['GET', 'POST'])
+@cached_page()
 def route_C(base):
-    raise NotImplementedError("Route C not implemented yet")
+    lang = request.args.get('lang', 'en')
+    return implem_route_C(base, lang)
 
 
 @gwd_bp.route('<base>/CAL/', methods=['GET', 'POST'])
@@ -187,8 +209,10 @@ def route_CONN_WIZ(base):
 
 
 @gwd_bp.route('<base>/D/', methods=['GET', 'POST'])
+@cached_page()
 def route_D(base):
-    raise NotImplementedError("Route D not implemented yet")
+    lang = request.args.get('lang', 'en')
+    return implem_route_D(base, lang)
 
 
 @gwd_bp.route('<base>/DAG/', methods=['GET', 'POST'])
@@ -196,6 +220,12 @@ def route_DAG(base):
     raise NotImplementedError("Route DAG not implemented yet")
 
 
+@gwd_bp.route('<base>/DATALIST/', methods=['GET'])
+@cached_page()
+def route_DATALIST(base):
+    return implem_route_DATALIST(base)
+
+
 @gwd_bp.route('<base>/DEL_FAM/', methods=['GET', 'POST'])
 def route_DEL_FAM(base):
     raise NotImplementedError("Route DEL_FAM not implemented yet")
@@ -447,8 +477,13 @@ def route_POP_PYR(base):
 
 
 @gwd_bp.route('<base>/PS/', methods=['GET', 'POST'])
+@cached_page()
 def route_PS(base):
-    raise NotImplementedError("Route PS not implemented yet")
+    lang = request.args.get('lang', 'en')
+    events = [arg for arg in PLACE_EVENT_ARGS
+              if request.args.get(arg) == 'on']
+    previous_url = request.args.get('previous_url', None)
+    return route_places_surnames(base, lang, events, previous_url)
 
 
 @gwd_bp.route('<base>/PPS/', methods=['GET', 'POST'])
@@ -458,7 +493,8 @@ def route_PPS(base):
 
 @gwd_bp.route('<base>/R/', methods=['GET', 'POST'])
 def route_R(base):
-    raise NotImplementedError("Route R not implemented yet")
+    lang = request.args.get('lang', 'en')
+    return implem_route_R(base, lang)
 
 
 @gwd_bp.route('<base>/REFRESH/', methods=['GET', 'POST'])
@@ -478,12 +514,14 @@ def route_RESET_IMAGE_C_OK(base):
 
 @gwd_bp.route('<base>/RL/', methods=['GET', 'POST'])
 def route_RL(base):
-    raise NotImplementedError("Route RL not implemented yet")
+    lang = request.args.get('lang', 'en')
+    return implem_route_RL(base, lang)
 
 
 @gwd_bp.route('<base>/RLM/', methods=['GET', 'POST'])
 def route_RLM(base):
-    raise NotImplementedError("Route RLM not implemented yet")
+    lang = request.args.get('lang', 'en')
+    return implem_route_RLM(base, lang)
 
 
 @gwd_bp.route('<base>/S/', methods=['GET', 'POST'])
@@ -1,4 +1,8 @@
+import re
+
 from flask import Blueprint, request, make_response
+from repositories.cache_files_repository import CacheFilesRepository
+from .db_utils import get_db_service
 from ..services.template_loader import TemplateService
 # Blueprint exposed for legacy gw setup endpoints
 gwsetup_bp = Blueprint('gwsetup', __name__, url_prefix='/gwsetup')
@@ -63,6 +67,26 @@ def route_gwc(lang):
 @gwsetup_bp.route('/gwu/<lang>', methods=['GET', 'POST'])
 def route_gwu(lang):
     return _render_setup("gwu.htm", lang)
+
+
+@gwsetup_bp.route('/cache_files/<lang>', methods=['GET', 'POST'])
+def route_cache_files(lang):
+    """Cache files form, or the computation of the cache files of the base
+    it submits (``anon``)."""
+    base = request.values.get("anon")
+    if not base:
+        return _render_setup("cache_files.htm", lang)
+    if not re.fullmatch(r"[A-Za-z0-9_\-]+", base):
+        return make_response("Invalid database name", 400,
+                             {"Content-Type": "text/plain"})
+    try:
+        db_service = get_db_service(base)
+    except FileNotFoundError as e:
+        return make_response(str(e), 404)
+    CacheFilesRepository(db_service).rebuild()
+    return _render_setup("cache_files_ok.htm", lang)
+
+
 # overview of the routes and endpoints will be refactor
 
 
@@ -15,11 +15,11 @@ def route_homepage(
     if not db_session:
         raise Exception("Could not get database session")
 
-    persons = db_service.get_all(db_session, Person)
+    total_persons = db_service.count(db_session, Person)
     return render_template(
         "gwd/homepage.html",
         base=base,
         lang=lang,
         previous_url=previous_url,
-        total_persons=len(persons)
+        total_persons=total_persons
     )
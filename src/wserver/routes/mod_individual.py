@@ -8,6 +8,7 @@ from datetime import date
 from typing import Optional, Dict, Any, List, Tuple
 import hashlib
 import json
+from .datalists import DATALISTS
 from .db_utils import get_db_service
 from database.sqlite_database_service import SQLiteDatabaseService
 from repositories.person_repository import PersonRepository
@@ -28,15 +29,7 @@ def find_person_by_name(
     Returns None if not found.
     """
     try:
-        all_persons = person_repo.get_all_persons()
-        for person in all_persons:
-            if (
-                person.first_name == first_name
-                and person.surname == surname
-                and person.occ == occ
-            ):
-                return person.index
-        return None
+        return person_repo.find_by_key(first_name, surname, occ)
     except Exception:
         return None
 
@@ -1628,6 +1621,7 @@ def implem_route_MOD_IND(base, id, lang="en"):
         "id": id,
         "lang": lang,
         "person": person,
+        "datalists": DATALISTS,
         "digest": digest,
         "wizard_message": None,  # Optional message from wizard
         "max_aliases": 10,  # Maximum number of alias fields to show
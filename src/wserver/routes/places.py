@@ -0,0 +1,45 @@
+from typing import Iterable, Optional
+from flask import g, render_template
+
+from database.place_event import PlaceEventKind
+from repositories.place_repository import PlaceRepository
+from .db_utils import get_db_service
+
+# Event kind of each event checkbox of the place pages
+PLACE_EVENT_ARGS = {
+    "bi": PlaceEventKind.BIRTH,
+    "ba": PlaceEventKind.BAPTISM,
+    "ma": PlaceEventKind.MARRIAGE,
+    "de": PlaceEventKind.DEATH,
+    "bu": PlaceEventKind.BURIAL,
+}
+
+
+def route_places_surnames(
+        base: str,
+        lang: str = "en",
+        events: Iterable[str] = (),
+        previous_url: Optional[str] = None):
+    """Surnames of the persons born, baptized, married, dead or buried at
+    each place (all of these events unless ``events`` selects some).
+
+    The places of a base built before they were split are not listed
+    until ``gwsetup database migrate`` splits them: a GET does not write.
+    """
+    g.locale = lang
+    checked = [arg for arg in PLACE_EVENT_ARGS if arg in events]
+    if not checked:
+        checked = list(PLACE_EVENT_ARGS)
+
+    places = PlaceRepository(get_db_service(base))
+    split = places.is_built()
+    return render_template(
+        "gwd/places_surnames.html",
+        base=base,
+        lang=lang,
+        previous_url=previous_url,
+        checked=checked,
+        split=split,
+        places=places.surnames_by_place(
+            PLACE_EVENT_ARGS[arg] for arg in checked) if split else [],
+    )
@@ -0,0 +1,97 @@
+from typing import List, Optional, Tuple
+
+from flask import g, render_template, request
+
+from repositories.genealogy_graph import graph_registry
+from repositories.person_repository import PersonRepository
+from repositories.relationship import (
+    RelationshipTimeout,
+    relationship_finder,
+)
+from .db_utils import get_db_service
+
+
+def _render_relationships(
+    base: str,
+    lang: str,
+    pairs: List[Tuple[int, int]],
+    ancestor: Optional[int] = None,
+):
+    """Render the relationship of every pair of ``pairs``, keeping only
+    the lines through ``ancestor`` when given."""
+    g.locale = lang
+    if not pairs:
+        return render_template("gwd/bad_request.html", base=base, lang=lang)
+
+    try:
+        db_service = get_db_service(base)
+    except FileNotFoundError:
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    graph = graph_registry.get(db_service)
+    if any(person not in graph for pair in pairs for person in pair):
+        return render_template("gwd/not_found.html", base=base, lang=lang)
+
+    finder = relationship_finder(graph)
+    relationships = []
+    timed_out = False
+    try:
+        for person1, person2 in pairs:
+            relationship = finder.find(person1, person2)
+            if ancestor is not None:
+                relationship = relationship._replace(ancestors=[
+                    common for common in relationship.ancestors
+                    if common.ancestor == ancestor
+                ])
+            relationships.append(relationship)
+    except RelationshipTimeout:
+        timed_out = True
+
+    person_ids = [person for pair in pairs for person in pair]
+    for relationship in relationships:
+        for common in relationship.ancestors:
+            for path in common.paths1 + common.paths2:
+                person_ids.extend(path)
+    persons = PersonRepository(db_service).get_person_summaries(person_ids)
+
+    return render_template(
+        "gwd/relationship.html",
+        base=base,
+        lang=lang,
+        relationships=relationships,
+        persons=persons,
+        timed_out=timed_out,
+    )
+
+
+def implem_route_R(base: str, lang: str = "en"):
+    """Relationship between persons ``i`` and ``ei``."""
+    person1 = request.args.get('i', type=int)
+    person2 = request.args.get('ei', type=int)
+    if person1 is None or person2 is None:
+        return _render_relationships(base, lang, [])
+    return _render_relationships(base, lang, [(person1, person2)])
+
+
+def implem_route_RL(base: str, lang: str = "en"):
+    """Lines between persons ``i1`` and ``i2``, only through ancestor
+    ``a`` when given."""
+    person1 = request.args.get('i1', type=int)
+    person2 = request.args.get('i2', type=int)
+    if person1 is None or person2 is None:
+        return _render_relationships(base, lang, [])
+    return _render_relationships(
+        base, lang, [(person1, person2)], request.args.get('a', type=int))
+
+
+def implem_route_RLM(base: str, lang: str = "en"):
+    """Relationships along the chain of persons ``i1``, ``i2``, ``i3``...
+    (each person with the next one)."""
+    persons: List[int] = []
+    while True:
+        person = request.args.get(f'i{len(persons) + 1}', type=int)
+        if person is None:
+            break
+        persons.append(person)
+    return _render_relationships(
+        base, lang, list(zip(persons, persons[1:])))
@@ -1,9 +1,40 @@
-from typing import Optional
+from typing import List, Optional, Sequence
 from flask import g, render_template
 
-from database.person import Person
+from database.name_index import NameKind
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.name_count_repository import NameCountRepository, NamePage
+from repositories.name_index_repository import (
+    FIRST_NAME_KINDS,
+    SURNAME_KINDS,
+    NameIndexRepository,
+)
+from repositories.person_repository import PersonRepository, PersonSummary
 from .db_utils import get_db_service
 
+# Persons listed when a name is only matched as a prefix
+PREFIX_MATCHES = 500
+
+
+def _find_persons(
+        db_service: SQLiteDatabaseService,
+        name: str,
+        kinds: Sequence[NameKind]) -> List[PersonSummary]:
+    """Persons with a name of ``kinds`` equal to ``name`` (ignoring case,
+    accents and punctuation), or starting with it when none is equal."""
+    index = NameIndexRepository(db_service)
+    ids = index.search(name, kinds) \
+        or index.search(name, kinds, prefix=True, limit=PREFIX_MATCHES)
+    return _load_persons(db_service, ids)
+
+
+def _load_persons(
+        db_service: SQLiteDatabaseService,
+        ids: List[int]) -> List[PersonSummary]:
+    """Summaries of the persons ``ids``, in that order."""
+    persons = PersonRepository(db_service).get_person_summaries(ids)
+    return [persons[i] for i in ids if i in persons]
+
 
 def route_search(
         base: str,
@@ -12,13 +43,12 @@ def route_search(
         on: Optional[str] = None,
         surname: Optional[str] = None,
         firstname: Optional[str] = None,
-        previous_url: Optional[str] = None):
+        previous_url: Optional[str] = None,
+        letter: Optional[str] = None,
+        page: int = 1):
 
     g.locale = lang
     db_service = get_db_service(base)
-    db_session = db_service.get_session()
-    if not db_session:
-        raise Exception("Could not get database session")
 
     # TODO: link to detail page
     # direct search
@@ -26,8 +56,23 @@ def route_search(
     #     person = db_service.get(db_session, Person, {
     #         "surname": surname, "first_name": firstname})
 
+    if sort is None and surname and firstname:
+        index = NameIndexRepository(db_service)
+        with_first_name = set(index.search(firstname, FIRST_NAME_KINDS))
+        persons = _load_persons(db_service, [
+            i for i in index.search(surname, SURNAME_KINDS)
+            if i in with_first_name
+        ])
+        return render_template(
+            "gwd/search_surname.html",
+            base=base,
+            lang=lang,
+            surname=f"{firstname} {surname}",
+            persons=persons,
+            total_persons=len(persons),
+            previous_url=previous_url)
     if sort is None and surname and (firstname is None or firstname == ""):
-        persons = db_service.get_all(db_session, Person, {"surname": surname})
+        persons = _find_persons(db_service, surname, SURNAME_KINDS)
         return render_template(
             "gwd/search_surname.html",
             base=base,
@@ -37,8 +82,7 @@ def route_search(
             total_persons=len(persons),
             previous_url=previous_url)
     if sort is None and firstname and (surname is None or surname == ""):
-        persons = db_service.get_all(
-            db_session, Person, {"first_name": firstname})
+        persons = _find_persons(db_service, firstname, FIRST_NAME_KINDS)
         return render_template(
             "gwd/search_firstname.html",
             base=base,
@@ -48,114 +92,33 @@ def route_search(
             total_persons=len(persons),
             previous_url=previous_url)
 
-    persons = db_service.get_all(db_session, Person)
-
-    if sort == "alpha" and on == "surname":
-        persons_sorted = sorted(
-            persons,
-            key=lambda p: ((p.surname or "").lower(),
-                           (p.first_name or "").lower()),
-        )
-        groups: dict[str, list[Person]] = {}
-        for p in persons_sorted:
-            initial = (p.surname or "").strip()[:1].lower()
-            if not initial or not initial.isalpha():
-                initial = "#"
-            groups.setdefault(initial, []).append(p)
-
-        letters = sorted([letter for letter in groups.keys() if letter != "#"])
-        if "#" in groups:
-            letters.append("#")
-
-        persons_grouped = [{"letter": letter, "persons": groups[letter]}
-                           for letter in letters]
-
-        return render_template(
-            "gwd/search_surnames_alpha.html",
-            base=base,
-            lang=lang,
-            previous_url=previous_url,
-            persons_grouped=persons_grouped,
-            total_persons=len(persons_sorted),
-            total_surnames=len(groups),
-        )
-
-    if sort == "freq" and on == "surname":
-        surname_groups: dict[str, list[Person]] = {}
-        for p in persons:
-            key = (p.surname or "").strip()
-            surname_groups.setdefault(key, []).append(p)
-        sorted_items = sorted(
-            surname_groups.items(),
-            key=lambda kv: (-len(kv[1]), (kv[0] or "").lower()),
-        )
-        persons_by_surname = [
-            {"surname": name, "count": len(lst), "persons": lst}
-            for name, lst in sorted_items
-        ]
-
-        return render_template(
-            "gwd/search_surnames_freq.html",
-            base=base,
-            lang=lang,
-            previous_url=previous_url,
-            persons_grouped=persons_by_surname,
-            total_persons=len(persons),
-            total_surnames=len(surname_groups),
-        )
-
-    if sort == "alpha" and on == "firstname":
-        persons_sorted = sorted(
-            persons,
-            key=lambda p: ((p.first_name or "").lower(),
-                           (p.surname or "").lower()),
-        )
-        groups = {}
-        for p in persons_sorted:
-            initial = (p.first_name or "").strip()[:1].lower()
-            if not initial or not initial.isalpha():
-                initial = "#"
-            groups.setdefault(initial, []).append(p)
-
-        letters = sorted([letter for letter in groups.keys() if letter != "#"])
-        if "#" in groups:
-            letters.append("#")
-
-        persons_grouped = [{"letter": letter, "persons": groups[letter]}
-                           for letter in letters]
-
-        return render_template(
-            "gwd/search_firstnames_alpha.html",
-            base=base,
-            lang=lang,
-            previous_url=previous_url,
-            persons_grouped=persons_grouped,
-            total_persons=len(persons_sorted),
-            total_firstnames=len(groups),
-        )
-
-    if sort == "freq" and on == "firstname":
-        firstname_groups: dict[str, list[Person]] = {}
-        for p in persons:
-            key = (p.first_name or "").strip()
-            firstname_groups.setdefault(key, []).append(p)
-
-        sorted_items = sorted(
-            firstname_groups.items(),
-            key=lambda kv: (-len(kv[1]), (kv[0] or "").lower())
-        )
-        persons_by_firstname = [
-            {"firstname": name, "count": len(lst), "persons": lst}
-            for name, lst in sorted_items
-        ]
-
-        return render_template(
-            "gwd/search_firstnames_freq.html",
-            base=base,
-            lang=lang,
-            previous_url=previous_url,
-            persons_grouped=persons_by_firstname,
-            total_persons=len(persons),
-            total_firstnames=len(firstname_groups),
-        )
-    return "Error: missing surname and/or firstname", 400
+    if sort not in ("alpha", "freq") or on not in ("surname", "firstname"):
+        return "Error: missing surname and/or firstname", 400
+
+    kind = NameKind.SURNAME if on == "surname" else NameKind.FIRST_NAME
+    template = "gwd/search_{}s_{}.html".format(on, sort)
+    counts = NameCountRepository(db_service)
+    initials = counts.initials(kind)
+    total_names = sum(bucket.names for bucket in initials)
+    total_persons = sum(bucket.persons for bucket in initials)
+
+    if sort == "alpha":
+        known = [bucket.initial for bucket in initials]
+        if letter not in known:
+            letter = known[0] if known else None
+        names = counts.names_by_initial(kind, letter, page) \
+            if letter is not None else NamePage([], 1, 1)
+    else:
+        names = counts.most_frequent(kind, page)
+
+    return render_template(
+        template,
+        base=base,
+        lang=lang,
+        previous_url=previous_url,
+        initials=initials,
+        letter=letter,
+        names=names,
+        total_names=total_names,
+        total_persons=total_persons,
+    )
@@ -4,6 +4,7 @@ from flask import g, render_template
 from database.titles import Titles
 from database.person_titles import PersonTitles
 from database.person import Person
+from repositories.person_repository import PersonRepository
 from .db_utils import get_db_service
 
 
@@ -29,13 +30,17 @@ def route_titles(
         titles = q.all()
         if len(titles) == 1:
             the_title = titles[0]
-            persons = (
-                db_session.query(Person)
+            person_ids = [
+                row[0] for row in
+                db_session.query(Person.id)
                 .join(PersonTitles, Person.id == PersonTitles.person_id)
                 .filter(PersonTitles.title_id == the_title.id)
                 .order_by(Person.surname, Person.first_name)
                 .all()
-            )
+            ]
+            summaries = PersonRepository(db_service).get_person_summaries(
+                person_ids)
+            persons = [summaries[i] for i in person_ids if i in summaries]
 
             return render_template(
                 "gwd/title_detail.html",
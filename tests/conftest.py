@@ -0,0 +1,79 @@
+"""Fixtures shared by the tests that work on a base compiled by gwc."""
+
+from unittest.mock import patch
+
+import pytest
+
+from database.engine_registry import engine_registry
+from database.sqlite_database_service import SQLiteDatabaseService
+from script.gwc import GwcArguments, gwc_main
+
+
+@pytest.fixture(scope="session")
+def gwc():
+    """``gwc(out_file, files, **options)``: run gwc on the ``files`` into
+    ``out_file`` and return its exit code. The options are those of the
+    command line by default."""
+    def run(out_file, files, **options):
+        arguments = dict(
+            out_file=out_file,
+            input_file_data=[],
+            separate=False,
+            bnotes="merge",
+            shift=0,
+            files=[str(file) for file in files],
+            verbose=False,
+            no_fail=False,
+            stats=False,
+            f=True,
+            cg=False,
+            ds="",
+            particles="",
+            nc=False,
+        )
+        arguments.update(options)
+        return gwc_main(GwcArguments(**arguments), lambda: None)
+    return run
+
+
+@pytest.fixture
+def compile_gw(tmp_path, gwc):
+    """``compile_gw(content, name="family", **options)``: compile the gw
+    ``content`` into a new base of ``tmp_path`` and return its path."""
+    paths = []
+
+    def compile(content, name="family", **options):
+        gw_file = tmp_path / f"{name}.gw"
+        gw_file.write_text(content, encoding="utf-8")
+        path = str(tmp_path / f"{name}.db")
+        assert gwc(path, [gw_file], **options) == 0
+        paths.append(path)
+        return path
+
+    yield compile
+    for path in paths:
+        engine_registry.invalidate(path)
+
+
+@pytest.fixture
+def db_service(db_path):
+    """Connected service on the ``db_path`` base of the test module."""
+    service = SQLiteDatabaseService(db_path)
+    service.connect()
+    yield service
+    service.disconnect()
+
+
+@pytest.fixture
+def client(db_path):
+    """Flask test client whose bases all are the ``db_path`` base of the
+    test module."""
+    from wserver import create_app
+    from wserver.page_cache import page_cache
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch('wserver.routes.db_utils.get_db_path', lambda base: db_path):
+        with app.test_client() as client:
+            yield client
+    page_cache.clear()
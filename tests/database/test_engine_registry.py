@@ -0,0 +1,167 @@
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+
+from database.engine_registry import EngineRegistry
+from database.sqlite_database_service import SQLiteDatabaseService
+from database.person import Person
+
+
+@pytest.fixture
+def registry():
+    reg = EngineRegistry()
+    yield reg
+    reg.clear()
+
+
+def test_first_get_is_a_miss_and_creates_schema(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+
+    engine, _ = registry.get(db_path)
+
+    assert registry.stats()["misses"] == 1
+    assert registry.stats()["hits"] == 0
+    assert os.path.exists(db_path)
+    assert Person.__tablename__ in inspect(engine).get_table_names()
+
+
+def test_second_get_reuses_engine(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+
+    engine1, maker1 = registry.get(db_path)
+    engine2, maker2 = registry.get(db_path)
+
+    assert engine1 is engine2
+    assert maker1 is maker2
+    assert registry.stats() == {
+        "entries": 1, "hits": 1, "misses": 1, "invalidations": 0}
+
+
+def test_relative_and_absolute_paths_share_entry(
+        tmp_path, registry, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    engine1, _ = registry.get("base.db")
+    engine2, _ = registry.get(str(tmp_path / "base.db"))
+
+    assert engine1 is engine2
+
+
+def test_deleted_file_invalidates_entry(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    engine1, _ = registry.get(db_path)
+
+    os.remove(db_path)
+    engine2, _ = registry.get(db_path)
+
+    assert engine1 is not engine2
+    assert registry.stats()["invalidations"] == 1
+    assert registry.stats()["misses"] == 2
+
+
+def test_replaced_file_invalidates_entry(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    other_path = str(tmp_path / "other.db")
+    engine1, _ = registry.get(db_path)
+    SQLiteDatabaseService(other_path).connect()
+
+    os.replace(other_path, db_path)
+    engine2, _ = registry.get(db_path)
+
+    assert engine1 is not engine2
+    assert registry.stats()["invalidations"] == 1
+
+
+def test_explicit_invalidate(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    registry.get(db_path)
+
+    assert registry.invalidate(db_path) is True
+    assert registry.invalidate(db_path) is False
+    assert registry.stats()["entries"] == 0
+
+
+def test_shared_service_disconnect_keeps_engine(tmp_path, monkeypatch):
+    import database.sqlite_database_service as service_module
+
+    registry = EngineRegistry()
+    monkeypatch.setattr(service_module, "engine_registry", registry)
+    db_path = str(tmp_path / "base.db")
+
+    first = SQLiteDatabaseService(db_path, shared=True)
+    first.connect()
+    first.disconnect()
+    second = SQLiteDatabaseService(db_path, shared=True)
+    second.connect()
+
+    session = second.get_session()
+    assert session is not None
+    assert second.get_all(session, Person) == []
+    session.close()
+    assert registry.stats()["hits"] == 1
+    assert registry.stats()["misses"] == 1
+    registry.clear()
+
+
+def test_version_changes_only_on_committed_writes(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    assert registry.version(db_path) is None
+    _, make_session = registry.get(db_path)
+    before = registry.version(db_path)
+    assert before is not None
+
+    session = make_session()
+    session.query(Person).all()
+    session.commit()
+    assert registry.version(db_path) == before
+
+    session.execute(Person.__table__.delete())
+    session.rollback()
+    assert registry.version(db_path) == before
+
+    session.execute(Person.__table__.delete())
+    session.commit()
+    session.close()
+    after = registry.version(db_path)
+    assert after is not None and after != before
+    assert after[0] == before[0]
+
+
+def test_version_follows_writes_from_other_connections(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    registry.get(db_path)
+    before = registry.version(db_path)
+
+    # As consang or another worker would
+    connection = sqlite3.connect(db_path)
+    connection.execute('DELETE FROM "Person"')
+    connection.execute('INSERT INTO "BuiltTable" VALUES (?)', ("Test",))
+    connection.commit()
+    connection.close()
+
+    after = registry.version(db_path)
+    assert after is not None and after != before
+    assert after[0] == before[0]
+
+
+def test_version_is_kept_across_restarts(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    registry.get(db_path)
+    before = registry.version(db_path)
+
+    restarted = EngineRegistry()
+    restarted.get(db_path)
+    assert restarted.version(db_path) == before
+    restarted.clear()
+
+
+def test_version_is_none_once_file_is_replaced(tmp_path, registry):
+    db_path = str(tmp_path / "base.db")
+    other_path = str(tmp_path / "other.db")
+    registry.get(db_path)
+    open(other_path, "wb").close()
+    os.replace(other_path, db_path)
+
+    assert registry.version(db_path) is None
@@ -0,0 +1,209 @@
+import sqlite3
+
+from sqlalchemy import create_engine, inspect
+
+from database import Base
+import libraries.date
+from database.migrations import (
+    ensure_columns, ensure_indexes, missing_indexes)
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.converter_to_db import convert_date_to_db
+
+
+def _declared_indexes():
+    return {
+        str(index.name)
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+
+
+def _make_legacy_base(db_path):
+    """Create a base with the current tables but none of the indexes, as
+    written by versions that did not declare them."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    connection = sqlite3.connect(db_path)
+    for name in _declared_indexes():
+        connection.execute(f'DROP INDEX "{name}"')
+    connection.commit()
+    connection.close()
+
+
+def test_fresh_database_has_all_indexes(tmp_path):
+    service = SQLiteDatabaseService(str(tmp_path / "base.db"))
+    service.connect()
+
+    assert missing_indexes(service._engine) == []
+    person_indexes = {
+        ix["name"]: ix["column_names"]
+        for ix in inspect(service._engine).get_indexes("Person")
+    }
+    assert person_indexes["ix_Person_surname_first_name_occ"] == [
+        "surname", "first_name", "occ"]
+    service.disconnect()
+
+
+def test_ensure_indexes_upgrades_legacy_database(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    _make_legacy_base(db_path)
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    assert set(missing_indexes(engine)) == _declared_indexes()
+    created = ensure_indexes(engine)
+
+    assert set(created) == _declared_indexes()
+    assert missing_indexes(engine) == []
+    assert ensure_indexes(engine) == []
+    engine.dispose()
+
+
+def test_connect_migrates_legacy_database(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    _make_legacy_base(db_path)
+
+    service = SQLiteDatabaseService(db_path)
+    service.connect()
+
+    assert missing_indexes(service._engine) == []
+    service.disconnect()
+
+
+def test_witness_lookup_uses_index(tmp_path):
+    service = SQLiteDatabaseService(str(tmp_path / "base.db"))
+    service.connect()
+
+    with service._engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            'EXPLAIN QUERY PLAN SELECT * FROM "PersonEventWitness" '
+            "WHERE person_id = 1"
+        ).fetchall()
+
+    assert any("USING INDEX" in str(row) for row in plan)
+    service.disconnect()
+
+
+def test_duplicate_keys_are_indexed(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    _make_legacy_base(db_path)
+    connection = sqlite3.connect(db_path)
+    columns = [
+        column.name for column in Base.metadata.tables["Person"].columns
+        if column.name != "id"
+    ]
+    values = {name: "" for name in columns}
+    values.update(first_name="Jean", surname="Dupont", occ=0,
+                  sex="MALE", access_right="PUBLIC",
+                  death_status="DONT_KNOW_IF_DEAD",
+                  burial_status="UNKNOWN_BURIAL")
+    for name in ("birth_date", "baptism_date", "death_date", "burial_date",
+                 "death_reason", "ascend_id", "families_id"):
+        values[name] = None
+    for _ in range(2):
+        connection.execute(
+            f'INSERT INTO "Person" ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" for _ in columns)})',
+            [values[name] for name in columns])
+    connection.commit()
+    connection.close()
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    assert "ix_Person_surname_first_name_occ" in ensure_indexes(engine)
+    assert missing_indexes(engine) == []
+    engine.dispose()
+
+
+def test_added_date_columns_are_filled(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    _make_legacy_base(db_path)
+    dates = [
+        libraries.date.CalendarDate(
+            dmy=libraries.date.DateValue(day, month, year, prec, delta),
+            cal=libraries.date.Calendar.GREGORIAN)
+        for day, month, year, prec, delta in (
+            (17, 10, 1905, libraries.date.Sure(), 0),
+            (0, 3, 1820, libraries.date.After(), 0),
+            (0, 0, 1700, libraries.date.About(), 0),
+            (2, 1, 1750, libraries.date.Maybe(), 3),
+            (1, 1, 1600, libraries.date.YearInt(
+                date_value=libraries.date.DateValue(1, 1, 1610, None)), 0),
+        )
+    ]
+    connection = sqlite3.connect(db_path)
+    connection.execute('ALTER TABLE "Date" DROP COLUMN ymd')
+    connection.execute('ALTER TABLE "Date" DROP COLUMN compressed')
+    for date in dates:
+        row = convert_date_to_db(date)
+        precision = row.precision_obj
+        precision_id = connection.execute(
+            'INSERT INTO "Precision" (precision_level, calendar) '
+            "VALUES (?, 'GREGORIAN')",
+            (precision.precision_level.name,)).lastrowid
+        connection.execute(
+            'INSERT INTO "Date" (iso_date, calendar, precision_id, delta) '
+            "VALUES (?, 'GREGORIAN', ?, ?)",
+            (row.iso_date, precision_id, row.delta))
+    connection.commit()
+    connection.close()
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    assert ensure_columns(engine) == ["Date.ymd", "Date.compressed"]
+    assert ensure_columns(engine) == []
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            'SELECT ymd, compressed FROM "Date" ORDER BY id').fetchall()
+    assert rows == [
+        (convert_date_to_db(date).ymd, convert_date_to_db(date).compressed)
+        for date in dates
+    ]
+    engine.dispose()
+
+
+PACKED_COLUMNS = {
+    "Person": ("birth_date_compressed", "baptism_date_compressed",
+               "death_date_compressed", "burial_date_compressed"),
+    "Family": ("marriage_date_compressed", "divorce_date_compressed"),
+}
+
+
+def _packed_columns(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return {
+            table: connection.execute(
+                f'SELECT {", ".join(columns)} FROM "{table}" '
+                'ORDER BY id').fetchall()
+            for table, columns in PACKED_COLUMNS.items()
+        }
+    finally:
+        connection.close()
+
+
+def test_packed_date_columns_are_filled(compile_gw):
+    db_path = compile_gw("""encoding: utf-8
+
+fam Dupont Jean 12/5/1850 1/2/1920J +3/6/1875 Martin Anne ~1852 1930
+beg
+- h Luc 1880
+end
+""")
+    written = _packed_columns(db_path)
+    # The Gregorian dates are packed, not the Julian one
+    assert sum(
+        value is not None
+        for row in written["Person"] for value in row) == 4
+    assert written["Family"][0][0] is not None
+    connection = sqlite3.connect(db_path)
+    for table, columns in PACKED_COLUMNS.items():
+        for column in columns:
+            connection.execute(f'ALTER TABLE "{table}" DROP COLUMN {column}')
+    connection.commit()
+    connection.close()
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    assert ensure_columns(engine) == [
+        f"{table}.{column}"
+        for table, columns in PACKED_COLUMNS.items() for column in columns]
+    engine.dispose()
+    assert _packed_columns(db_path) == written
@@ -380,6 +380,77 @@ class TestSQLiteDatabaseService:
         assert len(result) == 0
         db_session.close()
 
+    def test_get_all_has_no_default_limit(self, connected_db_service: SQLiteDatabaseService, test_person: Person):
+        db_session: Optional[Session] = connected_db_service.get_session()
+        assert db_session is not None
+
+        connected_db_service.add_all(db_session, _copies(test_person, 150))
+        connected_db_service.apply(db_session)
+
+        result = connected_db_service.get_all(db_session, Person)
+        assert len(result) == 150
+        db_session.close()
+
+    # === Iterate and count ===
+
+    def test_iter_all_with_none_session(self, connected_db_service: SQLiteDatabaseService):
+        assert list(connected_db_service.iter_all(None, Person)) == []  # type: ignore
+
+    def test_iter_all_walks_every_batch_in_key_order(self, connected_db_service: SQLiteDatabaseService, test_person: Person):
+        db_session: Optional[Session] = connected_db_service.get_session()
+        assert db_session is not None
+
+        connected_db_service.add_all(db_session, _copies(test_person, 25))
+        connected_db_service.apply(db_session)
+
+        result = list(connected_db_service.iter_all(
+            db_session, Person, batch_size=10))
+        assert [p.id for p in result] == sorted(p.id for p in result)
+        assert len(result) == 25
+
+        # Exact multiple of the batch size
+        result = list(connected_db_service.iter_all(
+            db_session, Person, batch_size=5))
+        assert len(result) == 25
+        db_session.close()
+
+    def test_iter_all_with_filter(self, connected_db_service: SQLiteDatabaseService, test_person: Person, test_person2: Person):
+        db_session: Optional[Session] = connected_db_service.get_session()
+        assert db_session is not None
+
+        connected_db_service.add_all(
+            db_session, _copies(test_person, 7) + [test_person2])
+        connected_db_service.apply(db_session)
+
+        result = list(connected_db_service.iter_all(
+            db_session, Person, {"surname": "Carter"}, batch_size=3))
+        assert len(result) == 7
+        assert all(p.surname == "Carter" for p in result)
+        db_session.close()
+
+    def test_iter_all_rejects_invalid_batch_size(self, connected_db_service: SQLiteDatabaseService):
+        db_session: Optional[Session] = connected_db_service.get_session()
+        assert db_session is not None
+
+        with pytest.raises(ValueError):
+            next(connected_db_service.iter_all(db_session, Person, batch_size=0))
+        db_session.close()
+
+    def test_count(self, connected_db_service: SQLiteDatabaseService, test_person: Person, test_person2: Person):
+        db_session: Optional[Session] = connected_db_service.get_session()
+        assert db_session is not None
+
+        assert connected_db_service.count(db_session, Person) == 0
+        connected_db_service.add_all(
+            db_session, _copies(test_person, 120) + [test_person2])
+        connected_db_service.apply(db_session)
+
+        assert connected_db_service.count(db_session, Person) == 121
+        assert connected_db_service.count(
+            db_session, Person, {"surname": "Carter"}) == 120
+        assert connected_db_service.count(None, Person) == 0  # type: ignore
+        db_session.close()
+
     # === Refresh objects ===
 
     def test_refresh_with_none_session(self, connected_db_service: SQLiteDatabaseService, test_person: Person):
@@ -441,3 +512,11 @@ class TestSQLiteDatabaseService:
         assert result is not None
         db_session3.close()
         db_session.close()
+
+
+def _copies(person: Person, n: int) -> list[Person]:
+    columns = [c.key for c in Person.__table__.columns if c.key != "id"]
+    return [
+        Person(**{key: getattr(person, key) for key in columns})
+        for _ in range(n)
+    ]
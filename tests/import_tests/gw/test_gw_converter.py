@@ -628,6 +628,88 @@ class TestConvertAll:
         assert len(converter.notes) == 1
 
 
+class TestConvertStream:
+    """Test converting blocks while they are produced."""
+
+    @staticmethod
+    def _family_block(person, index):
+        family = Family[int, Person[int, int, str, int], str](
+            index=index,
+            marriage_date=None,
+            marriage_place="",
+            marriage_note="",
+            marriage_src="",
+            witnesses=[],
+            relation_kind=MaritalStatus.MARRIED,
+            divorce_status=NotDivorced(),
+            family_events=[],
+            comment="",
+            origin_file="test.gw",
+            src="",
+            parents=Parents([person]),
+            children=[],
+        )
+        return FamilyGwSyntax(
+            couple=Parents([SomebodyDefined(person=person)]),
+            father_sex=Sex.MALE,
+            mother_sex=Sex.FEMALE,
+            witnesses=[],
+            events=[],
+            family=family,
+            descend=[],
+        )
+
+    def _blocks(self, simple_person, another_person):
+        return [
+            self._family_block(simple_person, 0),
+            NotesGwSyntax(key=Key("John", "Doe", 0), content="Notes"),
+            self._family_block(another_person, 1),
+        ]
+
+    def test_convert_stream_matches_convert_all(
+        self, simple_person, another_person
+    ):
+        """Streaming yields the families convert_all would keep."""
+        eager = GwConverter()
+        eager.convert_all(self._blocks(simple_person, another_person))
+
+        streaming = GwConverter()
+        families = list(streaming.convert_stream(
+            iter(self._blocks(simple_person, another_person))))
+
+        assert [f.index for f in families] == [
+            f.index for f in eager.get_all_families()]
+        assert [p.index for p in streaming.get_enriched_persons()] == [
+            p.index for p in eager.get_enriched_persons()]
+        assert streaming.get_statistics() == eager.get_statistics()
+
+    def test_convert_stream_is_lazy(self, simple_person, another_person):
+        """A family is yielded before the following blocks are read."""
+        consumed = []
+
+        def blocks():
+            for block in self._blocks(simple_person, another_person):
+                consumed.append(block)
+                yield block
+
+        converter = GwConverter()
+        stream = converter.convert_stream(blocks())
+        next(stream)
+
+        assert len(consumed) == 1
+
+    def test_convert_stream_drains_families(
+        self, simple_person, another_person
+    ):
+        """Yielded families are not kept by the converter."""
+        converter = GwConverter()
+        list(converter.convert_stream(
+            self._blocks(simple_person, another_person)))
+
+        assert converter.get_all_families() == []
+        assert converter.drain_families() == []
+
+
 class TestGetMethods:
     """Test getter methods."""
 
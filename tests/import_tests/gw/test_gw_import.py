@@ -1,9 +1,11 @@
 import os
 import tempfile
+import types
 from typing import cast
 
 from script.gw_parser import (
     SomebodyUndefined,
+    iter_gw_file,
     parse_gw_file,
     FamilyGwSyntax,
     NotesGwSyntax,
@@ -761,3 +763,55 @@ def test_family_events_named_custom():
     assert 'FamMarriage' in event_tags
     # Custom events should be parsed as FamNamedEvent
     assert 'FamNamedEvent' in event_tags
+
+
+def _structure(obj):
+    """Comparable view of parsed blocks, whose library types do not all
+    define equality."""
+    if isinstance(obj, (list, tuple)):
+        return [_structure(o) for o in obj]
+    if isinstance(obj, dict):
+        return {k: _structure(v) for k, v in obj.items()}
+    if hasattr(obj, "__dict__"):
+        return (type(obj).__name__, _structure(vars(obj)))
+    return obj
+
+
+def test_iter_gw_file_yields_the_blocks_of_parse_gw_file():
+    """The lazy parser produces the same blocks, one at a time."""
+    path = write_temp_gw(MIXED_CONTENT_FILE)
+    try:
+        blocks = iter_gw_file(path)
+        assert isinstance(blocks, types.GeneratorType)
+        first = next(blocks)
+        streamed = [first] + list(blocks)
+        parsed = parse_gw_file(path)
+    finally:
+        os.remove(path)
+    assert [type(b) for b in streamed] == [type(b) for b in parsed]
+    assert [_structure(b) for b in streamed] == [
+        _structure(b) for b in parsed]
+
+
+def test_iter_gw_file_no_fail_skips_invalid_blocks():
+    """In no_fail mode, invalid blocks are skipped and parsing goes on."""
+    path = write_temp_gw(INVALID_CONTENT_WITH_VALID_FAMILIES)
+    try:
+        streamed = list(iter_gw_file(path, no_fail=True))
+        parsed = parse_gw_file(path, no_fail=True)
+    finally:
+        os.remove(path)
+    assert len(streamed) == len(parsed) > 0
+
+
+def test_children_take_the_surname_of_a_referenced_father():
+    """A father that is only referred to still gives his surname."""
+    path = write_temp_gw("fam Smith John + Doe Jane\nbeg\n- h Paul\n"
+                         "- f Anna Martin\nend\n")
+    try:
+        result = parse_gw_file(path)
+    finally:
+        os.remove(path)
+    family = cast(FamilyGwSyntax, result[0])
+    assert [(c.first_name, c.surname) for c in family.descend] == [
+        ("Paul", "Smith"), ("Anna", "Martin")]
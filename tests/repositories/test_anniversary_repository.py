@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import text
+
+from repositories.anniversary_repository import (
+    Anniversary,
+    AnniversaryKind,
+    AnniversaryPerson,
+    AnniversaryRepository,
+)
+
+
+FAMILY_GW = """encoding: utf-8
+
+fam Dupont Jean 17/10/1980 +18/10/2005 Martin Anne 18/10/1982
+beg
+- f Marie 17/10/2010
+- h Luc 17/10/1990
+- h Paul 10/1995
+- h Marc 17/10/1870
+- h Leon 17/10/1990J
+end
+
+fam Durand Pierre +18/10/2001 Lefort Julie
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+def _execute(db_service, statement, **params):
+    session = db_service.get_session()
+    try:
+        session.execute(text(statement), params)
+        session.commit()
+    finally:
+        session.close()
+
+
+def _names(anniversaries):
+    return [tuple(p.first_name for p in a.persons) for a in anniversaries]
+
+
+def test_births_of_a_month(db_service):
+    births = AnniversaryRepository(db_service).anniversaries(
+        AnniversaryKind.BIRTH, month=10)
+
+    # Neither the month-only date of Paul nor the Julian one of Leon
+    assert [(a.day, a.year) for a in births] == [
+        (17, 1980), (17, 1990), (17, 1870), (17, 2010), (18, 1982)]
+    assert _names(births) == [
+        ("Jean",), ("Luc",), ("Marc",), ("Marie",), ("Anne",)]
+    assert AnniversaryRepository(db_service).anniversaries(
+        AnniversaryKind.BIRTH, month=11) == []
+
+
+def test_births_of_some_days(db_service):
+    repo = AnniversaryRepository(db_service)
+
+    births = repo.anniversaries(
+        AnniversaryKind.BIRTH, days=[(10, 18), (10, 19)])
+    assert births == [Anniversary(
+        10, 18, 1982, (AnniversaryPerson(1, "Anne", "Martin"),))]
+
+    births = repo.anniversaries(
+        AnniversaryKind.BIRTH, days=[(10, 17)], min_year=1900)
+    assert _names(births) == [("Jean",), ("Luc",), ("Marie",)]
+
+
+def test_dead_persons_have_death_anniversaries(db_service):
+    _execute(db_service, """
+        INSERT INTO Date (iso_date, calendar, precision_id, delta, ymd)
+        SELECT '2020-10-19', calendar, precision_id, delta, 20201019 FROM Date
+        WHERE id = (SELECT birth_date FROM Person WHERE first_name = 'Luc')
+    """)
+    _execute(db_service, """
+        UPDATE Person SET death_status = 'DEAD',
+            death_date = (SELECT max(id) FROM Date)
+        WHERE first_name = 'Luc'
+    """)
+    repo = AnniversaryRepository(db_service)
+
+    assert ("Luc",) not in _names(
+        repo.anniversaries(AnniversaryKind.BIRTH, month=10))
+    assert repo.anniversaries(AnniversaryKind.DEATH, days=[(10, 19)]) == [
+        Anniversary(10, 19, 2020, (AnniversaryPerson(3, "Luc", "Dupont"),))]
+
+
+def test_marriages_of_living_couples(db_service):
+    repo = AnniversaryRepository(db_service)
+
+    marriages = repo.anniversaries(AnniversaryKind.MARRIAGE, days=[(10, 18)])
+    assert [(a.year, _names([a])[0]) for a in marriages] == [
+        (2005, ("Jean", "Anne")), (2001, ("Pierre", "Julie"))]
+
+    _execute(db_service, """
+        UPDATE Family SET divorce_status = 'DIVORCED'
+        WHERE id = (SELECT min(id) FROM Family)
+    """)
+    _execute(db_service, """
+        UPDATE Person SET death_status = 'DEAD' WHERE first_name = 'Julie'
+    """)
+    assert repo.anniversaries(AnniversaryKind.MARRIAGE, month=10) == []
@@ -0,0 +1,96 @@
+from libraries.person import Sex
+from libraries.sosa import Sosa
+from repositories.ascendants import ascendants_page, iter_ascendant_generations
+from repositories.genealogy_graph import GenealogyGraph
+from repositories.person_repository import PersonSummary
+
+
+def _graph(parents):
+    """Graph where ``parents`` maps a child to its (father, mother), each
+    couple being its own family."""
+    persons = set(parents) | {p for couple in parents.values() for p in couple}
+    couples = sorted(set(parents.values()))
+    family_of = {couple: index for index, couple in enumerate(couples)}
+    return GenealogyGraph(
+        {p: family_of.get(parents.get(p)) for p in persons},
+        {index: couple for couple, index in family_of.items()},
+        [(family_of[couple], child) for child, couple in parents.items()],
+        [(p, family_of[couple]) for couple in couples for p in couple],
+    )
+
+
+class FakePersonRepository:
+    def __init__(self):
+        self.calls = []
+
+    def get_person_summaries(self, ids):
+        ids = list(dict.fromkeys(ids))
+        self.calls.append(ids)
+        return {
+            i: PersonSummary(i, f"p{i}", "X", 0, Sex.NEUTER, None, None)
+            for i in ids
+        }
+
+
+# 1 x 2 -> 3, 4 ; 3 x 5 -> 6 ; 7 x 4 -> 8 ; 6 x 8 -> 9 (first cousins)
+COUSINS = {3: (1, 2), 4: (1, 2), 6: (3, 5), 8: (7, 4), 9: (6, 8)}
+
+
+def _flatten(generations):
+    return [
+        [(e.sosa.value, e.person_id, e.implex_of and e.implex_of.value)
+         for e in generation]
+        for generation in generations
+    ]
+
+
+def test_generations_are_numbered_with_sosa():
+    generations = list(iter_ascendant_generations(_graph(COUSINS), 9, 10))
+    assert _flatten(generations) == [
+        [(1, 9, None)],
+        [(2, 6, None), (3, 8, None)],
+        [(4, 3, None), (5, 5, None), (6, 7, None), (7, 4, None)],
+        # 1 and 2 are reached again through 4: they point to 8 and 9
+        [(8, 1, None), (9, 2, None), (14, 1, 8), (15, 2, 9)],
+    ]
+
+
+def test_generation_limit():
+    generations = list(iter_ascendant_generations(_graph(COUSINS), 9, 2))
+    assert [len(g) for g in generations] == [1, 2]
+
+
+def test_implex_branches_are_walked_once():
+    # Brother x sister for 30 generations: 2 distinct persons per
+    # generation, instead of 2 ** 30 paths
+    parents = {}
+    for generation in range(1, 31):
+        for child in (2 * generation, 2 * generation + 1):
+            parents[child] = (2 * generation - 2, 2 * generation - 1)
+    generations = list(iter_ascendant_generations(_graph(parents), 61, 40))
+    assert len(generations) == 31
+    assert all(len(g) <= 4 for g in generations)
+
+
+def test_page_loads_one_batch_per_generation():
+    repo = FakePersonRepository()
+    page = ascendants_page(_graph(COUSINS), repo, 9, 10)
+
+    assert page.total == 11
+    assert page.implex_count == 2
+    assert page.page_count == 1
+    assert [g.number for g in page.generations] == [1, 2, 3, 4]
+    assert repo.calls == [[9], [6, 8], [3, 5, 7, 4], [1, 2]]
+
+
+def test_pagination_links_implex_to_their_page():
+    repo = FakePersonRepository()
+    page = ascendants_page(_graph(COUSINS), repo, 9, 10, page=3, page_size=4)
+
+    assert page.page_count == 3
+    rows = [row for g in page.generations for row in g.rows]
+    assert [row.sosa for row in rows] == [Sosa(9), Sosa(14), Sosa(15)]
+    # Person 1 is first shown as Sosa 8 on page 2, person 2 as Sosa 9 here
+    assert [row.implex_page for row in rows] == [None, 2, 3]
+    # Only the persons of the page are loaded
+    assert repo.calls == [[2, 1]]
@@ -0,0 +1,455 @@
+"""Tests for the set-based bulk loaders of the repositories.
+
+The bulk loaders must return exactly what the single-row accessors return,
+with a number of SQL statements that does not grow with the number of
+requested rows.
+"""
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+import database.descend_children as db_descend_children
+import database.family_event as db_family_event
+import database.family_event_witness as db_family_event_witness
+import database.family_witness as db_family_witness
+import database.person_event_witness as db_person_event_witness
+import database.person_non_native_relations as db_nnr
+import database.person_relations as db_person_relations
+import database.person_titles as db_person_titles
+import database.personal_event as db_personal_event
+import database.relation as db_relation
+import database.titles as db_titles
+import database.union_families as db_union_families
+from database.family import Family as DbFamily
+from database.person import Person as DbPerson
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.date import CalendarDate
+from database.date import Date as DbDate, packed_date
+from repositories import converter_from_db
+from repositories.converter_from_db import (
+    convert_family_from_db, convert_person_from_db)
+from repositories.family_repository import FamilyRepository
+from repositories.genealogy_graph import GenealogyGraph
+from repositories import family_repository, person_repository
+from libraries.person import Sex
+from repositories.person_repository import PersonRepository, PersonSummary
+
+
+GW_FILE = Path(__file__).parent.parent.parent / "test_assets" / "big.gw"
+
+
+@pytest.fixture(scope="module")
+def db_service(tmp_path_factory, gwc):
+    db_path = str(tmp_path_factory.mktemp("batch") / "big.db")
+    assert gwc(db_path, [GW_FILE]) == 0
+    service = SQLiteDatabaseService(db_path)
+    service.connect()
+    yield service
+    service.disconnect()
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def snapshot(obj):
+    """Structural view of a domain object, since several of the library
+    types (death status, burial, ...) do not define equality."""
+    if isinstance(obj, (list, tuple)):
+        return [snapshot(o) for o in obj]
+    if isinstance(obj, dict):
+        return {k: snapshot(v) for k, v in obj.items()}
+    if hasattr(obj, "__dict__"):
+        return (type(obj).__name__, snapshot(vars(obj)))
+    return obj
+
+
+def _all_person_ids(db_service):
+    session = db_service.get_session()
+    try:
+        rows = session.query(DbPerson.id).order_by(DbPerson.id).all()
+        return [row.id for row in rows]
+    finally:
+        session.close()
+
+
+def _person_row_by_row(db_service, person_id):
+    """A person read the way get_person_by_id did before the bulk loader:
+    one query per child table and per linked row."""
+    session = db_service.get_session()
+    try:
+        person = db_service.get(session, DbPerson, {"id": person_id})
+        titles = [
+            db_service.get(session, db_titles.Titles, {"id": link.title_id})
+            for link in db_service.get_all(
+                session, db_person_titles.PersonTitles,
+                {"person_id": person_id})
+        ]
+        relations = [
+            db_service.get(
+                session, db_relation.Relation, {"id": link.relation_id})
+            for link in db_service.get_all(
+                session, db_nnr.PersonNonNativeRelations,
+                {"person_id": person_id})
+        ]
+        related = db_service.get_all(
+            session, db_person_relations.PersonRelations,
+            {"person_id": person_id})
+        events = [
+            (event, db_service.get_all(
+                session, db_person_event_witness.PersonEventWitness,
+                {"event_id": event.id}))
+            for event in db_service.get_all(
+                session, db_personal_event.PersonalEvent,
+                {"person_id": person_id})
+        ]
+        family_ids = [
+            union_family.family_id
+            for union_family in db_service.get_all(
+                session, db_union_families.UnionFamilies,
+                {"union_id": person.families_id})
+        ] if person.families_id else []
+        return convert_person_from_db(
+            person, titles, relations, related, events, family_ids)
+    finally:
+        session.close()
+
+
+def test_get_persons_by_ids_matches_the_row_by_row_reading(db_service):
+    repo = PersonRepository(db_service)
+    ids = _all_person_ids(db_service)
+
+    bulk = repo.get_persons_by_ids(ids)
+
+    assert set(bulk) == set(ids)
+    for person_id in ids:
+        assert snapshot(bulk[person_id]) == snapshot(
+            _person_row_by_row(db_service, person_id))
+
+
+def test_expired_rows_convert_like_loaded_rows(db_service):
+    session = db_service.get_session()
+    try:
+        persons = session.query(DbPerson).options(
+            *person_repository._person_load_options()).all()
+        loaded = person_repository._convert_persons(session, persons)
+        # Read through the ORM descriptors, precisions included
+        session.expire_all()
+        expired = person_repository._convert_persons(session, persons)
+    finally:
+        session.close()
+
+    assert snapshot(expired) == snapshot(loaded)
+
+
+# Models whose rows the converters read through _loaded, with the
+# attributes read
+LOADED_MODELS = [
+    (DbPerson, converter_from_db._PERSON_ATTRIBUTES),
+    (db_personal_event.PersonalEvent, converter_from_db._EVENT_ATTRIBUTES),
+    (db_family_event.FamilyEvent, converter_from_db._EVENT_ATTRIBUTES),
+    (DbDate, converter_from_db._DATE_ATTRIBUTES),
+    (DbFamily, converter_from_db._FAMILY_DATE_ATTRIBUTES),
+]
+
+
+@pytest.mark.parametrize(
+    "model, names", LOADED_MODELS,
+    ids=[model.__name__ for model, _ in LOADED_MODELS])
+def test_loaded_reads_what_the_descriptors_read(db_service, model, names):
+    session = db_service.get_session()
+    try:
+        rows = session.query(model).all()
+        assert rows
+        for row in rows:
+            # Loads the lazy relationships too, as the loaders of the
+            # repositories do
+            expected = {name: getattr(row, name) for name in names}
+            values = converter_from_db._loaded(row, names)
+            # The instance dict itself, not a copy made by the descriptors
+            assert values is row.__dict__
+            assert {name: values[name] for name in names} == expected
+
+            session.expire(row)
+            assert dict(converter_from_db._loaded(row, names)) == expected
+    finally:
+        session.close()
+
+
+# Dated models, with their dates packed in ``<date>_compressed``
+PACKED_DATES = [
+    (DbPerson, person_repository._PERSON_DATES),
+    (DbFamily, family_repository._FAMILY_DATES),
+]
+
+
+@pytest.mark.parametrize(
+    "model, dates", PACKED_DATES,
+    ids=[model.__name__ for model, _ in PACKED_DATES])
+def test_packed_dates_read_like_their_date_rows(db_service, model, dates):
+    session = db_service.get_session()
+    try:
+        packed = 0
+        for row in session.query(model).all():
+            values = converter_from_db._loaded(
+                row, frozenset(f"{date}_compressed" for date in dates))
+            for date in dates:
+                date_row = getattr(row, f"{date}_obj")
+                assert values[f"{date}_compressed"] == packed_date(date_row)
+                assert converter_from_db._date_of(row, values, date) == (
+                    date_row is not None,
+                    converter_from_db.convert_date_from_db(date_row))
+                packed += values[f"{date}_compressed"] is not None
+        assert packed
+    finally:
+        session.close()
+
+
+def test_only_unpacked_dates_load_their_date_row(db_service):
+    session = db_service.get_session()
+    try:
+        persons = session.query(DbPerson).options(
+            *person_repository._person_load_options()).all()
+        person_repository._convert_persons(session, persons)
+        for person in persons:
+            for date in person_repository._PERSON_DATES:
+                unpacked = (getattr(person, date) is not None
+                            and getattr(person, f"{date}_compressed") is None)
+                assert (person.__dict__.get(f"{date}_obj")
+                        is not None) == unpacked
+    finally:
+        session.close()
+
+
+def test_get_persons_by_ids_ignores_missing_and_duplicates(db_service):
+    repo = PersonRepository(db_service)
+    first_id = _all_person_ids(db_service)[0]
+
+    result = repo.get_persons_by_ids([first_id, first_id, 999999])
+
+    assert list(result) == [first_id]
+
+
+def test_get_persons_by_ids_empty(db_service):
+    assert PersonRepository(db_service).get_persons_by_ids([]) == {}
+
+
+def test_get_person_by_id_missing_raises(db_service):
+    with pytest.raises(ValueError):
+        PersonRepository(db_service).get_person_by_id(999999)
+
+
+# One statement for Person and each child table, plus the selectin loads
+# of the Ascends / Date / Precision relationships.
+MAX_PERSON_BATCH_STATEMENTS = 25
+
+
+def test_get_persons_by_ids_statement_count_is_bounded(db_service):
+    repo = PersonRepository(db_service)
+    ids = _all_person_ids(db_service)
+    assert len(ids) > MAX_PERSON_BATCH_STATEMENTS
+
+    with StatementCounter(db_service._engine) as counter:
+        repo.get_persons_by_ids(ids)
+
+    assert counter.count <= MAX_PERSON_BATCH_STATEMENTS
+
+
+def test_get_all_persons_returns_every_person(db_service):
+    repo = PersonRepository(db_service)
+
+    persons = repo.get_all_persons()
+
+    assert [p.index for p in persons] == _all_person_ids(db_service)
+
+
+def test_find_by_key_is_one_statement(db_service):
+    repo = PersonRepository(db_service)
+    persons = repo.get_all_persons()
+
+    for person in persons:
+        assert repo.find_by_key(
+            person.first_name, person.surname, person.occ) == person.index
+
+    person = persons[-1]
+    with StatementCounter(db_service._engine) as counter:
+        repo.find_by_key(f" {person.first_name}", person.surname, person.occ)
+    assert counter.count == 1
+    assert repo.find_by_key(
+        person.first_name, person.surname, person.occ + 1) is None
+    assert repo.find_by_key(
+        person.first_name.upper(), person.surname, person.occ) is None
+
+
+def _year(date):
+    return date.dmy.year if isinstance(date, CalendarDate) else None
+
+
+def test_get_person_summaries_matches_get_persons_by_ids(db_service):
+    repo = PersonRepository(db_service)
+    ids = _all_person_ids(db_service)
+
+    persons = repo.get_persons_by_ids(ids)
+    with StatementCounter(db_service._engine) as counter:
+        summaries = repo.get_person_summaries(ids + [999999])
+
+    assert counter.count == 1
+    assert set(summaries) == set(ids)
+    for person_id in ids:
+        person = persons[person_id]
+        death_date = getattr(person.death_status, "date_of_death", None)
+        assert summaries[person_id] == (
+            person_id, person.first_name, person.surname, person.occ,
+            person.sex, _year(person.birth_date), _year(death_date),
+            person.public_name, (person.qualifiers or [""])[0])
+
+
+def test_person_summaries_read_unpacked_years_from_their_date(compile_gw):
+    db_service = SQLiteDatabaseService(compile_gw("""encoding: utf-8
+
+fam Dupont Jean 12/5/1850J + Martin Anne 1852
+beg
+- h Luc
+end
+"""))
+    db_service.connect()
+    try:
+        repo = PersonRepository(db_service)
+        ids = _all_person_ids(db_service)
+        with StatementCounter(db_service._engine) as counter:
+            summaries = repo.get_person_summaries(ids)
+    finally:
+        db_service.disconnect()
+
+    # The Julian birth date is not packed
+    assert counter.count == 2
+    assert sorted(
+        (s.first_name, s.dates) for s in summaries.values()) == [
+        ("Anne", "1852-"), ("Jean", "1850-"), ("Luc", "")]
+
+
+def test_person_summary_dates_skip_year_0():
+    summary = PersonSummary(1, "Jean", "Dupont", 0, Sex.MALE, 0, 1912)
+
+    assert summary.dates == "-1912"
+    assert summary._replace(death_year=0).dates == ""
+
+
+def test_get_children_ids_matches_genealogy_graph(db_service):
+    repo = PersonRepository(db_service)
+    ids = _all_person_ids(db_service)
+    graph = GenealogyGraph.load(db_service)
+
+    with StatementCounter(db_service._engine) as counter:
+        children = repo.get_children_ids(ids)
+
+    assert counter.count == 1
+    assert children
+    for person_id in ids:
+        assert children.get(person_id, []) == graph.person_children(
+            person_id)
+
+
+def test_get_parent_ids_matches_genealogy_graph(db_service):
+    repo = PersonRepository(db_service)
+    ids = _all_person_ids(db_service)
+    graph = GenealogyGraph.load(db_service)
+
+    with StatementCounter(db_service._engine) as counter:
+        parents = repo.get_parent_ids(ids)
+
+    assert counter.count == 1
+    assert parents
+    for person_id in ids:
+        expected = graph.parents(person_id)
+        if expected == (None, None):
+            assert person_id not in parents
+        else:
+            assert parents[person_id] == expected
+
+
+def _all_family_ids(db_service):
+    session = db_service.get_session()
+    try:
+        rows = session.query(DbFamily.id).order_by(DbFamily.id).all()
+        return [row.id for row in rows]
+    finally:
+        session.close()
+
+
+def _family_row_by_row(db_service, family_id):
+    """A family read the way get_family_by_id did before the bulk loader:
+    one query per child table and per event."""
+    session = db_service.get_session()
+    try:
+        family = db_service.get(session, DbFamily, {"id": family_id})
+        witnesses = db_service.get_all(
+            session, db_family_witness.FamilyWitness,
+            {"family_id": family_id})
+        events = [
+            (event, db_service.get_all(
+                session, db_family_event_witness.FamilyEventWitness,
+                {"event_id": event.id}))
+            for event in db_service.get_all(
+                session, db_family_event.FamilyEvent,
+                {"family_id": family_id})
+        ]
+        children = db_service.get_all(
+            session, db_descend_children.DescendChildren,
+            {"descend_id": family.children_id})
+        return convert_family_from_db(family, witnesses, events, children)
+    finally:
+        session.close()
+
+
+def test_get_families_by_ids_matches_the_row_by_row_reading(db_service):
+    repo = FamilyRepository(db_service)
+    ids = _all_family_ids(db_service)
+
+    bulk = repo.get_families_by_ids(ids)
+
+    assert set(bulk) == set(ids)
+    for family_id in ids:
+        assert snapshot(bulk[family_id]) == snapshot(
+            _family_row_by_row(db_service, family_id))
+
+
+def test_get_families_by_ids_ignores_missing_and_duplicates(db_service):
+    repo = FamilyRepository(db_service)
+    first_id = _all_family_ids(db_service)[0]
+
+    result = repo.get_families_by_ids([first_id, 999999, first_id])
+
+    assert list(result) == [first_id]
+
+
+def test_get_family_by_id_missing_raises(db_service):
+    with pytest.raises(ValueError):
+        FamilyRepository(db_service).get_family_by_id(999999)
+
+
+MAX_FAMILY_BATCH_STATEMENTS = 15
+
+
+def test_get_families_by_ids_statement_count_is_bounded(db_service):
+    repo = FamilyRepository(db_service)
+    ids = _all_family_ids(db_service)
+    assert len(ids) > MAX_FAMILY_BATCH_STATEMENTS
+
+    with StatementCounter(db_service._engine) as counter:
+        repo.get_families_by_ids(ids)
+
+    assert counter.count <= MAX_FAMILY_BATCH_STATEMENTS
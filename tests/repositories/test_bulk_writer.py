@@ -0,0 +1,249 @@
+"""The bulk writer used by gwc must produce exactly the rows of the
+per-record repository path."""
+import sqlite3
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+import libraries.date as app_date
+import libraries.family as app_family
+import libraries.title as app_title
+from libraries.events import EventWitnessKind
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.bulk_writer import BulkWriter
+from repositories.cache_files_repository import CacheFilesRepository
+from repositories.family_repository import FamilyRepository
+from repositories.name_count_repository import NameCountRepository
+from repositories.name_index_repository import NameIndexRepository
+from repositories.person_repository import PersonRepository
+from repositories.place_repository import PlaceRepository
+from script.gw_parser import GwConverter, parse_gw_file
+from script.gwc import normalize_family, normalize_person
+
+
+GW_FILE = Path(__file__).parent.parent.parent / "test_assets" / "big.gw"
+
+
+def _date(year: int) -> app_date.CompressedDate:
+    return app_date.CalendarDate(
+        dmy=app_date.DateValue(
+            day=1, month=1, year=year, prec=app_date.About(), delta=0),
+        cal=app_date.Calendar.GREGORIAN
+    )
+
+
+@pytest.fixture(scope="module")
+def records():
+    converter = GwConverter()
+    converter.convert_all(parse_gw_file(str(GW_FILE)))
+    persons = [normalize_person(p) for p in converter.get_enriched_persons()]
+    families = [
+        normalize_family(replace(f, origin_file=str(GW_FILE)))
+        for f in converter.get_all_families()
+    ]
+
+    # big.gw has no titles, relations or personal event witnesses: add
+    # some so that every table is exercised.
+    first, second = persons[0], persons[1]
+    persons[0] = replace(
+        first,
+        titles=[app_title.Title(
+            title_name=app_title.TitleName("Duke"),
+            ident="duke",
+            place="Somewhere",
+            date_start=_date(1800),
+            date_end=_date(1820),
+            nth=2,
+        )],
+        non_native_parents_relation=[app_family.Relation(
+            type=app_family.RelationToParentType.ADOPTION,
+            father=second.index,
+            mother=None,
+            sources="",
+        )],
+        related_persons=[second.index],
+        personal_events=[
+            replace(event, witnesses=[
+                (second.index, EventWitnessKind.WITNESS)])
+            for event in first.personal_events
+        ],
+    )
+    return persons, families
+
+
+def _write_per_record(db_path, persons, families):
+    db_service = SQLiteDatabaseService(db_path)
+    db_service.connect()
+    person_repo = PersonRepository(db_service)
+    family_repo = FamilyRepository(db_service)
+    for person in persons:
+        person_repo.add_person(person)
+    for family in families:
+        family_repo.add_family(family)
+    # The IDs of the places depend on the order they are met in
+    PlaceRepository(db_service).rebuild()
+    db_service.disconnect()
+
+
+def _build_derived_tables(db_service):
+    # As gwc does once the persons are written
+    NameIndexRepository(db_service).rebuild()
+    NameCountRepository(db_service).rebuild()
+    CacheFilesRepository(db_service).rebuild()
+    PlaceRepository(db_service).rebuild()
+
+
+def _write_bulk(db_path, persons, families, **kwargs):
+    db_service = SQLiteDatabaseService(db_path)
+    db_service.connect()
+    writer = BulkWriter(db_service, **kwargs)
+    for person in persons:
+        writer.add_person(person)
+    for family in families:
+        writer.add_family(family)
+    writer.commit()
+    _build_derived_tables(db_service)
+    db_service.disconnect()
+    return writer
+
+
+def _dump(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        tables = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_stat%' ORDER BY name")]
+        content = {
+            table: connection.execute(
+                f'SELECT * FROM "{table}" ORDER BY 1').fetchall()
+            for table in tables
+        }
+        content["<indexes>"] = connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "ORDER BY name").fetchall()
+        return content
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100000])
+def test_bulk_writer_matches_per_record_path(tmp_path, records, chunk_size):
+    persons, families = records
+    _write_per_record(str(tmp_path / "slow.db"), persons, families)
+    writer = _write_bulk(
+        str(tmp_path / "fast.db"), persons, families, chunk_size=chunk_size)
+
+    assert writer.persons_added == len(persons)
+    assert writer.families_added == len(families)
+    slow, fast = _dump(str(tmp_path / "slow.db")), _dump(
+        str(tmp_path / "fast.db"))
+    assert slow["Titles"] and slow["PersonEventWitness"]
+    assert fast == slow
+
+
+def test_failed_record_is_skipped_without_using_ids(tmp_path, records):
+    persons, families = records
+    broken = replace(persons[2], birth_date="not a date")
+
+    db_service = SQLiteDatabaseService(str(tmp_path / "fast.db"))
+    db_service.connect()
+    writer = BulkWriter(db_service, chunk_size=5)
+    for person in persons[:2]:
+        writer.add_person(person)
+    with pytest.raises(ValueError):
+        writer.add_person(broken)
+    for person in persons[3:]:
+        writer.add_person(person)
+    for family in families:
+        writer.add_family(family)
+    writer.commit()
+    _build_derived_tables(db_service)
+    db_service.disconnect()
+
+    _write_per_record(
+        str(tmp_path / "slow.db"), persons[:2] + persons[3:], families)
+    assert writer.persons_added == len(persons) - 1
+    assert _dump(str(tmp_path / "fast.db")) == _dump(
+        str(tmp_path / "slow.db"))
+
+
+def test_rollback_keeps_base_empty_and_indexed(tmp_path, records):
+    persons, _ = records
+    db_path = str(tmp_path / "base.db")
+    db_service = SQLiteDatabaseService(db_path)
+    db_service.connect()
+    before = _dump(db_path)
+
+    writer = BulkWriter(db_service, chunk_size=3)
+    for person in persons:
+        writer.add_person(person)
+    writer.rollback()
+    db_service.disconnect()
+
+    assert _dump(db_path) == before
+
+
+def test_import_pragmas_are_restored(tmp_path, records):
+    persons, _ = records
+    db_service = SQLiteDatabaseService(str(tmp_path / "base.db"))
+    db_service.connect()
+
+    writer = BulkWriter(db_service)
+    writer.add_person(persons[0])
+    writer.commit()
+
+    session = db_service.get_session()
+    assert session is not None
+    connection = session.connection()
+    assert connection.exec_driver_sql(
+        "PRAGMA journal_mode").scalar() == "delete"
+    assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 2
+    session.close()
+    db_service.disconnect()
+
+
+def test_rollback_to_savepoint_drops_only_later_records(tmp_path, records):
+    persons, _ = records
+    db_service = SQLiteDatabaseService(str(tmp_path / "fast.db"))
+    db_service.connect()
+    writer = BulkWriter(db_service, chunk_size=4)
+    for person in persons[:3]:
+        writer.add_person(person)
+    writer.savepoint()
+    for person in persons[3:]:
+        writer.add_person(person)
+    writer.rollback_to_savepoint()
+    writer.commit()
+    _build_derived_tables(db_service)
+    db_service.disconnect()
+
+    _write_per_record(str(tmp_path / "slow.db"), persons[:3], [])
+    assert writer.persons_added == 3
+    assert _dump(str(tmp_path / "fast.db")) == _dump(
+        str(tmp_path / "slow.db"))
+
+
+def _person_count(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute(
+            'SELECT COUNT(*) FROM "Person"').fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_gwc_drops_a_broken_file_as_a_whole(tmp_path, gwc):
+    broken = tmp_path / "broken.gw"
+    broken.write_text(
+        GW_FILE.read_text(encoding="utf-8") + "\nfam\n", encoding="utf-8")
+    db_path = str(tmp_path / "base.db")
+    assert gwc(db_path, [GW_FILE]) == 0
+    expected = _person_count(db_path)
+
+    assert gwc(db_path, [GW_FILE, broken], no_fail=True) == 0
+    assert _person_count(db_path) == expected
+
+    with pytest.raises(SystemExit):
+        gwc(db_path, [GW_FILE, broken])
+    assert not Path(db_path).exists()
@@ -0,0 +1,92 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import delete
+
+from database.built_table import BuiltTable
+from database.cached_value import CachedValue, CacheKind
+from repositories.cache_files_repository import CacheFilesRepository
+from repositories.person_repository import PersonRepository
+
+
+FAMILY_GW = """encoding: utf-8
+
+fam Dupont Jean #occu Boulanger #bp Paris +2005 #mp Évreux Martin Anne \
+#occu Boulangère #bp Lyon
+beg
+- f Marie #bp Paris
+- h ? ?
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+def test_lists_are_built_by_gwc(db_service):
+    cache_files = CacheFilesRepository(db_service)
+    assert cache_files.is_built()
+
+    # Sorted without accents or case, deduplicated, without "?"
+    assert cache_files.values(CacheKind.SURNAME) == ["Dupont", "Martin"]
+    assert cache_files.values(CacheKind.FIRST_NAME) == [
+        "Anne", "Jean", "Marie"]
+    assert cache_files.values(CacheKind.PLACE) == ["Évreux", "Lyon", "Paris"]
+    assert cache_files.values(CacheKind.OCCUPATION) == [
+        "Boulanger", "Boulangère"]
+    assert cache_files.values(CacheKind.TITLE) == []
+
+
+def test_values_by_prefix(db_service):
+    cache_files = CacheFilesRepository(db_service)
+
+    assert cache_files.values(CacheKind.PLACE, "ev") == ["Évreux"]
+    assert cache_files.values(CacheKind.OCCUPATION, "BOULANGE") == [
+        "Boulanger", "Boulangère"]
+    assert cache_files.values(CacheKind.OCCUPATION, "boulange", 1) == [
+        "Boulanger"]
+    assert cache_files.values(CacheKind.SURNAME, "x") == []
+
+
+def test_written_values_are_added(db_service):
+    persons = PersonRepository(db_service)
+    marie = next(p for p in persons.get_all_persons()
+                 if p.first_name == "Marie")
+    persons.edit_person(replace(
+        marie, surname="Durand", occupation="Meunière",
+        death_place="Rouen"))
+
+    cache_files = CacheFilesRepository(db_service)
+    assert "Durand" in cache_files.values(CacheKind.SURNAME)
+    assert cache_files.values(CacheKind.OCCUPATION) == [
+        "Boulanger", "Boulangère", "Meunière"]
+    assert "Rouen" in cache_files.values(CacheKind.PLACE)
+
+    # A value no longer used is listed until the next rebuild
+    assert "Dupont" in cache_files.values(CacheKind.SURNAME)
+    counts = cache_files.rebuild()
+    assert counts[CacheKind.OCCUPATION] == 3
+
+
+def test_base_without_lists_is_computed_on_demand(db_service):
+    session = db_service.get_session()
+    try:
+        session.execute(delete(CachedValue))
+        session.execute(delete(BuiltTable))
+        session.commit()
+    finally:
+        session.close()
+    cache_files = CacheFilesRepository(db_service)
+    assert not cache_files.is_built()
+
+    # The values written by an edit do not make up the lists
+    persons = PersonRepository(db_service)
+    marie = next(p for p in persons.get_all_persons()
+                 if p.first_name == "Marie")
+    persons.edit_person(replace(marie, occupation="Meunière"))
+    assert not cache_files.is_built()
+
+    cache_files.ensure_built()
+    assert cache_files.values(CacheKind.SURNAME) == ["Dupont", "Martin"]
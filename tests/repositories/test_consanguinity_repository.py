@@ -0,0 +1,162 @@
+"""Consanguinity computed on a base built by gwc."""
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.consanguinity import NO_CONSANG
+from repositories.consanguinity_repository import ConsanguinityRepository
+from repositories.family_repository import FamilyRepository
+from repositories.person_repository import PersonRepository
+
+
+# g and h are first cousins: their son k has a consanguinity of 1/16
+COUSINS_GW = """encoding: utf-8
+
+fam A a + A b
+beg
+- h c
+- f d
+end
+
+fam A c + X e
+beg
+- h g
+end
+
+fam Y f + A d
+beg
+- f h
+end
+
+fam A g + Y h
+beg
+- h k
+end
+"""
+
+
+def _consang_by_name(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute(
+            'SELECT p.first_name, a.consang FROM "Person" p '
+            'JOIN "Ascends" a ON p.ascend_id = a.id'))
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(COUSINS_GW, "cousins")
+
+
+def test_gwc_without_cg_leaves_consanguinity_unknown(compile_gw):
+    values = _consang_by_name(compile_gw(COUSINS_GW, "cousins", cg=False))
+    assert set(values.values()) == {NO_CONSANG}
+
+
+def test_gwc_cg_stores_consanguinity(compile_gw):
+    values = _consang_by_name(compile_gw(COUSINS_GW, "cousins", cg=True))
+    assert values == {"c": 0, "d": 0, "g": 0, "h": 0, "k": 62500}
+
+
+def test_compute_consanguinity_is_incremental(db_path, db_service):
+    repository = ConsanguinityRepository(db_service)
+
+    # Every person with parents goes from unknown to computed
+    assert repository.compute_consanguinity() == 5
+    assert _consang_by_name(db_path)["k"] == 62500
+    # Nothing left to compute
+    assert repository.compute_consanguinity() == 0
+
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute(
+            'UPDATE "Ascends" SET consang = ? WHERE id = (SELECT ascend_id '
+            'FROM "Person" WHERE first_name = \'h\')', (NO_CONSANG,))
+        connection.execute(
+            'UPDATE "Ascends" SET consang = 5 WHERE id = (SELECT ascend_id '
+            'FROM "Person" WHERE first_name = \'k\')')
+    connection.close()
+
+    # h and her son k are recomputed, the others are kept
+    assert repository.compute_consanguinity() == 2
+    assert _consang_by_name(db_path)["k"] == 62500
+
+
+def test_consanguinity_is_read_back_by_the_person_repository(db_service):
+    ConsanguinityRepository(db_service).compute_consanguinity()
+    persons = {
+        p.first_name: p for p in PersonRepository(db_service).get_all_persons()
+    }
+    assert int(persons["k"].ascend.consanguinity_rate) == 62500
+
+
+def _persons_by_name(db_service):
+    return {
+        p.first_name: p for p in PersonRepository(db_service).get_all_persons()
+    }
+
+
+@pytest.fixture
+def computed_db_path(compile_gw):
+    """The cousins base, with its consanguinity computed by gwc."""
+    return compile_gw(COUSINS_GW, "computed", cg=True)
+
+
+@pytest.fixture
+def computed_db_service(computed_db_path):
+    service = SQLiteDatabaseService(computed_db_path)
+    service.connect()
+    yield service
+    service.disconnect()
+
+
+def test_new_parents_reset_the_consanguinity_of_the_descendants(
+        computed_db_path, computed_db_service):
+    db_path, db_service = computed_db_path, computed_db_service
+    persons = _persons_by_name(db_service)
+    repo = PersonRepository(db_service)
+
+    # Same parents: nothing to compute again
+    repo.edit_person(replace(persons["g"], occupation="farmer"))
+    assert NO_CONSANG not in _consang_by_name(db_path).values()
+
+    # g becomes the brother of h
+    g = persons["g"]
+    repo.edit_person(replace(g, ascend=replace(
+        g.ascend, parents=persons["h"].ascend.parents)))
+    assert _consang_by_name(db_path) == {
+        "c": 0, "d": 0, "g": NO_CONSANG, "h": 0, "k": NO_CONSANG}
+
+    assert ConsanguinityRepository(db_service).compute_consanguinity() == 2
+    assert _consang_by_name(db_path)["k"] == 250000
+
+
+def test_added_family_resets_the_consanguinity_of_its_children(
+        computed_db_path, computed_db_service):
+    db_path, db_service = computed_db_path, computed_db_service
+    persons = _persons_by_name(db_service)
+    families = FamilyRepository(db_service)
+    family = families.get_family_by_id(persons["c"].ascend.parents)
+
+    families.add_family(replace(family, index=None, children=[
+        persons["g"].index]))
+
+    assert _consang_by_name(db_path) == {
+        "c": 0, "d": 0, "g": NO_CONSANG, "h": 0, "k": NO_CONSANG}
+
+
+def test_edited_children_reset_their_consanguinity(
+        computed_db_path, computed_db_service):
+    db_path, db_service = computed_db_path, computed_db_service
+    persons = _persons_by_name(db_service)
+    families = FamilyRepository(db_service)
+    family = families.get_family_by_id(persons["k"].ascend.parents)
+
+    families.edit_family(replace(family, children=[]))
+
+    assert _consang_by_name(db_path) == {
+        "c": 0, "d": 0, "g": 0, "h": 0, "k": NO_CONSANG}
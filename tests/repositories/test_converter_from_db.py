@@ -255,6 +255,40 @@ def test_convert_date_hebrew_calendar():
     assert result.cal == libraries.date.Calendar.HEBREW
 
 
+def test_convert_compressed_date_skips_precision():
+    """Test that a compressed date is read without its Precision row."""
+    db_date = database.date.Date()
+    db_date.iso_date = "1850-04"
+    db_date.calendar = libraries.date.Calendar.JULIAN
+    db_date.delta = 0
+    db_date.compressed = libraries.date.DateValue(
+        0, 4, 1850, libraries.date.Maybe()).compress()
+
+    result = convert_date_from_db(db_date)
+
+    assert result.cal == libraries.date.Calendar.JULIAN
+    assert (result.dmy.day, result.dmy.month, result.dmy.year) == (0, 4, 1850)
+    assert isinstance(result.dmy.prec, libraries.date.Maybe)
+
+
+def test_convert_date_year_month():
+    """Test conversion of a date without day, as written to the database."""
+    db_precision = database.date.Precision()
+    db_precision.precision_level = database.date.DatePrecision.ABOUT
+
+    db_date = database.date.Date()
+    db_date.iso_date = "1850-04"
+    db_date.calendar = libraries.date.Calendar.GREGORIAN
+    db_date.delta = 2
+    db_date.precision_obj = db_precision
+
+    result = convert_date_from_db(db_date)
+
+    assert (result.dmy.day, result.dmy.month, result.dmy.year) == (0, 4, 1850)
+    assert result.dmy.delta == 2
+    assert isinstance(result.dmy.prec, libraries.date.About)
+
+
 # ================== Divorce Status Conversion Tests ==================
 
 def test_convert_divorce_status_not_divorced():
@@ -209,6 +209,41 @@ def test_convert_date_without_precision():
     assert precision_level == database.date.DatePrecision.SURE
 
 
+def test_convert_date_packs_ymd_and_compressed():
+    """Test the integer forms of a date written with the date."""
+    lib_date = libraries.date.CalendarDate(
+        dmy=libraries.date.DateValue(
+            day=0, month=5, year=1995,
+            prec=libraries.date.Before(), delta=0
+        ),
+        cal=libraries.date.Calendar.GREGORIAN
+    )
+
+    result = convert_date_to_db(lib_date)
+
+    assert result.iso_date == "1995-05"
+    assert result.ymd == 19950500
+    assert result.compressed == lib_date.dmy.compress()
+
+
+def test_convert_date_without_compressed_form():
+    """Test that OrYear dates keep only their text form."""
+    lib_date = libraries.date.CalendarDate(
+        dmy=libraries.date.DateValue(
+            day=1, month=2, year=1800,
+            prec=libraries.date.OrYear(date_value=libraries.date.DateValue(
+                day=1, month=2, year=1801, prec=None)),
+            delta=0
+        ),
+        cal=libraries.date.Calendar.GREGORIAN
+    )
+
+    result = convert_date_to_db(lib_date)
+
+    assert result.ymd == 18000201
+    assert result.compressed is None
+
+
 # ============================================================================
 # DIVORCE STATUS CONVERSION TESTS
 # ============================================================================
@@ -0,0 +1,71 @@
+from libraries.person import Sex
+from repositories.cousins import CousinTable, cousins_page
+from repositories.person_repository import PersonSummary
+
+
+class FakePersonRepository:
+    def __init__(self, parents):
+        self.parents = parents
+        self.children = {}
+        for child, couple in parents.items():
+            for parent in couple:
+                self.children.setdefault(parent, []).append(child)
+        self.parent_calls = []
+        self.children_calls = []
+
+    def get_parent_ids(self, ids):
+        ids = list(dict.fromkeys(ids))
+        self.parent_calls.append(sorted(ids))
+        return {i: self.parents[i] for i in ids if i in self.parents}
+
+    def get_children_ids(self, ids):
+        ids = list(dict.fromkeys(ids))
+        self.children_calls.append(sorted(ids))
+        return {i: self.children[i] for i in ids if i in self.children}
+
+    def get_person_summaries(self, ids):
+        return {
+            i: PersonSummary(i, f"p{i:02}", "X", 0, Sex.NEUTER, None, None)
+            for i in ids
+        }
+
+
+# 1 x 2 -> 3, 4, 5 ; 3 x 6 -> 7, 8 ; 9 x 4 -> 10 ; 10 x 11 -> 12
+# 7 is the root: 8 is its sibling, 10 its first cousin, 12 its first
+# cousin once removed (downwards), 4 and 5 its aunts (up 2, down 1)
+PARENTS = {3: (1, 2), 4: (1, 2), 5: (1, 2), 7: (3, 6), 8: (3, 6),
+           10: (9, 4), 12: (10, 11)}
+
+
+def test_cells():
+    table = CousinTable(FakePersonRepository(PARENTS), 7, 3, 3)
+
+    assert table.cousins(1, 1) == {8}
+    assert table.cousins(2, 1) == {4, 5}
+    assert table.cousins(2, 2) == {10}
+    assert table.cousins(2, 3) == {12}
+    assert table.cousins(1, 0) == set()
+    assert table.cousins(3, 3) == set()
+
+
+def test_counts_walk_each_generation_once():
+    repo = FakePersonRepository(PARENTS)
+    table = CousinTable(repo, 7, 3, 3)
+
+    assert table.counts() == [[1, 0, 0], [2, 1, 1], [0, 0, 0]]
+    # The grandparents have no parents: the walk up stops there
+    assert repo.parent_calls == [[7], [3, 6], [1, 2]]
+    # Nobody's children are looked up twice
+    looked_up = [p for call in repo.children_calls for p in call]
+    assert len(looked_up) == len(set(looked_up))
+
+
+def test_page():
+    table = CousinTable(FakePersonRepository(PARENTS), 7, 2, 1)
+
+    first = cousins_page(table, 2, 1, page=1, page_size=1)
+    second = cousins_page(table, 2, 1, page=2, page_size=1)
+
+    assert [p.id for p in first.persons] == [4]
+    assert [p.id for p in second.persons] == [5]
+    assert (first.total, first.page_count) == (2, 2)
@@ -0,0 +1,86 @@
+from libraries.person import Sex
+from repositories.descendants import (
+    DescendantsPage,
+    iter_descendant_generations,
+)
+from repositories.person_repository import PersonSummary
+
+
+class FakePersonRepository:
+    def __init__(self, children):
+        self.children = children
+        self.children_calls = []
+        self.summary_calls = []
+
+    def get_children_ids(self, ids):
+        ids = list(dict.fromkeys(ids))
+        self.children_calls.append(ids)
+        return {i: self.children[i] for i in ids if i in self.children}
+
+    def get_person_summaries(self, ids):
+        ids = list(dict.fromkeys(ids))
+        self.summary_calls.append(ids)
+        return {
+            i: PersonSummary(i, f"p{i}", "X", 0, Sex.NEUTER, None, None)
+            for i in ids
+        }
+
+
+# 1 -> 2, 3 ; 2 -> 4, 5 ; 3 -> 6 ; 4 x 6 (cousins) -> 7
+CHILDREN = {1: [2, 3], 2: [4, 5], 3: [6], 4: [7], 6: [7]}
+
+
+def _flatten(generations):
+    return [
+        [(e.number, e.person_id, e.duplicate_of) for e in generation]
+        for generation in generations
+    ]
+
+
+def test_generations_are_numbered_d_aboville():
+    repo = FakePersonRepository(CHILDREN)
+    generations = list(iter_descendant_generations(repo, 1, 10))
+
+    assert _flatten(generations) == [
+        [("1", 1, None)],
+        [("1.1", 2, None), ("1.2", 3, None)],
+        [("1.1.1", 4, None), ("1.1.2", 5, None), ("1.2.1", 6, None)],
+        # 7 descends from both 4 and 6
+        [("1.1.1.1", 7, None), ("1.2.1.1", 7, "1.1.1.1")],
+    ]
+    # One set-based lookup per generation, duplicates not expanded
+    assert repo.children_calls == [[1], [2, 3], [4, 5, 6], [7]]
+
+
+def test_depth_limit_stops_the_lookups():
+    repo = FakePersonRepository(CHILDREN)
+    generations = list(iter_descendant_generations(repo, 1, 2))
+
+    assert [len(g) for g in generations] == [1, 2]
+    assert repo.children_calls == [[1]]
+
+
+def test_page_is_lazy_and_loads_only_its_persons():
+    repo = FakePersonRepository(CHILDREN)
+    page = DescendantsPage(repo, 1, 10, page=2, page_size=2)
+    assert repo.children_calls == []
+
+    generations = list(page)
+
+    assert [[r.number for r in g.rows] for g in generations] == [
+        ["1.2"], ["1.1.1"]]
+    assert repo.summary_calls == [[3], [4]]
+    assert page.has_next
+    # The walk stopped once the page was full
+    assert repo.children_calls == [[1], [2, 3]]
+
+
+def test_last_page_has_no_next():
+    repo = FakePersonRepository(CHILDREN)
+    page = DescendantsPage(repo, 1, 10, page=3, page_size=3)
+
+    rows = [r for g in page for r in g.rows]
+
+    assert [r.number for r in rows] == ["1.1.1.1", "1.2.1.1"]
+    assert rows[1].duplicate_of == "1.1.1.1"
+    assert not page.has_next
@@ -0,0 +1,152 @@
+"""Genealogy graph loaded from a base built by gwc."""
+import sqlite3
+
+import pytest
+from sqlalchemy import update
+
+import database.ascends as db_ascends
+from database.engine_registry import engine_registry
+from database.sqlite_database_service import SQLiteDatabaseService
+from libraries.consanguinity import NO_CONSANG
+from repositories.genealogy_graph import (
+    GenealogyGraph,
+    GraphRegistry,
+)
+
+
+# a x b -> c, d ; c x e -> g ; f x d -> h ; g x h -> k, l
+# c is also married to m, with whom he has n
+FAMILY_GW = """encoding: utf-8
+
+fam A a + A b
+beg
+- h c
+- f d
+end
+
+fam A c + X e
+beg
+- h g
+end
+
+fam A c + Z m
+beg
+- f n
+end
+
+fam Y f + A d
+beg
+- f h
+end
+
+fam A g + Y h
+beg
+- h k
+- f l
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+@pytest.fixture
+def ids(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute(
+            'SELECT first_name, id FROM "Person"'))
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def graph(db_path):
+    service = SQLiteDatabaseService(db_path)
+    service.connect()
+    try:
+        return GenealogyGraph.load(service)
+    finally:
+        service.disconnect()
+
+
+def test_parents_and_children(graph, ids):
+    assert graph.parents(ids["g"]) == (ids["c"], ids["e"])
+    assert graph.parents(ids["a"]) == (None, None)
+
+    family = graph.parent_family(ids["k"])
+    assert graph.family_parents(family) == (ids["g"], ids["h"])
+    assert list(graph.children(family)) == [ids["k"], ids["l"]]
+
+
+def test_families_and_person_children(graph, ids):
+    assert len(graph.families(ids["c"])) == 2
+    assert graph.person_children(ids["c"]) == [ids["g"], ids["n"]]
+    assert list(graph.families(ids["k"])) == []
+
+
+def test_siblings(graph, ids):
+    assert graph.siblings(ids["k"]) == [ids["l"]]
+    assert graph.siblings(ids["k"], include_self=True) == [ids["k"], ids["l"]]
+    assert graph.siblings(ids["a"]) == []
+
+
+def test_ancestors_are_listed_once_with_their_generation(graph, ids):
+    ancestors = graph.ancestors(ids["k"])
+    # a and b are reached through both g and h
+    assert ancestors == {
+        ids["g"]: 1, ids["h"]: 1,
+        ids["c"]: 2, ids["e"]: 2, ids["f"]: 2, ids["d"]: 2,
+        ids["a"]: 3, ids["b"]: 3,
+    }
+    assert set(graph.ancestors(ids["k"], max_depth=1)) == {
+        ids["g"], ids["h"]}
+
+
+def test_descendants(graph, ids):
+    descendants = graph.descendants(ids["a"])
+    assert descendants[ids["c"]] == 1
+    assert descendants[ids["n"]] == 2
+    assert descendants[ids["k"]] == 3
+    assert ids["e"] not in descendants
+    assert set(graph.descendants(ids["a"], max_depth=1)) == {
+        ids["c"], ids["d"]}
+
+
+def test_unknown_ids(graph):
+    assert 10 ** 6 not in graph
+    assert graph.parents(10 ** 6) == (None, None)
+    assert list(graph.children(10 ** 6)) == []
+    assert graph.ancestors(10 ** 6) == {}
+
+
+def test_registry_reuses_graph_until_a_write(db_path, ids):
+    registry = GraphRegistry()
+    service = SQLiteDatabaseService(db_path, shared=True)
+    service.connect()
+    try:
+        graph = registry.get(service)
+        assert registry.get(service) is graph
+        assert registry.hits == 1
+
+        session = service.get_session()
+        session.execute(
+            update(db_ascends.Ascends).values(parents=None))
+        session.commit()
+        session.close()
+
+        refreshed = registry.get(service)
+        assert refreshed is not graph
+        assert refreshed.parents(ids["k"]) == (None, None)
+    finally:
+        service.disconnect()
+        engine_registry.invalidate(db_path)
+
+
+def test_couples_and_consanguinity(graph, ids):
+    assert graph.couples([ids["k"], ids["a"]]) == {
+        ids["k"]: (ids["g"], ids["h"])}
+    assert graph.consanguinity(ids["k"]) == NO_CONSANG
+    assert graph.consanguinity(ids["a"]) == 0
@@ -0,0 +1,131 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import delete
+
+from database.built_table import BuiltTable
+from database.name_count import NameCount
+from database.name_initial_count import NameInitialCount
+from database.name_index import NameKind
+from database.person import Person
+from repositories.name_count_repository import (
+    InitialBucket,
+    NameCountRepository,
+    NameFrequency,
+    name_initial,
+)
+from repositories.person_repository import PersonRepository
+
+
+FAMILY_GW = """encoding: utf-8
+
+fam Dupont Jean + Martin Anne
+beg
+- f Marie
+- h Luc
+end
+
+fam Dupont Paul + 1Lefort Anne
+beg
+- h Émile
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+def test_name_initial():
+    assert name_initial("Émile") == "e"
+    assert name_initial("dupont") == "d"
+    assert name_initial("1Lefort") == "#"
+    assert name_initial("") == "#"
+
+
+def test_counts_are_built_by_gwc(db_service):
+    counts = NameCountRepository(db_service)
+    assert counts.is_built()
+
+    assert counts.initials(NameKind.SURNAME) == [
+        InitialBucket("d", 1, 5),
+        InitialBucket("m", 1, 1),
+        InitialBucket("#", 1, 1),
+    ]
+    assert counts.most_frequent(NameKind.FIRST_NAME).names == [
+        NameFrequency("Anne", 2),
+        NameFrequency("Émile", 1),
+        NameFrequency("Jean", 1),
+        NameFrequency("Luc", 1),
+        NameFrequency("Marie", 1),
+        NameFrequency("Paul", 1),
+    ]
+    assert counts.names_by_initial(NameKind.FIRST_NAME, "e").names == [
+        NameFrequency("Émile", 1)]
+
+
+def test_pages(db_service):
+    counts = NameCountRepository(db_service)
+
+    first = counts.most_frequent(NameKind.FIRST_NAME, page=1, page_size=2)
+    last = counts.most_frequent(NameKind.FIRST_NAME, page=9, page_size=2)
+    assert (first.page, first.page_count) == (1, 3)
+    assert [n.name for n in first.names] == ["Anne", "Émile"]
+    assert (last.page, [n.name for n in last.names]) == (
+        3, ["Marie", "Paul"])
+
+
+def test_counts_follow_person_edits(db_service):
+    session = db_service.get_session()
+    marie = session.query(Person).filter_by(first_name="Marie").one().id
+    session.close()
+    repo = PersonRepository(db_service)
+    counts = NameCountRepository(db_service)
+
+    repo.edit_person(replace(
+        repo.get_person_by_id(marie), first_name="Jean", surname="Lefort"))
+
+    assert counts.is_built()
+    assert counts.names_by_initial(NameKind.FIRST_NAME, "j").names == [
+        NameFrequency("Jean", 2)]
+    assert counts.names_by_initial(NameKind.FIRST_NAME, "m").names == []
+    assert "m" not in [
+        bucket.initial for bucket in counts.initials(NameKind.FIRST_NAME)]
+    assert counts.initials(NameKind.SURNAME) == [
+        InitialBucket("d", 1, 4),
+        InitialBucket("l", 1, 1),
+        InitialBucket("m", 1, 1),
+        InitialBucket("#", 1, 1),
+    ]
+
+
+def test_base_without_counts_is_counted_without_writing(db_service):
+    counts = NameCountRepository(db_service)
+    listings = [
+        lambda: counts.initials(NameKind.SURNAME),
+        lambda: counts.names_by_initial(NameKind.SURNAME, "d"),
+        lambda: counts.most_frequent(NameKind.FIRST_NAME, page_size=2),
+        lambda: counts.most_frequent(NameKind.FIRST_NAME, page=3,
+                                     page_size=2),
+    ]
+    expected = [listing() for listing in listings]
+    session = db_service.get_session()
+    session.execute(delete(NameCount))
+    session.execute(delete(NameInitialCount))
+    session.execute(delete(BuiltTable))
+    session.commit()
+    session.close()
+    counts = NameCountRepository(db_service)
+    assert not counts.is_built()
+
+    assert [listing() for listing in listings] == expected
+    assert not counts.is_built()
+    session = db_service.get_session()
+    assert session.query(NameCount).count() == 0
+    session.close()
+
+    counts.rebuild()
+    counts = NameCountRepository(db_service)
+    assert counts.is_built()
+    assert [listing() for listing in listings] == expected
@@ -0,0 +1,178 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import delete
+
+from database.built_table import BuiltTable
+from database.name_index import NameIndex, NameKind
+from database.person import Person
+from database.sqlite_database_service import SQLiteDatabaseService
+from repositories.name_index_repository import (
+    FIRST_NAME_KINDS,
+    SURNAME_KINDS,
+    NameIndexRepository,
+    name_index_rows,
+)
+from repositories.person_repository import PersonRepository
+
+
+FAMILY_GW = """encoding: utf-8
+
+fam de_la_Tour Élisabeth + Müller Hans
+beg
+- h Jean_Pierre
+end
+
+fam Dupont Jean + Dupontel Anne
+beg
+- f Marie
+end
+
+fam Иванов Иван + 李 梅
+beg
+- f Ольга
+end
+"""
+
+
+def _ids(db_service):
+    session = db_service.get_session()
+    try:
+        return {(p.first_name, p.surname): p.id
+                for p in session.query(Person)}
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+def test_rows_are_keyed_by_every_word_onwards():
+    rows = name_index_rows(7, "de la Tour", "Élisabeth", "", "Lisa Tour")
+
+    keys = {(row["kind"], row["key"]) for row in rows}
+    assert keys == {
+        (NameKind.SURNAME, "de la tour"),
+        (NameKind.SURNAME, "la tour"),
+        (NameKind.SURNAME, "tour"),
+        (NameKind.FIRST_NAME, "elisabeth"),
+        (NameKind.ALIAS, "lisa tour"),
+        (NameKind.ALIAS, "tour"),
+    }
+    assert all(row["person_id"] == 7 for row in rows)
+
+
+def test_search_ignores_accents_case_and_particles(db_service):
+    ids = _ids(db_service)
+    index = NameIndexRepository(db_service)
+
+    assert index.search("MULLER", SURNAME_KINDS) == [
+        ids[("Hans", "Müller")]]
+    assert sorted(index.search("Tour", SURNAME_KINDS)) == sorted([
+        ids[("Élisabeth", "de la Tour")], ids[("Jean Pierre", "de la Tour")]])
+    assert index.search("elisabeth", FIRST_NAME_KINDS) == [
+        ids[("Élisabeth", "de la Tour")]]
+    assert index.search("jean-pierre", FIRST_NAME_KINDS) == [
+        ids[("Jean Pierre", "de la Tour")]]
+    assert index.search("Tour", FIRST_NAME_KINDS) == []
+
+
+def test_non_latin_names_are_indexed_casefolded(db_service):
+    ids = _ids(db_service)
+    index = NameIndexRepository(db_service)
+
+    assert index.search("ИВАНОВ", SURNAME_KINDS) == [
+        ids[("Иван", "Иванов")], ids[("Ольга", "Иванов")]]
+    assert index.search("ив", SURNAME_KINDS, prefix=True) == [
+        ids[("Иван", "Иванов")], ids[("Ольга", "Иванов")]]
+    assert index.search("李", SURNAME_KINDS) == [ids[("梅", "李")]]
+
+    _forget_index(db_service)
+    assert index.search("иванов", SURNAME_KINDS) == [
+        ids[("Иван", "Иванов")], ids[("Ольга", "Иванов")]]
+    assert index.search("李", SURNAME_KINDS) == [ids[("梅", "李")]]
+
+
+def test_prefix_search(db_service):
+    ids = _ids(db_service)
+    index = NameIndexRepository(db_service)
+
+    assert index.search("dupon", SURNAME_KINDS) == []
+    assert index.search("dupon", SURNAME_KINDS, prefix=True) == [
+        ids[("Jean", "Dupont")], ids[("Marie", "Dupont")],
+        ids[("Anne", "Dupontel")]]
+    assert len(index.search("dupon", SURNAME_KINDS, prefix=True,
+                            limit=1)) == 1
+
+
+def test_index_follows_person_edits(db_service):
+    ids = _ids(db_service)
+    repo = PersonRepository(db_service)
+    index = NameIndexRepository(db_service)
+
+    person_id = ids[("Marie", "Dupont")]
+    person = repo.get_person_by_id(person_id)
+    repo.edit_person(replace(person, surname_aliases=["Dupond"]))
+
+    assert index.search("dupond", SURNAME_KINDS) == [person_id]
+    assert index.search("dupont", SURNAME_KINDS) == [
+        ids[("Jean", "Dupont")], person_id]
+
+
+def _forget_index(db_service):
+    """Make the base look as if it was built before the index existed."""
+    session = db_service.get_session()
+    session.execute(delete(NameIndex))
+    session.execute(delete(BuiltTable))
+    session.commit()
+    session.close()
+
+
+def test_base_without_index_is_searched_without_writing(db_service):
+    index = NameIndexRepository(db_service)
+    searches = [
+        ("muller", SURNAME_KINDS, False),
+        ("tour", SURNAME_KINDS, False),
+        ("dup", SURNAME_KINDS, True),
+        ("jean", FIRST_NAME_KINDS, True),
+        ("st martin", SURNAME_KINDS, False),
+    ]
+    expected = [index.search(*search) for search in searches]
+    assert expected[2]
+    _forget_index(db_service)
+    assert not index.is_built()
+
+    assert [index.search(*search) for search in searches] == expected
+    assert not index.is_built()
+    session = db_service.get_session()
+    assert session.query(NameIndex).count() == 0
+    session.close()
+
+
+def test_edit_does_not_mark_an_unbuilt_index_as_built(db_service):
+    ids = _ids(db_service)
+    _forget_index(db_service)
+    repo = PersonRepository(db_service)
+    person = repo.get_person_by_id(ids[("Marie", "Dupont")])
+    repo.edit_person(replace(person, surname_aliases=["Dupond"]))
+
+    index = NameIndexRepository(db_service)
+    assert not index.is_built()
+    assert index.search("muller", SURNAME_KINDS) == [ids[("Hans", "Müller")]]
+
+
+def test_new_base_is_indexed_by_its_writes(db_service, tmp_path):
+    ids = _ids(db_service)
+    person = PersonRepository(db_service).get_person_by_id(
+        ids[("Hans", "Müller")])
+    new_base = SQLiteDatabaseService(str(tmp_path / "new.db"))
+    new_base.connect()
+    index = NameIndexRepository(new_base)
+    assert index.is_built()
+
+    PersonRepository(new_base).add_person(person)
+    assert index.is_built()
+    assert len(index.search("muller", SURNAME_KINDS)) == 1
+    new_base.disconnect()
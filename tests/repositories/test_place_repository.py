@@ -0,0 +1,113 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from database.built_table import BuiltTable
+from database.place import Place
+from database.place_event import PlaceEvent, PlaceEventKind
+from libraries.person import Place as AppPlace
+from repositories.name_count_repository import NameFrequency
+from repositories.person_repository import PersonRepository
+from repositories.place_repository import (
+    PlaceRepository,
+    PlaceSurnames,
+    place_name,
+    split_place,
+)
+
+
+FAMILY_GW = """encoding: utf-8
+
+fam Dupont Jean #bp Paris,_Île-de-France,_France +2005 #mp Lyon,_France \
+Martin Anne #bp Lyon,_France
+beg
+- f Marie #bp Paris,_Île-de-France,_France #dp Rouen
+- h Luc #bp Paris,_Île-de-France,_France
+end
+"""
+
+ALL_EVENTS = list(PlaceEventKind)
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+def test_split_place():
+    assert split_place("Paris") == AppPlace(
+        "Paris", "", "", "", "", "", "", "")
+    place = split_place(" Saint-Denis , Montmartre, Paris ,, Île-de-France,"
+                        " France")
+    assert (place.town, place.other, place.county, place.region,
+            place.country) == (
+        "Saint-Denis", "Montmartre", "Paris", "Île-de-France", "France")
+    assert place_name(place) == (
+        "Saint-Denis, Montmartre, Paris, Île-de-France, France")
+    assert split_place(" , ") is None
+    assert split_place(None) is None
+
+
+def test_places_are_split_by_gwc(db_service):
+    places = PlaceRepository(db_service)
+    assert places.is_built()
+
+    assert places.surnames_by_place(ALL_EVENTS) == [
+        PlaceSurnames("Rouen", [NameFrequency("Dupont", 1)]),
+        PlaceSurnames("Lyon, France", [
+            NameFrequency("Dupont", 1), NameFrequency("Martin", 1)]),
+        PlaceSurnames("Paris, Île-de-France, France", [
+            NameFrequency("Dupont", 3)]),
+    ]
+    assert places.surnames_by_place([PlaceEventKind.MARRIAGE]) == [
+        PlaceSurnames("Lyon, France", [
+            NameFrequency("Dupont", 1), NameFrequency("Martin", 1)]),
+    ]
+    assert places.surnames_by_place([PlaceEventKind.BURIAL]) == []
+
+
+def test_written_places_are_recorded(db_service):
+    persons = PersonRepository(db_service)
+    marie = next(p for p in persons.get_all_persons()
+                 if p.first_name == "Marie")
+    persons.edit_person(replace(
+        marie, birth_place="Lyon,  France", death_place=""))
+
+    places = PlaceRepository(db_service)
+    assert places.surnames_by_place(ALL_EVENTS) == [
+        PlaceSurnames("Lyon, France", [
+            NameFrequency("Dupont", 2), NameFrequency("Martin", 1)]),
+        PlaceSurnames("Paris, Île-de-France, France", [
+            NameFrequency("Dupont", 2)]),
+    ]
+    # Rouen is no longer used: it goes with the next rebuild
+    assert places.rebuild() == 2
+
+
+def test_base_without_places_is_split_on_demand(db_service):
+    session = db_service.get_session()
+    try:
+        session.execute(delete(PlaceEvent))
+        session.execute(delete(Place))
+        session.execute(delete(BuiltTable))
+        session.commit()
+    finally:
+        session.close()
+    places = PlaceRepository(db_service)
+    assert not places.is_built()
+
+    # The places written by an edit do not make up the table
+    persons = PersonRepository(db_service)
+    marie = next(p for p in persons.get_all_persons()
+                 if p.first_name == "Marie")
+    persons.edit_person(replace(marie, birth_place="Lyon, France"))
+    assert not places.is_built()
+
+    places.ensure_built()
+    session = db_service.get_session()
+    try:
+        assert session.execute(
+            select(func.count()).select_from(PlaceEvent)).scalar_one() == 7
+    finally:
+        session.close()
@@ -0,0 +1,139 @@
+import pytest
+
+from libraries.consanguinity import NO_CONSANG, ConsanguinityEngine
+
+from repositories.genealogy_graph import GenealogyGraph
+from repositories.relationship import (
+    RelationshipTimeout,
+    find_relationship,
+    relationship_finder,
+)
+
+
+def _graph(parents, consang=None):
+    """Graph where ``parents`` maps a child to its (father, mother), each
+    couple being its own family."""
+    persons = set(parents) | {p for couple in parents.values() for p in couple}
+    couples = sorted(set(parents.values()))
+    family_of = {couple: index for index, couple in enumerate(couples)}
+    return GenealogyGraph(
+        {p: family_of.get(parents.get(p)) for p in persons},
+        {index: couple for couple, index in family_of.items()},
+        [(family_of[couple], child) for child, couple in parents.items()],
+        [(p, family_of[couple]) for couple in couples for p in couple],
+        consang,
+    )
+
+
+# 1 x 2 -> 3, 4 ; 3 x 5 -> 6 ; 7 x 4 -> 8 ; 6 x 8 -> 9 (first cousins)
+COUSINS = _graph({3: (1, 2), 4: (1, 2), 6: (3, 5), 8: (7, 4), 9: (6, 8)})
+
+
+def test_first_cousins():
+    relationship = find_relationship(COUSINS, 6, 8)
+
+    assert [c.ancestor for c in relationship.ancestors] == [1, 2]
+    common = relationship.ancestors[0]
+    assert (common.distance1, common.distance2) == (2, 2)
+    assert common.paths1 == [(6, 3, 1)]
+    assert common.paths2 == [(8, 4, 1)]
+    assert relationship.consanguinity == pytest.approx(1 / 16)
+
+
+def test_siblings_and_direct_line():
+    siblings = find_relationship(COUSINS, 3, 4)
+    assert [c.ancestor for c in siblings.ancestors] == [1, 2]
+    assert siblings.consanguinity == pytest.approx(1 / 4)
+
+    # 1 is an ancestor of 9: the closest common ancestor is 1 itself
+    direct = find_relationship(COUSINS, 9, 1)
+    assert [c.ancestor for c in direct.ancestors] == [1]
+    assert direct.ancestors[0].paths1 == [(9, 6, 3, 1), (9, 8, 4, 1)]
+    assert direct.ancestors[0].paths2 == [(1,)]
+
+
+def test_same_person():
+    relationship = find_relationship(COUSINS, 9, 9)
+
+    assert [c.ancestor for c in relationship.ancestors] == [9]
+    assert relationship.consanguinity == 1.0
+
+
+def test_unrelated():
+    relationship = find_relationship(COUSINS, 5, 7)
+
+    assert not relationship.related
+    assert relationship.consanguinity == 0.0
+
+
+def test_deep_pedigree():
+    # Two lines of 200 generations from the same founder couple
+    parents = {}
+    for line, start in ((0, 1000), (1, 2000)):
+        previous = (1, 2)
+        for generation in range(200):
+            child = start + 2 * generation
+            spouse = child + 1
+            parents[child] = previous
+            previous = (child, spouse) if line == 0 else (spouse, child)
+    graph = _graph(parents)
+
+    relationship = find_relationship(graph, 1000 + 398, 2000 + 398)
+
+    assert [c.ancestor for c in relationship.ancestors] == [1, 2]
+    assert relationship.ancestors[0].distance1 == 200
+
+
+def test_uses_stored_consanguinity_of_ancestors():
+    # 1 x 2 -> 3, 4 ; 3 x 4 -> 5, 6 ; 5 x 6 -> 7 ; 7 x 10 -> 8 ; 7 x 11 -> 9
+    parents = {3: (1, 2), 4: (1, 2), 5: (3, 4), 6: (3, 4), 7: (5, 6),
+               8: (7, 10), 9: (7, 11)}
+    engine = ConsanguinityEngine(parents)
+    engine.compute()
+    stored = {p: int(engine.consanguinity(p)) for p in range(1, 12)
+              if p in parents}
+    expected = engine.relationship(8, 9)
+
+    relationship = find_relationship(_graph(parents, stored), 8, 9)
+    assert relationship.consanguinity == pytest.approx(expected)
+
+    unknown = find_relationship(
+        _graph(parents, dict.fromkeys(stored, NO_CONSANG)), 8, 9)
+    assert unknown.consanguinity != pytest.approx(expected)
+
+
+def test_time_budget():
+    with pytest.raises(RelationshipTimeout):
+        find_relationship(COUSINS, 6, 8, time_budget=-1)
+
+
+def test_consanguinity_is_skipped_when_out_of_time(monkeypatch):
+    class SlowEngine:
+        def __init__(self, *args):
+            pass
+
+        def relationship(self, *args):
+            raise TimeoutError()
+
+    monkeypatch.setattr(
+        "repositories.relationship.ConsanguinityEngine", SlowEngine)
+    graph = _graph({3: (1, 2), 4: (1, 2)})
+    finder = relationship_finder(graph)
+
+    relationship = finder.find(3, 4)
+
+    assert [c.ancestor for c in relationship.ancestors] == [1, 2]
+    assert relationship.consanguinity is None
+    # Incomplete results are not cached
+    assert finder.find(3, 4) is not relationship
+
+
+def test_finder_caches_per_graph():
+    graph = _graph({3: (1, 2), 4: (1, 2)})
+    finder = relationship_finder(graph)
+
+    first = finder.find(3, 4)
+
+    assert finder.find(3, 4) is first
+    assert relationship_finder(graph) is finder
+    assert relationship_finder(_graph({3: (1, 2)})) is not finder
@@ -0,0 +1,169 @@
+import random
+from functools import lru_cache
+
+import pytest
+
+from libraries.consanguinity import (
+    ConsanguinityEngine,
+    NO_CONSANG,
+    TopologicalSortError,
+    topological_sort,
+)
+
+
+def reference_consanguinity(parents):
+    """Textbook recursive kinship coefficients, memoized on pairs."""
+    rank = topological_sort(
+        set(parents) | {p for c in parents.values() for p in c}, parents)
+
+    @lru_cache(maxsize=None)
+    def inbreeding(person):
+        couple = parents.get(person)
+        if couple is None:
+            return 0.0
+        return kinship(*couple)
+
+    @lru_cache(maxsize=None)
+    def kinship(a, b):
+        if a == b:
+            return (1.0 + inbreeding(a)) / 2
+        # Expand the youngest of the two, who cannot be an ancestor of the
+        # other
+        if rank[a] > rank[b]:
+            a, b = b, a
+        couple = parents.get(a)
+        if couple is None:
+            return 0.0
+        return (kinship(couple[0], b) + kinship(couple[1], b)) / 2
+
+    return {p: int(inbreeding(p) * 1000000.0 + 0.5) for p in rank}
+
+
+# 1 x 2 -> 3, 4 ; 3 x 5 -> 6 ; 7 x 4 -> 8 ; 6 x 8 -> 9 (first cousins)
+COUSINS = {3: (1, 2), 4: (1, 2), 6: (3, 5), 8: (7, 4), 9: (6, 8)}
+
+
+def test_topological_sort_ranks_ancestors_higher():
+    rank = topological_sort(range(1, 10), COUSINS)
+    for child, couple in COUSINS.items():
+        for parent in couple:
+            assert rank[parent] > rank[child]
+    assert rank[9] == 0
+
+
+def test_topological_sort_detects_loops():
+    with pytest.raises(TopologicalSortError) as exc:
+        topological_sort([1, 2, 3], {1: (2, 3), 2: (1, 3)})
+    assert exc.value.person in (1, 2)
+
+
+@pytest.mark.parametrize("parents, person, expected", [
+    (COUSINS, 9, 62500),
+    # Siblings
+    ({3: (1, 2), 4: (1, 2), 5: (3, 4)}, 5, 250000),
+    # Half siblings
+    ({3: (1, 2), 4: (1, 5), 6: (3, 4)}, 6, 125000),
+    # Parent and child
+    ({3: (1, 2), 4: (1, 3)}, 4, 250000),
+    # Unrelated parents
+    ({3: (1, 2)}, 3, 0),
+])
+def test_compute_known_values(parents, person, expected):
+    engine = ConsanguinityEngine(parents)
+    engine.compute()
+    assert int(engine.consanguinity(person)) == expected
+
+
+def test_persons_without_parents_are_zero():
+    engine = ConsanguinityEngine(COUSINS)
+    engine.compute()
+    assert int(engine.consanguinity(1)) == 0
+
+
+def test_inbred_common_ancestor():
+    # 1 x 2 -> 3, 4 ; 3 x 4 -> 5, 6 (F = 1/4) ; 5 x 6 -> 7
+    parents = {3: (1, 2), 4: (1, 2), 5: (3, 4), 6: (3, 4), 7: (5, 6)}
+    engine = ConsanguinityEngine(parents)
+    engine.compute()
+    assert int(engine.consanguinity(7)) == 375000
+    assert int(engine.consanguinity(7)) == reference_consanguinity(
+        parents)[7]
+
+
+def test_matches_reference_on_random_pedigree():
+    rng = random.Random(42)
+    parents = {}
+    founders = list(range(20))
+    generation = founders
+    next_id = len(founders)
+    for _ in range(8):
+        children = []
+        for _ in range(25):
+            father, mother = rng.sample(generation, 2)
+            parents[next_id] = (father, mother)
+            children.append(next_id)
+            next_id += 1
+        generation = children + rng.sample(generation, 5)
+
+    engine = ConsanguinityEngine(parents, persons=range(next_id))
+    engine.compute()
+
+    expected = reference_consanguinity(parents)
+    for person in range(next_id):
+        assert int(engine.consanguinity(person)) == pytest.approx(
+            expected.get(person, 0), abs=1)
+
+
+def test_deep_pedigree_collapse():
+    # Brother x sister for 300 generations: every ancestor is reached by
+    # 2**n paths
+    parents = {}
+    for generation in range(1, 301):
+        for child in (2 * generation, 2 * generation + 1):
+            parents[child] = (2 * generation - 2, 2 * generation - 1)
+    engine = ConsanguinityEngine(parents)
+    engine.compute()
+    assert engine.consanguinity(601).rate() == pytest.approx(1.0, abs=1e-5)
+
+
+def test_compute_keeps_known_values():
+    consang = {p: 0 for p in range(1, 10)}
+    consang[6] = 11
+    consang[8] = NO_CONSANG
+    engine = ConsanguinityEngine(COUSINS, consang)
+
+    changed = engine.compute()
+
+    assert int(engine.consanguinity(6)) == 11
+    assert changed == {8: 0, 9: 62500}
+
+
+def test_unknown_ancestor_recomputes_descendants():
+    consang = {p: 0 for p in range(1, 10)}
+    consang[4] = NO_CONSANG
+    engine = ConsanguinityEngine(COUSINS, consang)
+
+    changed = engine.compute()
+
+    assert changed == {4: 0, 9: 62500}
+
+
+def test_invalidate_recomputes_only_descendants():
+    engine = ConsanguinityEngine(COUSINS)
+    engine.compute()
+
+    engine.invalidate([6])
+    assert int(engine.consanguinity(6)) == NO_CONSANG
+    assert int(engine.consanguinity(9)) == NO_CONSANG
+    assert int(engine.consanguinity(8)) == 0
+
+    assert engine.compute() == {6: 0, 9: 62500}
+
+
+def test_from_scratch_recomputes_everything():
+    consang = {p: 7 for p in range(1, 10)}
+    engine = ConsanguinityEngine(COUSINS, consang)
+
+    changed = engine.compute(from_scratch=True)
+
+    assert changed == {**{p: 0 for p in range(1, 9)}, 9: 62500}
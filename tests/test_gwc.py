@@ -0,0 +1,89 @@
+"""gwc must produce the same database whatever the number of -j workers."""
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+
+ASSETS = Path(__file__).parent.parent / "test_assets"
+FILES = [str(ASSETS / name) for name in ("big.gw", "minimal.gw", "medium.gw")]
+
+
+def _dump(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        tables = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_stat%' ORDER BY name")]
+        return {
+            table: connection.execute(
+                f'SELECT * FROM "{table}" ORDER BY 1').fetchall()
+            for table in tables
+        }
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("jobs", [2, 8])
+def test_parallel_import_matches_sequential(tmp_path, gwc, jobs):
+    assert gwc(str(tmp_path / "seq.db"), FILES, jobs=1) == 0
+    assert gwc(str(tmp_path / "par.db"), FILES, jobs=jobs) == 0
+
+    sequential = _dump(str(tmp_path / "seq.db"))
+    assert sequential["Person"]
+    assert _dump(str(tmp_path / "par.db")) == sequential
+
+
+def test_parallel_import_keeps_command_line_order(tmp_path, gwc, capsys):
+    assert gwc(str(tmp_path / "par.db"), FILES, jobs=3) == 0
+    connection = sqlite3.connect(str(tmp_path / "par.db"))
+    try:
+        origins = [row[0] for row in connection.execute(
+            'SELECT origin_file FROM "Family" ORDER BY id')]
+    finally:
+        connection.close()
+
+    assert list(dict.fromkeys(origins)) == [
+        name for name in FILES if name in origins]
+
+
+def test_parallel_import_drops_a_broken_file(tmp_path, gwc):
+    broken = tmp_path / "broken.gw"
+    broken.write_text("fam\n", encoding="utf-8")
+    files = [FILES[0], str(broken), FILES[2]]
+
+    assert gwc(str(tmp_path / "seq.db"), files, jobs=1, no_fail=True) == 0
+    assert gwc(str(tmp_path / "par.db"), files, jobs=2, no_fail=True) == 0
+    assert _dump(str(tmp_path / "par.db")) == _dump(str(tmp_path / "seq.db"))
+
+    with pytest.raises(SystemExit):
+        gwc(str(tmp_path / "par.db"), files, jobs=2)
+    assert not (tmp_path / "par.db").exists()
+
+
+def test_invalid_number_of_jobs(tmp_path, gwc):
+    with pytest.raises(SystemExit) as exc:
+        gwc(str(tmp_path / "base.db"), FILES, jobs=0)
+    assert exc.value.code == 2
+
+
+def _count(db_path, table):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute(
+            f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_files_are_stored_after_each_other(tmp_path, gwc):
+    expected = {"Person": 0, "Family": 0}
+    for idx, name in enumerate(FILES):
+        db_path = str(tmp_path / f"single{idx}.db")
+        assert gwc(db_path, [name], jobs=1) == 0
+        for table in expected:
+            expected[table] += _count(db_path, table)
+
+    db_path = str(tmp_path / "all.db")
+    assert gwc(db_path, FILES, jobs=2) == 0
+    assert {table: _count(db_path, table) for table in expected} == expected
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -52,3 +53,47 @@ def test_cli_delete_nonexistent(tmp_path, monkeypatch):
     # expected non-zero exit code for failure
     assert result.exit_code != 0
     assert "does not exist" in result.output.lower()
+
+
+def test_cli_migrate_adds_missing_indexes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    p = Path(os.path.join(tmp_path, gwsetup.DEFAULT_BASES_DIR, "old.db"))
+    p.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(p)
+    connection.execute(
+        'CREATE TABLE "PersonEvents" (id INTEGER PRIMARY KEY, '
+        "person_id INTEGER NOT NULL, event_id INTEGER NOT NULL)")
+    connection.commit()
+    connection.close()
+
+    runner = CliRunner()
+    result = runner.invoke(gwsetup.cli, ["database", "migrate", "old"])
+    assert result.exit_code == 0, result.output
+    assert "added 2 indexes" in result.output.lower()
+
+    result = runner.invoke(gwsetup.cli, ["database", "migrate", "old"])
+    assert result.exit_code == 0, result.output
+    assert "up to date" in result.output.lower()
+
+
+def test_cli_migrate_nonexistent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(gwsetup.cli, ["database", "migrate", "nope"])
+    assert result.exit_code != 0
+    assert "does not exist" in result.output.lower()
+
+
+def test_cli_cache_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    assert runner.invoke(
+        gwsetup.cli, ["database", "create", "cached"]).exit_code == 0
+
+    result = runner.invoke(gwsetup.cli, ["database", "cache-files", "cached"])
+    assert result.exit_code == 0, result.output
+    assert "computed the cache files" in result.output.lower()
+
+    result = runner.invoke(gwsetup.cli, ["database", "cache-files", "nope"])
+    assert result.exit_code != 0
+    assert "does not exist" in result.output.lower()
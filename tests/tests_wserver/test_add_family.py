@@ -9,6 +9,7 @@ import tempfile
 import os
 from unittest.mock import patch
 from flask import Flask
+from wserver.routes.datalists import DATALISTS
 from wserver.routes.gwd import gwd_bp
 
 
@@ -37,6 +38,8 @@ class TestAddFamilyRoute(unittest.TestCase):
         self.assertEqual(args[0], "gwd/add_family.html")
         self.assertEqual(kwargs["base"], "testbase")
         self.assertEqual(kwargs["lang"], "en")
+        # The suggestions are asked for as the fields are typed in
+        self.assertEqual(kwargs["datalists"], DATALISTS)
 
     @patch("wserver.routes.add_family.render_template")
     def test_get_add_family_form_with_lang(self, mock_render):
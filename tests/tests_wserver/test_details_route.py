@@ -371,10 +371,10 @@ def test_get_children_info_with_children():
     )
 
     family_repo = Mock()
-    family_repo.get_family_by_id.return_value = family
+    family_repo.get_families_by_ids.return_value = {1: family}
 
     person_repo = Mock()
-    person_repo.get_person_by_id.side_effect = [child1, child2]
+    person_repo.get_persons_by_ids.return_value = {3: child1, 4: child2}
 
     result = get_children_info(person, family_repo, person_repo)
 
@@ -408,10 +408,10 @@ def test_get_children_info_with_tuple_dates():
     family = create_basic_family(index=1, children=[3])
 
     family_repo = Mock()
-    family_repo.get_family_by_id.return_value = family
+    family_repo.get_families_by_ids.return_value = {1: family}
 
     person_repo = Mock()
-    person_repo.get_person_by_id.return_value = child
+    person_repo.get_persons_by_ids.return_value = {3: child}
 
     result = get_children_info(person, family_repo, person_repo)
 
@@ -631,10 +631,10 @@ def test_get_timeline_events_with_marriage():
     )
 
     family_repo = Mock()
-    family_repo.get_family_by_id.return_value = family
+    family_repo.get_families_by_ids.return_value = {1: family}
 
     person_repo = Mock()
-    person_repo.get_person_by_id.side_effect = [spouse, witness]
+    person_repo.get_persons_by_ids.return_value = {2: spouse, 10: witness}
 
     result = get_timeline_events(person, family_repo, person_repo)
 
@@ -679,10 +679,10 @@ def test_get_timeline_events_with_children():
     )
 
     family_repo = Mock()
-    family_repo.get_family_by_id.return_value = family
+    family_repo.get_families_by_ids.return_value = {1: family}
 
     person_repo = Mock()
-    person_repo.get_person_by_id.return_value = child
+    person_repo.get_persons_by_ids.return_value = {3: child}
 
     result = get_timeline_events(person, family_repo, person_repo)
 
@@ -726,10 +726,10 @@ def test_get_timeline_events_with_divorce():
     )
 
     family_repo = Mock()
-    family_repo.get_family_by_id.return_value = family
+    family_repo.get_families_by_ids.return_value = {1: family}
 
     person_repo = Mock()
-    person_repo.get_person_by_id.return_value = spouse
+    person_repo.get_persons_by_ids.return_value = {2: spouse}
 
     result = get_timeline_events(person, family_repo, person_repo)
 
@@ -797,10 +797,10 @@ def test_get_timeline_events_chronological_order():
     )
 
     family_repo = Mock()
-    family_repo.get_family_by_id.return_value = family
+    family_repo.get_families_by_ids.return_value = {1: family}
 
     person_repo = Mock()
-    person_repo.get_person_by_id.return_value = spouse
+    person_repo.get_persons_by_ids.return_value = {2: spouse}
 
     result = get_timeline_events(person, family_repo, person_repo)
 
@@ -1443,7 +1443,7 @@ def test_get_siblings_info_with_siblings():
     family_repo.get_family_by_id.return_value = parent_family
     
     person_repo = Mock()
-    person_repo.get_person_by_id.side_effect = [sibling1, sibling2]
+    person_repo.get_persons_by_ids.return_value = {3: sibling1, 4: sibling2}
     
     result = get_siblings_info(person, family_repo, person_repo)
     
@@ -1485,7 +1485,7 @@ def test_get_siblings_info_with_tuple_dates():
     family_repo.get_family_by_id.return_value = parent_family
     
     person_repo = Mock()
-    person_repo.get_person_by_id.return_value = sibling
+    person_repo.get_persons_by_ids.return_value = {4: sibling}
     
     result = get_siblings_info(person, family_repo, person_repo)
     
@@ -1536,10 +1536,10 @@ def test_get_siblings_info_error_loading_sibling():
     family_repo.get_family_by_id.return_value = parent_family
     
     person_repo = Mock()
-    person_repo.get_person_by_id.side_effect = [
-        create_basic_person(index=3, first_name="Alice"),
-        Exception("Error loading sibling")
-    ]
+    # Sibling 4 could not be loaded and is missing from the batch
+    person_repo.get_persons_by_ids.return_value = {
+        3: create_basic_person(index=3, first_name="Alice"),
+    }
     
     result = get_siblings_info(person, family_repo, person_repo)
     
@@ -1627,6 +1627,39 @@ def test_get_ancestor_recursive_with_parents():
     assert result['mother']['first_name'] == "Mother"
 
 
+def test_get_ancestor_recursive_with_graph():
+    """Test ancestor recursion reading the parents from the graph."""
+    from repositories.genealogy_graph import GenealogyGraph
+    from wserver.routes.details import get_ancestor_recursive
+
+    persons = {
+        i: create_basic_person(index=i, first_name=f"P{i}", surname="Doe")
+        for i in range(1, 6)
+    }
+    # 2 x 3 -> 1 ; 4 x 5 -> 2
+    graph = GenealogyGraph(
+        {1: 0, 2: 1, 3: None, 4: None, 5: None},
+        {0: (2, 3), 1: (4, 5)},
+        [(0, 1), (1, 2)],
+        [(2, 0), (3, 0), (4, 1), (5, 1)],
+    )
+
+    person_repo = Mock()
+    person_repo.get_persons_by_ids.side_effect = lambda ids: {
+        i: persons[i] for i in ids}
+    family_repo = Mock()
+
+    result = get_ancestor_recursive(
+        1, person_repo, family_repo, max_depth=2, graph=graph)
+
+    assert result['father']['first_name'] == "P2"
+    assert result['mother']['first_name'] == "P3"
+    assert 'father' not in result['father']
+    person_repo.get_persons_by_ids.assert_called_once()
+    person_repo.get_person_by_id.assert_not_called()
+    family_repo.get_family_by_id.assert_not_called()
+
+
 def test_get_ancestor_recursive_max_depth():
     """Test ancestor recursion stops at max depth."""
     from wserver.routes.details import get_ancestor_recursive
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def _gw_date(day, years_ago):
+    return f"{day.day}/{day.month}/{day.year - years_ago}"
+
+
+TODAY = datetime.now().date()
+TOMORROW = TODAY + timedelta(days=1)
+NEXT_WEEK = TODAY + timedelta(days=7)
+
+ANNIVERSARIES_GW = f"""encoding: utf-8
+
+fam Dupont Jean {_gw_date(TODAY, 40)} +{_gw_date(TOMORROW, 15)} \
+Martin Anne {_gw_date(NEXT_WEEK, 38)}
+beg
+- h Luc {_gw_date(TODAY, 10)}
+- h Marc {_gw_date(TODAY, 150)}
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(ANNIVERSARIES_GW, "anniversaries")
+
+
+def test_birthdays_of_the_next_days(client):
+    html = client.get('/gwd/test/AN/').get_data(as_text=True)
+
+    assert 'Jean Dupont</a>' in html
+    assert f'({TODAY.year - 40})' in html
+    assert 'Luc Dupont</a>' in html
+    # Too old to be alive, and not in the next three days
+    assert 'Marc Dupont' not in html
+    assert 'Anne Martin' not in html
+
+
+def test_birthdays_of_a_month(client):
+    html = client.get(f'/gwd/test/AN/?v={NEXT_WEEK.month}').get_data(
+        as_text=True)
+
+    assert f'{NEXT_WEEK.day}: <a' in html
+    assert 'Anne Martin</a>' in html
+
+
+def test_wedding_anniversaries(client):
+    html = client.get('/gwd/test/AM/').get_data(as_text=True)
+
+    assert 'Jean Dupont</a>' in html
+    assert 'Anne Martin</a>' in html
+    assert f'({TOMORROW.year - 15})' in html
+
+
+def test_death_anniversaries(client):
+    html = client.get('/gwd/test/AD/').get_data(as_text=True)
+
+    assert 'Dupont</a>' not in html
+    assert 'action="/gwd/test/AD/"' in html
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+
+# g and h are first cousins: a and b are twice ancestors of k
+COUSINS_GW = """encoding: utf-8
+
+fam A a 1900 + A b
+beg
+- h c
+- f d
+end
+
+fam A c + X e
+beg
+- h g
+end
+
+fam Y f + A d
+beg
+- f h
+end
+
+fam A g + Y h
+beg
+- h k
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(COUSINS_GW, "cousins")
+
+
+@pytest.fixture
+def ids(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute(
+            'SELECT first_name, id FROM "Person"'))
+    finally:
+        connection.close()
+
+
+def test_ascendants_page_lists_generations(client, ids):
+    response = client.get(f'/gwd/test/A/?i={ids["k"]}&v=10')
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'id="s1"' in html
+    assert 'id="s15"' in html
+    # a is Sosa 8 and, through h, Sosa 14
+    assert '#s8' in html
+    assert '1900-' in html
+
+
+def test_ascendants_page_in_french(client, ids):
+    html = client.get(f'/gwd/test/A/?i={ids["k"]}&v=10&lang=fr').get_data(
+        as_text=True)
+
+    assert 'Ascendants' in html
+    assert 'Génération 2' in html
+    assert 'implexe' in html
+    assert 'voir' in html
+
+
+def test_ascendants_generation_limit(client, ids):
+    html = client.get(f'/gwd/test/A/?i={ids["k"]}&v=2').get_data(
+        as_text=True)
+
+    assert 'id="s3"' in html
+    assert 'id="s4"' not in html
+
+
+def test_ascendants_page_past_the_end(client, ids):
+    html = client.get(f'/gwd/test/A/?i={ids["k"]}&v=10&pg=2').get_data(
+        as_text=True)
+
+    assert 'id="s1"' not in html
+
+
+def test_ascendants_requires_person(client):
+    response = client.get('/gwd/test/A/')
+
+    assert response.status_code == 200
+    assert 'Incorrect request' in response.get_data(as_text=True)
+
+
+def test_ascendants_unknown_person(client):
+    response = client.get('/gwd/test/A/?i=999999')
+
+    assert response.status_code == 200
+    assert 'Incorrect request' not in response.get_data(as_text=True)
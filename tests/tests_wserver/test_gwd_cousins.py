@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+
+# g and h are first cousins, both grandchildren of a and b
+COUSINS_GW = """encoding: utf-8
+
+fam A a + A b
+beg
+- h c
+- f d
+end
+
+fam A c + X e
+beg
+- h g 1950
+- h i
+end
+
+fam Y f + A d
+beg
+- f h
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(COUSINS_GW, "cousins")
+
+
+@pytest.fixture
+def ids(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute(
+            'SELECT first_name, id FROM "Person"'))
+    finally:
+        connection.close()
+
+
+def test_cousins_table(client, ids):
+    html = client.get(f'/gwd/test/C/?i={ids["h"]}&v=2').get_data(
+        as_text=True)
+
+    # up 2, down 2: g and i
+    assert 'v1=2&amp;v2=2">2</a>' in html
+    assert 'v1=2&amp;v2=1">1</a>' in html
+
+
+def test_cousins_list(client, ids):
+    html = client.get(f'/gwd/test/C/?i={ids["h"]}&v1=2&v2=2').get_data(
+        as_text=True)
+
+    assert f'i={ids["g"]}"' in html
+    assert f'i={ids["i"]}"' in html
+    assert '1950-' in html
+    assert f'i={ids["c"]}"' not in html
+
+
+def test_cousins_bad_requests(client, ids):
+    assert 'Incorrect request' in client.get(
+        '/gwd/test/C/?v=2').get_data(as_text=True)
+    assert 'Incorrect request' in client.get(
+        f'/gwd/test/C/?i={ids["h"]}&v2=2').get_data(as_text=True)
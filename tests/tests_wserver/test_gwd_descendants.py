@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+
+# g and h are first cousins: k descends twice from a and b
+COUSINS_GW = """encoding: utf-8
+
+fam A a 1900 + A b
+beg
+- h c
+- f d
+end
+
+fam A c + X e
+beg
+- h g
+end
+
+fam Y f + A d
+beg
+- f h
+end
+
+fam A g + Y h
+beg
+- h k
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(COUSINS_GW, "cousins")
+
+
+@pytest.fixture
+def ids(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute(
+            'SELECT first_name, id FROM "Person"'))
+    finally:
+        connection.close()
+
+
+def test_descendants_page_is_streamed(client, ids):
+    response = client.get(f'/gwd/test/D/?i={ids["a"]}&v=10')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    html = response.get_data(as_text=True)
+    for number in ('1', '1.1', '1.2', '1.1.1', '1.2.1', '1.1.1.1'):
+        assert f'id="d{number}"' in html
+    # k is first reached through c and g, then again through d and h
+    assert 'id="d1.2.1.1"' in html
+    assert html.split('id="d1.2.1.1"')[1].split('</li>')[0].strip() \
+        .endswith('1.1.1.1')
+    assert '1900-' in html
+
+
+def test_descendants_generation_limit(client, ids):
+    html = client.get(f'/gwd/test/D/?i={ids["a"]}&v=2').get_data(
+        as_text=True)
+
+    assert 'id="d1.2"' in html
+    assert 'id="d1.1.1"' not in html
+
+
+def test_descendants_requires_person(client):
+    response = client.get('/gwd/test/D/?v=2')
+
+    assert 'Incorrect request' in response.get_data(as_text=True)
+
+
+def test_descendants_unknown_person(client):
+    response = client.get('/gwd/test/D/?i=999999')
+
+    assert response.status_code == 200
+    assert 'id="d1"' not in response.get_data(as_text=True)
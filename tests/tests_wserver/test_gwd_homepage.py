@@ -23,8 +23,7 @@ class TestGwdHomepage(unittest.TestCase):
         mock_render.return_value = '<html>home</html>'
         fake_db = SimpleNamespace()
         fake_db.get_session = lambda: 'session'
-        fake_db.get_all = lambda session, model: [
-            SimpleNamespace(), SimpleNamespace(), SimpleNamespace()]
+        fake_db.count = lambda session, model: 3
         mock_get_db_service.return_value = fake_db
 
         resp = self.client.get('/gwd/testbase')
@@ -32,5 +31,5 @@ class TestGwdHomepage(unittest.TestCase):
         mock_render.assert_called_once()
         args, kwargs = mock_render.call_args
         self.assertEqual(args[0], 'gwd/homepage.html')
-        # total_persons should match the number returned by fake_db.get_all
+        # total_persons should match the number returned by fake_db.count
         self.assertEqual(kwargs['total_persons'], 3)
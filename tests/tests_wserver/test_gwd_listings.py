@@ -0,0 +1,44 @@
+import pytest
+
+
+LISTINGS_GW = """encoding: utf-8
+
+fam Dupont Jean #nick Le_Grand [Duc:Jean:Bourgogne:1870:1900] 1850 + \
+Martin Anne 1852
+beg
+- h Luc 1880
+- f Marie 1882
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(LISTINGS_GW, "listings")
+
+
+def test_search_by_surname_lists_each_person_once(client):
+    response = client.get('/gwd/listings/search?surname=Dupont&lang=en')
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    for first_name in ("Jean", "Luc", "Marie"):
+        assert html.count(f"{first_name} Dupont") == 1
+    assert "1850-" in html
+    assert "Martin" not in html
+
+
+def test_search_by_first_name_shows_the_qualifier(client):
+    response = client.get('/gwd/listings/search?firstname=Jean&lang=en')
+
+    assert response.status_code == 200
+    assert "Le Grand" in response.get_data(as_text=True)
+
+
+def test_title_detail_shows_birth_years(client):
+    response = client.get('/gwd/listings/titles?title=Duc&lang=en')
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "Jean Dupont" in html
+    assert "1850" in html
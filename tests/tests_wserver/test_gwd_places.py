@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import delete, func, select
+
+from database.built_table import BuiltTable
+from database.place import Place
+from database.place_event import PlaceEvent
+
+
+PLACES_GW = """encoding: utf-8
+
+fam Dupont Jean #bp Paris,_France +2005 #mp Lyon,_France Martin Anne
+beg
+- f Marie #bp Paris,_France
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(PLACES_GW, "places")
+
+
+def test_places_surnames(client):
+    html = client.get('/gwd/test/PS/').get_data(as_text=True)
+
+    assert 'Lyon, France:' in html
+    assert 'Paris, France:' in html
+    assert 'surname=Dupont">Dupont</a> (2)' in html
+    assert 'surname=Martin">Martin</a> (1)' in html
+    assert html.index('Lyon, France:') < html.index('Paris, France:')
+
+
+def test_places_surnames_of_some_events(client):
+    html = client.get('/gwd/test/PS/?bi=on').get_data(as_text=True)
+
+    assert 'Paris, France:' in html
+    assert 'Lyon, France:' not in html
+    assert 'name="bi" value="on" checked' in html
+    assert 'name="ma" value="on" checked' not in html
+
+
+def test_places_of_an_unsplit_base_are_not_split_by_a_get(client, db_service):
+    session = db_service.get_session()
+    try:
+        session.execute(delete(PlaceEvent))
+        session.execute(delete(Place))
+        session.execute(delete(BuiltTable))
+        session.commit()
+    finally:
+        session.close()
+
+    html = client.get('/gwd/test/PS/?lang=fr').get_data(as_text=True)
+
+    assert "Les lieux de cette base n'ont pas encore été répertoriés." in html
+    assert 'Paris, France:' not in html
+    session = db_service.get_session()
+    try:
+        assert session.execute(
+            select(func.count()).select_from(Place)).scalar_one() == 0
+    finally:
+        session.close()
@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+
+
+# g and h are first cousins, through a and b
+COUSINS_GW = """encoding: utf-8
+
+fam A a 1900 + A b
+beg
+- h c
+- f d
+end
+
+fam A c + X e
+beg
+- h g
+end
+
+fam Y f + A d
+beg
+- f h
+end
+
+fam A g + Y h
+beg
+- h k
+end
+"""
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(COUSINS_GW, "cousins")
+
+
+@pytest.fixture
+def ids(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute(
+            'SELECT first_name, id FROM "Person"'))
+    finally:
+        connection.close()
+
+
+def test_relationship_of_cousins(client, ids):
+    response = client.get(f'/gwd/test/R/?i={ids["g"]}&ei={ids["h"]}')
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert '(2, 2)' in html
+    assert '6.2500%' in html
+
+
+def test_relationship_page_in_french(client, ids):
+    html = client.get(
+        f'/gwd/test/R/?i={ids["g"]}&ei={ids["h"]}&lang=fr').get_data(
+        as_text=True)
+
+    assert 'Consanguinité' in html
+
+
+def test_relationship_links_through_one_ancestor(client, ids):
+    response = client.get(
+        f'/gwd/test/RL/?i1={ids["g"]}&i2={ids["h"]}&a={ids["a"]}')
+
+    html = response.get_data(as_text=True)
+    assert html.count('(2, 2)') == 1
+
+
+def test_relationship_chain(client, ids):
+    response = client.get(
+        f'/gwd/test/RLM/?i1={ids["k"]}&i2={ids["a"]}&i3={ids["e"]}')
+
+    html = response.get_data(as_text=True)
+    # k descends from a, and a is not related to e
+    assert '(3, 0)' in html
+    assert html.count('<section') == 2
+
+
+def test_relationship_requires_two_persons(client, ids):
+    response = client.get(f'/gwd/test/R/?i={ids["g"]}')
+
+    assert 'Incorrect request' in response.get_data(as_text=True)
+
+
+def test_relationship_unknown_person(client, ids):
+    response = client.get(f'/gwd/test/R/?i={ids["g"]}&ei=999999')
+
+    assert response.status_code == 200
+    assert '<section' not in response.get_data(as_text=True)
@@ -3,6 +3,9 @@ from types import SimpleNamespace
 from unittest.mock import patch
 from flask import Flask
 
+from database.name_index import NameKind
+from repositories.name_count_repository import (
+    InitialBucket, NameFrequency, NamePage)
 from wserver.routes.gwd import gwd_bp
 
 
@@ -17,16 +20,19 @@ class TestGwdSearch(unittest.TestCase):
         self.app.register_blueprint(gwd_bp)
         self.client = self.app.test_client()
 
+    @patch('wserver.routes.search._load_persons')
+    @patch('wserver.routes.search.NameIndexRepository')
     @patch('wserver.routes.search.render_template')
     @patch('wserver.routes.search.get_db_service')
-    def test_search_by_surname_renders_correct_template(self, mock_get_db_service, mock_render):
+    def test_search_by_surname_renders_correct_template(
+            self, mock_get_db_service, mock_render, mock_index, mock_load):
         mock_render.return_value = '<html>search</html>'
         fake_db = SimpleNamespace()
         fake_db.get_session = lambda: 's'
-        # Emulate get_all(session, Person, {'surname': 'Smith'})
-        fake_db.get_all = lambda session, model, filters=None: [
-            SimpleNamespace(first_name='A', surname='Smith')]
         mock_get_db_service.return_value = fake_db
+        mock_index.return_value.search.return_value = [1]
+        mock_load.return_value = [
+            SimpleNamespace(id=1, first_name='A', surname='Smith')]
 
         resp = self.client.get('/gwd/testbase/search?surname=Smith')
         self.assertEqual(resp.status_code, 200)
@@ -34,52 +40,57 @@ class TestGwdSearch(unittest.TestCase):
         args, kwargs = mock_render.call_args
         self.assertEqual(args[0], 'gwd/search_surname.html')
 
+    @patch('wserver.routes.search.NameCountRepository')
     @patch('wserver.routes.search.render_template')
     @patch('wserver.routes.search.get_db_service')
-    def test_search_alpha_on_surname_groups_correctly(self, mock_get_db_service, mock_render):
+    def test_search_alpha_on_surname_lists_one_letter(
+            self, mock_get_db_service, mock_render, mock_counts):
         mock_render.return_value = '<html>alpha</html>'
-        # Create persons to exercise grouping by surname initial
-        p1 = SimpleNamespace(first_name='John', surname='Alpha')
-        p2 = SimpleNamespace(first_name='Jane', surname='Alpha')
-        p3 = SimpleNamespace(first_name='Bob', surname='Beta')
-
         fake_db = SimpleNamespace()
         fake_db.get_session = lambda: 's'
-        # When called without filters, get_all returns all persons
-        fake_db.get_all = lambda session, model, filters=None: [p1, p2, p3]
         mock_get_db_service.return_value = fake_db
+        counts = mock_counts.return_value
+        counts.initials.return_value = [
+            InitialBucket('a', 1, 2), InitialBucket('b', 1, 1)]
+        counts.names_by_initial.return_value = NamePage(
+            [NameFrequency('Beta', 1)], 1, 1)
 
-        resp = self.client.get('/gwd/testbase/search?sort=alpha&on=surname')
+        resp = self.client.get(
+            '/gwd/testbase/search?sort=alpha&on=surname&letter=b')
         self.assertEqual(resp.status_code, 200)
-        mock_render.assert_called_once()
+        counts.ensure_built.assert_not_called()
+        counts.names_by_initial.assert_called_once_with(
+            NameKind.SURNAME, 'b', 1)
         args, kwargs = mock_render.call_args
         self.assertEqual(args[0], 'gwd/search_surnames_alpha.html')
-        persons_grouped = kwargs.get('persons_grouped')
-        # Expect two letters groups A and B
-        letters = [g['letter'].upper() for g in persons_grouped]
-        self.assertIn('A', letters)
-        self.assertIn('B', letters)
+        self.assertEqual(kwargs['letter'], 'b')
+        self.assertEqual(kwargs['total_names'], 2)
+        self.assertEqual(kwargs['total_persons'], 3)
+
+        # Without a known letter, the first one is listed
+        self.client.get('/gwd/testbase/search?sort=alpha&on=surname')
+        counts.names_by_initial.assert_called_with(NameKind.SURNAME, 'a', 1)
 
+    @patch('wserver.routes.search.NameCountRepository')
     @patch('wserver.routes.search.render_template')
     @patch('wserver.routes.search.get_db_service')
-    def test_search_freq_on_firstname_counts_correctly(self, mock_get_db_service, mock_render):
+    def test_search_freq_on_firstname_pages_counts(
+            self, mock_get_db_service, mock_render, mock_counts):
         mock_render.return_value = '<html>freq</html>'
-        # Two Johns and one Alice
-        p1 = SimpleNamespace(first_name='John', surname='X')
-        p2 = SimpleNamespace(first_name='John', surname='Y')
-        p3 = SimpleNamespace(first_name='Alice', surname='Z')
-
         fake_db = SimpleNamespace()
         fake_db.get_session = lambda: 's'
-        fake_db.get_all = lambda session, model, filters=None: [p1, p2, p3]
         mock_get_db_service.return_value = fake_db
+        counts = mock_counts.return_value
+        counts.initials.return_value = [
+            InitialBucket('a', 1, 1), InitialBucket('j', 1, 2)]
+        names = NamePage(
+            [NameFrequency('John', 2), NameFrequency('Alice', 1)], 2, 2)
+        counts.most_frequent.return_value = names
 
-        resp = self.client.get('/gwd/testbase/search?sort=freq&on=firstname')
+        resp = self.client.get(
+            '/gwd/testbase/search?sort=freq&on=firstname&pg=2')
         self.assertEqual(resp.status_code, 200)
-        mock_render.assert_called_once()
+        counts.most_frequent.assert_called_once_with(NameKind.FIRST_NAME, 2)
         args, kwargs = mock_render.call_args
         self.assertEqual(args[0], 'gwd/search_firstnames_freq.html')
-        persons_grouped = kwargs.get('persons_grouped')
-        # First group should be John with count 2
-        self.assertGreaterEqual(len(persons_grouped), 1)
-        self.assertEqual(persons_grouped[0]['count'], 2)
+        self.assertEqual(kwargs['names'], names)
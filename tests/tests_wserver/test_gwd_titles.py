@@ -58,16 +58,20 @@ class TestGwdTitles(unittest.TestCase):
         self.app.register_blueprint(gwd_bp)
         self.client = self.app.test_client()
 
+    @patch('wserver.routes.titles.PersonRepository')
     @patch('wserver.routes.titles.render_template')
     @patch('wserver.routes.titles.get_db_service')
-    def test_titles_single_result_renders_detail(self, mock_get_db_service, mock_render):
+    def test_titles_single_result_renders_detail(
+            self, mock_get_db_service, mock_render, mock_persons):
         mock_render.return_value = '<html>title detail</html>'
         the_title = SimpleNamespace(id=1, name='Lord', place='Castle')
         person = SimpleNamespace(first_name='John', surname='Doe')
         results_map = {
             'Titles': [the_title],
-            'Person': [person]
+            'Person': [(7,)]
         }
+        mock_persons.return_value.get_person_summaries.return_value = {
+            7: person}
 
         fake_db = SimpleNamespace()
         fake_db.get_session = lambda: FakeSession(results_map)
@@ -80,6 +84,9 @@ class TestGwdTitles(unittest.TestCase):
         self.assertEqual(args[0], 'gwd/title_detail.html')
         self.assertEqual(kwargs['title_name'], 'Lord')
         self.assertEqual(kwargs['estate_name'], 'Castle')
+        self.assertEqual(kwargs['persons'], [person])
+        mock_persons.return_value.get_person_summaries.assert_called_once_with(
+            [7])
 
     @patch('wserver.routes.titles.render_template')
     @patch('wserver.routes.titles.get_db_service')
@@ -23,6 +23,37 @@ class TestBaseRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn(b'ok', response.data)
 
+    @patch('wserver.routes.gwsetup._template_service')
+    def test_route_cache_files_form(self, mock_service):
+        mock_service.render_gwsetup_template.return_value = '<html>ok</html>'
+        response = self.client.get('gwsetup/cache_files/en')
+        self.assertEqual(response.status_code, 200)
+        mock_service.render_gwsetup_template.assert_called_with(
+            'cache_files.htm')
+
+    @patch('wserver.routes.gwsetup.CacheFilesRepository')
+    @patch('wserver.routes.gwsetup.get_db_service')
+    @patch('wserver.routes.gwsetup._template_service')
+    def test_route_cache_files_computes(self, mock_service, mock_db,
+                                        mock_repo):
+        mock_service.render_gwsetup_template.return_value = '<html>ok</html>'
+        response = self.client.get('gwsetup/cache_files/en?anon=mybase')
+        self.assertEqual(response.status_code, 200)
+        mock_db.assert_called_once_with('mybase')
+        mock_repo.return_value.rebuild.assert_called_once_with()
+        mock_service.render_gwsetup_template.assert_called_with(
+            'cache_files_ok.htm')
+
+        response = self.client.get('gwsetup/cache_files/en?anon=../x')
+        self.assertEqual(response.status_code, 400)
+
+    def test_route_cache_files_does_not_echo_a_bad_name(self):
+        response = self.client.get(
+            'gwsetup/cache_files/en?anon=<script>alert(1)</script>')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.mimetype, 'text/plain')
+        self.assertNotIn(b'<script>', response.data)
+
     def test_not_implemented_routes(self):
         not_implemented_routes = [
             '/robots.txt', '/backg.htm', '/bsc.htm', '/bsi_cache_files.htm',
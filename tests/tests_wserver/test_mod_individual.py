@@ -197,6 +197,25 @@ class TestModIndividualWithDatabase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn(b'Test', response.data)
         self.assertIn(b'Person', response.data)
+        # The surname suggestions are not written into the form
+        self.assertIn(b'<datalist id="datalist_snames"></datalist>',
+                      response.data)
+        self.assertIn(b'list="datalist_snames"', response.data)
+
+    def test_datalist_lists_the_values_starting_with_the_prefix(self):
+        """Test the suggestions of a field come from the cache files."""
+        self.create_test_person('Test', 'Person', 0)
+
+        response = self.client.get(
+            f'/gwd/{self.base_name}/DATALIST/?data=snames&s=pe')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), ['Person'])
+        response = self.client.get(
+            f'/gwd/{self.base_name}/DATALIST/?data=fnames&s=pe')
+        self.assertEqual(response.get_json(), [])
+        response = self.client.get(
+            f'/gwd/{self.base_name}/DATALIST/?data=unknown&s=pe')
+        self.assertEqual(response.get_json(), [])
 
     def test_modify_person_basic_info(self):
         """Test modifying basic person information."""
@@ -0,0 +1,125 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import update
+
+import database.person as db_person
+from database.sqlite_database_service import SQLiteDatabaseService
+from wserver.page_cache import ENTRY_OVERHEAD, CachedPage, PageCache, \
+    page_cache
+
+
+FAMILY_GW = """encoding: utf-8
+
+fam Dupont Jean + Martin Marie
+beg
+- h Pierre
+end
+"""
+
+
+def _key(base, args=()):
+    return (base, "gwd.gwd_titles", tuple(args), "en", None)
+
+
+def _page(version, size):
+    return CachedPage(version, b"x" * (size - ENTRY_OVERHEAD), "text/html")
+
+
+def test_lru_eviction_is_bounded_by_bytes():
+    cache = PageCache(max_bytes=8000)
+    version = ((1, 1), (0, 0))
+    for index in range(8):
+        cache.put(_key("a", [("i", str(index))]), _page(version, 1000))
+    # Make the first page the most recently used
+    assert cache.get(_key("a", [("i", "0")]), version) is not None
+    cache.put(_key("a", [("i", "8")]), _page(version, 1000))
+
+    assert cache.size <= 8000
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(_key("a", [("i", "0")]), version) is not None
+    assert cache.get(_key("a", [("i", "1")]), version) is None
+
+
+def test_oversized_pages_are_not_kept():
+    cache = PageCache(max_bytes=8000)
+
+    cache.put(_key("a"), _page(((1, 1), (0, 0)), 1001))
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_new_version_drops_the_pages_of_its_base_only():
+    cache = PageCache()
+    old, new = ((1, 1), (0, 0)), ((1, 1), (1, 0))
+    cache.put(_key("a"), _page(old, 1000))
+    cache.put(_key("b"), _page(old, 1000))
+
+    assert cache.get(_key("a"), new) is None
+    assert cache.get(_key("b"), old) is not None
+    assert cache.size == 1000
+    # Rendered from the old version while the base was being written
+    cache.put(_key("a"), _page(old, 1000))
+    assert cache.get(_key("a"), new) is None
+
+
+@pytest.fixture
+def db_path(compile_gw):
+    return compile_gw(FAMILY_GW)
+
+
+def test_pages_are_served_until_a_write(client, db_path):
+    # The first request opens the shared engine the versions come from
+    client.get('/gwd/test/fiefs')
+    page_cache.clear()
+    first = client.get('/gwd/test/titles?lang=en')
+    assert first.status_code == 200
+
+    second = client.get('/gwd/test/titles?lang=en')
+    assert second.get_data() == first.get_data()
+    assert page_cache.stats()["hits"] == 1
+
+    # Another language is another page
+    client.get('/gwd/test/titles?lang=fr')
+    assert page_cache.stats()["entries"] == 2
+
+    service = SQLiteDatabaseService(db_path, shared=True)
+    service.connect()
+    session = service.get_session()
+    session.execute(update(db_person.Person).values(occupation="Baker"))
+    session.commit()
+    session.close()
+
+    client.get('/gwd/test/titles?lang=en')
+    assert page_cache.stats()["hits"] == 1
+    assert page_cache.stats()["entries"] == 1
+
+
+def test_conditional_get(client, db_path):
+    client.get('/gwd/test/fiefs')
+    first = client.get('/gwd/test/titles')
+    etag = first.headers['ETag']
+    assert etag
+
+    with patch('wserver.routes.titles.get_db_service') as get_db_service:
+        revalidated = client.get(
+            '/gwd/test/titles', headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == etag
+        # Answered without opening the base
+        get_db_service.assert_not_called()
+
+    # Each page has its own tag
+    other = client.get('/gwd/test/titles?lang=fr')
+    assert other.headers['ETag'] != etag
+
+    service = SQLiteDatabaseService(db_path, shared=True)
+    service.connect()
+    session = service.get_session()
+    session.execute(update(db_person.Person).values(occupation="Baker"))
+    session.commit()
+    session.close()
+
+    changed = client.get('/gwd/test/titles', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
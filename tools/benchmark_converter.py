@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the conversion of database rows to application persons
+(``repositories.converter_from_db.convert_person_from_db``).
+
+The rows of every person of a base are loaded once, the way
+``PersonRepository.get_persons_by_ids`` loads them, then converted again
+and again: the timings cover the conversion alone, not the queries. The
+same rows are converted by the current converter and by the one of an
+earlier revision (``--before``, by default the last one before the
+converters were made table-driven), read with ``git show``, in the same
+run.
+
+Usage (from the repository root)::
+
+    PYTHONPATH=src python tools/benchmark_converter.py [base.gw] [-n ROUNDS]
+        [--before REV]
+
+The base is compiled from ``test_assets/big.gw`` by default.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from sqlalchemy.orm import selectinload
+
+# Add the src directory to Python path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import repositories.person_repository as person_repository  # noqa: E402
+from database.sqlite_database_service import (  # noqa: E402
+    SQLiteDatabaseService)
+from repositories.converter_from_db import (  # noqa: E402
+    convert_person_from_db)
+from script.gwc import GwcArguments, gwc_main  # noqa: E402
+
+DEFAULT_GW = Path(__file__).parent.parent / "test_assets" / "big.gw"
+
+# Last revision before the converters were made table-driven
+DEFAULT_BEFORE = "276805968f9e"
+
+CONVERTER_PATH = "src/repositories/converter_from_db.py"
+
+
+def load_converter(revision: str):
+    """``convert_person_from_db`` of ``converter_from_db`` as it was at
+    ``revision`` of the repository."""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{CONVERTER_PATH}"],
+        cwd=Path(__file__).parent.parent, capture_output=True, text=True,
+        check=True).stdout
+    spec = importlib.util.spec_from_loader(
+        "converter_from_db_before", loader=None)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(source, f"{revision}:{CONVERTER_PATH}", "exec"),
+         module.__dict__)
+    return module.convert_person_from_db
+
+
+def compile_base(gw_file: str, db_path: str) -> None:
+    """Compile ``gw_file`` into a new base at ``db_path``."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = gwc_main(GwcArguments(
+            out_file=db_path, input_file_data=[], separate=False,
+            bnotes="merge", shift=0, files=[gw_file], verbose=False,
+            no_fail=False, stats=False, f=True, cg=False, ds="",
+            particles="", nc=False,
+        ), lambda: None)
+    if result != 0:
+        raise SystemExit(f"gwc failed on {gw_file}")
+
+
+def load_rows(db_service: SQLiteDatabaseService):
+    """Arguments of ``convert_person_from_db`` for every person of the
+    base, with their rows loaded (the session is left open so that lazy
+    attributes stay readable)."""
+    calls = []
+
+    def record(*args):
+        calls.append(args)
+        return convert_person_from_db(*args)
+
+    session = db_service.get_session()
+    person = person_repository.db_person.Person
+    persons = session.query(person).options(
+        *person_repository._person_load_options(),
+        # Read by the previous converter, which has no packed dates
+        *(selectinload(getattr(person, f"{date}_obj"))
+          for date in person_repository._PERSON_DATES)).all()
+    person_repository.convert_person_from_db = record
+    try:
+        person_repository._convert_persons(session, persons)
+    finally:
+        person_repository.convert_person_from_db = convert_person_from_db
+    return session, calls
+
+
+def time_converter(converter, calls, rounds: int) -> float:
+    """Best time of ``rounds`` conversions of all the ``calls`` by
+    ``converter``."""
+    def convert_all():
+        for call in calls:
+            converter(*call)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return min(timeit.repeat(convert_all, number=rounds, repeat=5))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("gw_file", nargs="?", default=str(DEFAULT_GW))
+    parser.add_argument("-n", "--rounds", type=int, default=200,
+                        help="conversions of the whole base (default 200)")
+    parser.add_argument("--before", default=DEFAULT_BEFORE, metavar="REV",
+                        help="revision of the converter compared with the "
+                             f"current one (default {DEFAULT_BEFORE})")
+    args = parser.parse_args()
+    # Converters timed, the previous one first
+    converters = (
+        ("before", load_converter(args.before)),
+        ("after", convert_person_from_db),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        compile_base(args.gw_file, db_path)
+        db_service = SQLiteDatabaseService(db_path)
+        db_service.connect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            session, calls = load_rows(db_service)
+        try:
+            timings = {
+                name: time_converter(converter, calls, args.rounds)
+                for name, converter in converters
+            }
+        finally:
+            session.close()
+            db_service.disconnect()
+
+    print(f"{len(calls)} persons, {args.rounds} rounds:")
+    for name, best in timings.items():
+        per_person = best / args.rounds / max(len(calls), 1)
+        print(f"  {name:<7} {per_person * 1e6:.1f} µs per person")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())